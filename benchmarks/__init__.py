@@ -0,0 +1 @@
+"""Benchmarks mot falske tjenester, se `benchmarks.run`."""
@@ -0,0 +1,446 @@
+"""Benchmarks for den ukentlige prosesseringen.
+
+Kjører eksport, resultater, PPR, matchup-digesten og optimal oppstilling mot
+de falske tjenestene i `core.fakes`, med fast forsinkelse per eksternt kall, for hver kombinasjon
+av antall tippere og uker. Hver kjøring måles med `core.perf`, så rapporten
+får veggtid og tid per fase og operasjon. Antall kall telles av de falske
+tjenestene selv, så også kall som ikke går gjennom `sheets_call` eller
+`timed` (f.eks. direkte gspread-kall på event-loopen) kommer med.
+
+Tippekanalen har trafikk for hele sesongen frem til uken som måles, og med
+--chatter i tillegg meldinger fra tipperne. Discord-kallene går gjennom en
+rate limit-modell per rute; ventetiden telles i rapporten, men sovnes ikke.
+
+Optimal oppstilling for en hel liga måles også mot brute force over alle
+tilordninger; er den ungarske metoden ikke raskere, regnes det som
+regresjon.
+
+Med --baseline sammenlignes rapporten med en tidligere kjøring: flere kall
+enn før, eller veggtid over toleransen, regnes som regresjon. Regresjoner
+gir avslutningskode 1.
+
+Eksempel:
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.run --baseline bench.json --out ny.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+import pytz
+
+from cogs.fantasy_reminders import FantasyReminders
+from cogs.ppr import PPR
+from cogs.vestsk_tipping import VestskTipping
+from core import perf
+from core.fakes import FakeBot, FakeChannel, FakeContext, FakeESPN, FakeLeague
+from core.fakes.discord import RateLimiter, build_season_channel
+from core.fakes.sheets import build_ppr_sheet, build_tipping_sheet, tipper_ids
+from core.metrics import timed
+from core.utils.lineup_optimizer import BENCH_SLOTS, league_efficiency
+from core.utils.playoff_odds import simulate
+from core.utils.tipping_projection import simulate_season
+from data.brukere import TEAM_NAMES
+
+PIPELINES = ("eksport", "resultater", "ppr", "digest", "lineup")
+DEFAULT_TIPPERS = (8, 32, 128)
+DEFAULT_WEEKS = (1, 18)
+# Fantasysesongen slutter i uke 17, så digesten lages for uke 16 og tidligere
+DIGEST_LAST_WEEK = 16
+# Lag i den falske fantasyligaen
+LEAGUE_TEAMS = 12
+
+
+def _vestsk_cog(bot: FakeBot) -> VestskTipping:
+    """VestskTipping uten bakgrunnsoppgavene som startes i __init__."""
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    return cog
+
+
+def _fantasy_cog(bot: FakeBot) -> FantasyReminders:
+    """FantasyReminders uten bakgrunnsoppgavene som startes i __init__."""
+    cog = FantasyReminders.__new__(FantasyReminders)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    return cog
+
+
+def _result(
+    name: str,
+    tippers: int | None,
+    weeks: int,
+    timing,
+    calls: Counter,
+    waited: Counter | None = None,
+) -> dict:
+    """Gjør en måling og kallene fra de falske tjenestene om til en rad."""
+    calls = dict(sorted(calls.items()))
+    return {
+        "pipeline": name,
+        "tippers": tippers,
+        "weeks": weeks,
+        "wall_seconds": round(timing.elapsed(), 4),
+        "calls": calls,
+        "total_calls": sum(calls.values()),
+        "stages": {
+            stage: round(seconds, 4)
+            for stage, (seconds, _) in sorted(timing.stages.items())
+        },
+        "rate_limit_wait": {
+            op: round(seconds, 2) for op, seconds in sorted((waited or {}).items())
+        },
+    }
+
+
+async def bench_vestsk(
+    tippers: int,
+    weeks: int,
+    latency: float,
+    simulations: int | None = None,
+    chatter: int = 0,
+) -> list[dict]:
+    """Eksport og resultater for uke `weeks`, med tidligere uker i arket.
+
+    Eksporten leser ukens kampmeldinger og reaksjoner fra kanalen og skriver
+    tipsene til arket, og resultatene regner ut poeng for samme uke.
+    """
+    calls: Counter = Counter()
+    limits = RateLimiter(time_scale=0)
+    book = build_tipping_sheet(tippers, weeks - 1, latency, calls)
+    bot = FakeBot()
+    channel = build_season_channel(
+        weeks, tipper_ids(tippers), bot.user, chatter, latency, calls, limits
+    )
+    espn = FakeESPN(completed_through=weeks, latency=latency, calls=calls)
+    cog = _vestsk_cog(bot)
+    ctx = FakeContext(channel, bot)
+
+    patches = [
+        patch(
+            "cogs.vestsk_tipping.get_sheet",
+            lambda name, worksheet_index=0: book.get_worksheet(worksheet_index),
+        ),
+        patch("cogs.vestsk_tipping.fetch_espn_json", espn.fetch_json),
+    ]
+    if simulations:
+        patches.append(
+            patch(
+                "cogs.vestsk_tipping.simulate_season",
+                functools.partial(simulate_season, simulations=simulations),
+            )
+        )
+    results = []
+    with contextlib.ExitStack() as stack:
+        for p in patches:
+            stack.enter_context(p)
+        for name, impl in (
+            ("eksport", cog._export_impl),
+            ("resultater", cog._resultater_impl),
+        ):
+            before, waited = Counter(calls), Counter(limits.waited)
+            with perf.measure(name) as timing:
+                await impl(ctx, weeks)
+            results.append(
+                _result(
+                    name,
+                    tippers,
+                    weeks,
+                    timing,
+                    calls - before,
+                    limits.waited - waited,
+                )
+            )
+    return results
+
+
+async def bench_ppr(weeks: int, latency: float) -> dict:
+    """PPR-oppdateringen mot et dokument med ett ark per manager.
+
+    PPR leser én verdi per sesong per manager, så antall uker påvirker ikke
+    arbeidet; uken tas bare med i rapporten.
+    """
+    calls: Counter = Counter()
+    bot = FakeBot()
+    channel = FakeChannel(1, latency=latency, calls=calls)
+    cog = PPR(bot)
+    cog.sheet = build_ppr_sheet(list(TEAM_NAMES), latency, calls)
+    with perf.measure("ppr") as timing:
+        await PPR.ppr.callback(cog, FakeContext(channel, bot))
+    return _result("ppr", None, weeks, timing, calls)
+
+
+async def bench_digest(
+    weeks: int, latency: float, cache_dir: str, simulations: int | None = None
+) -> dict:
+    """Matchup-digesten for uke `weeks` (maks DIGEST_LAST_WEEK) uten cache."""
+    finished = min(weeks, DIGEST_LAST_WEEK)
+    calls: Counter = Counter()
+    league = FakeLeague(
+        LEAGUE_TEAMS, current_week=finished + 1, latency=latency, calls=calls
+    )
+    bot = FakeBot()
+    channel = FakeChannel(1, latency=latency, calls=calls)
+    cog = _fantasy_cog(bot)
+
+    def get_league():
+        with timed("espn.league"):
+            time.sleep(latency)
+        calls["espn.league"] += 1
+        return league
+
+    patches = [
+        patch("cogs.fantasy_reminders.get_league", get_league),
+        patch(
+            "cogs.fantasy_reminders.DIGEST_CACHE",
+            os.path.join(cache_dir, f"digest_{weeks}.json"),
+        ),
+        patch(
+            "core.utils.season_stats.STATS_CACHE",
+            os.path.join(cache_dir, f"stats_{weeks}.json"),
+        ),
+    ]
+    if simulations:
+        patches.append(
+            patch(
+                "cogs.fantasy_reminders.simulate",
+                functools.partial(simulate, simulations=simulations),
+            )
+        )
+    with contextlib.ExitStack() as stack:
+        for p in patches:
+            stack.enter_context(p)
+        with perf.measure("digest") as timing:
+            await cog.build_matchup_digest(channel)
+    return _result("digest", None, finished, timing, calls)
+
+
+def brute_force_points(slots: list[str], players: list) -> float:
+    """Beste poengsum for plassene ved å prøve alle gyldige tilordninger.
+
+    Referanse for den ungarske metoden i `core.utils.lineup_optimizer`.
+
+    Args:
+        slots (list[str]): Startplassene som skal fylles
+        players (list): Spillerne som kan settes inn
+
+    Returns:
+        float: Poengene til beste tilordning
+    """
+    if not slots:
+        return 0.0
+    slot, rest = slots[0], slots[1:]
+    best = None
+    for i, player in enumerate(players):
+        if slot in player.eligibleSlots:
+            others = players[:i] + players[i + 1 :]
+            score = player.points + brute_force_points(rest, others)
+            best = score if best is None else max(best, score)
+    # Ingen kvalifiserte igjen: plassen står tom
+    return brute_force_points(rest, players) if best is None else best
+
+
+def bench_lineup(weeks: int) -> dict:
+    """Optimal oppstilling for alle lag i uke `weeks`, mot brute force."""
+    finished = min(weeks, DIGEST_LAST_WEEK)
+    calls: Counter = Counter()
+    league = FakeLeague(LEAGUE_TEAMS, current_week=finished + 1, calls=calls)
+    boxes = league.box_scores(finished)
+    lineups = [
+        [p for p in lineup if p.slot_position != "IR"]
+        for box in boxes
+        for lineup in (box.home_lineup, box.away_lineup)
+    ]
+    league_efficiency(boxes[:1])  # første kall laster numpy
+
+    with perf.measure("lineup") as timing:
+        league_efficiency(boxes)
+    result = _result("lineup", None, finished, timing, calls)
+
+    start = time.perf_counter()
+    for players in lineups:
+        slots = [p.slot_position for p in players if p.slot_position not in BENCH_SLOTS]
+        brute_force_points(slots, players)
+    result["brute_force_seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+async def run_all(
+    tippers: list[int],
+    weeks: list[int],
+    latency: float,
+    pipelines: tuple[str, ...] = PIPELINES,
+    simulations: int | None = None,
+    chatter: int = 0,
+) -> list[dict]:
+    """Kjører alle valgte benchmarks og returnerer radene i rapporten."""
+    runs: list[dict] = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for week in weeks:
+            if {"eksport", "resultater"} & set(pipelines):
+                for size in tippers:
+                    for result in await bench_vestsk(
+                        size, week, latency, simulations, chatter
+                    ):
+                        if result["pipeline"] in pipelines:
+                            runs.append(result)
+            if "ppr" in pipelines:
+                runs.append(await bench_ppr(week, latency))
+            if "digest" in pipelines:
+                runs.append(await bench_digest(week, latency, cache_dir, simulations))
+            if "lineup" in pipelines:
+                runs.append(bench_lineup(week))
+    return runs
+
+
+def _key(run: dict) -> tuple:
+    return run["pipeline"], run["tippers"], run["weeks"]
+
+
+def _label(run: dict) -> str:
+    size = f", {run['tippers']} tippere" if run["tippers"] is not None else ""
+    return f"{run['pipeline']} (uke {run['weeks']}{size})"
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Finner regresjoner mot en tidligere rapport.
+
+    Antall kall sammenlignes alltid. Veggtid sammenlignes bare når begge
+    rapportene er kjørt med samme forsinkelse.
+
+    Args:
+        report (dict): Ny rapport
+        baseline (dict): Tidligere rapport
+        tolerance (float): Tillatt økning i veggtid, f.eks. 0.25 for 25 %
+
+    Returns:
+        list[str]: Én linje per regresjon, tom hvis alt er like bra eller bedre
+    """
+    previous = {_key(run): run for run in baseline.get("runs", [])}
+    same_latency = report.get("latency_ms") == baseline.get("latency_ms")
+    problems = []
+    for run in report["runs"]:
+        old = previous.get(_key(run))
+        if old is None:
+            continue
+        for op, count in run["calls"].items():
+            before = old["calls"].get(op, 0)
+            if count > before:
+                problems.append(f"{_label(run)}: {op} {before} → {count} kall")
+        limit = old["wall_seconds"] * (1 + tolerance)
+        if same_latency and run["wall_seconds"] > limit:
+            problems.append(
+                f"{_label(run)}: {old['wall_seconds']:.2f} s → "
+                f"{run['wall_seconds']:.2f} s"
+            )
+    return problems
+
+
+def lineup_problems(runs: list[dict]) -> list[str]:
+    """Kjøringer der optimal oppstilling ikke var raskere enn brute force."""
+    return [
+        f"{_label(run)}: {run['wall_seconds']:.4f} s, brute force "
+        f"{run['brute_force_seconds']:.4f} s"
+        for run in runs
+        if "brute_force_seconds" in run
+        and run["wall_seconds"] >= run["brute_force_seconds"]
+    ]
+
+
+def format_table(runs: list[dict]) -> str:
+    """Kort oversikt over kjøringene for terminalen."""
+    lines = [f"{'benchmark':<36} {'tid':>8} {'kall':>6}"]
+    for run in runs:
+        lines.append(
+            f"{_label(run):<36} {run['wall_seconds']:>7.2f}s {run['total_calls']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Kommandolinje: kjører benchmarkene og skriver rapporten."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="Fil for JSON-rapporten (standard: stdout)")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--tippers", type=_int_list, default=list(DEFAULT_TIPPERS))
+    parser.add_argument("--weeks", type=_int_list, default=list(DEFAULT_WEEKS))
+    parser.add_argument(
+        "--pipelines",
+        type=lambda v: tuple(p for p in v.split(",") if p),
+        default=PIPELINES,
+    )
+    parser.add_argument(
+        "--simulations",
+        type=int,
+        help="Antall Monte Carlo-simuleringer (standard: samme som botten)",
+    )
+    parser.add_argument(
+        "--chatter",
+        type=int,
+        default=0,
+        help="Meldinger fra tipperne per uke i tippekanalen",
+    )
+    parser.add_argument("--baseline", help="Tidligere rapport å sammenligne med")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    # Cogs logger mye på INFO og PPR skriver debug til stdout
+    logging.getLogger().setLevel(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        runs = asyncio.run(
+            run_all(
+                args.tippers,
+                args.weeks,
+                args.latency_ms / 1000,
+                args.pipelines,
+                args.simulations,
+                args.chatter,
+            )
+        )
+
+    report: dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "latency_ms": args.latency_ms,
+        "simulations": args.simulations,
+        "chatter": args.chatter,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(format_table(runs))
+    else:
+        print(text)
+
+    problems = lineup_problems(runs)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems += compare(report, json.load(f), args.tolerance)
+    for problem in problems:
+        print(f"REGRESJON {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
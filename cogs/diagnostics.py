@@ -0,0 +1,195 @@
+"""
+Admin-kommandoer for drift og ytelse.
+
+Gir admins innsyn i målingene botten samler om eksterne kall
+(ESPN, Google Sheets og Discord), slik at optimalisering kan styres av data.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytz
+from discord.ext import commands
+from discord.ext.commands import Bot, Context
+
+from core.decorators import admin_only
+from core import profiler
+from core.error_reporter import recent_errors
+from core.metrics import histograms
+from core.perf import summary
+
+NORSK_TZ = pytz.timezone("Europe/Oslo")
+
+
+class Diagnostics(commands.Cog):
+    """Cog med admin-kommandoer for metrikker og feilsøking.
+
+    Attributes:
+        bot (Bot): Discord bot-instansen
+        profile_task (asyncio.Task | None): Tidsbestemt profilering fra
+            `!profil N` som kjører i bakgrunnen
+    """
+
+    def __init__(self, bot: Bot) -> None:
+        """Initialiserer Diagnostics cog.
+
+        Args:
+            bot (Bot): Discord bot-instansen
+        """
+        self.bot: Bot = bot
+        self.profile_task: asyncio.Task | None = None
+
+    async def cog_unload(self):
+        if self.profile_task is not None:
+            self.profile_task.cancel()
+
+    def _metrics_table(self, prefix: str | None = None) -> str:
+        """Lager en tabell med latens per operasjon, sortert etter total tid.
+
+        Args:
+            prefix (str | None): Vis kun operasjoner som starter med dette,
+                f.eks. "sheets"
+
+        Returns:
+            str: Ferdig formatert kodeblokk for Discord
+        """
+        rows = [
+            (op, hist)
+            for op, hist in histograms().items()
+            if prefix is None or op.startswith(prefix)
+        ]
+        if not rows:
+            return "Ingen eksterne kall registrert ennå."
+
+        rows.sort(key=lambda item: item[1].total, reverse=True)
+        lines = [
+            "```",
+            f"{'operasjon':<26} {'n':>5} {'p50':>6} {'p95':>6} {'maks':>6} "
+            f"{'feil':>4} {'t/o':>4}",
+        ]
+        for op, hist in rows:
+            lines.append(
+                f"{op[:26]:<26} {hist.count:>5} {hist.quantile(0.5):>6.2f} "
+                f"{hist.quantile(0.95):>6.2f} {hist.max:>6.2f} "
+                f"{hist.errors:>4} {hist.timeouts:>4}"
+            )
+        lines.append("```")
+        return "\n".join(lines)
+
+    @commands.command(name="metrikker")
+    @admin_only()
+    async def metrikker(self, ctx: Context, prefix: str | None = None) -> None:
+        """Viser latens (sekunder), feil og timeouts for eksterne kall.
+
+        Args:
+            ctx (Context): Discord context-objektet
+            prefix (str | None): Valgfritt filter, f.eks. "espn" eller "sheets"
+        """
+        await ctx.send(self._metrics_table(prefix))
+
+    @commands.command(name="perf")
+    @admin_only()
+    async def perf(self, ctx: Context) -> None:
+        """Viser p50/p95/maks (sekunder) for kommandoene i det rullerende vinduet.
+
+        Args:
+            ctx (Context): Discord context-objektet
+        """
+        stats = summary()
+        if not stats:
+            await ctx.send("Ingen kommandoer målt ennå.")
+            return
+
+        lines = [
+            "```",
+            f"{'kommando':<18} {'n':>5} {'p50':>6} {'p95':>6} {'maks':>6}",
+        ]
+        for command, row in sorted(
+            stats.items(), key=lambda item: item[1]["p95"], reverse=True
+        ):
+            lines.append(
+                f"{command[:18]:<18} {row['n']:>5} {row['p50']:>6.2f} "
+                f"{row['p95']:>6.2f} {row['max']:>6.2f}"
+            )
+        lines.append("```")
+        await ctx.send("\n".join(lines))
+
+    @commands.command(name="profil")
+    @admin_only()
+    async def profil(self, ctx: Context, maal: str) -> None:
+        """Profilerer botten i N sekunder eller neste kjøring av en kommando.
+
+        Profilen (pstats, collapsed stacks og rå .prof) sendes til
+        admin-kanalen. Den tidsbestemte profileringen kjører i bakgrunnen, så
+        kommandoen selv svarer med en gang og holder seg innenfor
+        ytelsesbudsjettet.
+
+        Args:
+            ctx (Context): Discord context-objektet
+            maal (str): Antall sekunder, eller et kommandonavn som "resultater"
+        """
+        if maal.isdigit():
+            seconds = min(int(maal), profiler.MAX_SECONDS)
+            try:
+                profiler.start_session()
+            except RuntimeError as e:
+                await ctx.send(f"⚠️ {e}")
+                return
+            await ctx.send(f"🔬 Profilerer i {seconds} s …")
+            self.profile_task = asyncio.get_running_loop().create_task(
+                self._profile_for(seconds), name="profil"
+            )
+            return
+
+        command = self.bot.get_command(maal.lstrip("!"))
+        if command is None:
+            await ctx.send(f"Fant ingen kommando `{maal}`.")
+            return
+        profiler.arm(command.qualified_name)
+        await ctx.send(f"🔬 Neste kjøring av `!{command.qualified_name}` profileres.")
+
+    async def _profile_for(self, seconds: int) -> None:
+        """Lar profileringen gå i `seconds` sekunder og sender resultatet."""
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = profiler.stop_session()
+        if result is None:
+            return
+        try:
+            await profiler.post_result(self.bot, result, f"{seconds} s")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"[PROFIL] Klarte ikke å sende profil: {e}")
+
+    @commands.command(name="feil")
+    @admin_only()
+    async def feil(self, ctx: Context, antall: int = 10) -> None:
+        """Viser de siste feilene fra feilrapporteringens ringbuffer.
+
+        Args:
+            ctx (Context): Discord context-objektet
+            antall (int): Hvor mange feil som vises (maks 25)
+        """
+        entries = recent_errors(min(max(antall, 1), 25))
+        if not entries:
+            await ctx.send("Ingen feil registrert siden oppstart. 🎉")
+            return
+
+        lines = ["```"]
+        for entry in entries:
+            when = datetime.fromtimestamp(entry.timestamp, NORSK_TZ)
+            lines.append(
+                f"{when:%d.%m %H:%M:%S} {entry.source}: "
+                f"{entry.kind}: {entry.message[:120]}"
+            )
+        lines.append("```")
+        await ctx.send("\n".join(lines))
+
+
+async def setup(bot: Bot) -> None:
+    """Setter opp cog-en i Discord bot-instansen.
+
+    Args:
+        bot (Bot): Discord bot-instansen som skal få cog-en
+    """
+    await bot.add_cog(Diagnostics(bot))
@@ -12,10 +12,45 @@ import discord
 from discord.ext.commands import Bot
 from data.channel_ids import PREIK_KANAL, ADMIN_CHANNEL_ID
 from data.brukere import load_discord_ids
-from core.utils.espn_helpers import get_league
+from core.utils.espn_helpers import SCOREBOARD_URL, fetch_espn_json, get_league
+from core.utils.json_store import cache_path, load_json, save_json
+from core.utils.kickoff_index import KickoffIndex
+from core.utils.lineup_optimizer import league_efficiency
+from core.utils.playoff_odds import SeasonModel, format_playoff_odds, simulate
+from core.utils.roster_tracker import (
+    INACTIVE_STARTER,
+    ExpiringSet,
+    RosterEvent,
+    RosterTracker,
+)
+from core.utils.season_stats import (
+    format_season_summary,
+    load_season_stats,
+    save_season_stats,
+)
+from core.error_reporter import report_error
+from core.health import register_task
+from core.metrics import timed
+from core.outbox import send_message
 
 logger = logging.getLogger(__name__)
 
+# Hvor lenge før kampstart inaktive startere varsles
+ALERT_LEAD = timedelta(minutes=60)
+# Kampstart-indeksen bygges på nytt etter så lang tid (flytting av kamper o.l.)
+INDEX_MAX_AGE = timedelta(hours=6)
+# Hvor lenge et sendt varsel huskes
+NOTIFIED_TTL = timedelta(days=7)
+
+# Ferdig beregnede matchup-digester, nøklet på ISO-uken de postes
+DIGEST_CACHE = cache_path("matchup_digest.json")
+# Antall uker som beholdes i digest-cachen
+DIGEST_CACHE_WEEKS = 8
+# Tid fra siste kampstart til kampen regnes som ferdig
+DIGEST_GAME_LENGTH = timedelta(hours=3, minutes=30)
+# Ventetid før nytt forsøk hvis ESPN feiler eller kamper ikke er ferdige
+DIGEST_RETRY = timedelta(minutes=30)
+
 
 class FantasyReminders(commands.Cog):
     """Cog for ukentlige påminnelser i fantasyligaen.
@@ -39,9 +74,18 @@ class FantasyReminders(commands.Cog):
         self.bot: Bot = bot
         self.norsk_tz = pytz.timezone("Europe/Oslo")
         self.last_waiver_week: int | None = None
-        self.inactive_notified: set[tuple[int, str | int | None, str | None]] = set()
-        self.bot.loop.create_task(self.reminder_scheduler())
-        self.bot.loop.create_task(self.inactive_alert_scheduler())
+        # Endringer i spillerstallene, og inaktive startere som venter på
+        # varslingsvinduet før kampstart
+        self.roster_tracker = RosterTracker()
+        self.pending_inactive: dict[tuple, RosterEvent] = {}
+        # Allerede varslede (lag, spiller, kampstart), glemmes etter en uke
+        self.inactive_notified = ExpiringSet(ttl=NOTIFIED_TTL.total_seconds())
+        self.reminder_task = self.bot.loop.create_task(self.reminder_scheduler())
+        self.inactive_task = self.bot.loop.create_task(self.inactive_alert_scheduler())
+        register_task("fantasy.reminder", self.reminder_task)
+        register_task("fantasy.inactive_alert", self.inactive_task)
+        self.digest_task = self.bot.loop.create_task(self.digest_precompute_scheduler())
+        register_task("fantasy.digest_precompute", self.digest_task)
 
     def _current_streak(self, team):
         length = getattr(team, "streak_length", 0)
@@ -51,17 +95,78 @@ class FantasyReminders(commands.Cog):
         last = "W" if streak_type.upper().startswith("WIN") else "L"
         return last, length
 
+    def _digest_key(self, now: datetime) -> str:
+        """Cachenøkkel for digesten: ISO-uken til tirsdagen den postes."""
+        year, week, _ = now.isocalendar()
+        return f"{year}-W{week:02d}"
+
+    def _load_digest(self, key: str) -> dict | None:
+        """Henter en ferdig beregnet digest fra cachen, eller None."""
+        return load_json(DIGEST_CACHE, default={}).get(key)
+
+    def _save_digest(self, key: str, digest: dict) -> None:
+        """Lagrer en digest i cachen og beholder bare de siste ukene."""
+        cache = load_json(DIGEST_CACHE, default={})
+        cache[key] = digest
+        for old_key in sorted(cache)[:-DIGEST_CACHE_WEEKS]:
+            del cache[old_key]
+        save_json(DIGEST_CACHE, cache)
+
     async def build_matchup_digest(self, channel):
         """
-        Lager og sender en ukentlig meldig som oppsummerer uken som var,
+        Sender den ukentlige oppsummeringen av uken som var.
+
+        Digesten beregnes normalt i bakgrunnen etter mandagskampen (se
+        `digest_precompute_scheduler`), så her sendes bare den lagrede teksten.
+        Finnes den ikke i cachen, beregnes den nå.
+        """
+        key = self._digest_key(datetime.now(self.norsk_tz))
+        digest = self._load_digest(key)
+        if digest is None:
+            digest = await self.compute_matchup_digest()
+            if digest is None:
+                return
+            self._save_digest(key, digest)
+
+        if channel:
+            # Digesten kan bli lengre enn 2000 tegn, køen deler den opp
+            await send_message(channel, digest["text"], coalesce=True)
+
+    async def compute_matchup_digest(
+        self, finished_week: int | None = None
+    ) -> dict | None:
+        """
+        Lager en ukentlig melding som oppsummerer uken som var,
         inkludert høydepunkter, presenterer seier- og tapsrekker,
-        og poster kampene i den kommende uken.
+        og kampene i den kommende uken.
 
         Fantasy-sesongen går til og med NFL uke 17 (15 uker regular season + 2 uker playoffs).
-        Etter uke 17 postes ingen flere oppsummeringer.
+        Etter uke 17 lages ingen flere oppsummeringer.
+
+        Args:
+            finished_week (int | None): NFL-uken som nettopp er ferdigspilt. Rett
+                etter mandagskampen har ikke ligaen alltid gått videre til neste
+                uke ennå, så bakgrunnsberegningen sender inn uken eksplisitt.
+                Standard er uken før `league.current_week`.
+
+        Returns:
+            dict | None: {"week", "text", "awards", "computed_at"}, eller None
+                etter sesongslutt (eller før ligaen har gått videre fra
+                `finished_week`)
         """
-        league = get_league()
-        current_week = league.current_week
+        league = await asyncio.to_thread(get_league)
+        if finished_week is not None:
+            if league.current_week <= finished_week:
+                # Ligaen har ikke rullet over ennå: tabell og neste ukes
+                # kamper ville vært feil, så vi venter
+                logger.info(
+                    "Fantasy-ligaen er fortsatt på uke %s, venter med digest",
+                    league.current_week,
+                )
+                return None
+            current_week = finished_week + 1
+        else:
+            current_week = league.current_week
 
         # Fantasy-sesongen slutter etter NFL uke 17 (fantasy week 17)
         # 15 uker regular season (NFL uke 1-15) + 2 uker playoffs (NFL uke 16-17)
@@ -74,17 +179,79 @@ class FantasyReminders(commands.Cog):
                 fantasy_final_week,
                 current_week,
             )
-            return
+            return None
 
         last_week = max(1, current_week - 1)
         next_week = current_week
         is_final_week = current_week == fantasy_final_week
 
+        async def fetch_box_scores(week: int) -> list:
+            async with timed("espn.box_scores"):
+                return await asyncio.to_thread(league.box_scores, week=week)
+
+        # Begge ukene hentes samtidig
+        weeks = [last_week] if is_final_week else [last_week, next_week]
+        boxes = await asyncio.gather(*(fetch_box_scores(week) for week in weeks))
+        recap_boxes = boxes[0]
+        preview_boxes = boxes[1] if len(boxes) > 1 else []
+
+        # Sesongtabellen oppdateres med uken som var (overskriver ved nytt forsøk)
+        stats = load_season_stats(league.year)
+        stats.record_week(last_week, recap_boxes)
+        save_season_stats(stats)
+
+        # Sluttspillsjanser så lenge det er grunnseriekamper igjen
+        playoff_odds = ""
+        try:
+            model = SeasonModel.from_league(league)
+            if model.schedule:
+                async with timed("fantasy.playoff_odds"):
+                    odds = await asyncio.to_thread(simulate, model)
+                playoff_odds = format_playoff_odds(odds, show_bye=model.byes > 0)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Klarte ikke å simulere sluttspillsjanser: %s", exc)
+
+        text, awards = self._render_digest(
+            league,
+            last_week,
+            next_week,
+            is_final_week,
+            recap_boxes,
+            preview_boxes,
+            season_summary=format_season_summary(stats) if is_final_week else "",
+            playoff_odds=playoff_odds,
+        )
+        return {
+            "week": last_week,
+            "text": text,
+            "awards": awards,
+            "computed_at": datetime.now(self.norsk_tz).isoformat(),
+        }
+
+    def _render_digest(
+        self,
+        league,
+        last_week: int,
+        next_week: int,
+        is_final_week: bool,
+        recap_boxes: list,
+        preview_boxes: list,
+        season_summary: str = "",
+        playoff_odds: str = "",
+    ) -> tuple[str, dict]:
+        """Lager digest-teksten og ukesprisene fra ferdig hentede box scores.
+
+        `season_summary` (sesongens rekorder) tas med etter sluttabellen i
+        siste uke, og `playoff_odds` (sluttspillsjanser) før neste ukes kamper.
+
+        Returns:
+            tuple[str, dict]: Meldingsteksten og prisene som
+                {navn: {"value": float, "text": str}}
+        """
         msg = []
 
         # Recap: Ukens oppsummering (Uke X)
         msg.append(f"**Ukens oppsummering (Uke {last_week}):**")
-        recap_boxes = league.box_scores(week=last_week)
 
         recap_lines = []
         nailbiter: Optional[Tuple[float, str]] = None
@@ -185,18 +352,41 @@ class FantasyReminders(commands.Cog):
         # Ukespriser/høydepunkter
         msg.append("")
         msg.append("**Ukespriser:**")
-        if nailbiter is not None:
-            msg.append(f"- Ukens neglebiter: {nailbiter[1]}")
-        if toppscorer is not None:
-            msg.append(f"- Toppscorer: {toppscorer[1]}")
-        if lavest is not None:
-            msg.append(f"- Bunnsuger: {lavest[1]}")
-        if bench_award is not None:
-            msg.append(f"- Benkesliteren: {bench_award[1]}")
-        if overachiever is not None:
-            msg.append(f"- Overpresterte: {overachiever[1]}")
-        if underachiever is not None:
-            msg.append(f"- Underpresterte: {underachiever[1]}")
+        awards: dict[str, dict] = {}
+        for name, label, award in [
+            ("nailbiter", "Ukens neglebiter", nailbiter),
+            ("toppscorer", "Toppscorer", toppscorer),
+            ("lavest", "Bunnsuger", lavest),
+            ("bench", "Benkesliteren", bench_award),
+            ("overachiever", "Overpresterte", overachiever),
+            ("underachiever", "Underpresterte", underachiever),
+        ]:
+            if award is not None:
+                msg.append(f"- {label}: {award[1]}")
+                awards[name] = {"value": award[0], "text": award[1]}
+
+        # Managereffektivitet: faktiske poeng mot beste mulige oppstilling
+        efficiency = sorted(
+            league_efficiency(recap_boxes).values(),
+            key=lambda item: item[1].efficiency,
+            reverse=True,
+        )
+        if efficiency:
+            msg.append("")
+            msg.append("**Managereffektivitet:**")
+            for team_name, result in efficiency:
+                msg.append(
+                    f"- {team_name}: {result.actual:.2f} av {result.optimal:.2f} "
+                    f"mulige ({result.efficiency:.0%})"
+                )
+            for name, (team_name, result) in [
+                ("best_manager", efficiency[0]),
+                ("worst_manager", efficiency[-1]),
+            ]:
+                awards[name] = {
+                    "value": result.efficiency,
+                    "text": f"{team_name} med {result.efficiency:.0%} effektivitet",
+                }
 
         # Streaks (3+)
         msg.append("")
@@ -222,6 +412,10 @@ class FantasyReminders(commands.Cog):
         else:
             msg.append("- Ingen")
 
+        if playoff_odds:
+            msg.append("")
+            msg.append(playoff_odds)
+
         # Final standings hvis dette er siste uke
         if is_final_week:
             msg.append("")
@@ -248,13 +442,16 @@ class FantasyReminders(commands.Cog):
                     f"({team.points_for:.2f} poeng)"
                 )
 
+            if season_summary:
+                msg.append("")
+                msg.append(season_summary)
+
             msg.append("")
             msg.append("Takk for sesongen! 🎉")
         else:
             # Preview: Ukens kamper (Uke next_week) - kun hvis ikke siste uke
             msg.append("")
             msg.append(f"**Neste ukes kamper (Uke {next_week}):**")
-            preview_boxes = league.box_scores(week=next_week)
             for box in preview_boxes:
                 home, away = box.home_team, box.away_team
                 msg.append(
@@ -262,8 +459,7 @@ class FantasyReminders(commands.Cog):
                     f"{home.team_name} ({home.wins}-{home.losses})"
                 )
 
-        if channel:
-            await channel.send("\n".join(msg))
+        return "\n".join(msg), awards
 
     async def reminder_scheduler(self) -> None:
         """
@@ -361,13 +557,89 @@ class FantasyReminders(commands.Cog):
                 logger.error("Feil i FantasyReminders: %s. Prøver igjen om 5 min.", e)
                 await asyncio.sleep(300)
 
-    def _player_kickoff(self, player) -> datetime | None:
+    @staticmethod
+    def _all_games_final(data: dict) -> bool:
+        """True hvis alle kampene i scoreboardet er ferdigspilt."""
+        events = data.get("events", [])
+        return bool(events) and all(
+            ev.get("status", {}).get("type", {}).get("completed", False)
+            for ev in events
+        )
+
+    async def digest_precompute_scheduler(self) -> None:
+        """Beregner matchup-digesten i bakgrunnen etter ukens siste kamp.
+
+        Schedulern sover til siste kampstart i scoreboardet pluss
+        DIGEST_GAME_LENGTH, sjekker at alle kampene er ferdige og lagrer
+        digesten for tirsdagens post. Feiler ESPN, eller er kampene ikke
+        ferdige ennå, prøves det igjen hvert 30. minutt frem til kl. 18:00.
+        """
+        await self.bot.wait_until_ready()
+        while True:
+            sleep_for = DIGEST_RETRY.total_seconds()
+            try:
+                data = await fetch_espn_json(SCOREBOARD_URL)
+                index = KickoffIndex.from_scoreboard(data)
+                now = datetime.now(self.norsk_tz)
+                if not index.kickoffs or data.get("season", {}).get("type", 2) != 2:
+                    # Ingen kamper eller sluttspill: ingen digest å beregne
+                    await asyncio.sleep(INDEX_MAX_AGE.total_seconds())
+                    continue
+
+                last_kickoff = index.kickoffs[-1].astimezone(self.norsk_tz)
+                post_at = (
+                    last_kickoff + timedelta(days=(1 - last_kickoff.weekday()) % 7)
+                ).replace(hour=18, minute=0, second=0, microsecond=0)
+                key = self._digest_key(post_at)
+                if now >= post_at or self._load_digest(key) is not None:
+                    # Ukens digest er ferdig, vent til scoreboardet går videre
+                    await asyncio.sleep(INDEX_MAX_AGE.total_seconds())
+                    continue
+
+                ready_at = last_kickoff + DIGEST_GAME_LENGTH
+                if now < ready_at:
+                    await asyncio.sleep(
+                        min(
+                            (ready_at - now).total_seconds(),
+                            INDEX_MAX_AGE.total_seconds(),
+                        )
+                    )
+                    continue
+
+                if self._all_games_final(data):
+                    finished_week = data.get("week", {}).get("number")
+                    digest = await self.compute_matchup_digest(finished_week)
+                    if digest is not None:
+                        self._save_digest(key, digest)
+                        logger.info(
+                            "Matchup digest for uke %s beregnet og lagret (%s)",
+                            digest["week"],
+                            key,
+                        )
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.error(
+                    "Feil ved beregning av matchup digest: %s. Prøver igjen om 30 min.",
+                    exc,
+                )
+                report_error("fantasy.digest_precompute", exc)
+            await asyncio.sleep(sleep_for)
+
+    def _player_kickoff(
+        self, player, index: KickoffIndex | None = None
+    ) -> datetime | None:
         """Henter forventet kampstart for en spiller så nøyaktig som mulig.
 
-        espn-api Player har ikke alltid et felt for kampstart, men roster-spillere
-        får et schedule-objekt (per scoring-period) med datetime. Vi plukker den
+        Med kampstart-indeksen er dette et direkte oppslag på proff-laget.
+        Ellers faller vi tilbake til feltene på spilleren: espn-api Player har
+        ikke alltid et felt for kampstart, men roster-spillere får et
+        schedule-objekt (per scoring-period) med datetime. Vi plukker den
         neste kampen som er i fremtiden.
         """
+        if index is not None:
+            kickoff = index.kickoff_for(getattr(player, "proTeam", None))
+            if kickoff is not None:
+                return kickoff
+
         # Hvis det finnes en direkte dato, bruk den.
         for attr in ("game_date", "gameDate", "game_start_time", "game_start"):
             kickoff = getattr(player, attr, None)
@@ -403,7 +675,13 @@ class FantasyReminders(commands.Cog):
         return None
 
     async def inactive_alert_scheduler(self) -> None:
-        """Kjører periodisk sjekk for inaktive spillere og varsler 1 time før kamp."""
+        """Varsler om inaktive startere 1 time før kamp.
+
+        Ukens kampstarter hentes én gang fra scoreboardet. Schedulern sover til
+        en time før neste klynge av kamper, og sjekker oppstillingene hvert
+        10. minutt bare mens en klynge nærmer seg. Resten av uken gjøres ingen
+        kall mot ESPN.
+        """
         await self.bot.wait_until_ready()
         try:
             id_map = load_discord_ids()
@@ -422,91 +700,153 @@ class FantasyReminders(commands.Cog):
                 await asyncio.sleep(30)
         admin_channel = self.bot.get_channel(ADMIN_CHANNEL_ID)
 
+        index: KickoffIndex | None = None
         while True:
-            now = datetime.now(self.norsk_tz)
             try:
-                league = get_league()
-                missing_id_flags: list[str] = []
-                for team in league.teams:
-                    discord_id = id_map.get(team.team_id)
-                    team_display = getattr(team, "team_name", f"Team {team.team_id}")
-
-                    flagged: list[tuple[str, str, datetime | None]] = []
-                    for player in team.roster:
-                        slot = getattr(player, "lineupSlot", "")
-                        if slot in {"BE", "IR"}:
-                            continue
-
-                        status = getattr(player, "injuryStatus", "") or ""
-                        if status.upper() not in {
-                            "OUT",
-                            "DOUBTFUL",
-                            "INACTIVE",
-                            "SUSPENSION",
-                        }:
-                            continue
-
-                        kickoff = self._player_kickoff(player)
-                        if kickoff:
-                            kickoff = kickoff.astimezone(self.norsk_tz)
-                            seconds_to_kickoff = (kickoff - now).total_seconds()
-                            if seconds_to_kickoff < 0 or seconds_to_kickoff > 3600:
-                                continue
-                            key_time = kickoff.isoformat()
-                        else:
-                            key_time = None
-
-                        unique_key = (
-                            team.team_id,
-                            getattr(player, "playerId", getattr(player, "name", None)),
-                            key_time,
-                        )
-                        if unique_key in self.inactive_notified:
-                            continue
-
-                        flagged.append((player.name, status, kickoff))
-                        self.inactive_notified.add(unique_key)
-
-                    if flagged and discord_id is not None:
-                        lines = [
-                            f"<@{discord_id}>: Du har inaktive spillere i oppstillingen din!"
-                        ]
-                        for name, status, kickoff in flagged:
-                            when_txt = kickoff.strftime("%H:%M") if kickoff else "snart"
-                            lines.append(
-                                f"- {name} ({status}) starter ca. kl {when_txt}"
-                            )
-                        await channel.send("\n".join(lines))
-                        if isinstance(admin_channel, discord.TextChannel):
-                            await admin_channel.send(
-                                f"[inactive-alert] Varslet <@{discord_id}> om {len(flagged)} spiller."
-                            )
-                    elif flagged and discord_id is None:
-                        for name, status, kickoff in flagged:
-                            when_txt = kickoff.strftime("%H:%M") if kickoff else "snart"
-                            missing_id_flags.append(
-                                f"- {team_display}: {name} ({status}) "
-                                f"ca. kl {when_txt}"
-                            )
+                now_utc = datetime.now(timezone.utc)
+                if index is None or now_utc - index.built_at > INDEX_MAX_AGE:
+                    index = await self._build_kickoff_index()
+
+                cluster = index.next_cluster(now_utc)
+                if cluster is None:
+                    # Ingen flere kamper i ukens scoreboard, bygg på nytt senere
+                    logger.debug("Ingen kommende kamper, sover til indeksen fornyes")
+                    await asyncio.sleep(INDEX_MAX_AGE.total_seconds())
+                    index = None
+                    continue
 
-                if missing_id_flags:
-                    lines = [
-                        "@everyone Noen har inaktive spillere i aktiv " "spillerstall:"
-                    ]
-                    lines.extend(missing_id_flags)
-                    await channel.send("\n".join(lines))
-                    if isinstance(admin_channel, discord.TextChannel):
-                        await admin_channel.send(
-                            f"[inactive-alert] Sendte @everyone fallback for "
-                            f"{len(missing_id_flags)} spiller(e)."
-                        )
+                window_start = cluster - ALERT_LEAD
+                if now_utc < window_start:
+                    sleep_for = min(
+                        (window_start - now_utc).total_seconds(),
+                        INDEX_MAX_AGE.total_seconds(),
+                    )
+                    logger.debug(
+                        "Neste kampklynge %s, sover %.0f s til varslingsvinduet",
+                        cluster,
+                        sleep_for,
+                    )
+                    await asyncio.sleep(sleep_for)
+                    continue
+
+                await self._check_inactive_players(
+                    index, channel, admin_channel, id_map
+                )
             except Exception as exc:  # pylint: disable=broad-exception-caught
                 logger.error(
                     "Feil ved sjekk av inaktive spillere: %s. Prøver igjen om 10 min.",
                     exc,
                 )
+                report_error("fantasy.inactive_alert", exc)
             await asyncio.sleep(600)
 
+    async def _build_kickoff_index(self) -> KickoffIndex:
+        """Bygger kampstart-indeksen for inneværende NFL-uke fra scoreboardet."""
+        data = await fetch_espn_json(SCOREBOARD_URL)
+        index = KickoffIndex.from_scoreboard(data)
+        logger.info(
+            "Kampstart-indeks bygget: %s lag, %s klynger",
+            len(index.by_team),
+            len(index.clusters()),
+        )
+        return index
+
+    async def _check_inactive_players(
+        self,
+        index: KickoffIndex,
+        channel: discord.TextChannel,
+        admin_channel: discord.TextChannel | None,
+        id_map: dict,
+    ) -> None:
+        """Henter oppstillingene og varsler om inaktive startere før kampstart.
+
+        Bare endringer fra `RosterTracker` behandles. Inaktive startere holdes
+        i `pending_inactive` til de er innenfor varslingsvinduet, eller til de
+        blir benket eller friskmeldt.
+
+        Args:
+            index (KickoffIndex): Kampstarter for uken
+            channel (discord.TextChannel): Kanalen varslene sendes til
+            admin_channel (discord.TextChannel | None): Kanal for admin-kopier
+            id_map (dict): ESPN team_id → Discord ID
+        """
+        league = await asyncio.to_thread(get_league)
+        for event in self.roster_tracker.update(league.teams):
+            if event.kind == INACTIVE_STARTER:
+                self.pending_inactive[event.key] = event
+            else:
+                # Benket, friskmeldt eller droppet: ikke lenger aktuelt
+                self.pending_inactive.pop(event.key, None)
+        if not self.pending_inactive:
+            return
+
+        now = datetime.now(self.norsk_tz)
+        flagged_by_team: dict[int, list[tuple[str, str, datetime | None]]] = {}
+        team_names: dict[int, str] = {}
+        for event in self.pending_inactive.values():
+            kickoff = self._player_kickoff(event.player, index)
+            if kickoff:
+                kickoff = kickoff.astimezone(self.norsk_tz)
+                seconds_to_kickoff = (kickoff - now).total_seconds()
+                if (
+                    seconds_to_kickoff < 0
+                    or seconds_to_kickoff > ALERT_LEAD.total_seconds()
+                ):
+                    continue
+                key_time = kickoff.isoformat()
+            else:
+                key_time = None
+
+            unique_key = (event.team_id, event.player_id, key_time)
+            if unique_key in self.inactive_notified:
+                continue
+            self.inactive_notified.add(unique_key)
+            flagged_by_team.setdefault(event.team_id, []).append(
+                (event.name, event.status, kickoff)
+            )
+            team_names[event.team_id] = event.team_name
+
+        missing_id_flags: list[str] = []
+        for team_id, flagged in flagged_by_team.items():
+            discord_id = id_map.get(team_id)
+            if discord_id is not None:
+                lines = [
+                    f"<@{discord_id}>: Du har inaktive spillere i oppstillingen din!"
+                ]
+                for name, status, kickoff in flagged:
+                    when_txt = kickoff.strftime("%H:%M") if kickoff else "snart"
+                    lines.append(f"- {name} ({status}) starter ca. kl {when_txt}")
+                await send_message(channel, "\n".join(lines), coalesce=True)
+                if isinstance(admin_channel, discord.TextChannel):
+                    await send_message(
+                        admin_channel,
+                        f"[inactive-alert] Varslet <@{discord_id}> "
+                        f"om {len(flagged)} spiller.",
+                        admin=True,
+                        coalesce=True,
+                        wait=False,
+                    )
+            else:
+                for name, status, kickoff in flagged:
+                    when_txt = kickoff.strftime("%H:%M") if kickoff else "snart"
+                    missing_id_flags.append(
+                        f"- {team_names[team_id]}: {name} ({status}) ca. kl {when_txt}"
+                    )
+
+        if missing_id_flags:
+            lines = ["@everyone Noen har inaktive spillere i aktiv spillerstall:"]
+            lines.extend(missing_id_flags)
+            await send_message(channel, "\n".join(lines), coalesce=True)
+            if isinstance(admin_channel, discord.TextChannel):
+                await send_message(
+                    admin_channel,
+                    f"[inactive-alert] Sendte @everyone fallback for "
+                    f"{len(missing_id_flags)} spiller(e).",
+                    admin=True,
+                    coalesce=True,
+                    wait=False,
+                )
+
 
 async def setup(bot: Bot) -> None:
     """Setter opp cog-en i Discord bot-instansen.
@@ -7,19 +7,24 @@ oppdaterte rangeringer i Discord.
 
 """
 
-import logging
 import asyncio
+import logging
 from typing import Dict, List, Any
 import os
 from discord.ext import commands
 from core.errors import PPRFetchError, PPRSnapshotError
-from cogs.sheets import get_client
+from cogs.sheets import col_letter, get_client, sheets_call
 from data.brukere import TEAM_NAMES
 
 # Sett opp logging
 logger = logging.getLogger(__name__)
 
 
+def _open_fest_i_vest():
+    """Åpner Fest i Vest-dokumentet (blokkerende, kjøres via `sheets_call`)."""
+    return get_client().open("Fest i Vest")
+
+
 class PPR(commands.Cog):
     """Cog for håndtering av PPR-statistikk og -kommandoer.
 
@@ -34,12 +39,25 @@ class PPR(commands.Cog):
             bot (commands.Bot): Discord bot-instansen
         """
         self.bot = bot
-        try:
-            self.sheet = get_client().open("Fest i Vest")
-            logger.info("PPR Cog: Tilkoblet Google Sheets")
-        except Exception as e:
-            logger.error("PPR Cog: Kunne ikke koble til Google Sheets: %s", e)
-            raise
+        self.sheet = None
+        self._sheet_lock = asyncio.Lock()
+
+    async def _get_sheet(self):
+        """Fest i Vest-dokumentet, åpnet ved første bruk.
+
+        Åpningen krever autorisering og et kall mot Google, så den utsettes
+        til første kommando og kjøres i en tråd, slik at verken oppstarten
+        eller event-loopen må vente på den.
+        """
+        async with self._sheet_lock:
+            if self.sheet is None:
+                try:
+                    self.sheet = await sheets_call("open", _open_fest_i_vest)
+                    logger.info("PPR Cog: Tilkoblet Google Sheets")
+                except Exception as e:
+                    logger.error("PPR Cog: Kunne ikke koble til Google Sheets: %s", e)
+                    raise
+        return self.sheet
 
     async def _get_players(self, season: str = "2025") -> List[Dict[str, Any]]:
         """Henter PPR-data for alle spillere for gitt sesong.
@@ -76,19 +94,18 @@ class PPR(commands.Cog):
 
         players = []
         logger.info("Henter PPR-data for sesong %s", season)
-        ws_titles = [ws.title for ws in self.sheet.worksheets()]
-        logger.info("Fant ark: %s", ws_titles)
+        sheet = await self._get_sheet()
+        worksheets = await sheets_call("worksheets", sheet.worksheets)
+        logger.info("Fant ark: %s", [ws.title for ws in worksheets])
 
-        for ws in self.sheet.worksheets():
+        for ws in worksheets:
             ws_title_norm = ws.title.strip().lower()
             if ws_title_norm not in target_names_normalized:
                 continue
 
             logger.debug("Prosesserer ark: %s", ws.title)
             try:
-                rows = await asyncio.wait_for(
-                    asyncio.to_thread(ws.get_all_values), timeout=10
-                )
+                rows = await sheets_call("get_all_values", ws.get_all_values)
                 target_row = None
                 for i, row in enumerate(rows, start=1):
                     if row and row[0].strip() == season:
@@ -133,13 +150,20 @@ class PPR(commands.Cog):
         Raises:
             PPRSnapshotError: Hvis snapshot ikke kan lagres.
         """
+        sheet = await self._get_sheet()
         try:
-            history_ws = self.sheet.worksheet("PPR-historikk")
+            history_ws = await sheets_call(
+                "worksheet", sheet.worksheet, "PPR-historikk"
+            )
             logger.debug("Fant eksisterende PPR-historikk ark")
         except Exception:  # pylint: disable=broad-exception-caught
             logger.info("Oppretter nytt PPR-historikk ark")
-            history_ws = self.sheet.add_worksheet(
-                title="PPR-historikk", rows=1000, cols=10
+            history_ws = await sheets_call(
+                "add_worksheet",
+                sheet.add_worksheet,
+                title="PPR-historikk",
+                rows=1000,
+                cols=10,
             )
 
         rows_to_add = []
@@ -152,26 +176,20 @@ class PPR(commands.Cog):
             return
 
         try:
-            all_rows_col_a = await asyncio.wait_for(
-                asyncio.to_thread(history_ws.col_values, 1), timeout=10
-            )
+            all_rows_col_a = await sheets_call("col_values", history_ws.col_values, 1)
             start_row = len(all_rows_col_a) + 1
             num_rows = len(rows_to_add)
             num_cols = len(rows_to_add[0])
 
             end_row = start_row + num_rows - 1
-            range_notation = f"A{start_row}:{chr(64 + num_cols)}{end_row}"
-            cell_range = await asyncio.wait_for(
-                asyncio.to_thread(history_ws.range, range_notation), timeout=10
-            )
+            range_notation = f"A{start_row}:{col_letter(num_cols)}{end_row}"
+            cell_range = await sheets_call("range", history_ws.range, range_notation)
             flat_values = [val for row in rows_to_add for val in row]
 
             for cell_obj, val in zip(cell_range, flat_values):
                 cell_obj.value = val
 
-            await asyncio.wait_for(
-                asyncio.to_thread(history_ws.update_cells, cell_range), timeout=10
-            )
+            await sheets_call("update_cells", history_ws.update_cells, cell_range)
             logger.info("Lagret snapshot med %s PPR-verdier", num_rows)
 
         except Exception as e:
@@ -195,11 +213,12 @@ class PPR(commands.Cog):
             players = await self._get_players()
             players_sorted = sorted(players, key=lambda x: x["ppr"], reverse=True)
             # Last historiske verdier
+            sheet = await self._get_sheet()
             try:
-                history_ws = self.sheet.worksheet("PPR-historikk")
-                rows = await asyncio.wait_for(
-                    asyncio.to_thread(history_ws.get_all_values), timeout=10
+                history_ws = await sheets_call(
+                    "worksheet", sheet.worksheet, "PPR-historikk"
                 )
+                rows = await sheets_call("get_all_values", history_ws.get_all_values)
                 logger.debug("Hentet %s historiske PPR-verdier", len(rows))
             except Exception as e:  # pylint: disable=broad-exception-caught
                 print(f"[DEBUG] Kunne ikke åpne PPR-historikk: {e}")
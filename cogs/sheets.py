@@ -6,19 +6,39 @@ inkludert autentisering, tilkobling, og celleformatering. Det håndterer
 feilsituasjoner og gir feilmeldinger.
 """
 
-from typing import List, Dict, Any
+from __future__ import annotations
+
+from typing import List, Dict, Any, Callable, TypeVar, TYPE_CHECKING
+import asyncio
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from gspread_formatting import format_cell_range
-from gspread.worksheet import Worksheet
-from gspread.client import Client
 
 from core.errors import (
     MissingCredentialsError,
     ClientAuthorizationError,
     SheetNotFoundError,
 )
+from core.metrics import timed
+from core.utils.lazy_import import LazyImport
+from data.brukere import TEAM_NAMES
+
+if TYPE_CHECKING:
+    from oauth2client.service_account import ServiceAccountCredentials as _Creds
+    from gspread.worksheet import Worksheet
+    from gspread.client import Client
+
+# Google-bibliotekene er trege å importere, så de lastes først ved bruk
+gspread = LazyImport("gspread")
+ServiceAccountCredentials = LazyImport(
+    "oauth2client.service_account", "ServiceAccountCredentials"
+)
+format_cell_range = LazyImport("gspread_formatting", "format_cell_range")
+# Falsk Sheets i minnet, brukes bare når SHEETS_BACKEND=fake
+fake_sheets = LazyImport("core.fakes.sheets")
+
+T = TypeVar("T")
+
+# Felles falsk klient, slik at data skrevet i én kommando kan leses i neste
+_fake_client = None
 
 # Definerer hvilke Google API-tilganger som trengs
 scope: List[str] = [
@@ -27,7 +47,7 @@ scope: List[str] = [
 ]
 
 
-def get_creds() -> ServiceAccountCredentials:
+def get_creds() -> _Creds:
     """Henter Google API-credentials fra lokal fil.
 
     Returns:
@@ -49,9 +69,39 @@ def get_creds() -> ServiceAccountCredentials:
         ) from e
 
 
+def get_fake_client():
+    """Returnerer den falske Sheets-klienten, opprettet ved første bruk.
+
+    Forsinkelse og kvote styres av SHEETS_FAKE_LATENCY_MS og
+    SHEETS_FAKE_QUOTA (kall per minutt, 0 for ubegrenset). "Vestsk Tipping"
+    fylles med SHEETS_FAKE_TIPPERS tippere og "Fest i Vest" med ett ark per
+    manager, slik at kommandoene har noe å jobbe med offline.
+
+    Returns:
+        FakeClient: Klient med dokumentene i minnet
+    """
+    global _fake_client  # pylint: disable=global-statement
+    if _fake_client is None:
+        quota = int(os.getenv("SHEETS_FAKE_QUOTA", "60"))
+        _fake_client = fake_sheets.FakeClient(
+            [
+                fake_sheets.build_tipping_sheet(
+                    int(os.getenv("SHEETS_FAKE_TIPPERS", "8")), 0
+                ),
+                fake_sheets.build_ppr_sheet(list(TEAM_NAMES)),
+            ],
+            latency=float(os.getenv("SHEETS_FAKE_LATENCY_MS", "0")) / 1000,
+            quota=fake_sheets.Quota(quota) if quota > 0 else None,
+        )
+    return _fake_client
+
+
 def get_client() -> Client:
     """Oppretter en autorisert Google Sheets-klient.
 
+    Med SHEETS_BACKEND=fake brukes i stedet et falskt Sheets i minnet (se
+    `get_fake_client`), for lasttesting og kjøring uten Google-tilgang.
+
     Returns:
         Client: Autorisert gspread-klient.
 
@@ -59,6 +109,8 @@ def get_client() -> Client:
         ClientAuthorizationError: Hvis autorisering mot Google feiler.
         MissingCredentialsError: Hvis credentials ikke kan hentes.
     """
+    if os.getenv("SHEETS_BACKEND", "google") == "fake":
+        return get_fake_client()
     try:
         creds = get_creds()
         return gspread.authorize(creds)
@@ -98,6 +150,54 @@ def get_sheet(sheet_name: str, worksheet_index: int = 0) -> Worksheet:
         ) from e
 
 
+async def sheets_call(
+    op: str,
+    func: Callable[..., T],
+    *args: Any,
+    timeout: float | None = 10,
+    **kwargs: Any,
+) -> T:
+    """Kjører et blokkerende gspread-kall i en tråd, med timeout og måling.
+
+    Kallet registreres i metrikkene som "sheets.<op>", inkludert feil og
+    timeouts, slik at treg Google-respons kan skilles fra ESPN og Discord.
+
+    Args:
+        op (str): Operasjonsnavn, f.eks. "get_all_values"
+        func (Callable): gspread-metoden som skal kalles
+        *args: Posisjonsargumenter til func
+        timeout (float | None): Timeout i sekunder, None for ingen timeout
+        **kwargs: Nøkkelordargumenter til func
+
+    Returns:
+        Returverdien fra func
+
+    Raises:
+        asyncio.TimeoutError: Hvis kallet tar lengre tid enn timeout
+    """
+    async with timed(f"sheets.{op}"):
+        call = asyncio.to_thread(func, *args, **kwargs)
+        if timeout is None:
+            return await call
+        return await asyncio.wait_for(call, timeout=timeout)
+
+
+def col_letter(col: int) -> str:
+    """Gjør et kolonnenummer om til bokstaver i A1-notasjon.
+
+    Args:
+        col (int): Kolonnenummer (1-basert)
+
+    Returns:
+        str: Kolonnebokstaver, f.eks. 1 → "A", 27 → "AA"
+    """
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
 def format_cell(
     sheet: Worksheet, row: int, col: int, color_fmt: Dict[str, Any]
 ) -> None:
@@ -109,13 +209,12 @@ def format_cell(
         col (int): Kolonnenummer (1-basert).
         color_fmt (Dict[str, Any]): Formateringsinstrukser for cellen.
     """
+    cell_range = f"{col_letter(col)}{row}"
     try:
-        col_letter = chr(64 + col)  # Konverterer kolonnenummer til bokstav
-        cell_range = f"{col_letter}{row}"
         format_cell_range(sheet, cell_range, color_fmt)
     except Exception as e:  # pylint: disable=broad-exception-caught
         # Logger feilen men lar den fortsette siden formatering ikke er kritisk
-        print(f"Advarsel: Kunne ikke formatere celle {col_letter}{row}: {str(e)}")
+        print(f"Advarsel: Kunne ikke formatere celle {cell_range}: {str(e)}")
 
 
 def green_format() -> Dict[str, Any]:
@@ -14,34 +14,82 @@ inkludert:
 import asyncio
 from datetime import datetime, timedelta
 import logging
+import os
 import re
 from types import SimpleNamespace
-import aiohttp
-from aiohttp import ClientTimeout
 import pytz
 import discord
 from discord.ext import commands
 from discord.ext.commands import CheckFailure
 
-from core.utils.espn_helpers import get_league
+from core.utils.espn_helpers import SCOREBOARD_URL, fetch_espn_json, get_league
+from core.error_reporter import report_error
+from core.health import register_task
+from core.outbox import send_message
+from core.perf import checkpoint
+from core.utils.sheet_archive import (
+    ARCHIVE_KEEP_WEEKS,
+    CARRY_LABEL,
+    DEFAULT_KEEP_WEEKS,
+    HEADER_ROWS,
+    TOTAL_LABEL,
+    archive_title,
+    plan_archive,
+)
+from core.utils.season_totals import (
+    TOTALS_FIRST_COL,
+    TOTALS_HEADER,
+    TOTALS_LAST_COL,
+    TOTALS_MIN_COLS,
+    SeasonTotals,
+)
+from core.utils.sheet_index import (
+    INDEX_FIRST_COL,
+    INDEX_HEADER,
+    INDEX_LAST_COL,
+    INDEX_MIN_COLS,
+    SheetIndex,
+)
+from core.utils.tipping_formulas import formula_mode, week_updates
+from core.utils.tipping_projection import (
+    REGULAR_SEASON_WEEKS,
+    format_projection,
+    game_probabilities,
+    pick_tendencies,
+    simulate_season,
+)
 from core.errors import (
     APIFetchError,
+    ArchiveError,
     NoEventsFoundError,
     ExportError,
     ResultaterError,
 )
 from core.decorators import admin_only
+from core.utils.lazy_import import LazyImport
 from data.teams import teams, team_emojis, team_location, DRAW_EMOJI
 from data.channel_ids import PREIK_KANAL, VESTSK_KANAL
-from cogs.sheets import get_sheet, green_format, red_format, yellow_format
+from cogs.sheets import (
+    col_letter,
+    get_sheet,
+    green_format,
+    red_format,
+    sheets_call,
+    yellow_format,
+)
+
+# Opptaksmodulen drar med seg unittest.mock og core.fakes, så den lastes
+# først når CASSETTE_DIR faktisk er satt
+cassette = LazyImport("core.cassette")
 
 # Konfigurer logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
 PROCESS_WEEKDAY = 1  # Tuesday (Monday=0)
 PROCESS_HOUR = 20  # 20:00 local time
+# Maks samtidige scoreboard-kall mot ESPN når flere uker hentes
+SCOREBOARD_CONCURRENCY = 4
 
 
 def parse_espn_date(datestr: str) -> datetime:
@@ -74,8 +122,19 @@ class VestskTipping(commands.Cog):
         last_reminder_sunday (Optional[datetime]): Siste søndag det ble
             sendt påminnelse
         reminder_task (asyncio.Task): Async task for påminnelser
+        sheet_index (Optional[SheetIndex]): Uke → rader i arket, lastes ved
+            første bruk
+        season_totals (Optional[SeasonTotals]): Sesongpoeng per tipper,
+            lastes ved første bruk
+        scoreboards (Optional[dict]): (sesong, uke) → scoreboard for
+            ferdigspilte uker, fylles ved første henting
     """
 
+    sheet_index: SheetIndex | None = None
+    season_totals: SeasonTotals | None = None
+    scoreboards: dict[tuple[int, int], dict] | None = None
+    _scoreboard_limit: asyncio.Semaphore | None = None
+
     @staticmethod
     def is_valid_game_message(msg_content: str) -> bool:
         """Validerer om en melding er et gyldig kampformat.
@@ -117,17 +176,13 @@ class VestskTipping(commands.Cog):
         self.last_posted_week = None
         self.last_processed_week = None
         self.state_loaded = False
+        self.sheet_index = None
+        self.season_totals = None
         task = self.reminder_scheduler()
         self.reminder_task = self.bot.loop.create_task(task)
         self.auto_post_task = self.bot.loop.create_task(self.auto_post_scheduler())
-
-    def _admin_channel(self) -> discord.TextChannel | None:
-        """Get the admin error reporting channel."""
-        from data.channel_ids import (
-            ADMIN_CHANNEL_ID,
-        )  # pylint: disable=import-outside-toplevel
-
-        return self.bot.get_channel(ADMIN_CHANNEL_ID)
+        register_task("vestsk.reminder", self.reminder_task)
+        register_task("vestsk.auto_post", self.auto_post_task)
 
     def get_players(self, sheet) -> dict:
         """
@@ -170,12 +225,19 @@ class VestskTipping(commands.Cog):
             away_team = away["team"]["displayName"]
             away_emoji = teams.get(away_team, {"emoji": ""})["emoji"]
             home_emoji = teams.get(home_team, {"emoji": ""})["emoji"]
-            await ctx.send(f"{away_emoji} {away_team} @ {home_team} {home_emoji}")
+            # Kampmeldinger får reaksjoner, så de sendes alltid hver for seg
+            await send_message(
+                ctx, f"{away_emoji} {away_team} @ {home_team} {home_emoji}"
+            )
 
         # Send en melding i preik
         kanal = ctx.bot.get_channel(PREIK_KANAL)
         if kanal:
-            await kanal.send(f"@everyone Ukens kamper er lagt ut i <#{VESTSK_KANAL}>!")
+            await send_message(
+                kanal,
+                f"@everyone Ukens kamper er lagt ut i <#{VESTSK_KANAL}>!",
+                coalesce=True,
+            )
 
     async def _fetch_week_events(self, uke: int | None) -> list:
         """Hent og sorter NFL-kamper for en uke via ESPN scoreboard API.
@@ -185,35 +247,11 @@ class VestskTipping(commands.Cog):
         """
         now = datetime.now()
         season = now.year if now.month >= 3 else now.year - 1
-        url = SCOREBOARD_URL
-        if uke:
-            # Hvis uke > 18, vi er i playoffs (seasontype=3)
-            # Playoff-uker i ESPN API: 1=Wild Card, 2=Divisional, 3=Conference,
-            # 4=Pro Bowl, 5=Super Bowl
-            if uke > 18:
-                playoff_week = uke - 18
-                url = (
-                    f"{SCOREBOARD_URL}?dates={season}&seasontype=3"
-                    f"&week={playoff_week}"
-                )
-            else:
-                url = f"{SCOREBOARD_URL}?dates={season}&seasontype=2&week={uke}"
+        url = self._week_scoreboard_url(season, uke)
         logger.debug("Henter URL: %s", url)
 
         try:
-            async with aiohttp.ClientSession(
-                timeout=ClientTimeout(total=10)
-            ) as session:
-                try:
-                    async with session.get(url) as resp:
-                        data = await resp.json()
-                except asyncio.TimeoutError:
-                    logger.warning(
-                        "API timeout mot ESPN, prøver igjen om 5 sekunder. URL=%s", url
-                    )
-                    await asyncio.sleep(5)
-                    async with session.get(url) as resp:
-                        data = await resp.json()
+            data = await fetch_espn_json(url)
         except Exception as e:  # pylint: disable=broad-exception-caught
             raise APIFetchError(url, e) from e
 
@@ -224,6 +262,42 @@ class VestskTipping(commands.Cog):
         events.sort(key=lambda ev: parse_espn_date(ev.get("date")))
         return events
 
+    async def _fetch_week_scoreboard(self, season: int, week: int) -> dict:
+        """Scoreboardet for én uke, fra cachen hvis uken er ferdigspilt.
+
+        Maks SCOREBOARD_CONCURRENCY kall går mot ESPN samtidig, og uker der
+        alle kampene er ferdige caches, siden de ikke endrer seg.
+        """
+        if self.scoreboards is None:
+            self.scoreboards = {}
+        cached = self.scoreboards.get((season, week))
+        if cached is not None:
+            return cached
+
+        if self._scoreboard_limit is None:
+            self._scoreboard_limit = asyncio.Semaphore(SCOREBOARD_CONCURRENCY)
+        async with self._scoreboard_limit:
+            data = await fetch_espn_json(self._week_scoreboard_url(season, week))
+        events = data.get("events", [])
+        if events and all(
+            ev.get("status", {}).get("type", {}).get("completed") for ev in events
+        ):
+            self.scoreboards[(season, week)] = data
+        return data
+
+    @staticmethod
+    def _week_scoreboard_url(season: int, uke: int | None) -> str:
+        """Scoreboard-URL for en uke, eller nåværende uke når `uke` mangler.
+
+        Uke 19 og utover er playoffs (seasontype=3). Playoff-uker i ESPN API:
+        1=Wild Card, 2=Divisional, 3=Conference, 4=Pro Bowl, 5=Super Bowl
+        """
+        if not uke:
+            return SCOREBOARD_URL
+        if uke > 18:
+            return f"{SCOREBOARD_URL}?dates={season}&seasontype=3&week={uke - 18}"
+        return f"{SCOREBOARD_URL}?dates={season}&seasontype=2&week={uke}"
+
     async def reminder_scheduler(self):
         """Bakgrunnsloop for torsdag/søndag-påminnelser i PREIK."""
         await self.bot.wait_until_ready()
@@ -271,27 +345,8 @@ class VestskTipping(commands.Cog):
 
                 # === Søndagspåminnelse ===
                 if weekday == 6:
-                    url = (
-                        "https://site.api.espn.com/apis/site/v2/sports/"
-                        "football/"
-                        "nfl/scoreboard"
-                    )
-
                     try:
-                        async with aiohttp.ClientSession(
-                            timeout=ClientTimeout(total=10)
-                        ) as session:
-                            try:
-                                async with session.get(url) as resp:
-                                    data = await resp.json()
-                            except asyncio.TimeoutError:
-                                logger.warning(
-                                    "API timeout mot ESPN, prøver igjen om 5 sekunder. URL=%s",
-                                    url,
-                                )
-                                await asyncio.sleep(5)
-                                async with session.get(url) as resp:
-                                    data = await resp.json()
+                        data = await fetch_espn_json(SCOREBOARD_URL)
                     except Exception as e:  # pylint: disable=broad-exception-caught
                         logger.error(
                             "Kunne ikke hente data fra ESPN API: %s. Prøver igjen om 5 min.",
@@ -366,16 +421,29 @@ class VestskTipping(commands.Cog):
 
     async def _get_state_sheet(self):
         """Hent eller opprett et lite 'State'-ark i samme Spreadsheet."""
-        base_sheet = await asyncio.to_thread(get_sheet, "Vestsk Tipping")
+        base_sheet = await sheets_call(
+            "open", get_sheet, "Vestsk Tipping", timeout=None
+        )
         spreadsheet = base_sheet.spreadsheet
         try:
-            return spreadsheet.worksheet("State")
+            return await sheets_call(
+                "worksheet", spreadsheet.worksheet, "State", timeout=None
+            )
         except Exception:  # pylint: disable=broad-except
-            state_ws = await asyncio.to_thread(
-                spreadsheet.add_worksheet, title="State", rows=2, cols=2
+            state_ws = await sheets_call(
+                "add_worksheet",
+                spreadsheet.add_worksheet,
+                title="State",
+                rows=2,
+                cols=2,
+                timeout=None,
             )
-            await asyncio.to_thread(
-                state_ws.update, "A1:B1", [["last_processed_week", "last_posted_week"]]
+            await sheets_call(
+                "update",
+                state_ws.update,
+                "A1:B1",
+                [["last_processed_week", "last_posted_week"]],
+                timeout=None,
             )
             return state_ws
 
@@ -383,7 +451,7 @@ class VestskTipping(commands.Cog):
         """Last tidligere state fra Sheets slik at restarts ikke trigger dobbeltkjøringer."""
         try:
             state_ws = await self._get_state_sheet()
-            values = await asyncio.to_thread(state_ws.get, "A2:B2")
+            values = await sheets_call("get", state_ws.get, "A2:B2", timeout=None)
             row = values[0] if values else []
             lpw = row[0] if len(row) > 0 else ""
             lpost = row[1] if len(row) > 1 else ""
@@ -391,11 +459,7 @@ class VestskTipping(commands.Cog):
             self.last_posted_week = int(lpost) if lpost else None
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("Klarte ikke laste state fra sheet: %s", exc)
-            admin_channel = self._admin_channel()
-            if admin_channel:
-                await admin_channel.send(
-                    f"[vestsk] Klarte ikke laste State-arket: {exc}"
-                )
+            report_error("vestsk.load_state", exc)
         finally:
             self.state_loaded = True
 
@@ -405,7 +469,8 @@ class VestskTipping(commands.Cog):
             return
         try:
             state_ws = await self._get_state_sheet()
-            await asyncio.to_thread(
+            await sheets_call(
+                "update",
                 state_ws.update,
                 "A2:B2",
                 [
@@ -414,14 +479,99 @@ class VestskTipping(commands.Cog):
                         self.last_posted_week if self.last_posted_week else "",
                     ]
                 ],
+                timeout=None,
             )
         except Exception as exc:  # pylint: disable=broad-except
             logger.warning("Klarte ikke lagre state til sheet: %s", exc)
-            admin_channel = self._admin_channel()
-            if admin_channel:
-                await admin_channel.send(
-                    f"[vestsk] Klarte ikke lagre State-arket: {exc}"
-                )
+            report_error("vestsk.save_state", exc)
+
+    def _current_season(self) -> int:
+        """Sesongen (årstall) som pågår, eller som nettopp er ferdig før mars."""
+        now = datetime.now(self.norsk_tz)
+        return now.year if now.month >= 3 else now.year - 1
+
+    async def _read_state_table(self, first_col: str, last_col: str) -> list:
+        """Les en tabell i "State"-fanen fra rad 2 og nedover."""
+        state_ws = await self._get_state_sheet()
+        values = await sheets_call(
+            "get", state_ws.get, f"{first_col}2:{last_col}", timeout=None
+        )
+        return values or []
+
+    async def _write_state_table(
+        self, first_col: str, header: list[str], rows: list[list], min_cols: int
+    ) -> None:
+        """Skriv en tabell med overskrift til "State"-fanen i ett kall."""
+        rows = [header] + rows
+        state_ws = await self._get_state_sheet()
+        # Eldre "State"-faner ble opprettet med bare 2x2 celler
+        if state_ws.row_count < len(rows) or state_ws.col_count < min_cols:
+            await sheets_call(
+                "resize",
+                state_ws.resize,
+                rows=max(state_ws.row_count, len(rows)),
+                cols=max(state_ws.col_count, min_cols),
+                timeout=None,
+            )
+        await sheets_call(
+            "update", state_ws.update, f"{first_col}1", rows, timeout=None
+        )
+
+    async def _get_sheet_index(self) -> SheetIndex:
+        """Hent uke → rad-indeksen for sesongen fra "State"-fanen.
+
+        Indeksen leses én gang og holdes i minnet. Klarer vi ikke lese den,
+        brukes en tom indeks, og kallerne faller tilbake til å lese arket.
+        """
+        season = self._current_season()
+        if self.sheet_index is not None and self.sheet_index.season == season:
+            return self.sheet_index
+        try:
+            values = await self._read_state_table(INDEX_FIRST_COL, INDEX_LAST_COL)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Klarte ikke laste radindeksen fra sheet: %s", exc)
+            return SheetIndex(season)
+        self.sheet_index = SheetIndex.from_rows(values, season)
+        return self.sheet_index
+
+    async def _save_sheet_index(self) -> None:
+        """Persister radindeksen i "State"-fanen."""
+        index = self.sheet_index
+        if index is None:
+            return
+        try:
+            await self._write_state_table(
+                INDEX_FIRST_COL, INDEX_HEADER, index.to_rows(), INDEX_MIN_COLS
+            )
+            index.stored = len(index.weeks)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Klarte ikke lagre radindeksen til sheet: %s", exc)
+            report_error("vestsk.save_index", exc)
+
+    async def _get_season_totals(self) -> SeasonTotals | None:
+        """Hent lagrede sesongpoeng fra "State"-fanen (én gang per kjøring)."""
+        if self.season_totals is None:
+            try:
+                values = await self._read_state_table(TOTALS_FIRST_COL, TOTALS_LAST_COL)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Klarte ikke laste sesongpoeng fra sheet: %s", exc)
+                return None
+            self.season_totals = SeasonTotals.from_rows(values)
+        return self.season_totals
+
+    async def _save_season_totals(self, totals: SeasonTotals) -> None:
+        """Persister sesongpoengene i "State"-fanen i ett kall."""
+        previous = self.season_totals
+        totals.stored = max(totals.stored, previous.stored if previous else 0)
+        self.season_totals = totals
+        try:
+            await self._write_state_table(
+                TOTALS_FIRST_COL, TOTALS_HEADER, totals.to_rows(), TOTALS_MIN_COLS
+            )
+            totals.stored = len(totals.totals)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Klarte ikke lagre sesongpoeng til sheet: %s", exc)
+            report_error("vestsk.save_totals", exc)
 
     async def _get_nfl_current_week(self) -> int:
         """Hent nåværende NFL-uke fra scoreboard API.
@@ -431,11 +581,7 @@ class VestskTipping(commands.Cog):
         """
         url = SCOREBOARD_URL
         try:
-            async with aiohttp.ClientSession(
-                timeout=ClientTimeout(total=10)
-            ) as session:
-                async with session.get(url) as resp:
-                    data = await resp.json()
+            data = await fetch_espn_json(url, retry_on_timeout=False)
         except Exception as e:  # pylint: disable=broad-except
             logger.error("Kunne ikke hente NFL current_week: %s", e)
             # Fallback til fantasy week hvis API feiler
@@ -547,18 +693,215 @@ class VestskTipping(commands.Cog):
             )
             return False
 
+        missed = self._missed_weeks(current_week)
+        if len(missed) > 1:
+            return await self._catch_up_weeks(channel, missed)
+        return await self._process_week(channel, previous_week)
+
+    def _missed_weeks(self, current_week: int) -> list[int]:
+        """Ukene fra `last_processed_week` og frem til nåværende uke.
+
+        Uten lagret state, eller når state er fra forrige sesong, er det bare
+        forrige uke som skal behandles.
+        """
+        previous_week = current_week - 1
+        last = self.last_processed_week
+        if not last or last >= previous_week:
+            return [previous_week]
+        return list(range(max(last + 1, 1), current_week))
+
+    async def _catch_up_weeks(self, channel, weeks: list[int]) -> bool:
+        """Tar igjen flere uker som ble hoppet over mens botten var nede.
+
+        Scoreboardene for alle ukene hentes samtidig, og kanalhistorikken
+        leses én gang for å se hvilke uker som faktisk ble postet (også for
+        hånd med `!kamper`). Postede uker går gjennom den vanlige eksporten og
+        resultatene, én uke om gangen. Uker uten postinger ble aldri lagt ut og
+        blir stående uten tips i arket. Kan ikke kanalen leses, behandles alle
+        ukene som postet, så ingen tips kastes.
+
+        Args:
+            channel: Kanalen ukene ble postet i
+            weeks (list[int]): Ukene som mangler, i rekkefølge
+
+        Returns:
+            bool: True hvis alle ukene er tatt igjen
+        """
+        logger.info("Tar igjen uke %s-%s", weeks[0], weeks[-1])
+        season = self._current_season()
+        try:
+            scoreboards = await asyncio.gather(
+                *(self._fetch_week_scoreboard(season, week) for week in weeks)
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error(
+                "Klarte ikke hente kamper for uke %s-%s: %s", weeks[0], weeks[-1], exc
+            )
+            return False
+
+        all_events = [ev for data in scoreboards for ev in data.get("events", [])]
+        try:
+            sessions = await self._posting_sessions(
+                channel, self._posting_window(all_events)
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.warning("Klarte ikke lese kanalhistorikken: %s", exc)
+            sessions = None
+
+        skipped = []
+        caught_up = True
+        for week, data in zip(weeks, scoreboards):
+            events = data.get("events", [])
+            if not all(
+                ev.get("status", {}).get("type", {}).get("completed") for ev in events
+            ):
+                logger.info("Uke %s er ikke ferdigspilt ennå", week)
+                caught_up = False
+                break
+            posted = (
+                sessions is None
+                or week == self.last_posted_week
+                or bool(self._week_posting(sessions, events))
+            )
+            if not posted:
+                skipped.append(week)
+                self.last_processed_week = week
+            elif not await self._process_week(channel, week, data):
+                caught_up = False
+                break
+
+        if skipped:
+            await self._skip_season_totals(skipped)
+            await self._save_state()
+            uker = ", ".join(str(w) for w in skipped)
+            await send_message(
+                channel,
+                f"Uke {uker} ble aldri lagt ut mens botten var nede, "
+                "og står uten tips i arket.",
+                coalesce=True,
+            )
+        return caught_up
+
+    def _posting_window(self, events: list) -> datetime:
+        """Tidligste tidspunkt kampene kan ha blitt postet i kanalen.
+
+        En uke før første kickoff, eller 14 dager tilbake uten kampdatoer.
+        """
+        kickoffs = [parse_espn_date(ev["date"]) for ev in events if ev.get("date")]
+        if not kickoffs:
+            return datetime.now(self.norsk_tz) - timedelta(days=14)
+        return min(kickoffs) - timedelta(days=7)
+
+    async def _posting_sessions(self, channel, after: datetime) -> list[list]:
+        """Bottens kampmeldinger siden `after`, gruppert per posting.
+
+        Meldinger med over 2 timer mellomrom hører til hver sin posting.
+
+        Args:
+            channel: Kanalen som leses
+            after (datetime): Eldste tidspunkt som tas med
+
+        Returns:
+            list[list]: Postingene i kronologisk rekkefølge
+        """
+        sessions: list[list] = []
+        last = None
+        async for msg in channel.history(limit=None, after=after, oldest_first=True):
+            if msg.author != self.bot.user or not self.is_valid_game_message(
+                msg.content
+            ):
+                continue
+            if (
+                last is None
+                or (msg.created_at - last.created_at).total_seconds() > 7200
+            ):
+                sessions.append([])
+            sessions[-1].append(msg)
+            last = msg
+        return sessions
+
+    def _week_posting(self, sessions: list[list], events: list) -> list:
+        """Meldingene for ukens kamper fra postingen som har flest av dem.
+
+        Samme oppgjør kan gå igjen senere i sesongen, så meldingene hentes fra
+        én posting i stedet for å plukkes fra hele historikken.
+        """
+        wanted = {self._format_event(ev) for ev in events}
+        return max(
+            (
+                [m for m in session if m.content.strip() in wanted]
+                for session in sessions
+            ),
+            key=len,
+            default=[],
+        )
+
+    async def _skip_season_totals(self, weeks: list[int]) -> None:
+        """Fører de lagrede sesongpoengene forbi uker uten tips.
+
+        Da kan neste uke fortsatt bygge på totalen i "State"-fanen i stedet
+        for å lese forrige "Sesongpoeng"-rad i arket.
+        """
+        totals = await self._get_season_totals()
+        if totals is None or totals.season != self._current_season():
+            return
+        changed = False
+        for week in weeks:
+            if totals.week == week - 1:
+                totals.before = dict(totals.totals)
+                totals.week = week
+                changed = True
+        if changed:
+            await self._save_season_totals(totals)
+
+    async def _process_week(self, channel, week: int, data: dict | None = None) -> bool:
+        """Behandler én uke, og tar opp kjøringen når CASSETTE_DIR er satt."""
+        if not os.getenv("CASSETTE_DIR"):
+            return await self._run_previous_week(channel, week, data)
+        path = cassette.cassette_path(week)
+
+        # Tar opp kjøringen for offline avspilling (python -m core.cassette).
+        # Scoreboardet hentes på nytt så kassetten får med kallet.
+        recorder = cassette.Recorder(
+            {
+                "week": week,
+                "bot_user_id": self.bot.user.id,
+                "channel_id": channel.id,
+            }
+        )
+        try:
+            with recorder.installed(__name__):
+                return await self._run_previous_week(recorder.channel(channel), week)
+        finally:
+            try:
+                recorder.cassette.save(path)
+            except OSError as exc:
+                logger.warning("Klarte ikke lagre kassett %s: %s", path, exc)
+
+    async def _run_previous_week(
+        self, channel, previous_week: int, data: dict | None = None
+    ) -> bool:
+        """Eksport, resultater og lagring av state for én uke.
+
+        Args:
+            channel: Kanalen ukens kamper ble postet i
+            previous_week (int): Uken som behandles
+            data (dict | None): Scoreboardet for uken, hvis det er hentet. Da
+                eksporteres ukens egne kamper i stedet for siste posting.
+        """
         ctx = SimpleNamespace(channel=channel, send=channel.send, bot=self.bot)
 
         try:
             logger.info("Running export for week %s", previous_week)
-            await self._export_impl(ctx, previous_week)
+            events = data.get("events") if data is not None else None
+            await self._export_impl(ctx, previous_week, events)
         except Exception as exc:  # pylint: disable=broad-exception-caught
             logger.error("Klarte ikke eksportere for uke %s: %s", previous_week, exc)
             return False
 
         try:
             logger.info("Running resultater for week %s", previous_week)
-            await self._resultater_impl(ctx, previous_week)
+            await self._resultater_impl(ctx, previous_week, data)
         except Exception as exc:  # pylint: disable=broad-exception-caught
             logger.error(
                 "Klarte ikke beregne resultater for uke %s: %s", previous_week, exc
@@ -572,6 +915,13 @@ class VestskTipping(commands.Cog):
             previous_week,
             self.last_processed_week,
         )
+
+        if ARCHIVE_KEEP_WEEKS:
+            try:
+                await self._archive_weeks(ARCHIVE_KEEP_WEEKS)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.warning("Klarte ikke arkivere gamle uker: %s", exc)
+                report_error("vestsk.archive", exc)
         return True
 
     async def auto_post_scheduler(self):
@@ -711,13 +1061,17 @@ class VestskTipping(commands.Cog):
                     current_week,
                 )
                 for ev in events:
-                    await vestsk_channel.send(self._format_event(ev))
-                await vestsk_channel.send(
-                    "Reager med laget du tror vinner på meldingene over."
+                    await send_message(vestsk_channel, self._format_event(ev))
+                await send_message(
+                    vestsk_channel,
+                    "Reager med laget du tror vinner på meldingene over.",
+                    coalesce=True,
                 )
             if isinstance(preik_channel, discord.TextChannel):
-                await preik_channel.send(
-                    f"@everyone Ukens kamper (uke {current_week}) er lagt ut i <#{VESTSK_KANAL}>!"
+                await send_message(
+                    preik_channel,
+                    f"@everyone Ukens kamper (uke {current_week}) er lagt ut i <#{VESTSK_KANAL}>!",
+                    coalesce=True,
                 )
 
             self.last_posted_week = current_week
@@ -761,8 +1115,11 @@ class VestskTipping(commands.Cog):
         needed = {self._format_event(ev) for ev in events}
         found: set[str] = set()
 
-        # Søk gjennom historikk med høyere limit for å sikre vi finner all bot-meldinger
-        async for msg in channel.history(limit=500, after=two_weeks_ago):
+        # Nyeste først og uten limit, så ukens poster ikke faller utenfor når
+        # kanalen har mye annen trafikk
+        async for msg in channel.history(
+            limit=None, after=two_weeks_ago, oldest_first=False
+        ):
             if msg.author != self.bot.user:
                 continue
             content = msg.content.strip()
@@ -793,38 +1150,33 @@ class VestskTipping(commands.Cog):
         """Eksporterer siste kamp-postinger til Google Sheet."""
         await self._export_impl(ctx, uke)
 
-    async def _export_impl(
-        self, ctx, uke: int | None = None
-    ):  # pylint: disable=unused-argument
-        try:
-            sheet = await asyncio.wait_for(
-                asyncio.to_thread(get_sheet, "Vestsk Tipping"), timeout=10
-            )
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
-        channel = ctx.channel
-
-        players = self.get_players(sheet)
-        num_players = len(players)
-
-        norsk_tz = pytz.timezone("Europe/Oslo")
-        now = datetime.now(norsk_tz)
-
-        # Søk siste 14 dager for å finne siste gruppe med bot-meldinger
-        search_limit = now - timedelta(days=14)
+    async def _latest_posting(self, channel, search_limit: datetime) -> list:
+        """Meldingene fra bottens siste posting av kamper, i kronologisk rekkefølge.
 
-        emoji_to_team_short = {v: k for k, v in team_emojis.items()}
+        Raises:
+            ExportError: Hvis ingen kampmeldinger er postet siden `search_limit`
+        """
         is_valid_game_message = VestskTipping.is_valid_game_message
 
+        # Nyeste først, så siste posting ikke faller utenfor når kanalen har
+        # mye trafikk; stopper ved første opphold på over 2 timer mellom
+        # bot-meldingene (forrige posting)
         all_bot_messages = []
-        async for msg in channel.history(limit=200, after=search_limit):
+        async for msg in channel.history(
+            limit=None, after=search_limit, oldest_first=False
+        ):
             if msg.author == self.bot.user and is_valid_game_message(msg.content):
+                if (
+                    all_bot_messages
+                    and (
+                        all_bot_messages[-1].created_at - msg.created_at
+                    ).total_seconds()
+                    > 7200
+                ):
+                    break
                 all_bot_messages.append(msg)
 
+        checkpoint("fase: les meldingshistorikk")
         if not all_bot_messages:
             raise ExportError(
                 f"Ingen gyldige bot-meldinger funnet siden {search_limit}"
@@ -852,7 +1204,44 @@ class VestskTipping(commands.Cog):
 
         if not messages:
             raise ExportError("Ingen meldinger funnet fra siste posting")
+        return messages
 
+    async def _export_impl(
+        self, ctx, uke: int | None = None, events: list | None = None
+    ):  # pylint: disable=unused-argument
+        try:
+            sheet = await sheets_call("open", get_sheet, "Vestsk Tipping")
+        except asyncio.TimeoutError:
+            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
+            return
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
+            return
+        channel = ctx.channel
+
+        players = self.get_players(sheet)
+        num_players = len(players)
+
+        norsk_tz = pytz.timezone("Europe/Oslo")
+        now = datetime.now(norsk_tz)
+
+        # Søk siste 14 dager for å finne siste gruppe med bot-meldinger
+        search_limit = now - timedelta(days=14)
+
+        if events is not None:
+            # En bestemt uke (innhenting etter nedetid): ukens egne kamper fra
+            # postingen som har flest av dem, ikke bare siste posting
+            sessions = await self._posting_sessions(
+                channel, self._posting_window(events)
+            )
+            messages = self._week_posting(sessions, events)
+            checkpoint("fase: les meldingshistorikk")
+            if not messages:
+                raise ExportError(f"Fant ikke kampene for uke {uke} i kanalen")
+        else:
+            messages = await self._latest_posting(channel, search_limit)
+
+        emoji_to_team_short = {v: k for k, v in team_emojis.items()}
         values = []
         for msg in messages:
             clean_text = re.sub(r"<:.+?:\d+>", "", msg.content).strip()
@@ -878,29 +1267,52 @@ class VestskTipping(commands.Cog):
                         else:
                             row[col_idx] = emoji_to_team_short.get(emoji_str, "")
             values.append(row)
+        checkpoint("fase: les reaksjoner")
+
+        # Radindeksen gir plassen uten å lese hele kolonne A: samme rader hvis
+        # uken er eksportert før, ellers rett etter siste kjente uke
+        index = await self._get_sheet_index() if uke else None
+        week_rows = index.get(uke) if index else None
+        start_row = None
+        if week_rows and week_rows.games == len(values):
+            start_row = week_rows.first
+        elif index and index.next_start():
+            candidate = index.next_start()
+            try:
+                taken = await sheets_call(
+                    "get",
+                    sheet.get,
+                    f"A{candidate}:A{candidate + len(values) + 1}",
+                )
+            except asyncio.TimeoutError as exc:
+                raise ExportError(
+                    "Timeout ved lesing av radene etter siste kjente uke"
+                ) from exc
+            except Exception as e:
+                raise ExportError(
+                    f"Feil ved lesing av radene etter siste kjente uke: {e}"
+                ) from e
+            # Rader lagt inn for hånd betyr at indeksen er utdatert
+            if not any(any(row) for row in taken or []):
+                start_row = candidate
 
-        try:
-            all_rows_col_a = await asyncio.wait_for(
-                asyncio.to_thread(sheet.col_values, 1), timeout=10
-            )
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
-        last_data_row = len(all_rows_col_a)
-        start_row = last_data_row + 2
+        if start_row is None:
+            try:
+                all_rows_col_a = await sheets_call("col_values", sheet.col_values, 1)
+            except asyncio.TimeoutError as exc:
+                raise ExportError("Timeout ved lesing av kolonne A") from exc
+            except Exception as e:
+                raise ExportError(f"Feil ved lesing av kolonne A: {e}") from e
+            last_data_row = len(all_rows_col_a)
+            start_row = last_data_row + 2
 
         if values:
             try:
                 end_row = start_row + len(values) - 1
                 end_col = 1 + num_players
-                range_notation = f"A{start_row}:{chr(64 + end_col)}{end_row}"
+                range_notation = f"A{start_row}:{col_letter(end_col)}{end_row}"
                 try:
-                    cell_range = await asyncio.wait_for(
-                        asyncio.to_thread(sheet.range, range_notation), timeout=10
-                    )
+                    cell_range = await sheets_call("range", sheet.range, range_notation)
                 except asyncio.TimeoutError:
                     logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
                     return
@@ -911,9 +1323,7 @@ class VestskTipping(commands.Cog):
                 for cell_obj, val in zip(cell_range, flat_values):
                     cell_obj.value = val
                 try:
-                    await asyncio.wait_for(
-                        asyncio.to_thread(sheet.update_cells, cell_range), timeout=10
-                    )
+                    await sheets_call("update_cells", sheet.update_cells, cell_range)
                 except asyncio.TimeoutError:
                     logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
                     return
@@ -925,6 +1335,9 @@ class VestskTipping(commands.Cog):
                     f"Feil ved eksport til sheet '{sheet.title}': {e}"
                 ) from e
 
+            if index is not None:
+                index.record(uke, start_row, len(values))
+                await self._save_sheet_index()
             await ctx.send("Kampdata eksportert til Sheets.")
         else:
             await ctx.send("Ingen verdier å oppdatere")
@@ -937,11 +1350,11 @@ class VestskTipping(commands.Cog):
         logger.info("Kommando !resultater kjørt for uke=%s", uke)
         await self._resultater_impl(ctx, uke)
 
-    async def _resultater_impl(self, ctx, uke: int | None = None):
+    async def _resultater_impl(
+        self, ctx, uke: int | None = None, data: dict | None = None
+    ):
         try:
-            sheet = await asyncio.wait_for(
-                asyncio.to_thread(get_sheet, "Vestsk Tipping"), timeout=10
-            )
+            sheet = await sheets_call("open", get_sheet, "Vestsk Tipping")
             if not sheet:
                 raise ResultaterError("Kunne ikke hente worksheet 'Vestsk Tipping'")
         except asyncio.TimeoutError as exc:
@@ -958,41 +1371,18 @@ class VestskTipping(commands.Cog):
         season = now.year if now.month >= 3 else now.year - 1
         logger.debug("Sesong: %s", season)
 
-        url = SCOREBOARD_URL
-        if uke:
-            # Hvis uke > 18, vi er i playoffs (seasontype=3)
-            # Playoff-uker: 1=Wild Card, 2=Divisional, 3=Conference,
-            # 4=Pro Bowl, 5=Super Bowl
-            if uke > 18:
-                playoff_week = uke - 18
-                url = (
-                    f"{SCOREBOARD_URL}?dates={season}&seasontype=3"
-                    f"&week={playoff_week}"
-                )
-            else:
-                url = f"{SCOREBOARD_URL}?dates={season}&seasontype=2&week={uke}"
-        logger.debug("Henter URL: %s", url)
-
-        try:
-            async with aiohttp.ClientSession(
-                timeout=ClientTimeout(total=10)
-            ) as session:
-                try:
-                    async with session.get(url) as resp:
-                        data = await resp.json()
-                except asyncio.TimeoutError:
-                    logger.warning(
-                        "API timeout mot ESPN, prøver igjen om 5 sekunder. URL=%s", url
-                    )
-                    await asyncio.sleep(5)
-                    # Retry once
-                    async with session.get(url) as resp:
-                        data = await resp.json()
-        except Exception as e:
-            raise APIFetchError(url, e) from e
+        # Innhenting av flere uker har allerede hentet scoreboardet
+        if data is None:
+            url = self._week_scoreboard_url(season, uke)
+            logger.debug("Henter URL: %s", url)
+            try:
+                data = await fetch_espn_json(url)
+            except Exception as e:
+                raise APIFetchError(url, e) from e
 
         events = data.get("events", [])
         logger.debug("Antall events hentet: %s", len(events))
+        checkpoint("fase: hent sheet og kamper")
 
         if not events:
             raise NoEventsFoundError(uke)
@@ -1032,26 +1422,61 @@ class VestskTipping(commands.Cog):
         logger.debug("Spillere funnet: %s", players)
         num_players = len(players)
 
-        # Hent alle relevante rader og kolonner i én batch
-        try:
-            all_rows = await asyncio.wait_for(
-                asyncio.to_thread(sheet.get_all_values), timeout=10
-            )
-            sheet_rows = all_rows[2:]
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
         sheet_kamper = []
         row_mapping = {}
         gyldige_kampkoder = set(kamp_resultater.keys())
-        for i, row in enumerate(sheet_rows, start=3):
-            kampkode = row[0].strip()
-            if kampkode in gyldige_kampkoder:
-                sheet_kamper.append(kampkode)
-                row_mapping[len(sheet_kamper) - 1] = i
+        kamp_cell_range = None
+
+        # Med radindeksen leses bare ukens kamprader (kampkode og tips)
+        index = await self._get_sheet_index() if uke else None
+        week_rows = index.get(uke) if index else None
+        if week_rows:
+            range_notation = (
+                f"A{week_rows.first}:{col_letter(1 + num_players)}"
+                f"{week_rows.last_game}"
+            )
+            try:
+                kamp_cell_range = await sheets_call(
+                    "range", sheet.range, range_notation
+                )
+            except asyncio.TimeoutError as exc:
+                raise ResultaterError(
+                    f"Timeout ved lesing av kampradene for uke {uke}"
+                ) from exc
+            except Exception as e:
+                raise ResultaterError(
+                    f"Feil ved lesing av kampradene for uke {uke}: {e}"
+                ) from e
+            codes = {
+                cell.row: str(cell.value).strip()
+                for cell in kamp_cell_range
+                if cell.col == 1
+            }
+            if all(code in gyldige_kampkoder for code in codes.values()):
+                for row_idx in sorted(codes):
+                    sheet_kamper.append(codes[row_idx])
+                    row_mapping[len(sheet_kamper) - 1] = row_idx
+            else:
+                logger.warning(
+                    "Radindeksen for uke %s stemmer ikke med arket, leser alt", uke
+                )
+                week_rows = None
+                kamp_cell_range = None
+
+        if week_rows is None:
+            # Hent alle relevante rader og kolonner i én batch
+            try:
+                all_rows = await sheets_call("get_all_values", sheet.get_all_values)
+                sheet_rows = all_rows[2:]
+            except asyncio.TimeoutError as exc:
+                raise ResultaterError("Timeout ved lesing av hele arket") from exc
+            except Exception as e:
+                raise ResultaterError(f"Feil ved lesing av hele arket: {e}") from e
+            for i, row in enumerate(sheet_rows, start=3):
+                kampkode = row[0].strip()
+                if kampkode in gyldige_kampkoder:
+                    sheet_kamper.append(kampkode)
+                    row_mapping[len(sheet_kamper) - 1] = i
 
         logger.debug("Kamper i sheet: %s", sheet_kamper)
         logger.debug("Row mapping: %s", row_mapping)
@@ -1077,19 +1502,22 @@ class VestskTipping(commands.Cog):
         end_row = max(row_mapping.values(), default=3)
 
         # Hent alle celler for kampdata i én batch
-        range_notation = (
-            f"{chr(64 + start_col)}{start_row}:" f"{chr(64 + end_col)}{end_row}"
-        )
-        try:
-            kamp_cell_range = await asyncio.wait_for(
-                asyncio.to_thread(sheet.range, range_notation), timeout=10
+        if kamp_cell_range is None:
+            range_notation = (
+                f"{col_letter(start_col)}{start_row}:{col_letter(end_col)}{end_row}"
             )
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
+            try:
+                kamp_cell_range = await sheets_call(
+                    "range", sheet.range, range_notation
+                )
+            except asyncio.TimeoutError as exc:
+                raise ResultaterError(
+                    f"Timeout ved lesing av tipsene for uke {uke}"
+                ) from exc
+            except Exception as e:
+                raise ResultaterError(
+                    f"Feil ved lesing av tipsene for uke {uke}: {e}"
+                ) from e
 
         # Lag mapping: (row_idx, col_idx) -> cell_obj
         cell_map = {(cell.row, cell.col): cell for cell in kamp_cell_range}
@@ -1147,99 +1575,150 @@ class VestskTipping(commands.Cog):
                 format_updates.append((row_idx, col_idx, fmt))
 
         logger.info("Ukespoeng: %s", uke_poeng)
-
-        # --- Sett inn Ukespoeng på ny rad etter denne ukens kamper ---
-        # Skriv "Ukespoeng" i kolA
-        try:
-            uke_label_cell = await asyncio.wait_for(
-                asyncio.to_thread(sheet.cell, uke_total_row, 1), timeout=10
+        checkpoint("fase: beregn ukespoeng")
+
+        if formula_mode():
+            # Google regner ut poengene; botten skriver vinnere og formler
+            winners = {
+                row_mapping[idx]: kamp_resultater[kampkode]
+                for idx, kampkode in enumerate(sheet_kamper)
+            }
+            if week_rows:
+                forrige = week_rows.previous_total
+                forrige = forrige if forrige > HEADER_ROWS else None
+            else:
+                forrige = None
+                for i, row in enumerate(all_rows[: start_row - 1], start=1):
+                    if row and row[0].strip() in (TOTAL_LABEL, CARRY_LABEL):
+                        forrige = i
+            uke_poeng, nye_totaler = await self._write_week_formulas(
+                sheet, winners, num_players, uke_total_row, forrige
             )
-            uke_label_cell.value = "Ukespoeng"
-            cell_updates.append(uke_label_cell)
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
-
-        # Skriv ukespoeng i kolonnene
-        for pidx, _ in enumerate(player_ids):
-            col_idx = start_col + pidx
+            tidligere = {
+                pid: total - points
+                for pid, total, points in zip(player_ids, nye_totaler, uke_poeng)
+            }
+        else:
+            # --- Sett inn Ukespoeng på ny rad etter denne ukens kamper ---
+            # Skriv "Ukespoeng" i kolA
             try:
-                cell_obj = await asyncio.wait_for(
-                    asyncio.to_thread(sheet.cell, uke_total_row, col_idx), timeout=10
-                )
-            except asyncio.TimeoutError:
-                logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-                return
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-                return
-            poeng = uke_poeng[pidx]
-            if str(cell_obj.value) != str(poeng):
-                cell_obj.value = str(poeng)
-                cell_updates.append(cell_obj)
-
-        # --- Finn siste Sesongpoeng-rad for å hente forrige totalsum ---
-        try:
-            all_sheet_rows = await asyncio.wait_for(
-                asyncio.to_thread(sheet.get_all_values), timeout=10
-            )
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
-        forrige_sesong_row = None
-        for i, row in enumerate(all_sheet_rows, start=1):
-            if row and row[0].strip() == "Sesongpoeng":
-                forrige_sesong_row = i
-
-        # --- Sett inn Sesongpoeng på rad rett under Ukespoeng ---
-        try:
-            sesong_label_cell = await asyncio.wait_for(
-                asyncio.to_thread(sheet.cell, uke_total_row + 1, 1), timeout=10
-            )
-            sesong_label_cell.value = "Sesongpoeng"
-            cell_updates.append(sesong_label_cell)
-        except asyncio.TimeoutError:
-            logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-            return
-        except Exception as e:  # pylint: disable=broad-exception-caught
-            logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-            return
+                uke_label_cell = await sheets_call("cell", sheet.cell, uke_total_row, 1)
+                uke_label_cell.value = "Ukespoeng"
+                cell_updates.append(uke_label_cell)
+            except asyncio.TimeoutError as exc:
+                raise ResultaterError("Timeout ved lesing av Ukespoeng-raden") from exc
+            except Exception as e:
+                raise ResultaterError(f"Feil ved lesing av Ukespoeng-raden: {e}") from e
 
-        for pidx, _ in enumerate(player_ids):
-            col_idx = start_col + pidx
-            tidligere_total = 0
-            if forrige_sesong_row:
-                val = all_sheet_rows[forrige_sesong_row - 1][col_idx - 1]
-                tidligere_total = int(val) if val and str(val).isdigit() else 0
+            # Skriv ukespoeng i kolonnene
+            for pidx, _ in enumerate(player_ids):
+                col_idx = start_col + pidx
+                try:
+                    cell_obj = await sheets_call(
+                        "cell", sheet.cell, uke_total_row, col_idx
+                    )
+                except asyncio.TimeoutError as exc:
+                    raise ResultaterError(
+                        f"Timeout ved lesing av ukespoeng-cellene for uke {uke}"
+                    ) from exc
+                except Exception as e:
+                    raise ResultaterError(
+                        f"Feil ved lesing av ukespoeng-cellene for uke {uke}: {e}"
+                    ) from e
+                poeng = uke_poeng[pidx]
+                if str(cell_obj.value) != str(poeng):
+                    cell_obj.value = str(poeng)
+                    cell_updates.append(cell_obj)
 
-            ny_total = tidligere_total + uke_poeng[pidx]
+            # --- Forrige totalsum: lagrede sesongpoeng, ellers fra arket ---
+            lagret = await self._get_season_totals() if uke else None
+            base = lagret.base_for(season, uke) if lagret else None
+            forrige_rad: list[str] = []
+            if base is not None:
+                logger.debug("Bygger på lagrede sesongpoeng etter uke %s", lagret.week)
+            elif week_rows:
+                # Forrige totalsum står alltid to rader over ukens første kamp
+                prev = week_rows.previous_total
+                try:
+                    values = await sheets_call(
+                        "get", sheet.get, f"A{prev}:{col_letter(end_col)}{prev}"
+                    )
+                except asyncio.TimeoutError as exc:
+                    raise ResultaterError(
+                        f"Timeout ved lesing av forrige totalsum for uke {uke}"
+                    ) from exc
+                except Exception as e:
+                    raise ResultaterError(
+                        f"Feil ved lesing av forrige totalsum for uke {uke}: {e}"
+                    ) from e
+                row = values[0] if values else []
+                if row and row[0].strip() in (TOTAL_LABEL, CARRY_LABEL):
+                    forrige_rad = row
+            else:
+                try:
+                    all_sheet_rows = await sheets_call(
+                        "get_all_values", sheet.get_all_values
+                    )
+                except asyncio.TimeoutError as exc:
+                    raise ResultaterError(
+                        "Timeout ved lesing av forrige totalsum i hele arket"
+                    ) from exc
+                except Exception as e:
+                    raise ResultaterError(
+                        f"Feil ved lesing av forrige totalsum i hele arket: {e}"
+                    ) from e
+                for row in all_sheet_rows:
+                    if row and row[0].strip() in (TOTAL_LABEL, CARRY_LABEL):
+                        forrige_rad = row
+
+            # --- Sett inn Sesongpoeng på rad rett under Ukespoeng ---
             try:
-                cell_obj = await asyncio.wait_for(
-                    asyncio.to_thread(sheet.cell, uke_total_row + 1, col_idx),
-                    timeout=10,
+                sesong_label_cell = await sheets_call(
+                    "cell", sheet.cell, uke_total_row + 1, 1
                 )
+                sesong_label_cell.value = "Sesongpoeng"
+                cell_updates.append(sesong_label_cell)
             except asyncio.TimeoutError:
                 logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
                 return
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
                 return
-            if str(cell_obj.value) != str(ny_total):
-                cell_obj.value = str(ny_total)
-                cell_updates.append(cell_obj)
+
+            tidligere: dict[str, int] = {}
+            nye_totaler: list[int] = []
+            for pidx, pid in enumerate(player_ids):
+                col_idx = start_col + pidx
+                tidligere_total = 0
+                if base is not None:
+                    tidligere_total = base.get(pid, 0)
+                elif col_idx <= len(forrige_rad):
+                    val = forrige_rad[col_idx - 1]
+                    tidligere_total = int(val) if val and str(val).isdigit() else 0
+
+                ny_total = tidligere_total + uke_poeng[pidx]
+                tidligere[pid] = tidligere_total
+                nye_totaler.append(ny_total)
+                try:
+                    cell_obj = await sheets_call(
+                        "cell", sheet.cell, uke_total_row + 1, col_idx
+                    )
+                except asyncio.TimeoutError as exc:
+                    raise ResultaterError(
+                        f"Timeout ved lesing av sesongpoeng-cellene for uke {uke}"
+                    ) from exc
+                except Exception as e:
+                    raise ResultaterError(
+                        f"Feil ved lesing av sesongpoeng-cellene for uke {uke}: {e}"
+                    ) from e
+                if str(cell_obj.value) != str(ny_total):
+                    cell_obj.value = str(ny_total)
+                    cell_updates.append(cell_obj)
 
         # === Batch update alle celler ===
         if cell_updates:
             try:
-                await asyncio.wait_for(
-                    asyncio.to_thread(sheet.update_cells, cell_updates), timeout=10
-                )
+                await sheets_call("update_cells", sheet.update_cells, cell_updates)
             except asyncio.TimeoutError:
                 logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
                 return
@@ -1281,24 +1760,29 @@ class VestskTipping(commands.Cog):
 
         if requests:
             try:
-                await asyncio.wait_for(
-                    asyncio.to_thread(
-                        sheet.spreadsheet.batch_update, {"requests": requests}
-                    ),
-                    timeout=10,
+                await sheets_call(
+                    "batch_update",
+                    sheet.spreadsheet.batch_update,
+                    {"requests": requests},
                 )
             except Exception as e:
                 raise ResultaterError(
                     f"Feil ved batch-formattering av celler: {e}"
                 ) from e
 
+        # Uker som er funnet ved å lese hele arket føres inn i radindeksen
+        if index is not None and not week_rows and row_mapping:
+            first = min(row_mapping.values())
+            if max(row_mapping.values()) - first + 1 == len(row_mapping):
+                index.record(uke, first, len(row_mapping))
+                await self._save_sheet_index()
+
         logger.info("Ferdig med oppdatering av sheet, sender Discord-melding")
+        checkpoint("fase: oppdater sheet")
 
         # Discord-melding
         try:
-            header_row = await asyncio.wait_for(
-                asyncio.to_thread(sheet.row_values, 1), timeout=10
-            )
+            header_row = await sheets_call("row_values", sheet.row_values, 1)
             header_row = header_row[1 : 1 + num_players]
         except asyncio.TimeoutError:
             logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
@@ -1307,26 +1791,64 @@ class VestskTipping(commands.Cog):
             logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
             return
 
-        discord_msg = []
-        for idx, name in enumerate(header_row, start=2):
-            uke_p = uke_poeng[idx - 2]
-            try:
-                sesong_cell = await asyncio.wait_for(
-                    asyncio.to_thread(sheet.cell, sesong_total_row, idx), timeout=10
+        # Totalene er nettopp regnet ut, så de trenger ikke leses tilbake
+        discord_msg = list(zip(header_row, uke_poeng, nye_totaler))
+
+        # En ny kjøring av en eldre uke skal ikke overskrive nyere totaler
+        lagret = await self._get_season_totals() if uke else None
+        if (
+            uke
+            and lagret is not None
+            and lagret.season == season
+            and lagret.week is not None
+            and uke < lagret.week
+        ):
+            logger.info(
+                "Beholder lagrede sesongpoeng etter uke %s (kjørte uke %s)",
+                lagret.week,
+                uke,
+            )
+        elif uke:
+            await self._save_season_totals(
+                SeasonTotals(
+                    season,
+                    uke,
+                    names=dict(zip(player_ids, header_row)),
+                    totals=dict(zip(player_ids, nye_totaler)),
+                    before=tidligere,
                 )
-                sesong_p_cell = sesong_cell.value
-            except asyncio.TimeoutError:
-                logger.warning("Timeout ved åpning av sheet Vestsk Tipping")
-                return
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                logger.error("Kunne ikke åpne sheet Vestsk Tipping: %s", e)
-                return
-            sesong_p = (
-                int(sesong_p_cell)
-                if sesong_p_cell and str(sesong_p_cell).isdigit()
-                else 0
             )
-            discord_msg.append((name, uke_p, sesong_p))
+
+        if week_rows:
+            # Hjemmetendensen trenger kampradene fra tidligere uker
+            if uke < REGULAR_SEASON_WEEKS:
+                try:
+                    all_sheet_rows = await sheets_call(
+                        "get",
+                        sheet.get,
+                        f"A{HEADER_ROWS + 1}:{col_letter(end_col)}"
+                        f"{week_rows.last_game}",
+                    )
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.warning("Kunne ikke lese tips for projeksjon: %s", e)
+                    all_sheet_rows = []
+            else:
+                all_sheet_rows = []
+        else:
+            all_sheet_rows = all_rows
+
+        try:
+            projection = await self._season_projection(
+                season,
+                uke,
+                [name for name, _, _ in discord_msg],
+                [sesong_p for _, _, sesong_p in discord_msg],
+                all_sheet_rows,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("Klarte ikke å projisere sesongen: %s", e)
+            projection = []
+        checkpoint("fase: projiser sesongen")
 
         discord_msg.sort(key=lambda x: x[1], reverse=True)
         lines = [f"```Poeng for uke {uke if uke else 'nåværende'}:"]
@@ -1339,11 +1861,316 @@ class VestskTipping(commands.Cog):
         for i, (name, _, sesong_p) in enumerate(discord_msg, start=1):
             lines.append(f"{i}. {name:<10} {sesong_p}")
 
+        if projection:
+            lines.append("")
+            lines.append("Sjanse for å vinne sesongen:")
+            lines.extend(projection)
+
         lines.append("```")
         await ctx.send("\n".join(lines))
         await ctx.send(
             f"✅ Resultater for uke {uke if uke else 'nåværende'} er " "oppdatert."
         )
+        checkpoint("fase: send resultater")
+
+    async def _write_week_formulas(
+        self,
+        sheet,
+        winners: dict[int, str],
+        num_players: int,
+        uke_row: int,
+        previous_total: int | None,
+    ) -> tuple[list[int], list[int]]:
+        """Skriver vinnere og formler for uken og leser poengene tilbake.
+
+        Args:
+            sheet: Tippearket
+            winners (dict[int, str]): Kamprad → vinner
+            num_players (int): Antall tippere
+            uke_row (int): Raden til "Ukespoeng"
+            previous_total (int | None): Raden med forrige totalsum, om noen
+
+        Returns:
+            tuple[list[int], list[int]]: Ukespoeng og sesongpoeng per tipper
+        """
+        data = week_updates(winners, num_players, uke_row, previous_total)
+        last_col = col_letter(1 + num_players)
+        try:
+            await sheets_call(
+                "batch_update",
+                sheet.batch_update,
+                data,
+                value_input_option="USER_ENTERED",
+            )
+            values = await sheets_call(
+                "get", sheet.get, f"B{uke_row}:{last_col}{uke_row + 1}"
+            )
+        except Exception as e:
+            raise ResultaterError(f"Feil ved skriving av formler: {e}") from e
+
+        def parse(row: list[str]) -> list[int]:
+            row = list(row) + [""] * (num_players - len(row))
+            return [int(v) if str(v).isdigit() else 0 for v in row[:num_players]]
+
+        rows = list(values or []) + [[], []]
+        return parse(rows[0]), parse(rows[1])
+
+    async def _season_projection(
+        self,
+        season: int,
+        uke: int | None,
+        names: list[str],
+        totals: list[int],
+        rows: list[list[str]],
+    ) -> list[str]:
+        """Simulerer resten av grunnserien og gir vinnersjanse per tipper.
+
+        Oddsen for de gjenværende ukene hentes fra scoreboardet, noen uker om
+        gangen og fra cachen for ferdigspilte uker. Tippernes hjemmetendens
+        leses fra radene som allerede er hentet.
+
+        Args:
+            season (int): Sesongen (årstall)
+            uke (int | None): Uken som nettopp er oppdatert, None for nåværende
+            names (list[str]): Tippernavn i kolonnerekkefølge
+            totals (list[int]): Sesongpoeng i samme rekkefølge
+            rows (list[list[str]]): Alle rader i arket
+
+        Returns:
+            list[str]: Linjer til resultatmeldingen, tom etter grunnserien
+        """
+        week = uke or await self._get_nfl_current_week()
+        remaining = range(week + 1, REGULAR_SEASON_WEEKS + 1)
+        if not names or not remaining:
+            return []
+
+        scoreboards = await asyncio.gather(
+            *(self._fetch_week_scoreboard(season, w) for w in remaining)
+        )
+        weeks = [game_probabilities(data.get("events", [])) for data in scoreboards]
+        home_rates = pick_tendencies(rows, len(names))
+        probs = await asyncio.to_thread(simulate_season, totals, weeks, home_rates)
+        return format_projection(names, probs)
+
+    # === stilling ===
+    @commands.command(name="stilling")
+    async def stilling(self, ctx, valg: str | None = None):
+        """Viser sesongstillingen i tippeleken.
+
+        `!stilling sjekk` sammenligner de lagrede sesongpoengene med arket
+        først, og henter dem fra arket på nytt hvis de ikke stemmer.
+        """
+        logger.info("Kommando !stilling kjørt med valg=%s", valg)
+        await self._stilling_impl(ctx, check=valg == "sjekk")
+
+    async def _stilling_impl(self, ctx, check: bool = False):
+        if check:
+            await self._check_season_totals(ctx)
+        totals = await self._get_season_totals()
+        if (
+            totals is None
+            or totals.season != self._current_season()
+            or not totals.totals
+        ):
+            await ctx.send("Ingen sesongpoeng er registrert ennå.")
+            return
+
+        heading = (
+            f"Sesongstilling etter uke {totals.week}:"
+            if totals.week
+            else "Sesongstilling:"
+        )
+        lines = [f"```{heading}"]
+        for i, (name, points) in enumerate(totals.standings(), start=1):
+            lines.append(f"{i}. {name:<10} {points}")
+        lines.append("```")
+        await ctx.send("\n".join(lines))
+
+    async def _sheet_season_totals(self) -> SeasonTotals:
+        """Leser siste "Sesongpoeng"- eller "Overført"-rad fra arket."""
+        try:
+            sheet = await sheets_call("open", get_sheet, "Vestsk Tipping")
+            rows = await sheets_call("get_all_values", sheet.get_all_values)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ResultaterError(f"Feil ved henting av sheet: {e}") from e
+
+        names = rows[0] if rows else []
+        ids = rows[1] if len(rows) > 1 else []
+        total_row, total_number = [], None
+        for number, row in enumerate(rows[HEADER_ROWS:], start=HEADER_ROWS + 1):
+            if row and row[0].strip() in (TOTAL_LABEL, CARRY_LABEL):
+                total_row, total_number = row, number
+
+        index = await self._get_sheet_index()
+        week = next(
+            (w for w, r in index.weeks.items() if r.sesongpoeng == total_number),
+            None,
+        )
+        totals = SeasonTotals(self._current_season(), week)
+        for col, pid in enumerate(ids[1:], start=1):
+            if not pid:
+                continue
+            val = total_row[col] if col < len(total_row) else ""
+            totals.names[pid] = names[col] if col < len(names) else pid
+            totals.totals[pid] = int(val) if val and str(val).isdigit() else 0
+        return totals
+
+    async def _check_season_totals(self, ctx) -> None:
+        """Sammenligner lagrede sesongpoeng med arket og retter dem ved avvik."""
+        from_sheet = await self._sheet_season_totals()
+        stored = await self._get_season_totals()
+        if stored is not None and stored.season == from_sheet.season:
+            avvik = stored.mismatches(from_sheet.totals)
+        else:
+            avvik = {pid: (0, points) for pid, points in from_sheet.totals.items()}
+
+        if not avvik:
+            await ctx.send("✅ Sesongpoengene stemmer med arket.")
+            return
+
+        lines = [f"Fant {len(avvik)} avvik, henter sesongpoengene fra arket:"]
+        for pid, (lagret, arket) in sorted(avvik.items()):
+            lines.append(
+                f"- {from_sheet.names.get(pid, pid)}: lagret {lagret}, arket {arket}"
+            )
+        await ctx.send("\n".join(lines))
+        if stored is not None and stored.week == from_sheet.week:
+            from_sheet.before = stored.before
+        await self._save_season_totals(from_sheet)
+
+    # === arkiver ===
+    @commands.command(name="arkiver")
+    @admin_only()
+    async def arkiver(self, ctx, behold: str | None = None, sesong: int | None = None):
+        """Flytter eldre uker til arkivfanen for sesongen.
+
+        `!arkiver 4` beholder de fire nyeste ukene i hovedarket, `!arkiver 0`
+        arkiverer alle ferdige uker, og `!arkiver sesong 2025` flytter hele
+        sesongen og nullstiller totalen.
+        """
+        logger.info("Kommando !arkiver kjørt med behold=%s, sesong=%s", behold, sesong)
+        whole_season = behold == "sesong"
+        if whole_season:
+            keep = 0
+        else:
+            try:
+                keep = int(behold) if behold else None
+            except ValueError as exc:
+                raise ArchiveError(
+                    f"Ugyldig antall uker: {behold} (bruk et tall eller 'sesong')"
+                ) from exc
+            if keep is not None and keep < 0:
+                await ctx.send("Antall uker å beholde kan ikke være negativt.")
+                return
+            if keep is None:
+                # ARCHIVE_KEEP_WEEKS=0 betyr bare at automatisk arkivering er av
+                keep = ARCHIVE_KEEP_WEEKS or DEFAULT_KEEP_WEEKS
+        await self._arkiver_impl(ctx, keep, whole_season, sesong)
+
+    async def _arkiver_impl(
+        self,
+        ctx,
+        keep: int,
+        whole_season: bool = False,
+        season: int | None = None,
+    ):
+        weeks, title = await self._archive_weeks(keep, whole_season, season)
+        if not weeks:
+            await ctx.send("Ingen ferdige uker å arkivere.")
+            return
+        await ctx.send(f"✅ Arkiverte {weeks} uke(r) til «{title}».")
+
+    async def _archive_weeks(
+        self, keep: int, whole_season: bool = False, season: int | None = None
+    ) -> tuple[int, str]:
+        """Flytter ferdige uker fra hovedarket til arkivfanen for sesongen.
+
+        Radene legges til i arkivfanen før de slettes fra hovedarket, slik at
+        en feil underveis aldri mister data. Slettingen gjøres med
+        `delete_rows`, så fargene på ukene som blir stående følger med.
+
+        Args:
+            keep (int): Antall nyeste ferdige uker som blir stående
+            whole_season (bool): Arkiver alle ferdige uker uten "Overført"-rad
+            season (int | None): Sesongen arkivet gjelder, None for nåværende
+
+        Returns:
+            tuple[int, str]: Antall arkiverte uker og navnet på arkivfanen
+        """
+        if season is None:
+            season = self._current_season()
+        title = archive_title(season)
+
+        try:
+            sheet = await sheets_call("open", get_sheet, "Vestsk Tipping")
+            rows = await sheets_call("get_all_values", sheet.get_all_values)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ArchiveError(f"Feil ved henting av sheet: {e}") from e
+
+        plan = plan_archive(rows, keep, whole_season)
+        if plan is None:
+            return 0, title
+
+        if plan.rows:
+            await self._append_to_archive(sheet.spreadsheet, title, rows, plan.rows)
+
+        try:
+            if plan.carry_row:
+                # Verdiene skrives på nytt, siden formler i raden ville pekt
+                # på rader som slettes
+                await sheets_call(
+                    "update",
+                    sheet.update,
+                    f"A{plan.carry_row}",
+                    [[CARRY_LABEL] + rows[plan.carry_row - 1][1:]],
+                    value_input_option="USER_ENTERED",
+                )
+            if plan.delete_start <= plan.delete_end:
+                await sheets_call(
+                    "delete_rows",
+                    sheet.delete_rows,
+                    plan.delete_start,
+                    plan.delete_end,
+                )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ArchiveError(f"Feil ved opprydding i hovedarket: {e}") from e
+
+        index = await self._get_sheet_index()
+        if index.weeks:
+            index.delete_rows(plan.delete_start, plan.delete_end)
+            await self._save_sheet_index()
+
+        logger.info("Arkiverte %s uke(r) til %s", plan.weeks, title)
+        return plan.weeks, title
+
+    async def _append_to_archive(
+        self, spreadsheet, title: str, rows: list[list[str]], archived: list[list[str]]
+    ) -> None:
+        """Legger arkiverte rader til nederst i arkivfanen, som opprettes ved behov."""
+        try:
+            try:
+                archive = await sheets_call("worksheet", spreadsheet.worksheet, title)
+            except Exception:  # pylint: disable=broad-except
+                archive = await sheets_call(
+                    "add_worksheet",
+                    spreadsheet.add_worksheet,
+                    title=title,
+                    rows=HEADER_ROWS,
+                    cols=max(len(row) for row in rows),
+                )
+                await sheets_call("update", archive.update, "A1", rows[:HEADER_ROWS])
+            # Kolonne A slutter alltid på en "Sesongpoeng"-rad i arkivet
+            used = await sheets_call("col_values", archive.col_values, 1)
+            await sheets_call("add_rows", archive.add_rows, len(archived))
+            await sheets_call(
+                "update",
+                archive.update,
+                f"A{len(used) + 1}",
+                archived,
+                value_input_option="USER_ENTERED",
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            raise ArchiveError(f"Feil ved skriving til '{title}': {e}") from e
 
 
 # --- Setup ---
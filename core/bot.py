@@ -2,14 +2,25 @@
 
 import os
 import asyncio
+import ast
+import importlib
+import importlib.util
+import time
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
 from core.keep_alive import keep_alive
+from core.loop_monitor import LoopMonitor
+from core.outbox import start_outbox, stop_outbox
 from core.utils.global_cooldown import setup_global_cooldown
-from core.errors import BotError
-from data.channel_ids import ADMIN_CHANNEL_ID
+from core.error_reporter import report_error, setup_error_reporting
+from core.metrics import discord_trace_config
+from core.perf import setup_command_timing
+from core.utils.lazy_import import IMPORT_TIMES
+
+# Tidspunkt prosessen startet, brukes til å måle tid frem til on_ready
+STARTUP_STARTED = time.perf_counter()
 
 # === Last miljøvariabler ===
 load_dotenv()
@@ -23,11 +34,20 @@ intents.messages = True
 intents.guilds = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# http_trace måler alle Discord HTTP-kall (send, historikk, reaksjoner)
+bot = commands.Bot(
+    command_prefix="!", intents=intents, http_trace=discord_trace_config()
+)
 
 # Global cooldown for å unngå kommandospam
 setup_global_cooldown(bot)
 
+# Tidsmåling av alle kommandoer, trege kommandoer rapporteres til admin
+setup_command_timing(bot)
+
+# Feil samles og sendes som oppsummering til admin-kanalen
+setup_error_reporting(bot)
+
 # === Cogs ===
 COGS = [
     "cogs.utility",  # ping, småkommandoer
@@ -35,6 +55,7 @@ COGS = [
     "cogs.responses",  # forskjellige humorkommandoer
     "cogs.ppr",  # oppdaterer og poster PPRs
     "cogs.fantasy_reminders",  # generelle påminnelser for fantasyligaen
+    "cogs.diagnostics",  # admin-kommandoer for metrikker og ytelse
 ]
 
 
@@ -43,6 +64,9 @@ COGS = [
 async def on_ready():
     """Logger til konsollen når botten er klar og pålogget."""
     print(f"✅ Botten er logget inn som {bot.user}")
+    print(f"[OPPSTART] Klar etter {time.perf_counter() - STARTUP_STARTED:.2f} s")
+    for module_name, seconds in sorted(IMPORT_TIMES.items()):
+        print(f"[IMPORT] {module_name} (utsatt) importert på {seconds * 1000:.1f} ms")
 
 
 # --- Global error handler ---
@@ -60,41 +84,132 @@ async def on_command_error(ctx, error):
         )
         return
 
-    # Sjekk om error er en BotError
-    if isinstance(error, BotError):
-        error_msg = f"⚠️ BotError i `{ctx.command}`:\n```{error}```"
-    else:
-        # Andre exceptions
-        error_msg = f"❌ Uventet feil i `{ctx.command}`:\n```{error}```"
-
-    # Send til admin-kanal
-    admin_channel = bot.get_channel(ADMIN_CHANNEL_ID)
-    if admin_channel and isinstance(admin_channel, discord.TextChannel):
-        await admin_channel.send(error_msg)
+    # Grupperes med like feil og sendes samlet til admin-kanalen.
+    # BotError og andre unntak skilles på feiltypen i oppsummeringen.
+    report_error(f"kommando:{ctx.command}", getattr(error, "original", error))
 
     # Logg i terminal
     print(f"[ERROR] Command: {ctx.command}, User: {ctx.author}, Error: {error}")
 
 
+# === Cog-lasting ===
+def _cog_dependencies(cog: str) -> list[str]:
+    """Modulene en cog kan importere på toppnivå, uten å kjøre cogen selv.
+
+    Relative importer og andre cogs i COGS tas ikke med; de kjøres av
+    `load_extension` som en del av cogen.
+    """
+    spec = importlib.util.find_spec(cog)
+    if spec is None or spec.origin is None or not spec.has_location:
+        return []
+    with open(spec.origin, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+            # `from pakke import modul` importerer undermoduler; navn som
+            # ikke er moduler feiler billig og hoppes over ved oppvarming
+            modules.extend(
+                f"{node.module}.{alias.name}"
+                for alias in node.names
+                if alias.name != "*"
+            )
+    return [name for name in dict.fromkeys(modules) if name not in COGS]
+
+
+def _warm_cog_imports(cog: str) -> float:
+    """Importerer avhengighetene til en cog og returnerer tiden det tok (sekunder).
+
+    Feil ignoreres her; `load_extension` får den samme feilen og melder den
+    som `ExtensionFailed` for riktig cog.
+    """
+    start = time.perf_counter()
+    for name in _cog_dependencies(cog):
+        try:
+            importlib.import_module(name)
+        except Exception:  # pylint: disable=broad-exception-caught
+            continue
+    return time.perf_counter() - start
+
+
+async def load_cog(cog: str) -> tuple[float, float] | None:
+    """Importerer avhengighetene til én cog og laster den.
+
+    `load_extension` kjører alltid cog-modulen på nytt (module_from_spec og
+    exec_module), så å importere selve cogen i en tråd ville kjørt den to
+    ganger. Tråden importerer derfor bare modulene cogen importerer, slik at
+    flere cogs kan varme opp avhengigheter samtidig uten å blokkere
+    event-loopen. Cog-modulen kjøres deretter én gang av `load_extension`,
+    mot allerede importerte avhengigheter.
+
+    Args:
+        cog (str): Modulnavnet til cogen, f.eks. "cogs.utility"
+
+    Returns:
+        tuple[float, float] | None: (importtid for avhengigheter, tid for
+            `load_extension`) i sekunder, eller None hvis cogen ikke kunne
+            lastes.
+    """
+    try:
+        import_time = await asyncio.to_thread(_warm_cog_imports, cog)
+        start = time.perf_counter()
+        await bot.load_extension(cog)
+        setup_time = time.perf_counter() - start
+    except commands.ExtensionNotFound as e:
+        print(f"[COG] Ikke funnet: {cog} ({e})")
+        return None
+    except commands.ExtensionFailed as e:
+        print(f"[COG] FEIL ved lasting av {cog}: {e}")
+        return None
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        print(f"[COG] Uventet feil ved lasting av {cog}: {e}")
+        return None
+
+    print(
+        f"[COG] Lastet {cog} (avhengigheter {import_time * 1000:.1f} ms, "
+        f"oppsett {setup_time * 1000:.1f} ms)"
+    )
+    return import_time, setup_time
+
+
+async def load_cogs() -> dict[str, tuple[float, float]]:
+    """Laster alle cogs i COGS samtidig og skriver ut en tidsoversikt.
+
+    Returns:
+        dict[str, tuple[float, float]]: Cog → (importtid, oppsettstid) for
+            cogs som ble lastet.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(*(load_cog(cog) for cog in COGS))
+    timings = {cog: res for cog, res in zip(COGS, results) if res is not None}
+    print(
+        f"[COG] {len(timings)}/{len(COGS)} cogs lastet på "
+        f"{(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return timings
+
+
 # === Main async startup ===
 async def main():
-    """Starter flask keep_alive, laster cogs og starter botten."""
-    keep_alive()  # starter Flask-serveren for uptime
+    """Starter helseserver, lag-monitor og meldingskø, laster cogs og starter botten."""
     async with bot:
-        for cog in COGS:
-            try:
-                await bot.load_extension(cog)
-                print(f"[COG] Lastet {cog}")
-            except commands.ExtensionNotFound as e:
-                print(f"[COG] Ikke funnet: {cog} ({e})")
-            except commands.ExtensionFailed as e:
-                print(f"[COG] FEIL ved lasting av {cog}: {e}")
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                print(f"[COG] Uventet feil ved lasting av {cog}: {e}")
-
-        if TOKEN is None:
-            raise ValueError("TOKEN ikke definert i miljøvariabler")
-        await bot.start(TOKEN)
+        runner = await keep_alive(bot)  # helse/metrikk-server for uptime
+        loop_monitor = LoopMonitor(bot)  # varsler om blokkerende kall
+        loop_monitor.start()
+        start_outbox()  # kø for utgående meldinger med rate limit-håndtering
+        try:
+            await load_cogs()
+
+            if TOKEN is None:
+                raise ValueError("TOKEN ikke definert i miljøvariabler")
+            await bot.start(TOKEN)
+        finally:
+            loop_monitor.stop()
+            await stop_outbox()
+            await runner.cleanup()
 
 
 if __name__ == "__main__":
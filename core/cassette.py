@@ -0,0 +1,700 @@
+"""Opptak og avspilling av ukeprosesseringen (kassetter).
+
+Med miljøvariabelen CASSETTE_DIR satt tar `_process_previous_week` opp alle
+kall mot ESPN, Google Sheets og Discord til en JSON-kassett
+(`<CASSETTE_DIR>/uke_<uke>.json`): forespørsel, svar, tidspunkt og
+latens per kall. Kassetten kan så spilles av offline mot dagens kode:
+
+    python -m core.cassette replay cassette.json --speed 1
+
+Avspillingen gir en tidslinje kall for kall (opptak mot avspilling) og en
+diff av alt som ble skrevet (celler, formatering, state og meldinger).
+Ulike skrivinger gir avslutningskode 1, så kassetter fra ekte tirsdager kan
+brukes som regresjonstest. `record-fake` tar opp en kjøring mot
+`core.fakes`, nyttig når ingen ekte kassett finnes.
+
+Kallene fanges ved å bytte ut `get_sheet`, `fetch_espn_json` og
+`simulate_season` i modulen som kjøres (standard `cogs.vestsk_tipping`).
+Byttet gjelder bare oppgaven som tar opp eller spiller av; andre oppgaver
+i botten går rett gjennom. Sesongsimuleringen får fast frø, så
+meldingene blir like mellom opptak og avspilling.
+"""
+
+import abc
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import difflib
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import patch
+
+import pytz
+
+from core.fakes import FakeBot, FakeESPN
+from core.fakes.discord import FakeMessage, FakeUser, build_season_channel
+from core.fakes.sheets import FakeCell, build_tipping_sheet, tipper_ids
+
+CASSETTE_VERSION = 1
+# Funksjonene i modulen som byttes ut under opptak og avspilling
+PATCHED = ("get_sheet", "fetch_espn_json", "simulate_season")
+# Kall som endrer noe hos Google eller Discord, og som diffes ved avspilling
+WRITE_OPS = {
+    ("sheets", "update_cells"),
+    ("sheets", "update"),
+    ("sheets", "update_cell"),
+    ("sheets", "append_row"),
+    ("sheets", "append_rows"),
+    ("sheets", "add_worksheet"),
+    ("sheets", "add_rows"),
+    ("sheets", "delete_rows"),
+    ("sheets", "batch_update"),
+    ("discord", "send"),
+}
+
+# Opptaket eller avspillingen som gjelder for oppgaven som kjører nå
+_active: contextvars.ContextVar["_Session | None"] = contextvars.ContextVar(
+    "cassette_session", default=None
+)
+
+
+def cassette_path(week: int) -> str | None:
+    """Filen uke `week` skal tas opp til, eller None uten CASSETTE_DIR."""
+    directory = os.getenv("CASSETTE_DIR")
+    if not directory:
+        return None
+    return os.path.join(directory, f"uke_{week}.json")
+
+
+def _is_value(value: Any) -> bool:
+    return value is None or isinstance(
+        value, (str, int, float, bool, list, tuple, dict, datetime)
+    )
+
+
+def _is_cell(value: Any) -> bool:
+    return all(hasattr(value, attr) for attr in ("row", "col", "value"))
+
+
+def encode(value: Any) -> Any:
+    """Gjør et svar eller argument om til JSON (celler og datoer merkes)."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, dict):
+        return {str(k): encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if _is_cell(value):
+        return {"__cell__": [value.row, value.col, value.value]}
+    return repr(value)
+
+
+def decode(value: Any) -> Any:
+    """Motsatt av `encode`; celler blir `FakeCell`."""
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__cell__" in value:
+            return FakeCell(*value["__cell__"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        return {k: decode(v) for k, v in value.items()}
+    return value
+
+
+class Cassette:
+    """Kallene fra én kjøring, i rekkefølge.
+
+    Hvert kall er en dict med `service`, `op`, `target` (objektet kallet
+    gikk mot), `kind` ("call" eller "attr"), `request`, `response`, `at`
+    (sekunder fra start) og `latency` (sekunder).
+    """
+
+    def __init__(
+        self, interactions: list[dict] | None = None, meta: dict | None = None
+    ) -> None:
+        self.interactions = interactions or []
+        self.meta = meta or {}
+
+    def writes(self) -> list[dict]:
+        """Skrivingene, i rekkefølge."""
+        return [
+            {"service": i["service"], "op": i["op"], "request": i["request"]}
+            for i in self.interactions
+            if (i["service"], i["op"]) in WRITE_OPS
+        ]
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = {
+            "version": CASSETTE_VERSION,
+            "meta": self.meta,
+            "interactions": self.interactions,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Ukjent kassettversjon: {data.get('version')}")
+        return cls(data["interactions"], data.get("meta"))
+
+
+class _Session(abc.ABC):
+    """Felles for opptak og avspilling: klokke, objekt-ID-er og utbytting."""
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self._handles = 0
+
+    def _now(self) -> float:
+        return round(time.perf_counter() - self._start, 6)
+
+    def _new_handle(self) -> str:
+        self._handles += 1
+        return f"o{self._handles}"
+
+    @abc.abstractmethod
+    def open_sheet(self, original, args: tuple, kwargs: dict):
+        """Åpner et ark i stedet for `get_sheet`."""
+
+    @abc.abstractmethod
+    async def fetch_json(self, original, url: str, op: str, retry_on_timeout: bool):
+        """Henter JSON i stedet for `fetch_espn_json`."""
+
+    @contextlib.contextmanager
+    def installed(self, module_name: str = "cogs.vestsk_tipping"):
+        """Bytter ut funksjonene i PATCHED i modulen mens blokken kjører."""
+        module = importlib.import_module(module_name)
+        originals = {name: getattr(module, name) for name in PATCHED}
+
+        def get_sheet(*args, **kwargs):
+            session = _active.get()
+            if session is None:
+                return originals["get_sheet"](*args, **kwargs)
+            return session.open_sheet(originals["get_sheet"], args, kwargs)
+
+        async def fetch_espn_json(url, op="espn.scoreboard", retry_on_timeout=True):
+            session = _active.get()
+            if session is None:
+                return await originals["fetch_espn_json"](url, op, retry_on_timeout)
+            return await session.fetch_json(
+                originals["fetch_espn_json"], url, op, retry_on_timeout
+            )
+
+        def simulate_season(*args, **kwargs):
+            if _active.get() is not None:
+                kwargs.setdefault("seed", 0)
+            return originals["simulate_season"](*args, **kwargs)
+
+        token = _active.set(self)
+        for name, func in zip(PATCHED, (get_sheet, fetch_espn_json, simulate_season)):
+            setattr(module, name, func)
+        try:
+            yield self
+        finally:
+            for name, func in originals.items():
+                setattr(module, name, func)
+            _active.reset(token)
+
+
+# === Opptak ===
+
+
+class Recorder(_Session):
+    """Tar opp kall mot de ekte tjenestene til en kassett.
+
+    Args:
+        meta (dict | None): Ekstra metadata, f.eks. uke og botens bruker-ID
+    """
+
+    def __init__(self, meta: dict | None = None) -> None:
+        super().__init__()
+        self.cassette = Cassette(
+            meta={"recorded_at": datetime.now(timezone.utc).isoformat(), **(meta or {})}
+        )
+
+    def _add(self, service, op, request, response=None, started=None, **extra):
+        at = self._now() if started is None else started
+        interaction = {
+            "service": service,
+            "op": op,
+            "kind": "call",
+            "target": None,
+            "request": request,
+            "response": response,
+            "at": at,
+            "latency": round(self._now() - at, 6),
+            **extra,
+        }
+        self.cassette.interactions.append(interaction)
+        return interaction
+
+    def _wrap(self, value: Any) -> tuple[Any, Any]:
+        """(verdi til koden, verdi til kassetten) for et svar."""
+        if _is_value(value) or _is_cell(value):
+            return value, encode(value)
+        handle = self._new_handle()
+        return _RecordingProxy(self, value, handle), {"__object__": handle}
+
+    def open_sheet(self, original, args, kwargs):
+        started = self._now()
+        sheet, response = self._wrap(original(*args, **kwargs))
+        self._add("sheets", "open", encode([args, kwargs]), response, started)
+        return sheet
+
+    async def fetch_json(self, original, url, op, retry_on_timeout):
+        started = self._now()
+        data = await original(url, op, retry_on_timeout)
+        self._add("espn", op, {"url": url}, data, started)
+        return data
+
+    def channel(self, channel) -> "_RecordingChannel":
+        """Discord-kanalen, med historikk, reaksjoner og sending tatt opp."""
+        return _RecordingChannel(self, channel)
+
+
+class _RecordingProxy:
+    """Videresender til et gspread-objekt og tar opp kall og attributter."""
+
+    def __init__(self, recorder: Recorder, target: Any, handle: str) -> None:
+        object.__setattr__(self, "_recorder", recorder)
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_handle", handle)
+
+    def __getattr__(self, name: str) -> Any:
+        recorder, handle = self._recorder, self._handle
+        value = getattr(self._target, name)
+        if not callable(value):
+            result, response = recorder._wrap(value)
+            recorder._add("sheets", name, None, response, kind="attr", target=handle)
+            return result
+
+        def call(*args, **kwargs):
+            started = recorder._now()
+            request = encode([args, kwargs])
+            try:
+                result, response = recorder._wrap(value(*args, **kwargs))
+            except Exception as exc:
+                recorder._add(
+                    "sheets",
+                    name,
+                    request,
+                    None,
+                    started,
+                    target=handle,
+                    error=repr(exc),
+                )
+                raise
+            recorder._add("sheets", name, request, response, started, target=handle)
+            return result
+
+        return call
+
+
+def _message_data(msg) -> dict:
+    return {
+        "id": msg.id,
+        "content": msg.content,
+        "author": msg.author.id,
+        "created_at": encode(msg.created_at),
+        "reactions": [
+            {"emoji": str(reaction.emoji), "count": reaction.count}
+            for reaction in msg.reactions
+        ],
+    }
+
+
+class _RecordingChannel:
+    """Discord-kanal der historikk, reaksjoner og sending tas opp."""
+
+    def __init__(self, recorder: Recorder, channel) -> None:
+        self._recorder = recorder
+        self._channel = channel
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._channel, name)
+
+    async def history(self, **kwargs):
+        # Svaret fylles ut etter hvert som koden leser, så et tidlig
+        # `break` gir et opptak av akkurat det som ble lest
+        interaction = self._recorder._add("discord", "history", encode(kwargs), [])
+        async for msg in self._channel.history(**kwargs):
+            interaction["response"].append(_message_data(msg))
+            interaction["latency"] = round(self._recorder._now() - interaction["at"], 6)
+            yield _RecordingMessage(self._recorder, msg)
+
+    async def send(self, content=None, **kwargs):
+        started = self._recorder._now()
+        msg = await self._channel.send(content, **kwargs)
+        self._recorder._add(
+            "discord", "send", {"content": content}, {"id": msg.id}, started
+        )
+        return msg
+
+
+class _RecordingMessage:
+    def __init__(self, recorder: Recorder, msg) -> None:
+        self._msg = msg
+        self.reactions = [
+            _RecordingReaction(recorder, msg.id, reaction) for reaction in msg.reactions
+        ]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._msg, name)
+
+
+class _RecordingReaction:
+    def __init__(self, recorder: Recorder, message_id: int, reaction) -> None:
+        self._recorder = recorder
+        self._message_id = message_id
+        self._reaction = reaction
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._reaction, name)
+
+    async def users(self, **kwargs):
+        request = {"message": self._message_id, "emoji": str(self._reaction.emoji)}
+        interaction = self._recorder._add("discord", "reaction_users", request, [])
+        async for user in self._reaction.users(**kwargs):
+            interaction["response"].append(user.id)
+            interaction["latency"] = round(self._recorder._now() - interaction["at"], 6)
+            yield user
+
+
+# === Avspilling ===
+
+
+class Player(_Session):
+    """Spiller av en kassett i stedet for de ekte tjenestene.
+
+    Kall matches mot opptaket per tjeneste, objekt og operasjon, i
+    rekkefølge; finnes et kall med samme forespørsel brukes det. Kall som
+    ikke finnes i opptaket gir None og markeres i tidslinjen.
+
+    Args:
+        cassette (Cassette): Opptaket
+        speed (float): Andel av opptatt latens som ventes, 0 for ingen
+    """
+
+    def __init__(self, cassette: Cassette, speed: float = 0.0) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.speed = speed
+        self.timeline: list[dict] = []
+        self.writes: list[dict] = []
+        self._queues: dict[tuple, deque] = {}
+        for interaction in cassette.interactions:
+            key = (
+                interaction["service"],
+                interaction.get("target"),
+                interaction["op"],
+            )
+            self._queues.setdefault(key, deque()).append(interaction)
+
+    def _take(self, service: str, target, op: str, request) -> dict | None:
+        """Neste opptatte kall, helst med samme forespørsel."""
+        queue = self._queues.get((service, target, op))
+        if not queue:
+            found = None
+        else:
+            key = _match_key(request)
+            found = next(
+                (i for i in queue if _match_key(i["request"]) == key), queue[0]
+            )
+            queue.remove(found)
+        if (service, op) in WRITE_OPS:
+            self.writes.append({"service": service, "op": op, "request": request})
+        if found is None or found.get("kind") != "attr":
+            self.timeline.append(
+                {
+                    "service": service,
+                    "op": op,
+                    "recorded_at": found["at"] if found else None,
+                    "recorded_latency": found["latency"] if found else None,
+                    "replayed_at": self._now(),
+                    "status": (
+                        "mangler"
+                        if found is None
+                        else (
+                            "lik"
+                            if _match_key(found["request"]) == _match_key(request)
+                            else "avvik"
+                        )
+                    ),
+                }
+            )
+        return found
+
+    def _peek_kind(self, target: str, op: str) -> str | None:
+        queue = self._queues.get(("sheets", target, op))
+        return queue[0].get("kind") if queue else None
+
+    def _result(self, interaction: dict | None) -> Any:
+        if interaction is None:
+            return None
+        response = interaction["response"]
+        if isinstance(response, dict) and "__object__" in response:
+            return _ReplayProxy(self, response["__object__"])
+        if "error" in interaction:
+            raise RuntimeError(interaction["error"])
+        return decode(response)
+
+    def open_sheet(self, original, args, kwargs):
+        interaction = self._take("sheets", None, "open", encode([args, kwargs]))
+        self._sleep(interaction)
+        return self._result(interaction)
+
+    def _sleep(self, interaction: dict | None) -> None:
+        if interaction and self.speed:
+            time.sleep(interaction["latency"] * self.speed)
+
+    async def _async_sleep(self, interaction: dict | None) -> None:
+        if interaction and self.speed:
+            await asyncio.sleep(interaction["latency"] * self.speed)
+
+    async def fetch_json(self, original, url, op, retry_on_timeout):
+        interaction = self._take("espn", None, op, {"url": url})
+        await self._async_sleep(interaction)
+        if interaction is None:
+            raise RuntimeError(f"Ingen opptatt respons for {url}")
+        return interaction["response"]
+
+    def channel(self, channel_id: int = 0) -> "_ReplayChannel":
+        """Discord-kanalen fra opptaket."""
+        return _ReplayChannel(self, channel_id)
+
+    def report(self) -> dict:
+        """Tidslinje, skrivinger og diff mot opptaket."""
+        recorded = self.cassette.writes()
+        diff = list(
+            difflib.unified_diff(
+                _write_lines(recorded),
+                _write_lines(self.writes),
+                "opptak",
+                "avspilling",
+                lineterm="",
+            )
+        )
+        return {
+            "meta": self.cassette.meta,
+            "timeline": self.timeline,
+            "recorded_seconds": max(
+                (i["at"] + i["latency"] for i in self.cassette.interactions),
+                default=0.0,
+            ),
+            "replayed_seconds": self._now(),
+            "writes": len(self.writes),
+            "unused": sum(len(q) for q in self._queues.values()),
+            "diff": diff,
+        }
+
+
+def _match_key(request: Any) -> str:
+    """Forespørselen uten tidspunkter, som avhenger av når kjøringen skjer."""
+
+    def strip(value):
+        if isinstance(value, dict):
+            if "__datetime__" in value:
+                return "*"
+            return {k: strip(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    return json.dumps(strip(request), sort_keys=True)
+
+
+def _write_lines(writes: list[dict]) -> list[str]:
+    return json.dumps(writes, ensure_ascii=False, indent=1, sort_keys=True).splitlines()
+
+
+class _ReplayProxy:
+    """Et gspread-objekt fra opptaket."""
+
+    def __init__(self, player: Player, handle: str) -> None:
+        self._player = player
+        self._handle = handle
+
+    def __getattr__(self, name: str) -> Any:
+        player, handle = self._player, self._handle
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if player._peek_kind(handle, name) == "attr":
+            return player._result(player._take("sheets", handle, name, None))
+
+        def call(*args, **kwargs):
+            interaction = player._take("sheets", handle, name, encode([args, kwargs]))
+            player._sleep(interaction)
+            return player._result(interaction)
+
+        return call
+
+
+class _ReplayReaction:
+    def __init__(self, player: Player, message_id: int, emoji: str, count: int):
+        self._player = player
+        self._message_id = message_id
+        self.emoji = emoji
+        self.count = count
+
+    async def users(self, **kwargs):
+        request = {"message": self._message_id, "emoji": self.emoji}
+        interaction = self._player._take("discord", None, "reaction_users", request)
+        await self._player._async_sleep(interaction)
+        for user_id in interaction["response"] if interaction else []:
+            yield FakeUser(user_id)
+
+
+class _ReplayChannel:
+    def __init__(self, player: Player, channel_id: int) -> None:
+        self._player = player
+        self.id = channel_id
+
+    async def history(self, **kwargs):
+        interaction = self._player._take("discord", None, "history", encode(kwargs))
+        await self._player._async_sleep(interaction)
+        for data in interaction["response"] if interaction else []:
+            yield FakeMessage(
+                content=data["content"],
+                author=FakeUser(data["author"]),
+                created_at=decode(data["created_at"]),
+                reactions=[
+                    _ReplayReaction(self._player, data["id"], r["emoji"], r["count"])
+                    for r in data["reactions"]
+                ],
+                id=data["id"],
+            )
+
+    async def send(self, content=None, **kwargs):
+        interaction = self._player._take("discord", None, "send", {"content": content})
+        await self._player._async_sleep(interaction)
+        return FakeMessage(content, FakeUser(0), datetime.now(timezone.utc), [])
+
+
+# === Kjøring ===
+
+
+def _cog(bot_user_id: int):
+    """VestskTipping uten bakgrunnsoppgaver, med botbrukeren fra opptaket."""
+    # Importeres her så kassettmodulen kan lastes uten å laste cogen
+    from cogs.vestsk_tipping import VestskTipping
+
+    bot = FakeBot()
+    bot.user = FakeUser(bot_user_id)
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    cog.last_processed_week = None
+    cog.last_posted_week = None
+    cog.state_loaded = True
+    return cog
+
+
+async def replay(cassette: Cassette, speed: float = 0.0) -> dict:
+    """Spiller av en tatt opp ukeprosessering mot dagens kode.
+
+    Args:
+        cassette (Cassette): Opptaket
+        speed (float): Andel av opptatt latens som ventes
+
+    Returns:
+        dict: Rapport fra `Player.report`, med `ok` fra kjøringen
+    """
+    player = Player(cassette, speed)
+    cog = _cog(cassette.meta.get("bot_user_id", 0))
+    with player.installed():
+        ok = await cog._run_previous_week(
+            player.channel(cassette.meta.get("channel_id", 0)), cassette.meta["week"]
+        )
+    return {"ok": ok, **player.report()}
+
+
+async def record_fake(week: int, tippers: int = 8, chatter: int = 0) -> Cassette:
+    """Tar opp ukeprosesseringen for `week` mot de falske tjenestene."""
+    cog = _cog(0)
+    book = build_tipping_sheet(tippers, week - 1)
+    channel = build_season_channel(week, tipper_ids(tippers), cog.bot.user, chatter)
+    espn = FakeESPN(completed_through=week)
+    recorder = Recorder({"week": week, "bot_user_id": 0, "channel_id": channel.id})
+    with (
+        patch(
+            "cogs.vestsk_tipping.get_sheet",
+            lambda name, worksheet_index=0: book.get_worksheet(worksheet_index),
+        ),
+        patch("cogs.vestsk_tipping.fetch_espn_json", espn.fetch_json),
+    ):
+        with recorder.installed():
+            await cog._run_previous_week(recorder.channel(channel), week)
+    return recorder.cassette
+
+
+def format_report(report: dict) -> str:
+    """Tidslinje og diff som tekst for terminalen."""
+    lines = [f"{'#':>4} {'tjeneste':<8} {'operasjon':<18} {'opptak':>16} {'avsp.':>8}"]
+    for i, row in enumerate(report["timeline"], start=1):
+        recorded = (
+            f"{row['recorded_at']:7.3f}+{row['recorded_latency']:.3f}"
+            if row["recorded_at"] is not None
+            else "-"
+        )
+        status = "" if row["status"] == "lik" else f"  ({row['status']})"
+        lines.append(
+            f"{i:>4} {row['service']:<8} {row['op']:<18} {recorded:>16} "
+            f"{row['replayed_at']:8.3f}{status}"
+        )
+    lines.append(
+        f"Opptak {report['recorded_seconds']:.2f} s, avspilling "
+        f"{report['replayed_seconds']:.2f} s, {report['writes']} skrivinger, "
+        f"{report['unused']} ubrukte kall i kassetten"
+    )
+    lines.extend(report["diff"] or ["Skrivingene er like opptaket."])
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Kommandolinje: `replay` eller `record-fake`."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    play = sub.add_parser("replay", help="Spill av en kassett mot dagens kode")
+    play.add_argument("cassette")
+    play.add_argument("--speed", type=float, default=0.0)
+    play.add_argument("--out", help="Fil for JSON-rapporten")
+    fake = sub.add_parser("record-fake", help="Ta opp en kjøring mot core.fakes")
+    fake.add_argument("--week", type=int, required=True)
+    fake.add_argument("--tippers", type=int, default=8)
+    fake.add_argument("--chatter", type=int, default=0)
+    fake.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    # Cogs logger mye på INFO
+    logging.getLogger().setLevel(logging.WARNING)
+    if args.command == "record-fake":
+        cassette = asyncio.run(record_fake(args.week, args.tippers, args.chatter))
+        cassette.save(args.out)
+        print(f"{len(cassette.interactions)} kall tatt opp til {args.out}")
+        return 0
+
+    report = asyncio.run(replay(Cassette.load(args.cassette), args.speed))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(format_report(report))
+    return 1 if report["diff"] or not report["ok"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Samlet og strupet feilrapportering til admin-kanalen.
+
+Når Google Sheets eller ESPN er nede, feiler hver runde i schedulerne på
+samme måte. I stedet for én melding per feil grupperes like feil etter et
+fingeravtrykk (kilde, feiltype og melding uten tall), og det sendes én
+oppsummering per tidsvindu med antall og første/siste tidspunkt.
+
+De siste feilene holdes også i en ringbuffer som admins kan se med `!feil`.
+"""
+
+import asyncio
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytz
+
+from core.outbox import send_message
+from data.channel_ids import ADMIN_CHANNEL_ID
+
+# Lengden (sekunder) på vinduet feil samles i før oppsummeringen sendes
+WINDOW_SECONDS = float(os.getenv("ERROR_REPORT_WINDOW_SECONDS", "60"))
+# Antall enkeltfeil som beholdes i ringbufferen
+BUFFER_SIZE = 100
+# Maks antall feilgrupper i én oppsummering
+MAX_GROUPS_PER_SUMMARY = 15
+
+_NORSK_TZ = pytz.timezone("Europe/Oslo")
+
+
+@dataclass
+class ErrorEntry:
+    """Én registrert feil.
+
+    Attributes:
+        timestamp (float): Unix-tid for feilen
+        source (str): Hvor feilen oppsto, f.eks. "vestsk.load_state"
+        kind (str): Feiltypen, f.eks. "APIError"
+        message (str): Feilmeldingen
+        fingerprint (str): Nøkkelen feilen grupperes på
+    """
+
+    timestamp: float
+    source: str
+    kind: str
+    message: str
+    fingerprint: str
+
+
+@dataclass
+class ErrorGroup:
+    """Like feil i gjeldende vindu.
+
+    Attributes:
+        sample (ErrorEntry): Første feil i gruppen
+        count (int): Antall feil i vinduet
+        first_seen (float): Unix-tid for første feil
+        last_seen (float): Unix-tid for siste feil
+    """
+
+    sample: ErrorEntry
+    count: int
+    first_seen: float
+    last_seen: float
+
+
+_buffer: deque = deque(maxlen=BUFFER_SIZE)
+_pending: dict[str, ErrorGroup] = {}
+_bot = None
+_window = WINDOW_SECONDS
+_flush_task: asyncio.Task | None = None
+
+
+def fingerprint(source: str, kind: str, message: str) -> str:
+    """Lager nøkkelen like feil grupperes på.
+
+    Tall (IDer, uker, tidspunkter) erstattes slik at f.eks. "uke 5" og
+    "uke 6" regnes som samme feil.
+    """
+    normalized = re.sub(r"0x[0-9a-fA-F]+|\d+", "N", message)[:200]
+    return f"{source}|{kind}|{normalized}"
+
+
+def setup_error_reporting(bot, window: float | None = None) -> None:
+    """Kobler feilrapporteringen til botten sin admin-kanal.
+
+    Uten oppsett registreres feil bare i ringbufferen og terminalen.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+        window (float | None): Vindu i sekunder, standard er WINDOW_SECONDS
+    """
+    global _bot, _window  # pylint: disable=global-statement
+    _bot = bot
+    _window = WINDOW_SECONDS if window is None else window
+
+
+def report_error(source: str, error: BaseException | str) -> ErrorEntry:
+    """Registrerer en feil og planlegger en samlet rapport til admin-kanalen.
+
+    Args:
+        source (str): Hvor feilen oppsto, f.eks. "kommando:resultater"
+        error (BaseException | str): Unntaket eller en feilmelding
+
+    Returns:
+        ErrorEntry: Den registrerte feilen
+    """
+    global _flush_task  # pylint: disable=global-statement
+    if isinstance(error, BaseException):
+        kind, message = type(error).__name__, str(error)
+    else:
+        kind, message = "Feil", str(error)
+    now = time.time()
+    entry = ErrorEntry(now, source, kind, message, fingerprint(source, kind, message))
+    _buffer.append(entry)
+    print(f"[FEIL] {source}: {kind}: {message}")
+
+    group = _pending.get(entry.fingerprint)
+    if group is None:
+        _pending[entry.fingerprint] = ErrorGroup(entry, 1, now, now)
+    else:
+        group.count += 1
+        group.last_seen = now
+
+    if _bot is not None and (_flush_task is None or _flush_task.done()):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return entry
+        _flush_task = loop.create_task(_flush_later(_window), name="error_reporter")
+    return entry
+
+
+def recent_errors(limit: int = 10) -> list[ErrorEntry]:
+    """Returnerer de siste feilene i ringbufferen, nyeste først."""
+    return list(reversed(_buffer))[:limit]
+
+
+def _fmt_time(ts: float) -> str:
+    """Formaterer et tidspunkt i norsk tid."""
+    return datetime.fromtimestamp(ts, _NORSK_TZ).strftime("%H:%M:%S")
+
+
+def format_summary(groups: list[ErrorGroup]) -> str:
+    """Formaterer en oppsummering av feilgrupper for admin-kanalen.
+
+    Args:
+        groups (list[ErrorGroup]): Gruppene som skal rapporteres
+
+    Returns:
+        str: Ferdig melding
+    """
+    total = sum(group.count for group in groups)
+    groups = sorted(groups, key=lambda g: g.count, reverse=True)
+    lines = [f"⚠️ {total} feil fordelt på {len(groups)} type(r):"]
+    for group in groups[:MAX_GROUPS_PER_SUMMARY]:
+        sample = group.sample
+        when = (
+            _fmt_time(group.first_seen)
+            if group.count == 1
+            else f"{_fmt_time(group.first_seen)}–{_fmt_time(group.last_seen)}"
+        )
+        lines.append(
+            f"• `{sample.source}` {sample.kind}: {sample.message[:300]} "
+            f"(×{group.count}, {when})"
+        )
+    if len(groups) > MAX_GROUPS_PER_SUMMARY:
+        lines.append(f"… og {len(groups) - MAX_GROUPS_PER_SUMMARY} til (se !feil)")
+    return "\n".join(lines)
+
+
+async def flush() -> None:
+    """Sender oppsummeringen av ventende feil nå."""
+    if not _pending:
+        return
+    groups = list(_pending.values())
+    _pending.clear()
+    channel = _bot.get_channel(ADMIN_CHANNEL_ID) if _bot is not None else None
+    if channel is None:
+        return
+    await send_message(
+        channel, format_summary(groups), admin=True, coalesce=True, wait=False
+    )
+
+
+async def _flush_later(delay: float) -> None:
+    """Venter ut vinduet og sender oppsummeringen."""
+    await asyncio.sleep(delay)
+    try:
+        await flush()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        print(f"[FEIL] Klarte ikke å sende feiloppsummering: {e}")
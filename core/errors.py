@@ -125,6 +125,14 @@ class ResultaterError(VestskError):
         super().__init__(self.message)
 
 
+class ArchiveError(VestskError):
+    """Raised ved feil under arkivering av uker i Sheets."""
+
+    def __init__(self, message: str | None = None):
+        self.message = message or "Feil under arkivering av uker i Sheets"
+        super().__init__(self.message)
+
+
 class ReminderError(VestskError):
     """Raised når påminnelse feiler."""
 
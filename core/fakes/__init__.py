@@ -0,0 +1,29 @@
+"""Falske versjoner av de eksterne tjenestene botten snakker med.
+
+Google Sheets, ESPN og Discord erstattes av objekter i minnet med samme
+grensesnitt som botten bruker, konfigurerbar forsinkelse og telling av kall.
+Brukes av benchmarkene (`python -m benchmarks.run`) og i tester.
+"""
+
+from core.fakes.discord import (
+    FakeBot,
+    FakeChannel,
+    FakeContext,
+    FakeUser,
+    RateLimiter,
+)
+from core.fakes.espn import FakeESPN, FakeLeague, make_scoreboard
+from core.fakes.sheets import FakeSpreadsheet, FakeWorksheet
+
+__all__ = [
+    "FakeBot",
+    "FakeChannel",
+    "FakeContext",
+    "FakeESPN",
+    "FakeLeague",
+    "FakeSpreadsheet",
+    "FakeUser",
+    "FakeWorksheet",
+    "RateLimiter",
+    "make_scoreboard",
+]
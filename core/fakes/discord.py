@@ -0,0 +1,336 @@
+"""Falske Discord-objekter: kanal med historikk, meldinger og reaksjoner.
+
+Kall som går mot Discord sitt API i den ekte klienten (sende melding, hente
+historikk, hente hvem som har reagert) venter `latency` sekunder og måles
+med samme operasjonsnavn som `core.metrics` bruker for ekte trafikk. Som hos
+Discord hentes historikk og reaksjoner i sider på 100, og med en
+`RateLimiter` får hver rute en egen bøtte med begrenset antall kall per
+tidsvindu.
+
+`build_season_channel` lager en kanal med en hel sesong trafikk (kampmeldinger
+med reaksjoner, resultatposter og prat), så kostnaden ved å lese historikken
+kan måles etter hvert som kanalen vokser.
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from core.fakes.espn import week_games
+from core.metrics import timed
+from data.teams import teams
+
+# Maks antall meldinger/brukere per forespørsel mot Discord
+PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class FakeUser:
+    """En Discord-bruker (lik en annen med samme ID)."""
+
+    id: int
+    name: str = ""
+
+
+# Omtrentlige grenser per rute (kall, sekunder), som Discord sine bøtter
+ROUTE_LIMITS = {
+    "discord.history": (5, 5.0),
+    "discord.reaction_users": (5, 1.0),
+    "discord.send": (5, 5.0),
+}
+
+
+class RateLimiter:
+    """Rate limits per rute med faste vinduer, som Discord sine bøtter.
+
+    Når en bøtte er tom venter kallet til vinduet nullstilles, slik
+    discord.py gjør etter en 429. Ventetiden legges til en virtuell klokke
+    og summeres per rute; med `time_scale` 0 sover ingen kall faktisk, så
+    benchmarker kan telle ventetiden uten å betale den.
+
+    Args:
+        limits (dict[str, tuple[int, float]] | None): Kall og sekunder per rute
+        time_scale (float): Andel av ventetiden som faktisk sovnes
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, tuple[int, float]] | None = None,
+        time_scale: float = 1.0,
+    ) -> None:
+        self.limits = dict(ROUTE_LIMITS if limits is None else limits)
+        self.time_scale = time_scale
+        self.limited: Counter = Counter()
+        self.waited: Counter = Counter()
+        self._offset = 0.0
+        # Rute → (gjenstående kall, tidspunkt vinduet nullstilles)
+        self._buckets: dict[str, tuple[int, float]] = {}
+
+    def _now(self) -> float:
+        return time.monotonic() + self._offset
+
+    async def acquire(self, op: str) -> None:
+        """Bruker ett kall fra rutens bøtte, og venter hvis den er tom."""
+        if op not in self.limits:
+            return
+        limit, per = self.limits[op]
+        now = self._now()
+        remaining, reset_at = self._buckets.get(op, (limit, now + per))
+        if now >= reset_at:
+            remaining, reset_at = limit, now + per
+        if remaining <= 0:
+            wait = reset_at - now
+            self.limited[op] += 1
+            self.waited[op] += wait
+            self._offset += wait
+            await asyncio.sleep(wait * self.time_scale)
+            remaining, reset_at = limit, self._now() + per
+        self._buckets[op] = (remaining - 1, reset_at)
+
+
+class _Endpoint:
+    """Felles forsinkelse, rate limits og telling for alt som ville vært et API-kall."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        calls: Counter | None = None,
+        limits: RateLimiter | None = None,
+    ) -> None:
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+        self.limits = limits
+
+    async def _request(self, op: str) -> None:
+        async with timed(op):
+            if self.limits is not None:
+                await self.limits.acquire(op)
+            await asyncio.sleep(self.latency)
+        self.calls[op] += 1
+
+
+class FakeReaction(_Endpoint):
+    """En reaksjon på en melding, med brukerne som har reagert."""
+
+    def __init__(self, emoji: str, users: list[FakeUser], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.emoji = emoji
+        self._users = list(users)
+        self.count = len(users)
+
+    async def users(self):
+        """Brukerne som har reagert, hentet side for side."""
+        for start in range(0, max(len(self._users), 1), PAGE_SIZE):
+            await self._request("discord.reaction_users")
+            for user in self._users[start : start + PAGE_SIZE]:
+                yield user
+
+
+@dataclass
+class FakeMessage:
+    """En melding i en kanal."""
+
+    content: str
+    author: FakeUser
+    created_at: datetime
+    reactions: list[FakeReaction]
+    id: int = 0
+
+
+class FakeChannel(_Endpoint):
+    """En tekstkanal med meldingshistorikk.
+
+    Args:
+        channel_id (int): Kanal-ID
+        messages (list[FakeMessage] | None): Historikken, eldste først
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+        limits (RateLimiter | None): Rate limits som deles med andre fakes
+    """
+
+    def __init__(
+        self,
+        channel_id: int = 0,
+        messages: list[FakeMessage] | None = None,
+        latency: float = 0.0,
+        calls: Counter | None = None,
+        limits: RateLimiter | None = None,
+    ) -> None:
+        super().__init__(latency, calls, limits)
+        self.id = channel_id
+        self.messages = list(messages or [])
+        self.sent: list[str] = []
+
+    async def history(
+        self,
+        limit: int | None = 100,
+        before: datetime | None = None,
+        after: datetime | None = None,
+        oldest_first: bool | None = None,
+    ):
+        """Meldinger mellom `after` og `before`, sidevis som i discord.py.
+
+        Som i discord.py kommer meldingene eldste først når `after` er satt,
+        ellers nyeste først, og `limit` teller fra den enden.
+        """
+        if oldest_first is None:
+            oldest_first = after is not None
+        matching = [
+            msg
+            for msg in self.messages
+            if (after is None or msg.created_at > after)
+            and (before is None or msg.created_at < before)
+        ]
+        if not oldest_first:
+            matching.reverse()
+        matching = matching[:limit]
+        for start in range(0, max(len(matching), 1), PAGE_SIZE):
+            await self._request("discord.history")
+            for msg in matching[start : start + PAGE_SIZE]:
+                yield msg
+
+    async def send(self, content: str = "", **kwargs) -> FakeMessage:
+        await self._request("discord.send")
+        self.sent.append(content)
+        return FakeMessage(content, FakeUser(0), datetime.now(timezone.utc), [])
+
+
+class FakeContext:
+    """Kommando-kontekst med kanal, bot og forfatter."""
+
+    def __init__(self, channel: FakeChannel, bot: "FakeBot", author=None) -> None:
+        self.channel = channel
+        self.bot = bot
+        self.author = author or FakeUser(1)
+        self.send = channel.send
+
+
+class FakeBot:
+    """Det cogs bruker av botten: egen bruker og oppslag av kanaler."""
+
+    def __init__(self, channels: list[FakeChannel] | None = None) -> None:
+        self.user = FakeUser(0, "bot")
+        self.channels = {channel.id: channel for channel in channels or []}
+
+    def get_channel(self, channel_id: int) -> FakeChannel | None:
+        return self.channels.get(channel_id)
+
+
+def build_week_messages(
+    week: int,
+    user_ids: list[str],
+    bot_user: FakeUser,
+    latency: float = 0.0,
+    calls: Counter | None = None,
+    limits: RateLimiter | None = None,
+    posted: datetime | None = None,
+) -> list[FakeMessage]:
+    """Ukens kampmeldinger fra botten, med tipsene som reaksjoner.
+
+    Tipperne fordeles mellom borte- og hjemmelaget, og botten har selv
+    reagert med begge (som når kampene postes).
+
+    Args:
+        week (int): NFL-uken
+        user_ids (list[str]): Discord-ID-ene til tipperne
+        bot_user (FakeUser): Botten som postet meldingene
+        latency (float): Forsinkelse per reaksjonskall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+        limits (RateLimiter | None): Rate limits som deles med andre fakes
+        posted (datetime | None): Når kampene ble postet (standard: 2 dager siden)
+
+    Returns:
+        list[FakeMessage]: Meldingene, eldste først
+    """
+    users = [FakeUser(int(uid)) for uid in user_ids]
+    posted = posted or datetime.now(timezone.utc) - timedelta(days=2)
+    messages = []
+    for i, (away, home) in enumerate(week_games(week)):
+        away_emoji = teams[away]["emoji"]
+        home_emoji = teams[home]["emoji"]
+        reactions = [
+            FakeReaction(
+                emoji,
+                [bot_user] + users[side::2],
+                latency=latency,
+                calls=calls,
+                limits=limits,
+            )
+            for side, emoji in ((i % 2, away_emoji), (1 - i % 2, home_emoji))
+        ]
+        messages.append(
+            FakeMessage(
+                content=f"{away_emoji} {away} @ {home} {home_emoji}",
+                author=bot_user,
+                created_at=posted + timedelta(seconds=i),
+                reactions=reactions,
+                id=week * 100 + i,
+            )
+        )
+    return messages
+
+
+def build_season_channel(
+    weeks: int,
+    user_ids: list[str],
+    bot_user: FakeUser,
+    chatter: int = 0,
+    latency: float = 0.0,
+    calls: Counter | None = None,
+    limits: RateLimiter | None = None,
+    channel_id: int = 1,
+) -> FakeChannel:
+    """Tippekanalen etter `weeks` uker, med siste uke postet for 2 dager siden.
+
+    Hver uke har kampmeldingene fra `build_week_messages`, en resultatpost fra
+    botten dagen etter og `chatter` meldinger fra tipperne spredt utover uken.
+
+    Args:
+        weeks (int): Antall uker med trafikk
+        user_ids (list[str]): Discord-ID-ene til tipperne
+        bot_user (FakeUser): Botten som poster kampene
+        chatter (int): Meldinger fra tipperne per uke
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+        limits (RateLimiter | None): Rate limits som deles med andre fakes
+        channel_id (int): Kanal-ID
+
+    Returns:
+        FakeChannel: Kanalen, med meldingene eldste først
+    """
+    rng = random.Random(weeks * 1000 + chatter)
+    users = [FakeUser(int(uid)) for uid in user_ids] or [bot_user]
+    last_posted = datetime.now(timezone.utc) - timedelta(days=2)
+    messages: list[FakeMessage] = []
+    for week in range(1, weeks + 1):
+        posted = last_posted - timedelta(weeks=weeks - week)
+        messages += build_week_messages(
+            week, user_ids, bot_user, latency, calls, limits, posted
+        )
+        messages.append(
+            FakeMessage(
+                content=f"Resultater uke {week - 1}",
+                author=bot_user,
+                created_at=posted - timedelta(days=1),
+                reactions=[],
+                id=week * 100 + 99,
+            )
+        )
+        for i in range(chatter):
+            offset = timedelta(seconds=rng.randint(3 * 3600, 7 * 24 * 3600 - 1))
+            messages.append(
+                FakeMessage(
+                    content=f"Melding {i} i uke {week}",
+                    author=rng.choice(users),
+                    created_at=posted - timedelta(days=2) + offset,
+                    reactions=[],
+                    id=week * 100_000 + 1000 + i,
+                )
+            )
+    now = datetime.now(timezone.utc)
+    messages = [msg for msg in messages if msg.created_at < now]
+    messages.sort(key=lambda msg: msg.created_at)
+    return FakeChannel(channel_id, messages, latency, calls, limits)
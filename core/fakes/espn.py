@@ -0,0 +1,304 @@
+"""Falske ESPN-data: NFL-scoreboard og fantasyliga.
+
+Alt genereres deterministisk fra uke og lag, slik at to kjøringer gir samme
+data. Kampoppsettet er en rundturnering (circle method) over de 32 lagene i
+`data.teams`, så hver uke har 16 kamper og ingen kamp gjentas i løpet av
+grunnserien.
+"""
+
+import asyncio
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from core.metrics import timed
+from data.teams import teams
+
+# Første søndag i den falske sesongen
+SEASON_START = datetime(2025, 9, 7, 17, 0, tzinfo=timezone.utc)
+
+# Startplasser i fantasyligaen, i rekkefølgen ESPN viser dem
+STARTER_SLOTS = ("QB", "RB", "RB", "WR", "WR", "TE", "RB/WR/TE", "D/ST", "K")
+BENCH_SIZE = 6
+
+# Hvilke plasser en spiller på hver posisjon kan stå på
+_ELIGIBLE = {
+    "QB": ["QB", "OP", "BE", "IR"],
+    "RB": ["RB", "RB/WR/TE", "BE", "IR"],
+    "WR": ["WR", "RB/WR/TE", "BE", "IR"],
+    "TE": ["TE", "RB/WR/TE", "BE", "IR"],
+    "D/ST": ["D/ST", "BE", "IR"],
+    "K": ["K", "BE", "IR"],
+}
+_BENCH_POSITIONS = ("QB", "RB", "RB", "WR", "WR", "TE")
+
+
+def round_robin(items: list, week: int) -> list[tuple]:
+    """Parer elementene for én runde i en rundturnering.
+
+    Args:
+        items (list): Et partall elementer
+        week (int): Runden, 1-basert
+
+    Returns:
+        list[tuple]: (borte, hjemme) per kamp, hjemmefordel veksler per runde
+    """
+    rest = list(items[1:])
+    shift = (week - 1) % len(rest)
+    rotated = [items[0]] + rest[shift:] + rest[:shift]
+    half = len(rotated) // 2
+    pairs = list(zip(rotated[:half], reversed(rotated[half:])))
+    if week % 2:
+        return pairs
+    return [(home, away) for away, home in pairs]
+
+
+def week_games(week: int) -> list[tuple[str, str]]:
+    """Ukens NFL-kamper som (bortelag, hjemmelag) med fulle lagnavn."""
+    return round_robin(sorted(teams), week)
+
+
+def game_code(away: str, home: str) -> str:
+    """Kampkoden "Borte@Hjemme" slik den står i tippearket."""
+    return f"{away.split()[-1]}@{home.split()[-1]}"
+
+
+# Statusnavnene ESPN bruker for kamper som ikke er startet, pågår og er ferdige
+STATUS_NAMES = {
+    "pre": "STATUS_SCHEDULED",
+    "in": "STATUS_IN_PROGRESS",
+    "post": "STATUS_FINAL",
+}
+
+
+def game_status(state: str) -> dict:
+    """`status`-feltet til en kamp i tilstanden "pre", "in" eller "post"."""
+    return {
+        "type": {
+            "name": STATUS_NAMES[state],
+            "state": state,
+            "completed": state == "post",
+        }
+    }
+
+
+def make_scoreboard(week: int, completed: bool = True, season: int = 2025) -> dict:
+    """Lager et scoreboard i samme format som ESPN sitt site-API.
+
+    Args:
+        week (int): NFL-uken, 1-18
+        completed (bool): Om kampene er ferdigspilt (med resultat)
+        season (int): Sesongen
+
+    Returns:
+        dict: JSON-lignende dict med `events`, `week` og `season`
+    """
+    rng = random.Random(week)
+    kickoff = SEASON_START + timedelta(weeks=week - 1)
+    events = []
+    for i, (away, home) in enumerate(week_games(week)):
+        home_ml = rng.choice([-250, -180, -130, 110, 150, 210])
+        away_ml = -home_ml
+        competitors = []
+        for side, name in (("home", home), ("away", away)):
+            competitors.append(
+                {
+                    "homeAway": side,
+                    "team": {
+                        "displayName": name,
+                        "abbreviation": name.split()[-1][:3].upper(),
+                    },
+                    "score": str(rng.randint(3, 42) if completed else 0),
+                }
+            )
+        events.append(
+            {
+                "id": f"{season}{week:02d}{i:02d}",
+                "date": (kickoff + timedelta(hours=3 * (i % 3))).strftime(
+                    "%Y-%m-%dT%H:%MZ"
+                ),
+                "competitions": [
+                    {
+                        "competitors": competitors,
+                        "odds": [
+                            {
+                                "homeTeamOdds": {"moneyLine": home_ml},
+                                "awayTeamOdds": {"moneyLine": away_ml},
+                            }
+                        ],
+                    }
+                ],
+                "status": game_status("post" if completed else "pre"),
+            }
+        )
+    return {
+        "events": events,
+        "week": {"number": week},
+        "season": {"type": 2, "year": season},
+    }
+
+
+class FakeESPN:
+    """Stand-in for `fetch_espn_json` med konfigurerbar forsinkelse.
+
+    Uker til og med `completed_through` er ferdigspilt, senere uker har odds
+    men ingen resultater. URL-er uten `week=` gir uken etter.
+
+    Args:
+        completed_through (int): Siste ferdigspilte uke
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+    """
+
+    def __init__(
+        self,
+        completed_through: int = 0,
+        latency: float = 0.0,
+        calls: Counter | None = None,
+    ) -> None:
+        self.completed_through = completed_through
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+
+    async def fetch_json(
+        self, url: str, op: str = "espn.scoreboard", retry_on_timeout: bool = True
+    ) -> dict:
+        """Samme signatur som `core.utils.espn_helpers.fetch_espn_json`."""
+        async with timed(op):
+            await asyncio.sleep(self.latency)
+        self.calls[op] += 1
+        match = re.search(r"[?&]week=(\d+)", url)
+        week = int(match.group(1)) if match else self.completed_through + 1
+        return make_scoreboard(week, completed=week <= self.completed_through)
+
+
+def _player(name: str, position: str, slot: str, points: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        name=name,
+        position=position,
+        slot_position=slot,
+        eligibleSlots=_ELIGIBLE[position],
+        points=points,
+        projected_points=round(points * 0.9 + 2, 2),
+    )
+
+
+def team_lineup(team_id: int, week: int) -> list[SimpleNamespace]:
+    """Oppstillingen til et fantasylag én uke, med startere og benk."""
+    rng = random.Random(team_id * 1000 + week)
+    lineup = []
+    for i, slot in enumerate(STARTER_SLOTS):
+        position = "RB" if slot == "RB/WR/TE" else slot
+        points = round(rng.uniform(0, 30), 2)
+        lineup.append(_player(f"Spiller {team_id}-{i}", position, slot, points))
+    for i, position in enumerate(_BENCH_POSITIONS[:BENCH_SIZE]):
+        points = round(rng.uniform(0, 25), 2)
+        lineup.append(_player(f"Benk {team_id}-{i}", position, "BE", points))
+    return lineup
+
+
+def team_score(team_id: int, week: int) -> float:
+    """Poengene til et fantasylag én uke (sum av starterne)."""
+    lineup = team_lineup(team_id, week)
+    return round(sum(p.points for p in lineup if p.slot_position != "BE"), 2)
+
+
+class FakeLeague:
+    """Stand-in for espn_api sin `League` med samme attributter som botten bruker.
+
+    Args:
+        num_teams (int): Antall lag (partall)
+        current_week (int): Uken ligaen står på; tidligere uker er spilt
+        year (int): Sesongen
+        latency (float): Forsinkelse per `box_scores`-kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+    """
+
+    def __init__(
+        self,
+        num_teams: int = 12,
+        current_week: int = 2,
+        year: int = 2025,
+        latency: float = 0.0,
+        calls: Counter | None = None,
+    ) -> None:
+        self.current_week = current_week
+        self.year = year
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+        self.settings = SimpleNamespace(
+            reg_season_count=14,
+            playoff_team_count=6,
+            playoff_seed_tie_rule="TOTAL_POINTS_SCORED",
+        )
+        self.teams = [
+            SimpleNamespace(team_id=i, team_name=f"Lag {i}", roster=[])
+            for i in range(1, num_teams + 1)
+        ]
+        self._build_season()
+
+    def _build_season(self) -> None:
+        """Fyller inn kampoppsett, resultater og tabell for alle lag."""
+        for team in self.teams:
+            team.schedule, team.scores, team.outcomes = [], [], []
+        weeks = range(1, self.settings.reg_season_count + 1)
+        for week in weeks:
+            for away, home in round_robin(self.teams, week):
+                played = week < self.current_week
+                away_score = team_score(away.team_id, week)
+                home_score = team_score(home.team_id, week)
+                for team, opp, own, other in (
+                    (away, home, away_score, home_score),
+                    (home, away, home_score, away_score),
+                ):
+                    team.schedule.append(opp)
+                    team.scores.append(own if played else 0.0)
+                    if not played:
+                        team.outcomes.append("U")
+                    else:
+                        team.outcomes.append("W" if own > other else "L")
+
+        for team in self.teams:
+            results = [o for o in team.outcomes if o != "U"]
+            team.wins = results.count("W")
+            team.losses = results.count("L")
+            team.ties = 0
+            team.points_for = round(sum(team.scores), 2)
+            streak = 0
+            for outcome in reversed(results):
+                if outcome != results[-1]:
+                    break
+                streak += 1
+            team.streak_length = streak
+            team.streak_type = (
+                "WIN" if results and results[-1] == "W" else "LOSS" if results else ""
+            )
+
+    def box_scores(self, week: int) -> list[SimpleNamespace]:
+        """Ukens kamper med oppstillinger, som `League.box_scores`."""
+        time.sleep(self.latency)
+        self.calls["espn.box_scores"] += 1
+        boxes = []
+        for away, home in round_robin(self.teams, week):
+            home_lineup = team_lineup(home.team_id, week)
+            away_lineup = team_lineup(away.team_id, week)
+            boxes.append(
+                SimpleNamespace(
+                    home_team=home,
+                    away_team=away,
+                    home_score=team_score(home.team_id, week),
+                    away_score=team_score(away.team_id, week),
+                    home_lineup=home_lineup,
+                    away_lineup=away_lineup,
+                    home_projected=round(
+                        sum(p.projected_points for p in home_lineup[:9]), 2
+                    ),
+                    away_projected=round(
+                        sum(p.projected_points for p in away_lineup[:9]), 2
+                    ),
+                )
+            )
+        return boxes
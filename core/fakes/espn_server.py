@@ -0,0 +1,590 @@
+"""Lokal HTTP-stand-in for ESPN: NFL-scoreboard og fantasyliga.
+
+Serverer de samme stiene som ESPN sitt site-API og fantasy-API, så botten
+kan pekes hit med `ESPN_SITE_BASE_URL` og `ESPN_FANTASY_BASE_URL` (se
+`core.utils.espn_helpers`). Sesongen går frem i steg: hver uke spilles i tre
+kickoff-puljer, og kampene går fra planlagt via pågående (med delvis
+stilling) til ferdigspilt. Fantasyligaen følger samme klokke.
+
+Data genereres som i `core.fakes.espn`, eller leses fra innspilte
+JSON-filer i en katalog (`scoreboard_week_<uke>.json` og `league.json`).
+Forsinkelse og feil (HTTP-status eller ingen svar) kan settes ved oppstart
+eller underveis via `/_control`.
+
+Eksempel:
+    python -m core.fakes.espn_server --port 8765 --latency-ms 50
+    curl -X POST localhost:8765/_control/advance?steps=3
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+from collections import Counter, deque
+from datetime import timedelta
+
+from aiohttp import web
+
+from core.fakes.espn import (
+    SEASON_START,
+    FakeLeague,
+    game_status,
+    make_scoreboard,
+    round_robin,
+    team_lineup,
+    team_score,
+)
+
+SITE_PREFIX = "/apis/site/v2/sports/football/nfl"
+FANTASY_PREFIX = "/apis/v3/games/ffl/seasons/{year}"
+
+REGULAR_SEASON_WEEKS = 18
+# Steg fra første kickoff til kampen er ferdig
+GAME_STEPS = 4
+# Steg mellom kickoff-puljene (tidlig, sen og kveldskamp)
+SLOT_STEPS = 2
+KICKOFF_SLOTS = 3
+WEEK_STEPS = (KICKOFF_SLOTS - 1) * SLOT_STEPS + GAME_STEPS
+
+# Plass- og lag-ID-ene ESPN bruker i fantasy-API-et
+_SLOT_IDS = {
+    "QB": 0,
+    "RB": 2,
+    "WR": 4,
+    "TE": 6,
+    "OP": 7,
+    "D/ST": 16,
+    "K": 17,
+    "BE": 20,
+    "IR": 21,
+    "RB/WR/TE": 23,
+}
+_DEFAULT_POSITION_IDS = {"QB": 1, "RB": 2, "WR": 3, "TE": 4, "K": 5, "D/ST": 16}
+_PRO_TEAM_IDS = list(range(1, 31)) + [33, 34]
+
+
+class SeasonClock:
+    """Hvor langt den simulerte sesongen har kommet.
+
+    Args:
+        week (int): Uken som spilles nå
+        step (int): Steg i uken, 0 (ingen kamper startet) til WEEK_STEPS
+    """
+
+    def __init__(self, week: int = 1, step: int = 0) -> None:
+        self.week = week
+        self.step = step
+
+    def advance(self, steps: int = 1) -> None:
+        """Flytter klokken; etter siste steg i en uke starter neste uke."""
+        for _ in range(steps):
+            if self.step < WEEK_STEPS:
+                self.step += 1
+            elif self.week < REGULAR_SEASON_WEEKS:
+                self.week += 1
+                self.step = 0
+
+    def game_state(self, week: int, index: int) -> tuple[str, float]:
+        """Tilstand og andel spilt for kamp nummer `index` i uke `week`."""
+        if week < self.week:
+            return "post", 1.0
+        if week > self.week:
+            return "pre", 0.0
+        played = self.step - (index % KICKOFF_SLOTS) * SLOT_STEPS
+        if played <= 0:
+            return "pre", 0.0
+        if played >= GAME_STEPS:
+            return "post", 1.0
+        return "in", played / GAME_STEPS
+
+    def week_fraction(self, week: int) -> float:
+        """Andelen av uke `week` som er spilt."""
+        if week < self.week:
+            return 1.0
+        if week > self.week:
+            return 0.0
+        return self.step / WEEK_STEPS
+
+    def as_dict(self) -> dict:
+        return {"week": self.week, "step": self.step, "week_steps": WEEK_STEPS}
+
+
+def apply_game_state(event: dict, state: str, fraction: float) -> dict:
+    """Setter status og stilling på en ferdigspilt kamp etter klokken.
+
+    Pågående kamper får sluttresultatet skalert med andelen spilt, så
+    stillingen bare øker frem mot resultatet.
+    """
+    event = copy.deepcopy(event)
+    event["status"] = game_status(state)
+    for competitor in event["competitions"][0]["competitors"]:
+        final = int(competitor.get("score") or 0)
+        competitor["score"] = str(int(final * fraction))
+    return event
+
+
+def calendar(season: int = 2025) -> list[dict]:
+    """Kalenderen i `leagues[0].calendar`, med én oppføring per uke."""
+    entries = []
+    for week in range(1, REGULAR_SEASON_WEEKS + 1):
+        start = SEASON_START + timedelta(weeks=week - 1, days=-3)
+        entries.append(
+            {
+                "label": f"Week {week}",
+                "value": str(week),
+                "startDate": start.strftime("%Y-%m-%dT%H:%MZ"),
+                "endDate": (start + timedelta(days=7, minutes=-1)).strftime(
+                    "%Y-%m-%dT%H:%MZ"
+                ),
+            }
+        )
+    return [
+        {
+            "label": "Regular Season",
+            "value": "2",
+            "startDate": entries[0]["startDate"],
+            "endDate": entries[-1]["endDate"],
+            "entries": entries,
+        },
+        {"label": "Postseason", "value": "3", "entries": []},
+    ]
+
+
+def _roster_entry(player, player_id: int, week: int, year: int, fraction: float):
+    """En spiller i formatet espn_api leser fra `roster.entries`."""
+    pro_team = _PRO_TEAM_IDS[player_id % len(_PRO_TEAM_IDS)]
+    return {
+        "playerId": player_id,
+        "lineupSlotId": _SLOT_IDS[player.slot_position],
+        "playerPoolEntry": {
+            "player": {
+                "id": player_id,
+                "fullName": player.name,
+                "proTeamId": pro_team,
+                "defaultPositionId": _DEFAULT_POSITION_IDS[player.position],
+                "eligibleSlots": [_SLOT_IDS[slot] for slot in player.eligibleSlots],
+                "stats": [
+                    {
+                        "seasonId": year,
+                        "scoringPeriodId": week,
+                        "statSourceId": 0,
+                        "statSplitTypeId": 1,
+                        "proTeamId": pro_team,
+                        "appliedTotal": round(player.points * fraction, 2),
+                        "stats": {"0": 1} if fraction else {},
+                    },
+                    {
+                        "seasonId": year,
+                        "scoringPeriodId": week,
+                        "statSourceId": 1,
+                        "statSplitTypeId": 1,
+                        "appliedTotal": player.projected_points,
+                    },
+                ],
+            }
+        },
+    }
+
+
+class FakeESPNServer:
+    """ESPN-stand-in med klokke, forsinkelse og feilinjeksjon.
+
+    Args:
+        clock (SeasonClock | None): Klokken sesongen følger
+        fixtures_dir (str | None): Katalog med innspilte JSON-svar
+        latency (float): Forsinkelse per forespørsel i sekunder
+        error_rate (float): Andel forespørsler som feiler, 0-1
+        error_status (int): HTTP-status for feilene; 0 betyr ingen svar
+            (forespørselen henger til klienten gir opp)
+        num_teams (int): Lag i fantasyligaen
+        year (int): Sesongen
+        league_id (int): Liga-ID-en som svarer (andre gir 404)
+        seed (int): Frø for tilfeldige feil
+    """
+
+    def __init__(
+        self,
+        clock: SeasonClock | None = None,
+        fixtures_dir: str | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        num_teams: int = 12,
+        year: int = 2025,
+        league_id: int = 1,
+        seed: int = 0,
+    ) -> None:
+        self.clock = clock or SeasonClock()
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.num_teams = num_teams
+        self.year = year
+        self.league_id = league_id
+        self.calls: Counter = Counter()
+        # Statuser som skal gis på de neste forespørslene, før tilfeldige feil
+        self.fail_next: deque[int] = deque()
+        self._rng = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+
+    # === Data ===
+
+    def _fixture(self, name: str):
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def scoreboard(self, week: int | None = None, season_type: int = 2) -> dict:
+        """Scoreboardet for en uke slik det ser ut ved klokkens steg."""
+        week = week or self.clock.week
+        if season_type != 2:
+            data = {"events": [], "week": {"number": week}}
+        else:
+            data = self._fixture(f"scoreboard_week_{week}.json") or make_scoreboard(
+                week, completed=True, season=self.year
+            )
+            data = dict(data)
+            data["events"] = [
+                apply_game_state(event, *self.clock.game_state(week, i))
+                for i, event in enumerate(data.get("events", []))
+            ]
+        data["season"] = {"type": season_type, "year": self.year}
+        data["leagues"] = [{"calendar": calendar(self.year)}]
+        return data
+
+    def league(self) -> dict:
+        """Ligaen i formatet til viewene mTeam/mRoster/mMatchup/mSettings."""
+        recorded = self._fixture("league.json")
+        if recorded is not None:
+            return recorded
+        week = self.clock.week
+        league = FakeLeague(self.num_teams, current_week=week, year=self.year)
+        reg_season = league.settings.reg_season_count
+        ranked = sorted(league.teams, key=lambda t: (-t.wins, -t.points_for))
+        teams = []
+        for team in league.teams:
+            against = sum(
+                opp.scores[i]
+                for i, opp in enumerate(team.schedule)
+                if team.outcomes[i] != "U"
+            )
+            teams.append(
+                {
+                    "id": team.team_id,
+                    "abbrev": f"L{team.team_id}",
+                    "name": team.team_name,
+                    "divisionId": 0,
+                    "playoffSeed": ranked.index(team) + 1,
+                    "rankCalculatedFinal": 0,
+                    "owners": [],
+                    "record": {
+                        "overall": {
+                            "wins": team.wins,
+                            "losses": team.losses,
+                            "ties": team.ties,
+                            "pointsFor": team.points_for,
+                            "pointsAgainst": round(against, 2),
+                            "streakLength": team.streak_length,
+                            "streakType": team.streak_type or "WIN",
+                        }
+                    },
+                    "roster": {"entries": self._lineup(team.team_id, week, 0.0)},
+                }
+            )
+        return {
+            "seasonId": self.year,
+            "scoringPeriodId": week,
+            "status": {
+                "currentMatchupPeriod": week,
+                "firstScoringPeriod": 1,
+                "finalScoringPeriod": 17,
+                "latestScoringPeriod": week,
+                "previousSeasons": [],
+            },
+            "settings": {
+                "name": "Fantasyliga",
+                "size": self.num_teams,
+                "scheduleSettings": {
+                    "matchupPeriodCount": reg_season,
+                    "matchupPeriods": {str(w): [w] for w in range(1, 18)},
+                    "playoffTeamCount": league.settings.playoff_team_count,
+                    "playoffSeedingRule": "TOTAL_POINTS_SCORED",
+                },
+                "tradeSettings": {"vetoVotesRequired": 4},
+                "draftSettings": {"keeperCount": 0},
+                "scoringSettings": {
+                    "matchupTieRule": "NONE",
+                    "playoffMatchupTieRule": "NONE",
+                    "scoringType": "H2H_POINTS",
+                    "scoringItems": [],
+                },
+                "acquisitionSettings": {"isUsingAcquisitionBudget": False},
+                "rosterSettings": {"lineupSlotCounts": {}},
+            },
+            "members": [],
+            "teams": teams,
+            "schedule": self.schedule(range(1, reg_season + 1)),
+        }
+
+    def _lineup(self, team_id: int, week: int, fraction: float) -> list[dict]:
+        return [
+            _roster_entry(player, team_id * 100 + i, week, self.year, fraction)
+            for i, player in enumerate(team_lineup(team_id, week))
+        ]
+
+    def schedule(self, weeks, with_lineups: bool = False) -> list[dict]:
+        """Fantasykampene i `weeks`, med stilling etter klokken."""
+        team_ids = list(range(1, self.num_teams + 1))
+        matchups = []
+        for week in weeks:
+            fraction = self.clock.week_fraction(week)
+            for away, home in round_robin(team_ids, week):
+                sides = {}
+                for side, team_id in (("away", away), ("home", home)):
+                    sides[side] = {
+                        "teamId": team_id,
+                        "totalPoints": round(team_score(team_id, week) * fraction, 2),
+                    }
+                    if with_lineups:
+                        sides[side]["rosterForCurrentScoringPeriod"] = {
+                            "entries": self._lineup(team_id, week, fraction)
+                        }
+                if fraction < 1:
+                    winner = "UNDECIDED"
+                elif sides["home"]["totalPoints"] > sides["away"]["totalPoints"]:
+                    winner = "HOME"
+                else:
+                    winner = "AWAY"
+                matchups.append(
+                    {
+                        "id": len(matchups) + 1,
+                        "matchupPeriodId": week,
+                        "playoffTierType": "NONE",
+                        "winner": winner,
+                        **sides,
+                    }
+                )
+        return matchups
+
+    def pro_schedule(self) -> dict:
+        """NFL-kampene per lag og uke (view proTeamSchedules_wl)."""
+        games: dict[int, dict] = {team_id: {} for team_id in _PRO_TEAM_IDS}
+        for week in range(1, REGULAR_SEASON_WEEKS + 1):
+            kickoff = SEASON_START + timedelta(weeks=week - 1)
+            date = int(kickoff.timestamp() * 1000)
+            for away, home in round_robin(_PRO_TEAM_IDS, week):
+                game = {"awayProTeamId": away, "homeProTeamId": home, "date": date}
+                games[away][str(week)] = [game]
+                games[home][str(week)] = [game]
+        return {
+            "settings": {
+                "proTeams": [
+                    {"id": team_id, "proGamesByScoringPeriod": by_week}
+                    for team_id, by_week in games.items()
+                ]
+            }
+        }
+
+    # === HTTP ===
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler):
+        """Forsinkelse, telling og feilinjeksjon for alt utenom /_control."""
+        if request.path.startswith("/_control"):
+            return await handler(request)
+        self.calls[request.path] += 1
+        await asyncio.sleep(self.latency)
+        status = None
+        if self.fail_next:
+            status = self.fail_next.popleft()
+        elif self.error_rate and self._rng.random() < self.error_rate:
+            status = self.error_status
+        if status == 0:
+            # Ingen svar: klienten får timeout
+            await asyncio.sleep(3600)
+        if status:
+            return web.json_response({"error": "injisert feil"}, status=status)
+        return await handler(request)
+
+    async def _scoreboard(self, request: web.Request) -> web.Response:
+        week = request.query.get("week")
+        season_type = int(request.query.get("seasontype", 2))
+        return web.json_response(
+            self.scoreboard(int(week) if week else None, season_type)
+        )
+
+    async def _fantasy_league(self, request: web.Request) -> web.Response:
+        if int(request.match_info["league_id"]) != self.league_id:
+            return web.json_response({"messages": ["not found"]}, status=404)
+        views = request.query.getall("view", [])
+        if "mDraftDetail" in views:
+            return web.json_response({"draftDetail": {"drafted": False}})
+        if "mPositionalRatings" in views:
+            return web.json_response(
+                {"positionAgainstOpponent": {"positionalRatings": {}}}
+            )
+        if "mMatchupScore" in views:
+            week = int(request.query.get("scoringPeriodId", self.clock.week))
+            filters = json.loads(request.headers.get("x-fantasy-filter", "{}"))
+            periods = (
+                filters.get("schedule", {})
+                .get("filterMatchupPeriodIds", {})
+                .get("value", [week])
+            )
+            weeks = [int(period) for period in periods]
+            return web.json_response(
+                {"schedule": self.schedule(weeks, with_lineups=True)}
+            )
+        return web.json_response(self.league())
+
+    async def _fantasy_season(self, request: web.Request) -> web.Response:
+        return web.json_response(self.pro_schedule())
+
+    async def _fantasy_players(self, request: web.Request) -> web.Response:
+        players = []
+        for team_id in range(1, self.num_teams + 1):
+            for entry in self._lineup(team_id, self.clock.week, 0.0):
+                player = entry["playerPoolEntry"]["player"]
+                players.append({"id": player["id"], "fullName": player["fullName"]})
+        return web.json_response(players)
+
+    async def _control_state(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                **self.clock.as_dict(),
+                "latency": self.latency,
+                "error_rate": self.error_rate,
+                "error_status": self.error_status,
+                "calls": dict(self.calls),
+            }
+        )
+
+    async def _control_advance(self, request: web.Request) -> web.Response:
+        self.clock.advance(int(request.query.get("steps", 1)))
+        return await self._control_state(request)
+
+    async def _control_set(self, request: web.Request) -> web.Response:
+        """Setter klokke, forsinkelse og feil fra query-parametere."""
+        query = request.query
+        if "week" in query:
+            self.clock.week = int(query["week"])
+            self.clock.step = int(query.get("step", 0))
+        if "latency_ms" in query:
+            self.latency = float(query["latency_ms"]) / 1000
+        if "error_rate" in query:
+            self.error_rate = float(query["error_rate"])
+        if "error_status" in query:
+            self.error_status = int(query["error_status"])
+        if "fail_next" in query:
+            self.fail_next.extend(int(s) for s in query["fail_next"].split(","))
+        return await self._control_state(request)
+
+    def make_app(self) -> web.Application:
+        """aiohttp-appen med ESPN-stiene og kontrollstiene."""
+        app = web.Application(middlewares=[self._faults])
+        season = FANTASY_PREFIX.format(year=self.year)
+        app.add_routes(
+            [
+                web.get(f"{SITE_PREFIX}/scoreboard", self._scoreboard),
+                web.get(season, self._fantasy_season),
+                web.get(f"{season}/players", self._fantasy_players),
+                web.get(
+                    f"{season}/segments/0/leagues/{{league_id}}", self._fantasy_league
+                ),
+                web.get("/_control", self._control_state),
+                web.post("/_control/advance", self._control_advance),
+                web.post("/_control/set", self._control_set),
+            ]
+        )
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Starter serveren og returnerer base-URL-en (port 0 gir ledig port)."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def write_fixtures(directory: str, year: int = 2025, num_teams: int = 12) -> None:
+    """Skriver en hel sesong som JSON-filer serveren kan lese inn igjen.
+
+    Scoreboardene lagres ferdigspilt; klokken bestemmer status og stilling
+    når de serveres. Ligaen lagres slik den står etter grunnserien.
+    """
+    os.makedirs(directory, exist_ok=True)
+    server = FakeESPNServer(SeasonClock(week=1), num_teams=num_teams, year=year)
+    for week in range(1, REGULAR_SEASON_WEEKS + 1):
+        path = os.path.join(directory, f"scoreboard_week_{week}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(make_scoreboard(week, season=year), f)
+    server.clock.week = FakeLeague(num_teams).settings.reg_season_count + 1
+    with open(os.path.join(directory, "league.json"), "w", encoding="utf-8") as f:
+        json.dump(server.league(), f)
+
+
+async def _serve(server: FakeESPNServer, host: str, port: int, step_seconds: float):
+    base_url = await server.start(host, port)
+    print(f"ESPN-stand-in på {base_url}")
+    print(f"  ESPN_SITE_BASE_URL={base_url}")
+    print(f"  ESPN_FANTASY_BASE_URL={base_url}")
+    try:
+        while True:
+            await asyncio.sleep(step_seconds or 3600)
+            if step_seconds:
+                server.clock.advance()
+    finally:
+        await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Kommandolinje: starter serveren eller skriver fixtures."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--week", type=int, default=1)
+    parser.add_argument("--fixtures", help="Katalog med innspilte JSON-svar")
+    parser.add_argument("--write-fixtures", help="Skriv en generert sesong hit")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument(
+        "--step-seconds",
+        type=float,
+        default=0.0,
+        help="Flytt klokken ett steg så ofte (0: bare via /_control)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.write_fixtures:
+        write_fixtures(args.write_fixtures)
+        return
+    server = FakeESPNServer(
+        SeasonClock(week=args.week),
+        fixtures_dir=args.fixtures,
+        latency=args.latency_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    try:
+        asyncio.run(_serve(server, args.host, args.port, args.step_seconds))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
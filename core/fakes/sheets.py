@@ -0,0 +1,497 @@
+"""Falsk Google Sheets i minnet, med samme metoder som gspread-objektene.
+
+Bare metodene botten faktisk bruker er med, men arket er et ekte rutenett,
+så det som skrives kan leses tilbake. Hvert kall venter `latency` sekunder
+(blokkerende, som gspread) og telles i `calls`, så benchmarkene kan se hvor
+mange rundturer mot Google en kommando ville gjort.
+
+Formlene botten skriver i formelmodus (treff med SUMPRODUCT og summer av
+celler) regnes ut ved lesing, slik Google gjør. Andre formler leses som tekst.
+
+Med en kvote (`Quota`) avvises kall over grensen per minutt med samme
+`gspread.exceptions.APIError` (429 RESOURCE_EXHAUSTED) som Google gir.
+`cogs.sheets` bruker `FakeClient` når SHEETS_BACKEND=fake.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from core.fakes.espn import game_code, week_games
+from core.utils.lazy_import import LazyImport
+
+APIError = LazyImport("gspread.exceptions", "APIError")
+
+# Beskytter kvoten og tellingen, kallene kjøres fra flere tråder
+_lock = threading.Lock()
+
+# Formlene fra core.utils.tipping_formulas
+_MATCHES = re.compile(
+    r"SUMPRODUCT\(\(([A-Z]+)(\d+):[A-Z]+(\d+)=([A-Z]+)\d+:[A-Z]+\d+\)"
+    r'\*\([A-Z]+\d+:[A-Z]+\d+<>""\)\)'
+)
+_CELL = re.compile(r"[A-Z]+\d+")
+
+
+class WorksheetNotFound(Exception):
+    """Arket finnes ikke (tilsvarer `gspread.WorksheetNotFound`)."""
+
+
+class Quota:
+    """Maks antall kall per rullerende minutt, som Google sin kvote per bruker.
+
+    Args:
+        per_minute (int): Tillatte kall per 60 sekunder
+        clock (Callable[[], float]): Klokke i sekunder (byttes ut i tester)
+    """
+
+    def __init__(
+        self, per_minute: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.per_minute = per_minute
+        self.clock = clock
+        self._calls: deque = deque()
+
+    def acquire(self) -> None:
+        """Registrerer ett kall, eller kaster 429 hvis kvoten er brukt opp.
+
+        Raises:
+            gspread.exceptions.APIError: Med status 429 når kvoten er nådd
+        """
+        now = self.clock()
+        while self._calls and now - self._calls[0] >= 60:
+            self._calls.popleft()
+        if len(self._calls) >= self.per_minute:
+            error = {
+                "code": 429,
+                "message": (
+                    "Quota exceeded for quota metric 'Read requests' "
+                    f"({self.per_minute} per minute)"
+                ),
+                "status": "RESOURCE_EXHAUSTED",
+            }
+            raise APIError(
+                SimpleNamespace(
+                    status_code=429,
+                    text=error["message"],
+                    json=lambda: {"error": error},
+                )
+            )
+        self._calls.append(now)
+
+
+def _request(owner: Any, op: str) -> None:
+    """Ett kall mot den falske tjenesten: kvote, forsinkelse og telling."""
+    with _lock:
+        if owner.quota is not None:
+            owner.quota.acquire()
+        owner.calls[f"sheets.{op}"] += 1
+    time.sleep(owner.latency)
+
+
+def parse_a1(label: str) -> tuple[int | None, int | None]:
+    """Gjør en A1-celle om til (rad, kolonne), f.eks. "AB12" → (12, 28).
+
+    Rad eller kolonne kan mangle ("B" eller "12"), og blir da None.
+    """
+    match = re.fullmatch(r"([A-Za-z]*)(\d*)", label.strip())
+    if not match or not any(match.groups()):
+        raise ValueError(f"Ugyldig celle: {label}")
+    col = 0
+    for char in match.group(1).upper():
+        col = col * 26 + ord(char) - 64
+    return (int(match.group(2)) if match.group(2) else None), (col or None)
+
+
+class FakeCell:
+    """En celle med posisjon og verdi, som `gspread.Cell`."""
+
+    def __init__(self, row: int, col: int, value: Any = "") -> None:
+        self.row = row
+        self.col = col
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"FakeCell({self.row}, {self.col}, {self.value!r})"
+
+
+class FakeWorksheet:
+    """Ett regneark (fane) lagret som en liste av rader.
+
+    Args:
+        title (str): Navnet på arket
+        rows (list[list[str]] | None): Startinnhold
+        sheet_id (int): sheetId, brukes i batch_update
+        spreadsheet (FakeSpreadsheet | None): Dokumentet arket hører til
+    """
+
+    def __init__(
+        self,
+        title: str,
+        rows: list[list[str]] | None = None,
+        sheet_id: int = 0,
+        spreadsheet: "FakeSpreadsheet | None" = None,
+    ) -> None:
+        self.title = title
+        self.id = sheet_id
+        self.rows = [[str(v) for v in row] for row in rows or []]
+        self.spreadsheet = spreadsheet or FakeSpreadsheet(worksheets=[])
+        # Rutenettet begrenser ikke skriving her, men leses som i gspread
+        self.row_count = 1000
+        self.col_count = 26
+
+    def _call(self, op: str) -> None:
+        _request(self.spreadsheet, op)
+
+    def _width(self) -> int:
+        return max((len(row) for row in self.rows), default=0)
+
+    def _get(self, row: int, col: int) -> str:
+        if row <= len(self.rows) and col <= len(self.rows[row - 1]):
+            return self._display(self.rows[row - 1][col - 1])
+        return ""
+
+    def _display(self, value: str) -> str:
+        """Verdien slik Google viser den: formler regnes ut hvis vi kan."""
+        if not value.startswith("="):
+            return value
+        total = 0
+        for term in value[1:].split("+"):
+            if match := _MATCHES.fullmatch(term):
+                picks, first, last, answers = match.groups()
+                _, pick_col = parse_a1(picks)
+                _, answer_col = parse_a1(answers)
+                for row in range(int(first), int(last) + 1):
+                    answer = self._get(row, answer_col)
+                    total += answer != "" and (
+                        self._get(row, pick_col).lower() == answer.lower()
+                    )
+            elif _CELL.fullmatch(term):
+                cell = self._get(*parse_a1(term))
+                total += int(cell) if cell.lstrip("-").isdigit() else 0
+            elif term.isdigit():
+                total += int(term)
+            else:
+                return value
+        return str(total)
+
+    def _set(self, row: int, col: int, value: Any) -> None:
+        while len(self.rows) < row:
+            self.rows.append([])
+        line = self.rows[row - 1]
+        line.extend([""] * (col - len(line)))
+        line[col - 1] = "" if value is None else str(value)
+
+    def _bounds(self, a1: str) -> tuple[int, int, int, int]:
+        """(første rad, første kolonne, siste rad, siste kolonne) for et område.
+
+        Åpne områder som "A:B" eller "A3:C" går til siste rad/kolonne med data.
+        """
+        start, _, end = a1.partition(":")
+        row1, col1 = parse_a1(start)
+        row2, col2 = parse_a1(end) if end else (row1, col1)
+        return (
+            row1 or 1,
+            col1 or 1,
+            row2 or max(len(self.rows), row1 or 1),
+            col2 or max(self._width(), col1 or 1),
+        )
+
+    def _cells(self, a1: str) -> list[FakeCell]:
+        row1, col1, row2, col2 = self._bounds(a1)
+        return [
+            FakeCell(r, c, self._get(r, c))
+            for r in range(row1, row2 + 1)
+            for c in range(col1, col2 + 1)
+        ]
+
+    def _values(self, a1: str) -> list[list[str]]:
+        """Verdiene i et område, uten tomme celler og rader på slutten (som API-et)."""
+        row1, col1, row2, col2 = self._bounds(a1)
+        values = []
+        for r in range(row1, row2 + 1):
+            row = [self._get(r, c) for c in range(col1, col2 + 1)]
+            while row and row[-1] == "":
+                row.pop()
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def row_values(self, row: int) -> list[str]:
+        self._call("row_values")
+        values = (
+            [self._display(v) for v in self.rows[row - 1]]
+            if row <= len(self.rows)
+            else []
+        )
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def col_values(self, col: int) -> list[str]:
+        self._call("col_values")
+        values = [self._get(r, col) for r in range(1, len(self.rows) + 1)]
+        while values and values[-1] == "":
+            values.pop()
+        return values
+
+    def get_all_values(self) -> list[list[str]]:
+        self._call("get_all_values")
+        width = self._width()
+        return [
+            [self._display(v) for v in row] + [""] * (width - len(row))
+            for row in self.rows
+        ]
+
+    def get(self, a1: str) -> list[list[str]]:
+        self._call("get")
+        return self._values(a1)
+
+    def range(self, a1: str) -> list[FakeCell]:
+        self._call("range")
+        return self._cells(a1)
+
+    def cell(self, row: int, col: int) -> FakeCell:
+        self._call("cell")
+        return FakeCell(row, col, self._get(row, col))
+
+    def update_cells(self, cells: list[FakeCell], **kwargs) -> None:
+        self._call("update_cells")
+        for cell in cells:
+            self._set(cell.row, cell.col, cell.value)
+
+    def update(self, a1: str, values: list[list[Any]], **kwargs) -> None:
+        self._call("update")
+        row1, col1, _, _ = self._bounds(a1)
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                self._set(row1 + r, col1 + c, value)
+
+    def batch_update(self, data: list[dict], **kwargs) -> None:
+        self._call("batch_update")
+        for item in data:
+            row1, col1, _, _ = self._bounds(item["range"])
+            for r, row in enumerate(item["values"]):
+                for c, value in enumerate(row):
+                    self._set(row1 + r, col1 + c, value)
+
+    def add_rows(self, rows: int) -> None:
+        self._call("add_rows")
+        self.row_count += rows
+
+    def resize(self, rows: int | None = None, cols: int | None = None) -> None:
+        self._call("resize")
+        self.row_count = rows or self.row_count
+        self.col_count = cols or self.col_count
+
+    def delete_rows(self, start_index: int, end_index: int | None = None) -> None:
+        self._call("delete_rows")
+        del self.rows[start_index - 1 : end_index or start_index]
+
+
+class FakeSpreadsheet:
+    """Et dokument med flere ark, som `gspread.Spreadsheet`.
+
+    Args:
+        title (str): Navnet på dokumentet
+        worksheets (list[FakeWorksheet] | None): Arkene i dokumentet
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+        quota (Quota | None): Kvote per minutt, None for ubegrenset
+    """
+
+    def __init__(
+        self,
+        title: str = "",
+        worksheets: list[FakeWorksheet] | None = None,
+        latency: float = 0.0,
+        calls: Counter | None = None,
+        quota: Quota | None = None,
+    ) -> None:
+        self.title = title
+        self.latency = latency
+        self.calls = calls if calls is not None else Counter()
+        self.quota = quota
+        self._worksheets: list[FakeWorksheet] = []
+        self.batch_requests: list[dict] = []
+        for ws in worksheets or []:
+            self._attach(ws)
+
+    def _attach(self, ws: FakeWorksheet) -> FakeWorksheet:
+        ws.spreadsheet = self
+        ws.id = len(self._worksheets)
+        self._worksheets.append(ws)
+        return ws
+
+    def _call(self, op: str) -> None:
+        _request(self, op)
+
+    def _find(self, title: str) -> FakeWorksheet:
+        for ws in self._worksheets:
+            if ws.title == title:
+                return ws
+        raise WorksheetNotFound(title)
+
+    def worksheets(self) -> list[FakeWorksheet]:
+        self._call("worksheets")
+        return list(self._worksheets)
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._call("worksheet")
+        return self._find(title)
+
+    def get_worksheet(self, index: int) -> FakeWorksheet:
+        self._call("get_worksheet")
+        return self._worksheets[index]
+
+    def add_worksheet(self, title: str, rows: int = 0, cols: int = 0) -> FakeWorksheet:
+        self._call("add_worksheet")
+        ws = self._attach(FakeWorksheet(title))
+        ws.row_count, ws.col_count = rows or ws.row_count, cols or ws.col_count
+        return ws
+
+    def batch_update(self, body: dict) -> dict:
+        self._call("batch_update")
+        self.batch_requests.extend(body.get("requests", []))
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+    def values_batch_get(self, ranges: list[str], params: dict | None = None) -> dict:
+        """Flere områder i ett kall, f.eks. ["'State'!A2:B2", "A1:C3"].
+
+        Områder uten arknavn gjelder første ark.
+        """
+        self._call("values_batch_get")
+        value_ranges = []
+        for a1 in ranges:
+            title, _, cells = a1.rpartition("!")
+            ws = self._find(title.strip("'")) if title else self._worksheets[0]
+            value_ranges.append(
+                {"range": a1, "majorDimension": "ROWS", "values": ws._values(cells)}
+            )
+        return {"spreadsheetId": self.title, "valueRanges": value_ranges}
+
+
+class FakeClient:
+    """Stand-in for `gspread.Client` som åpner dokumenter fra minnet.
+
+    Dokumenter som ikke finnes opprettes med ett tomt ark ved første
+    `open`, slik at botten kan kjøre uten tilgang til Google.
+
+    Args:
+        spreadsheets (list[FakeSpreadsheet] | None): Dokumenter fra start
+        latency (float): Forsinkelse per kall i sekunder
+        quota (Quota | None): Kvote per minutt, delt av alle dokumentene
+        calls (Counter | None): Teller som deles med andre fakes
+    """
+
+    def __init__(
+        self,
+        spreadsheets: list[FakeSpreadsheet] | None = None,
+        latency: float = 0.0,
+        quota: Quota | None = None,
+        calls: Counter | None = None,
+    ) -> None:
+        self.latency = latency
+        self.quota = quota
+        self.calls = calls if calls is not None else Counter()
+        self.spreadsheets: dict[str, FakeSpreadsheet] = {}
+        for book in spreadsheets or []:
+            self.add(book)
+
+    def add(self, book: FakeSpreadsheet) -> FakeSpreadsheet:
+        """Legger til et dokument med klientens forsinkelse, kvote og teller."""
+        book.latency, book.quota, book.calls = self.latency, self.quota, self.calls
+        self.spreadsheets[book.title] = book
+        return book
+
+    def open(self, title: str) -> FakeSpreadsheet:
+        _request(self, "open")
+        book = self.spreadsheets.get(title)
+        if book is None:
+            book = self.add(FakeSpreadsheet(title, [FakeWorksheet(title)]))
+        return book
+
+
+def tipper_ids(tippers: int) -> list[str]:
+    """Discord-ID-ene til de falske tipperne, i kolonnerekkefølge."""
+    return [str(1000 + i) for i in range(tippers)]
+
+
+def build_tipping_sheet(
+    tippers: int, weeks: int, latency: float = 0.0, calls: Counter | None = None
+) -> FakeSpreadsheet:
+    """Lager "Vestsk Tipping" med navn, ID-er og ferdig behandlede uker.
+
+    Oppsettet følger det ekte arket: navn i rad 1 og Discord-ID i rad 2 fra
+    kolonne B, deretter per uke en tom rad, én rad per kamp med tipsene,
+    "Ukespoeng" og "Sesongpoeng".
+
+    Args:
+        tippers (int): Antall tippere
+        weeks (int): Antall uker som allerede er ført
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+
+    Returns:
+        FakeSpreadsheet: Dokumentet, med tippearket som første ark
+    """
+    rng = random.Random(tippers)
+    rows = [
+        ["Navn"] + [f"Tipper{i}" for i in range(tippers)],
+        ["ID"] + tipper_ids(tippers),
+    ]
+    totals = [0] * tippers
+    for week in range(1, weeks + 1):
+        rows.append([])
+        week_points = [0] * tippers
+        for away, home in week_games(week):
+            code = game_code(away, home)
+            winner = rng.choice(code.split("@"))
+            picks = [rng.choice(code.split("@")) for _ in range(tippers)]
+            for t, pick in enumerate(picks):
+                week_points[t] += pick == winner
+            rows.append([code] + picks)
+        totals = [t + p for t, p in zip(totals, week_points)]
+        rows.append(["Ukespoeng"] + [str(p) for p in week_points])
+        rows.append(["Sesongpoeng"] + [str(t) for t in totals])
+
+    return FakeSpreadsheet(
+        "Vestsk Tipping",
+        [FakeWorksheet("Vestsk Tipping", rows)],
+        latency=latency,
+        calls=calls,
+    )
+
+
+def build_ppr_sheet(
+    names: list[str], latency: float = 0.0, calls: Counter | None = None
+) -> FakeSpreadsheet:
+    """Lager "Fest i Vest" med ett ark per manager og en PPR-historikk.
+
+    Args:
+        names (list[str]): Managernavn (arkene PPR leter etter)
+        latency (float): Forsinkelse per kall i sekunder
+        calls (Counter | None): Teller som deles med andre fakes
+
+    Returns:
+        FakeSpreadsheet: Dokumentet
+    """
+    rng = random.Random(len(names))
+    sheets = [
+        FakeWorksheet(
+            name,
+            [[str(year), f"{rng.uniform(0.4, 0.7):.3f}"] for year in range(2018, 2026)],
+        )
+        for name in names
+    ]
+    history = [
+        [name, f"{rng.uniform(0.4, 0.7):.3f}", str(rank)]
+        for rank, name in enumerate(names, 1)
+    ]
+    sheets.append(FakeWorksheet("PPR-historikk", history))
+    return FakeSpreadsheet("Fest i Vest", sheets, latency=latency, calls=calls)
@@ -0,0 +1,111 @@
+"""Helsestatus for botten.
+
+Samler informasjonen helse-endepunktet trenger: gateway-latens, siste
+heartbeat fra Discord, status for bakgrunnsoppgavene i cogs og tidspunkt for
+siste vellykkede kall mot ESPN og Google Sheets.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any
+
+# Maks alder (sekunder) på siste heartbeat-ACK før botten regnes som nede.
+# Discord sender heartbeat ca. hvert 41. sekund.
+HEARTBEAT_STALE_SECONDS = 120
+
+_tasks: dict[str, Any] = {}
+_last_success: dict[str, float] = {}
+
+
+def register_task(name: str, task: Any) -> None:
+    """Registrerer en bakgrunnsoppgave slik at statusen vises i /health.
+
+    Args:
+        name (str): Navn på oppgaven, f.eks. "vestsk.auto_post"
+        task (asyncio.Task): Oppgaven som ble opprettet med create_task
+    """
+    _tasks[name] = task
+
+
+def record_success(service: str) -> None:
+    """Noterer et vellykket kall mot en ekstern tjeneste ("espn", "sheets").
+
+    Args:
+        service (str): Navn på tjenesten
+    """
+    _last_success[service] = time.time()
+
+
+def last_success() -> dict[str, float]:
+    """Returnerer tjeneste → unix-tid for siste vellykkede kall."""
+    return dict(_last_success)
+
+
+def scheduler_status() -> dict[str, str]:
+    """Returnerer status for alle registrerte bakgrunnsoppgaver.
+
+    Returns:
+        dict[str, str]: Oppgavenavn → "running", "cancelled", "failed",
+            "finished" eller "unknown"
+    """
+    status = {}
+    for name, task in _tasks.items():
+        if not isinstance(task, asyncio.Task):
+            status[name] = "unknown"
+        elif not task.done():
+            status[name] = "running"
+        elif task.cancelled():
+            status[name] = "cancelled"
+        elif task.exception() is not None:
+            status[name] = "failed"
+        else:
+            status[name] = "finished"
+    return status
+
+
+def heartbeat_age(bot) -> float | None:
+    """Sekunder siden siste heartbeat-ACK fra Discord, eller None.
+
+    discord.py eksponerer ikke dette offentlig, så verdien leses defensivt
+    fra gateway-ens keep-alive-tråd.
+    """
+    keep_alive = getattr(getattr(bot, "ws", None), "_keep_alive", None)
+    last_ack = getattr(keep_alive, "_last_ack", None)
+    if not isinstance(last_ack, (int, float)):
+        return None
+    return max(0.0, time.perf_counter() - last_ack)
+
+
+def gateway_latency(bot) -> float | None:
+    """Gateway-latens i sekunder, eller None hvis den ikke er målt ennå."""
+    latency = getattr(bot, "latency", None)
+    if not isinstance(latency, (int, float)) or not math.isfinite(latency):
+        return None
+    return float(latency)
+
+
+def health_snapshot(bot) -> dict[str, Any]:
+    """Bygger et øyeblikksbilde av helsestatusen til botten.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+
+    Returns:
+        dict[str, Any]: JSON-vennlig oversikt der "ok" er False hvis botten
+            ikke er klar, eller siste heartbeat er for gammel.
+    """
+    ready = bool(bot.is_ready()) and not bot.is_closed()
+    age = heartbeat_age(bot)
+    ok = ready and (age is None or age < HEARTBEAT_STALE_SECONDS)
+    now = time.time()
+    return {
+        "ok": ok,
+        "ready": ready,
+        "gateway_latency_seconds": gateway_latency(bot),
+        "last_heartbeat_seconds_ago": age,
+        "schedulers": scheduler_status(),
+        "last_success_seconds_ago": {
+            service: round(now - ts, 1) for service, ts in _last_success.items()
+        },
+    }
@@ -1,23 +1,77 @@
-"""Enkel Flask-server for å holde botten i live (pingbar endpoint)."""
+"""Asynkron webserver for uptime-overvåking (helse- og metrikk-endepunkter).
 
-from threading import Thread
-from flask import Flask
+Serveren kjører på samme event-loop som botten, så den trenger verken egen
+tråd eller WSGI-server.
 
-app = Flask(__name__)
+Endepunkter:
+- `/`: enkel statusmelding (bakoverkompatibel med gamle ping-oppsett)
+- `/health`: JSON med gateway-latens, heartbeat, scheduler-status og siste
+  vellykkede ESPN/Sheets-kall. Gir 503 hvis botten ikke er frisk.
+- `/metrics`: metrikker i Prometheus sitt tekstformat
+"""
 
+import os
 
-@app.route("/")
-def home():
+from aiohttp import web
+
+from core.health import health_snapshot
+from core.metrics import render_prometheus
+
+BOT_KEY = web.AppKey("bot", object)
+
+
+async def home(request: web.Request) -> web.Response:  # pylint: disable=unused-argument
     """Returnerer en enkel statusmelding for helse/ping."""
-    return "Bot is running!"
+    return web.Response(text="Bot is running!")
+
+
+async def health(request: web.Request) -> web.Response:
+    """Returnerer helsestatus som JSON (200 hvis frisk, ellers 503)."""
+    snapshot = health_snapshot(request.app[BOT_KEY])
+    return web.json_response(snapshot, status=200 if snapshot["ok"] else 503)
+
+
+async def metrics(request: web.Request) -> web.Response:
+    """Returnerer metrikker i Prometheus sitt tekstformat."""
+    body = render_prometheus(request.app[BOT_KEY])
+    return web.Response(text=body, content_type="text/plain", charset="utf-8")
+
+
+def create_app(bot) -> web.Application:
+    """Lager aiohttp-appen med alle endepunktene.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen som rapporteres på
+
+    Returns:
+        web.Application: Ferdig konfigurert app
+    """
+    app = web.Application()
+    app[BOT_KEY] = bot
+    app.router.add_get("/", home)
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", metrics)
+    return app
 
 
-def run():
-    """Starter Flask-serveren på 0.0.0.0:8080."""
-    app.run(host="0.0.0.0", port=8080)
+async def keep_alive(
+    bot, host: str = "0.0.0.0", port: int | None = None
+) -> web.AppRunner:
+    """Starter webserveren på botten sin event-loop.
 
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+        host (str): Adressen serveren lytter på
+        port (int | None): Port, standard er miljøvariabelen PORT eller 8080
 
-def keep_alive():
-    """Starter serveren i egen tråd slik at botten kan holdes aktiv."""
-    thread = Thread(target=run)
-    thread.start()
+    Returns:
+        web.AppRunner: Runneren, som må ryddes opp med `await runner.cleanup()`
+    """
+    if port is None:
+        port = int(os.getenv("PORT", "8080"))
+    runner = web.AppRunner(create_app(bot), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    print(f"[HTTP] Helseserver lytter på {host}:{port}")
+    return runner
@@ -0,0 +1,224 @@
+"""Overvåking av forsinkelse (lag) i event-loopen.
+
+Synkrone kall som `get_league()`, `league.box_scores()` eller gspread-kall
+direkte på loopen stopper hele botten mens de kjører. Monitoren består av to
+deler:
+
+- en heartbeat-oppgave på loopen som måler hvor mye senere enn planlagt den
+  blir vekket (scheduling-forsinkelse)
+- en vakttråd som oppdager at heartbeaten har stoppet opp og tar et
+  øyeblikksbilde av stacken til loop-tråden og hvilken oppgave som kjører
+
+Når loopen er i gang igjen, sendes en rapport med stacken til admin-kanalen.
+Rapportene strupes slik at en tilbakevendende blokkering ikke spammer kanalen.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+
+from core.outbox import send_message
+from data.channel_ids import ADMIN_CHANNEL_ID
+
+# Terskel (sekunder) før en forsinkelse regnes som blokkering
+LAG_THRESHOLD_SECONDS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "250")) / 1000
+# Hvor ofte heartbeaten kjører (sekunder)
+HEARTBEAT_INTERVAL = 0.1
+# Minste tid (sekunder) mellom to rapporter til admin-kanalen
+REPORT_COOLDOWN_SECONDS = 300
+# Maks antall stack-rammer som tas med i rapporten
+MAX_STACK_FRAMES = 12
+
+
+@dataclass
+class Stall:
+    """Én observert blokkering av event-loopen.
+
+    Attributes:
+        lag (float): Hvor lenge loopen var blokkert (sekunder)
+        task (str | None): Navn og korutine for oppgaven som kjørte
+        stack (list[str]): Formaterte stack-rammer fra loop-tråden
+    """
+
+    lag: float
+    task: str | None
+    stack: list[str]
+
+
+def _describe_task(task: asyncio.Task | None) -> str | None:
+    """Lager en kort beskrivelse av en asyncio-oppgave."""
+    if task is None:
+        return None
+    coro = task.get_coro()
+    name = getattr(coro, "__qualname__", None) or repr(coro)
+    return f"{task.get_name()} ({name})"
+
+
+class LoopMonitor:
+    """Måler event-loop-lag og rapporterer blokkerende kall.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen (for admin-kanalen)
+        threshold (float): Lag-terskel i sekunder
+        interval (float): Intervall for heartbeaten i sekunder
+        cooldown (float): Minste tid mellom rapporter i sekunder
+
+    Attributes:
+        last_lag (float): Siste målte forsinkelse
+        max_lag (float): Høyeste målte forsinkelse
+        stalls (int): Antall ganger terskelen er overskredet
+    """
+
+    def __init__(
+        self,
+        bot,
+        threshold: float = LAG_THRESHOLD_SECONDS,
+        interval: float = HEARTBEAT_INTERVAL,
+        cooldown: float = REPORT_COOLDOWN_SECONDS,
+    ) -> None:
+        self.bot = bot
+        self.threshold = threshold
+        self.interval = interval
+        self.cooldown = cooldown
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_tick = time.perf_counter()
+        self._captured: Stall | None = None
+        self._last_report = float("-inf")
+        self._suppressed = 0
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Starter heartbeat-oppgaven og vakttråden. Må kalles fra loopen."""
+        global _active  # pylint: disable=global-statement
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat(), name="loop_monitor")
+        self._thread = threading.Thread(
+            target=self._watchdog, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+        _active = self
+
+    def stop(self) -> None:
+        """Stopper heartbeaten og vakttråden."""
+        global _active  # pylint: disable=global-statement
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if _active is self:
+            _active = None
+
+    async def _heartbeat(self) -> None:
+        """Sover i faste intervaller og måler hvor sent loopen vekker oss."""
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._last_tick = now
+            lag = max(0.0, now - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._on_stall(lag)
+
+    def _watchdog(self) -> None:
+        """Kjører i egen tråd og tar stacken til loopen mens den er blokkert."""
+        poll = min(self.interval, self.threshold / 2)
+        while not self._stop.wait(poll):
+            stalled_for = time.perf_counter() - self._last_tick - self.interval
+            if stalled_for < self.threshold or self._captured is not None:
+                continue
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self._loop_thread_id
+            )
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)[-MAX_STACK_FRAMES:]
+            task = None
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                pass
+            self._captured = Stall(
+                lag=stalled_for, task=_describe_task(task), stack=stack
+            )
+
+    def _on_stall(self, lag: float) -> None:
+        """Registrerer en blokkering og planlegger rapport (med struping)."""
+        self.stalls += 1
+        stall = self._captured or Stall(lag=lag, task=None, stack=[])
+        stall.lag = lag
+        self._captured = None
+        print(
+            f"[LOOP] Event-loopen var blokkert i {lag * 1000:.0f} ms"
+            + (f" ({stall.task})" if stall.task else "")
+        )
+
+        now = time.monotonic()
+        if now - self._last_report < self.cooldown:
+            self._suppressed += 1
+            return
+        self._last_report = now
+        suppressed, self._suppressed = self._suppressed, 0
+        asyncio.get_running_loop().create_task(self._report(stall, suppressed))
+
+    def format_report(self, stall: Stall, suppressed: int = 0) -> str:
+        """Formaterer en blokkering som Discord-melding (maks 2000 tegn).
+
+        Args:
+            stall (Stall): Blokkeringen som skal rapporteres
+            suppressed (int): Antall strupede rapporter siden forrige melding
+
+        Returns:
+            str: Ferdig melding
+        """
+        header = f"🐢 Event-loopen var blokkert i {stall.lag * 1000:.0f} ms"
+        if suppressed:
+            header += f" (+{suppressed} blokkeringer siden forrige rapport)"
+        lines = [header]
+        if stall.task:
+            lines.append(f"Oppgave: `{stall.task}`")
+        if stall.stack:
+            stack = "".join(stall.stack)
+            budget = 2000 - len("\n".join(lines)) - 10
+            if len(stack) > budget:
+                stack = "…" + stack[-budget:]
+            lines.append(f"```{stack}```")
+        else:
+            lines.append("Ingen stack fanget (blokkeringen var for kort).")
+        return "\n".join(lines)
+
+    async def _report(self, stall: Stall, suppressed: int) -> None:
+        """Sender rapporten til admin-kanalen."""
+        channel = self.bot.get_channel(ADMIN_CHANNEL_ID)
+        if channel is None:
+            return
+        try:
+            await send_message(
+                channel,
+                self.format_report(stall, suppressed),
+                admin=True,
+                coalesce=True,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"[LOOP] Klarte ikke å sende lag-rapport: {e}")
+
+
+_active: LoopMonitor | None = None
+
+
+def active_monitor() -> LoopMonitor | None:
+    """Returnerer monitoren som kjører, eller None."""
+    return _active
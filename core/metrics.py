@@ -0,0 +1,386 @@
+"""Metrikker for botten i Prometheus sitt tekstformat.
+
+Modulen har også et lett instrumenteringslag for eksterne kall (ESPN,
+Google Sheets og Discord). Hvert kall registreres i et histogram per
+operasjonsnavn med faste bøtter, så minnebruken er begrenset uansett hvor
+lenge botten kjører.
+"""
+
+import asyncio
+import bisect
+import re
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from core import health, outbox, perf
+from core.loop_monitor import active_monitor
+
+PROCESS_STARTED = time.time()
+
+# Øvre grenser (sekunder) for latens-bøttene
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Latens-histogram med faste bøtter, feil- og timeout-tellere.
+
+    Attributes:
+        buckets (list[int]): Antall observasjoner per bøtte (siste er +Inf)
+        count (int): Totalt antall kall
+        total (float): Sum av alle latenser i sekunder
+        max (float): Høyeste observerte latens
+        errors (int): Antall kall som feilet
+        timeouts (int): Antall kall som fikk timeout
+    """
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.timeouts = 0
+
+    def observe(
+        self, seconds: float, error: bool = False, timeout: bool = False
+    ) -> None:
+        """Registrerer ett kall."""
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if timeout:
+            self.timeouts += 1
+        elif error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimerer en kvantil fra bøttene (øvre grense for bøtta).
+
+        Args:
+            q (float): Kvantil mellom 0 og 1, f.eks. 0.95
+
+        Returns:
+            float: Estimert latens i sekunder, eller 0.0 uten observasjoner
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for idx, n in enumerate(self.buckets):
+            running += n
+            if running >= target:
+                return LATENCY_BUCKETS[idx] if idx < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+
+_histograms: dict[str, Histogram] = {}
+
+
+def observe(
+    op: str, seconds: float, error: bool = False, timeout: bool = False
+) -> None:
+    """Registrerer et eksternt kall i histogrammet for operasjonen.
+
+    Vellykkede kall mot ESPN og Sheets oppdaterer også helsestatusen, og
+    kall under en kommando blir med i kommandoens fordeling per steg.
+
+    Args:
+        op (str): Operasjonsnavn, f.eks. "sheets.get_all_values"
+        seconds (float): Hvor lang tid kallet tok
+        error (bool): True hvis kallet feilet
+        timeout (bool): True hvis kallet fikk timeout
+    """
+    hist = _histograms.get(op)
+    if hist is None:
+        hist = _histograms[op] = Histogram()
+    hist.observe(seconds, error=error, timeout=timeout)
+    timing = perf.current()
+    if timing is not None:
+        timing.add(op, seconds)
+    if not error and not timeout:
+        service = op.split(".", 1)[0]
+        if service in ("espn", "sheets"):
+            health.record_success(service)
+
+
+def histograms() -> dict[str, Histogram]:
+    """Returnerer alle histogrammer (operasjonsnavn → Histogram)."""
+    return dict(_histograms)
+
+
+class timed:  # pylint: disable=invalid-name
+    """Måler et kall og registrerer det under `op`.
+
+    Kan brukes både som `with` og `async with`. Unntak slippes videre, men
+    registreres som feil eller timeout.
+
+    Example:
+        >>> async with timed("espn.scoreboard"):
+        ...     data = await resp.json()
+    """
+
+    def __init__(self, op: str) -> None:
+        self.op = op
+        self.start = 0.0
+
+    def __enter__(self) -> "timed":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self.start
+        is_timeout = exc_type is not None and issubclass(
+            exc_type, (asyncio.TimeoutError, TimeoutError)
+        )
+        observe(
+            self.op,
+            elapsed,
+            error=exc_type is not None and not is_timeout,
+            timeout=is_timeout,
+        )
+        return False
+
+    async def __aenter__(self) -> "timed":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+# Discord-ruter → operasjonsnavn. Rekkefølgen betyr noe (mest spesifikk først).
+_DISCORD_ROUTES: list[tuple[str, re.Pattern, str]] = [
+    (
+        "PUT",
+        re.compile(r"/channels/\d+/messages/\d+/reactions/[^/]+/@me$"),
+        "discord.add_reaction",
+    ),
+    (
+        "GET",
+        re.compile(r"/channels/\d+/messages/\d+/reactions/[^/]+$"),
+        "discord.reaction_users",
+    ),
+    ("POST", re.compile(r"/channels/\d+/messages$"), "discord.send"),
+    ("GET", re.compile(r"/channels/\d+/messages$"), "discord.history"),
+]
+
+
+def discord_operation(method: str, path: str) -> str:
+    """Oversetter en Discord HTTP-forespørsel til et operasjonsnavn.
+
+    Args:
+        method (str): HTTP-metode, f.eks. "POST"
+        path (str): URL-sti, f.eks. "/api/v10/channels/123/messages"
+
+    Returns:
+        str: Operasjonsnavn, f.eks. "discord.send"
+    """
+    for route_method, pattern, op in _DISCORD_ROUTES:
+        if method == route_method and pattern.search(path):
+            return op
+    return f"discord.{method.lower()}"
+
+
+def discord_trace_config() -> aiohttp.TraceConfig:
+    """Lager en aiohttp TraceConfig som måler alle Discord HTTP-kall.
+
+    Sendes inn som `http_trace` til `commands.Bot`, slik at send, historikk
+    og reaksjoner måles uten å endre kallene i cogs. Rate limit-headerne
+    videresendes til meldingskøen i `core.outbox`.
+    """
+    trace = aiohttp.TraceConfig()
+
+    async def on_start(_session, ctx: SimpleNamespace, _params) -> None:
+        ctx.start = time.perf_counter()
+
+    async def on_end(_session, ctx: SimpleNamespace, params) -> None:
+        op = discord_operation(params.method, params.url.path)
+        observe(
+            op, time.perf_counter() - ctx.start, error=params.response.status >= 400
+        )
+        outbox.record_rate_limit(
+            params.method, params.url.path, params.response.headers
+        )
+
+    async def on_exception(_session, ctx: SimpleNamespace, params) -> None:
+        op = discord_operation(params.method, params.url.path)
+        is_timeout = isinstance(params.exception, (asyncio.TimeoutError, TimeoutError))
+        observe(
+            op,
+            time.perf_counter() - getattr(ctx, "start", time.perf_counter()),
+            error=not is_timeout,
+            timeout=is_timeout,
+        )
+
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_exception)
+    return trace
+
+
+def _format_value(value: float) -> str:
+    """Formaterer et tall slik Prometheus forventer."""
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.6g}"
+
+
+def _escape_label(value: str) -> str:
+    """Escaper en label-verdi i Prometheus-format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _gauge(lines: list[str], name: str, help_text: str, samples) -> None:
+    """Legger til en gauge med tilhørende HELP/TYPE-linjer.
+
+    Args:
+        lines (list[str]): Listen det skrives til
+        name (str): Metrikknavn
+        help_text (str): Beskrivelse av metrikken
+        samples: Liste med (labels, verdi), der labels er en dict
+    """
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for labels, value in samples:
+        if labels:
+            label_str = ",".join(
+                f'{key}="{_escape_label(str(val))}"' for key, val in labels.items()
+            )
+            lines.append(f"{name}{{{label_str}}} {_format_value(value)}")
+        else:
+            lines.append(f"{name} {_format_value(value)}")
+
+
+def render_prometheus(bot) -> str:
+    """Bygger /metrics-responsen i Prometheus sitt tekstformat.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+
+    Returns:
+        str: Metrikkene som tekst, avsluttet med linjeskift
+    """
+    lines: list[str] = []
+    now = time.time()
+
+    _gauge(
+        lines,
+        "tippebot_up",
+        "1 hvis botten er klar og har fersk heartbeat",
+        [({}, 1 if health.health_snapshot(bot)["ok"] else 0)],
+    )
+    _gauge(
+        lines,
+        "tippebot_uptime_seconds",
+        "Sekunder siden prosessen startet",
+        [({}, now - PROCESS_STARTED)],
+    )
+
+    latency = health.gateway_latency(bot)
+    if latency is not None:
+        _gauge(
+            lines,
+            "tippebot_gateway_latency_seconds",
+            "Latens mellom heartbeat og ACK mot Discord",
+            [({}, latency)],
+        )
+
+    age = health.heartbeat_age(bot)
+    if age is not None:
+        _gauge(
+            lines,
+            "tippebot_heartbeat_age_seconds",
+            "Sekunder siden siste heartbeat-ACK",
+            [({}, age)],
+        )
+
+    _gauge(
+        lines,
+        "tippebot_scheduler_running",
+        "1 hvis bakgrunnsoppgaven kjører",
+        [
+            ({"task": name}, 1 if status == "running" else 0)
+            for name, status in sorted(health.scheduler_status().items())
+        ],
+    )
+    _gauge(
+        lines,
+        "tippebot_last_success_timestamp_seconds",
+        "Unix-tid for siste vellykkede kall mot ekstern tjeneste",
+        [
+            ({"service": service}, ts)
+            for service, ts in sorted(health.last_success().items())
+        ],
+    )
+
+    monitor = active_monitor()
+    if monitor is not None:
+        _gauge(
+            lines,
+            "tippebot_event_loop_lag_seconds",
+            "Siste målte forsinkelse i event-loopen",
+            [({}, monitor.last_lag)],
+        )
+        _gauge(
+            lines,
+            "tippebot_event_loop_lag_max_seconds",
+            "Høyeste målte forsinkelse i event-loopen",
+            [({}, monitor.max_lag)],
+        )
+        lines.append(
+            "# HELP tippebot_event_loop_stalls_total Antall blokkeringer over terskel"
+        )
+        lines.append("# TYPE tippebot_event_loop_stalls_total counter")
+        lines.append(f"tippebot_event_loop_stalls_total {monitor.stalls}")
+
+    _render_histograms(lines)
+
+    return "\n".join(lines) + "\n"
+
+
+def _render_histograms(lines: list[str]) -> None:
+    """Legger til latens-histogrammer og feiltellere for eksterne kall."""
+    if not _histograms:
+        return
+    name = "tippebot_external_call_duration_seconds"
+    lines.append(f"# HELP {name} Latens for eksterne kall (ESPN, Sheets, Discord)")
+    lines.append(f"# TYPE {name} histogram")
+    for op, hist in sorted(_histograms.items()):
+        label = f'op="{_escape_label(op)}"'
+        running = 0
+        for bound, n in zip(LATENCY_BUCKETS, hist.buckets):
+            running += n
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {running}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{label}}} {_format_value(hist.total)}")
+        lines.append(f"{name}_count{{{label}}} {hist.count}")
+
+    for metric, attr, help_text in (
+        (
+            "tippebot_external_call_errors_total",
+            "errors",
+            "Antall eksterne kall som feilet",
+        ),
+        (
+            "tippebot_external_call_timeouts_total",
+            "timeouts",
+            "Antall eksterne kall med timeout",
+        ),
+    ):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for op, hist in sorted(_histograms.items()):
+            lines.append(f'{metric}{{op="{_escape_label(op)}"}} {getattr(hist, attr)}')
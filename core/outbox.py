@@ -0,0 +1,353 @@
+"""Utgående kø for Discord-meldinger.
+
+Alle meldinger til samme kanal sendes fra én kø per kanal, slik at botten
+holder seg innenfor Discord sine rate limits i stedet for å få 429 og prøve
+på nytt:
+
+- Rate limit-headerne fra forrige sending (X-RateLimit-Remaining og
+  X-RateLimit-Reset-After) fanges opp via http_trace i `core.metrics`, og køen
+  venter selv til bøtta er fylt opp igjen før den sender
+- Tekst ingen skal reagere på (kunngjøringer i preik, admin-varsler) kan slås
+  sammen til så få meldinger på maks 2000 tegn som mulig
+- Meldinger til brukere sendes før admin-logger i samme kanal
+
+Kampmeldinger i tippekanalen skal få egne reaksjoner, så de sendes alltid som
+egne meldinger (`coalesce=False`).
+
+Hvis køen ikke er startet (f.eks. i tester), eller målet ikke har en
+kanal-ID, sendes meldingene direkte.
+"""
+
+import asyncio
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Maks lengde på en Discord-melding
+MAX_MESSAGE_LENGTH = 2000
+# Hvor lenge (sekunder) køen venter på flere meldinger som kan slås sammen
+COALESCE_DELAY = 0.5
+
+USER = 0
+ADMIN = 1
+
+_MESSAGES_ROUTE = re.compile(r"/channels/(\d+)/messages$")
+
+# Kanal-ID → (gjenstående kall i bøtta, monotonic-tid bøtta fylles opp)
+_limits: dict[int, tuple[int, float]] = {}
+
+
+def record_rate_limit(method: str, path: str, headers) -> None:
+    """Lagrer rate limit-headerne fra en sending til en kanal.
+
+    Kalles fra Discord sin http_trace for hver respons.
+
+    Args:
+        method (str): HTTP-metode
+        path (str): URL-sti, f.eks. "/api/v10/channels/123/messages"
+        headers: Respons-headerne
+    """
+    if method != "POST":
+        return
+    match = _MESSAGES_ROUTE.search(path)
+    if match is None:
+        return
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset_after = headers.get("X-RateLimit-Reset-After")
+    if remaining is None or reset_after is None:
+        return
+    try:
+        _limits[int(match.group(1))] = (
+            int(remaining),
+            time.monotonic() + float(reset_after),
+        )
+    except ValueError:
+        return
+
+
+def rate_limit_delay(channel_id: int) -> float:
+    """Sekunder køen må vente før neste sending til kanalen (0 hvis ingen)."""
+    limit = _limits.get(channel_id)
+    if limit is None:
+        return 0.0
+    remaining, reset_at = limit
+    if remaining > 0:
+        return 0.0
+    return max(0.0, reset_at - time.monotonic())
+
+
+def split_message(content: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Deler en tekst i biter på maks `limit` tegn, helst på linjeskift."""
+    chunks: list[str] = []
+    current = ""
+    for line in content.split("\n"):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current or not chunks:
+        chunks.append(current)
+    return chunks
+
+
+def pack_messages(contents: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Slår sammen tekster til så få meldinger på maks `limit` tegn som mulig.
+
+    Rekkefølgen beholdes, og en tekst deles bare hvis den alene er for lang.
+
+    Args:
+        contents (list[str]): Tekstene som skal sendes
+        limit (int): Maks lengde per melding
+
+    Returns:
+        list[str]: Meldingene som skal sendes
+    """
+    packed: list[str] = []
+    current = ""
+    for content in contents:
+        if len(content) > limit:
+            if current:
+                packed.append(current)
+                current = ""
+            packed.extend(split_message(content, limit))
+            continue
+        candidate = f"{current}\n{content}" if current else content
+        if len(candidate) > limit:
+            packed.append(current)
+            current = content
+        else:
+            current = candidate
+    if current:
+        packed.append(current)
+    return packed
+
+
+def _channel_id(target) -> int | None:
+    """Kanal-ID for en kanal eller en Context (som har `.channel`)."""
+    channel_id = getattr(target, "id", None)
+    if not isinstance(channel_id, int):
+        channel_id = getattr(getattr(target, "channel", None), "id", None)
+    return channel_id if isinstance(channel_id, int) else None
+
+
+@dataclass(order=True)
+class _Item:
+    """Én melding i køen, sortert etter prioritet og deretter rekkefølge."""
+
+    priority: int
+    seq: int
+    target: Any = field(compare=False)
+    content: str = field(compare=False)
+    coalesce: bool = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False, default_factory=dict)
+
+
+class Outbox:
+    """Kø per kanal med rate limit-håndtering og sammenslåing.
+
+    Args:
+        coalesce_delay (float): Sekunder å vente på flere sammenslåbare
+            meldinger før sending
+    """
+
+    def __init__(self, coalesce_delay: float = COALESCE_DELAY) -> None:
+        self.coalesce_delay = coalesce_delay
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._queues: dict[int, asyncio.PriorityQueue] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._seq = itertools.count()
+
+    def start(self) -> None:
+        """Knytter køen til event-loopen som kjører."""
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        """Stopper alle kanal-arbeiderne."""
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    def submit(
+        self,
+        target,
+        content: str,
+        *,
+        admin: bool = False,
+        coalesce: bool = False,
+        **kwargs: Any,
+    ) -> asyncio.Future:
+        """Legger en melding i køen til kanalen.
+
+        Args:
+            target: Kanal eller Context med `.send`
+            content (str): Meldingsteksten
+            admin (bool): True for admin-logger (lavere prioritet)
+            coalesce (bool): True hvis meldingen kan slås sammen med andre
+            **kwargs: Sendes videre til `send` (kun uten sammenslåing)
+
+        Returns:
+            asyncio.Future: Løses med meldingen som ble sendt
+        """
+        loop = asyncio.get_running_loop()
+        channel_id = _channel_id(target)
+        if channel_id is None:
+            # Uten kanal-ID finnes verken kø eller rate limit å følge
+            return loop.create_task(target.send(content, **kwargs))
+
+        future = loop.create_future()
+        item = _Item(
+            ADMIN if admin else USER,
+            next(self._seq),
+            target,
+            content,
+            coalesce and not kwargs,
+            future,
+            kwargs,
+        )
+
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = asyncio.PriorityQueue()
+        queue.put_nowait(item)
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = loop.create_task(
+                self._worker(channel_id, queue),
+                name=f"outbox-{channel_id}",
+            )
+        return future
+
+    async def _worker(self, channel_id, queue: asyncio.PriorityQueue) -> None:
+        """Sender meldinger fra køen til én kanal, én om gangen.
+
+        Køen er sortert på prioritet, så admin-logger tas først når ingen
+        brukermeldinger til kanalen står og venter. Trafikk i andre kanaler
+        holder dem ikke igjen.
+        """
+        while True:
+            item = await queue.get()
+            batch = [item]
+            if item.coalesce:
+                await asyncio.sleep(self.coalesce_delay)
+                batch.extend(self._take_coalescable(queue, item.priority))
+            await self._send_batch(channel_id, batch)
+
+    @staticmethod
+    def _take_coalescable(queue: asyncio.PriorityQueue, priority: int) -> list:
+        """Henter påfølgende sammenslåbare meldinger med samme prioritet."""
+        taken = []
+        while not queue.empty():
+            nxt = queue.get_nowait()
+            if not nxt.coalesce or nxt.priority != priority:
+                queue.put_nowait(nxt)
+                break
+            taken.append(nxt)
+        return taken
+
+    async def _send_batch(self, channel_id, batch: list) -> None:
+        """Sender en gruppe meldinger og løser futures med resultatet.
+
+        Hver melding sendes via sitt eget mål; en sammenslått gruppe går til
+        samme kanal og sendes via den første meldingens mål.
+        """
+        if len(batch) == 1 and not batch[0].coalesce:
+            contents = [batch[0].content]
+        else:
+            contents = pack_messages([item.content for item in batch])
+
+        message = None
+        try:
+            for content in contents:
+                delay = rate_limit_delay(channel_id) if channel_id else 0.0
+                if delay:
+                    await asyncio.sleep(delay)
+                message = await batch[0].target.send(content, **batch[0].kwargs)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(message)
+
+
+_active: Outbox | None = None
+
+
+def start_outbox(coalesce_delay: float = COALESCE_DELAY) -> Outbox:
+    """Starter den globale køen på event-loopen som kjører."""
+    global _active  # pylint: disable=global-statement
+    outbox = Outbox(coalesce_delay)
+    outbox.start()
+    _active = outbox
+    return outbox
+
+
+async def stop_outbox() -> None:
+    """Stopper den globale køen. Nye meldinger sendes deretter direkte."""
+    global _active  # pylint: disable=global-statement
+    outbox, _active = _active, None
+    if outbox is not None:
+        await outbox.stop()
+
+
+def _log_failure(future: asyncio.Future) -> None:
+    """Logger feil for meldinger ingen venter på."""
+    if not future.cancelled() and future.exception() is not None:
+        print(f"[OUTBOX] Klarte ikke å sende melding: {future.exception()}")
+
+
+async def send_message(
+    target,
+    content: str,
+    *,
+    admin: bool = False,
+    coalesce: bool = False,
+    wait: bool = True,
+    **kwargs: Any,
+):
+    """Sender en melding via køen, eller direkte hvis køen ikke kjører.
+
+    Args:
+        target: Kanal eller Context med `.send`
+        content (str): Meldingsteksten
+        admin (bool): True for admin-logger (sendes etter brukermeldinger)
+        coalesce (bool): True hvis meldingen kan slås sammen med andre.
+            Skal ikke brukes for meldinger som skal få reaksjoner.
+        wait (bool): Vent til meldingen er sendt. Med False logges feil
+            i stedet for å kastes.
+        **kwargs: Sendes videre til `send`
+
+    Returns:
+        discord.Message | None: Meldingen (eller siste del av den), None når
+            `wait` er False
+    """
+    outbox = _active
+    if outbox is None or outbox.loop is not asyncio.get_running_loop():
+        if not wait:
+            try:
+                await target.send(content, **kwargs)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                print(f"[OUTBOX] Klarte ikke å sende melding: {e}")
+            return None
+        return await target.send(content, **kwargs)
+
+    future = outbox.submit(target, content, admin=admin, coalesce=coalesce, **kwargs)
+    if not wait:
+        future.add_done_callback(_log_failure)
+        return None
+    return await future
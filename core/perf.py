@@ -0,0 +1,239 @@
+"""Tidsmåling av kommandoer med del-steg og rapportering av trege kommandoer.
+
+Hver kommando måles fra `before_invoke` til `after_invoke`. Underveis kan
+koden registrere del-steg:
+
+- `stage("navn")` måler en blokk. Eksterne kall som måles i `core.metrics`
+  (ESPN, Sheets og Discord) registreres automatisk som steg.
+- `checkpoint("navn")` måler tiden siden forrige checkpoint, nyttig for å
+  dele en lang kommando i faser uten å rykke inn koden
+
+Resultatene lagres i et rullerende vindu per kommando. Kommandoer som bruker
+mer enn budsjettet (miljøvariabelen PERF_BUDGET_MS) rapporteres til
+admin-kanalen med fordeling per steg.
+"""
+
+import contextlib
+import contextvars
+import os
+import time
+from collections import deque
+
+from core import profiler
+from core.outbox import send_message
+from data.channel_ids import ADMIN_CHANNEL_ID
+
+# Budsjett (sekunder) før en kommando rapporteres som treg
+BUDGET_SECONDS = float(os.getenv("PERF_BUDGET_MS", "5000")) / 1000
+# Antall målinger som beholdes per kommando
+WINDOW_SIZE = 200
+
+
+class CommandTiming:
+    """Måling av én kjøring av en kommando.
+
+    Attributes:
+        command (str): Kommandonavnet, f.eks. "resultater"
+        start (float): perf_counter ved start
+        stages (dict[str, list]): Stegnavn → [sum sekunder, antall]
+    """
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.start = time.perf_counter()
+        self.stages: dict[str, list] = {}
+        self._last_checkpoint = self.start
+
+    def add(self, name: str, seconds: float) -> None:
+        """Legger til tid på et steg."""
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def checkpoint(self, name: str) -> None:
+        """Registrerer tiden siden forrige checkpoint som steget `name`."""
+        now = time.perf_counter()
+        self.add(name, now - self._last_checkpoint)
+        self._last_checkpoint = now
+
+    def elapsed(self) -> float:
+        """Sekunder siden kommandoen startet."""
+        return time.perf_counter() - self.start
+
+
+_current: contextvars.ContextVar[CommandTiming | None] = contextvars.ContextVar(
+    "perf_current", default=None
+)
+_windows: dict[str, deque] = {}
+
+
+def current() -> CommandTiming | None:
+    """Returnerer målingen for kommandoen som kjører, eller None."""
+    return _current.get()
+
+
+class stage:  # pylint: disable=invalid-name
+    """Måler en blokk som et del-steg av kommandoen som kjører.
+
+    Gjør ingenting utenfor en kommando. Kan brukes med `with` og `async with`.
+
+    Example:
+        >>> with stage("beregn poeng"):
+        ...     poeng = beregn(rader)
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        timing = _current.get()
+        if timing is not None:
+            timing.add(self.name, time.perf_counter() - self.start)
+        return False
+
+    async def __aenter__(self) -> "stage":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        return self.__exit__(exc_type, exc, tb)
+
+
+def checkpoint(name: str) -> None:
+    """Avslutter en fase i kommandoen som kjører (gjør ingenting utenfor)."""
+    timing = _current.get()
+    if timing is not None:
+        timing.checkpoint(name)
+
+
+@contextlib.contextmanager
+def measure(command: str):
+    """Måler en blokk som om den var en kommando, uten Discord-hooks.
+
+    Brukes når kommandologikken kjøres direkte, f.eks. i benchmarkene. Steg
+    og checkpoints havner i målingen, men den legges ikke inn i vinduet.
+
+    Yields:
+        CommandTiming: Målingen, ferdig utfylt når blokken er ferdig
+    """
+    timing = CommandTiming(command)
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+def record(command: str, seconds: float) -> None:
+    """Legger en måling inn i det rullerende vinduet for kommandoen."""
+    window = _windows.get(command)
+    if window is None:
+        window = _windows[command] = deque(maxlen=WINDOW_SIZE)
+    window.append(seconds)
+
+
+def quantile(values, q: float) -> float:
+    """Kvantil med nearest-rank-metoden (0.0 for tom liste)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, int(q * len(ordered) + 0.999999) - 1))
+    return ordered[idx]
+
+
+def summary() -> dict[str, dict[str, float]]:
+    """Returnerer n, p50, p95 og maks (sekunder) per kommando."""
+    return {
+        command: {
+            "n": len(window),
+            "p50": quantile(window, 0.5),
+            "p95": quantile(window, 0.95),
+            "max": max(window),
+        }
+        for command, window in _windows.items()
+        if window
+    }
+
+
+def format_slow_report(
+    timing: CommandTiming, total: float, failed: bool, budget: float
+) -> str:
+    """Formaterer en rapport om en treg kommando med fordeling per steg.
+
+    Args:
+        timing (CommandTiming): Målingen for kommandoen
+        total (float): Total tid i sekunder
+        failed (bool): True hvis kommandoen feilet
+        budget (float): Budsjettet som ble overskredet, i sekunder
+
+    Returns:
+        str: Ferdig melding for admin-kanalen
+    """
+    status = " (feilet)" if failed else ""
+    lines = [
+        f"🐌 `!{timing.command}` brukte {total:.2f} s "
+        f"(budsjett {budget:.2f} s){status}"
+    ]
+    if timing.stages:
+        lines.append("```")
+        stages = sorted(timing.stages.items(), key=lambda s: s[1][0], reverse=True)
+        for name, (seconds, count) in stages[:15]:
+            calls = f"  ({count} kall)" if count > 1 else ""
+            lines.append(f"{name[:28]:<28} {seconds:>6.2f} s{calls}")
+        lines.append("```")
+    return "\n".join(lines)
+
+
+def setup_command_timing(bot, budget: float | None = None) -> None:
+    """Registrerer globale before/after-invoke-hooks som måler alle kommandoer.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+        budget (float | None): Budsjett i sekunder, standard er BUDGET_SECONDS
+    """
+    limit = BUDGET_SECONDS if budget is None else budget
+
+    @bot.before_invoke
+    async def start_timing(ctx) -> None:
+        timing = CommandTiming(ctx.command.qualified_name)
+        ctx.perf_timing = timing
+        ctx.perf_token = _current.set(timing)
+        profiler.command_started(timing.command)
+
+    @bot.after_invoke
+    async def finish_timing(ctx) -> None:
+        timing = getattr(ctx, "perf_timing", None)
+        if timing is None:
+            return
+        try:
+            _current.reset(ctx.perf_token)
+        except ValueError:
+            # Token fra en annen kontekst (skal ikke skje, men ikke kræsj)
+            _current.set(None)
+        total = timing.elapsed()
+        record(timing.command, total)
+        try:
+            await profiler.command_finished(bot, timing.command)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"[PROFIL] Klarte ikke å sende profil: {e}")
+        if total <= limit:
+            return
+
+        failed = bool(getattr(ctx, "command_failed", False))
+        print(f"[PERF] !{timing.command} brukte {total:.2f} s")
+        channel = bot.get_channel(ADMIN_CHANNEL_ID)
+        if channel is None:
+            return
+        try:
+            await send_message(
+                channel,
+                format_slow_report(timing, total, failed, limit),
+                admin=True,
+                coalesce=True,
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"[PERF] Klarte ikke å sende rapport: {e}")
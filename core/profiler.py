@@ -0,0 +1,222 @@
+"""Profilering av botten mens den kjører.
+
+En profil kan tas i N sekunder, eller for neste kjøring av en bestemt
+kommando (f.eks. `!resultater`). To profiler kjører samtidig:
+
+- cProfile (deterministisk) på event-loop-tråden, som gir pstats-output med
+  antall kall og kumulativ tid per funksjon
+- en samplingstråd som leser stacken til loop-tråden med faste intervaller og
+  merker hver sample med navnet på asyncio-oppgaven som kjørte. Resultatet er
+  "collapsed stacks" som kan åpnes i f.eks. speedscope eller flamegraph.pl
+
+Resultatet sendes som vedlegg til admin-kanalen.
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+import discord
+
+from data.channel_ids import ADMIN_CHANNEL_ID
+
+# Intervall (sekunder) mellom hver sample
+SAMPLE_INTERVAL = 0.005
+# Lengste tillatte profilering i sekunder
+MAX_SECONDS = 120
+
+
+def _frame_label(frame) -> str:
+    """Lager en kort etikett for en stack-ramme: funksjon (fil:linje)."""
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+class ProfileResult:
+    """Resultatet av en profilering.
+
+    Attributes:
+        seconds (float): Hvor lenge profileringen varte
+        stats (pstats.Stats): Statistikk fra cProfile
+        collapsed (Counter): Collapsed stack → antall samples
+    """
+
+    def __init__(self, seconds: float, stats: pstats.Stats, collapsed: Counter):
+        self.seconds = seconds
+        self.stats = stats
+        self.collapsed = collapsed
+
+    def pstats_text(self, limit: int = 40) -> str:
+        """Topp `limit` funksjoner sortert etter kumulativ tid."""
+        buffer = io.StringIO()
+        self.stats.stream = buffer
+        self.stats.sort_stats("cumulative").print_stats(limit)
+        return buffer.getvalue()
+
+    def pstats_bytes(self) -> bytes:
+        """Rå pstats-data (samme format som `dump_stats`), for snakeviz o.l."""
+        return marshal.dumps(self.stats.stats)
+
+    def collapsed_text(self) -> str:
+        """Collapsed stacks, én linje per stack: `a;b;c antall`."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.collapsed.most_common()
+        )
+
+
+class Profiler:
+    """Kjører cProfile og en stack-sampler mot event-loop-tråden.
+
+    `start()` må kalles fra event-loopen som skal profileres.
+
+    Args:
+        interval (float): Sekunder mellom hver sample
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.collapsed: Counter = Counter()
+        self._profile = cProfile.Profile()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """Starter begge profilerne."""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._profile.enable()
+        self._sampler = threading.Thread(
+            target=self._sample, name="profiler-sampler", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self) -> ProfileResult:
+        """Stopper profilerne og returnerer resultatet."""
+        self._profile.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        seconds = time.perf_counter() - self._started
+        return ProfileResult(seconds, pstats.Stats(self._profile), self.collapsed)
+
+    def _sample(self) -> None:
+        """Leser stacken til loop-tråden til profileringen stoppes."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                self._thread_id
+            )
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+
+            task = None
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                pass
+            prefix = f"task:{task.get_name()}" if task is not None else "task:-"
+            self.collapsed[";".join([prefix, *stack])] += 1
+
+
+_session: Profiler | None = None
+_session_command: str | None = None
+_armed: set[str] = set()
+
+
+def is_running() -> bool:
+    """True hvis en profilering pågår."""
+    return _session is not None
+
+
+def start_session() -> None:
+    """Starter en profilering. Feiler hvis en allerede kjører."""
+    global _session  # pylint: disable=global-statement
+    if _session is not None:
+        raise RuntimeError("En profilering kjører allerede")
+    session = Profiler()
+    session.start()
+    _session = session
+
+
+def stop_session() -> ProfileResult | None:
+    """Stopper profileringen som kjører og returnerer resultatet."""
+    global _session, _session_command  # pylint: disable=global-statement
+    if _session is None:
+        return None
+    result = _session.stop()
+    _session = None
+    _session_command = None
+    return result
+
+
+def arm(command: str) -> None:
+    """Profilerer neste kjøring av kommandoen `command`."""
+    _armed.add(command)
+
+
+def command_started(command: str) -> None:
+    """Kalles før en kommando kjører; starter profilering hvis den er bestilt."""
+    global _session_command  # pylint: disable=global-statement
+    if command not in _armed or _session is not None:
+        return
+    _armed.discard(command)
+    start_session()
+    _session_command = command
+
+
+async def command_finished(bot, command: str) -> None:
+    """Kalles etter en kommando; stopper og poster profilen for kommandoen."""
+    if _session is None or _session_command != command:
+        return
+    result = stop_session()
+    await post_result(bot, result, f"`!{command}`")
+
+
+async def post_result(bot, result: ProfileResult, title: str) -> None:
+    """Sender profilen til admin-kanalen som vedlegg.
+
+    Args:
+        bot (commands.Bot): Discord bot-instansen
+        result (ProfileResult): Resultatet som skal sendes
+        title (str): Hva som ble profilert, f.eks. "`!resultater`"
+    """
+    channel = bot.get_channel(ADMIN_CHANNEL_ID)
+    if channel is None:
+        print(f"[PROFIL] Fant ikke admin-kanalen, profil for {title} forkastet")
+        return
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    files = [
+        discord.File(
+            io.BytesIO(result.pstats_text().encode("utf-8")),
+            filename=f"profil-{stamp}.txt",
+        ),
+        discord.File(
+            io.BytesIO(result.collapsed_text().encode("utf-8")),
+            filename=f"profil-{stamp}.collapsed.txt",
+        ),
+        discord.File(
+            io.BytesIO(result.pstats_bytes()), filename=f"profil-{stamp}.prof"
+        ),
+    ]
+    samples = sum(result.collapsed.values())
+    await channel.send(
+        f"🔬 Profil for {title}: {result.seconds:.2f} s, {samples} samples",
+        files=files,
+    )
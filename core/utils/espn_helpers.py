@@ -2,17 +2,77 @@
 Hjelpefunksjoner knyttet opp mot ESPNs API for fantasy
 """
 
+import asyncio
+import logging
 import os
-from espn_api.football import League
+
+import aiohttp
+from aiohttp import ClientTimeout
+
+from core.metrics import timed
+from core.utils.lazy_import import LazyImport
+
+# espn_api drar inn mye ved import, så den lastes først når ligaen hentes
+League = LazyImport("espn_api.football", "League")
+espn_requests = LazyImport("espn_api.requests.espn_requests")
+
+logger = logging.getLogger(__name__)
+
+# Base-URL-ene kan pekes mot en lokal stand-in, f.eks. core.fakes.espn_server
+ESPN_SITE_BASE_URL = os.getenv("ESPN_SITE_BASE_URL", "https://site.api.espn.com")
+SCOREBOARD_URL = (
+    f"{ESPN_SITE_BASE_URL.rstrip('/')}/apis/site/v2/sports/football/nfl/scoreboard"
+)
 
 
 def get_league():
     """
     Henter informasjon om ligaen fra ESPNs API for fantasy football.
+
+    Med `ESPN_FANTASY_BASE_URL` satt går kallene dit i stedet for til ESPN.
+    """
+    base_url = os.getenv("ESPN_FANTASY_BASE_URL")
+    if base_url:
+        # espn_api bygger URL-ene fra denne konstanten når League opprettes
+        espn_requests.FANTASY_BASE_ENDPOINT = f"{base_url.rstrip('/')}/apis/v3/games/"
+    with timed("espn.league"):
+        return League(
+            league_id=int(os.getenv("ESPN_LEAGUE_ID")),
+            year=int(os.getenv("ESPN_YEAR")),
+            espn_s2=os.getenv("ESPN_S2"),
+            swid=os.getenv("ESPN_SWID"),
+        )
+
+
+async def fetch_espn_json(
+    url: str, op: str = "espn.scoreboard", retry_on_timeout: bool = True
+) -> dict:
+    """Henter JSON fra ESPNs API og måler kallet.
+
+    Args:
+        url (str): URL-en som skal hentes
+        op (str): Operasjonsnavn kallet registreres under i metrikkene
+        retry_on_timeout (bool): Prøv én gang til etter 5 sekunder ved timeout
+
+    Returns:
+        dict: JSON-responsen
+
+    Raises:
+        asyncio.TimeoutError: Hvis kallet (og eventuelt nytt forsøk) får timeout
+        aiohttp.ClientError: Ved andre nettverksfeil
     """
-    return League(
-        league_id=int(os.getenv("ESPN_LEAGUE_ID")),
-        year=int(os.getenv("ESPN_YEAR")),
-        espn_s2=os.getenv("ESPN_S2"),
-        swid=os.getenv("ESPN_SWID"),
-    )
+    async with aiohttp.ClientSession(timeout=ClientTimeout(total=10)) as session:
+        try:
+            async with timed(op):
+                async with session.get(url) as resp:
+                    return await resp.json()
+        except asyncio.TimeoutError:
+            if not retry_on_timeout:
+                raise
+            logger.warning(
+                "API timeout mot ESPN, prøver igjen om 5 sekunder. URL=%s", url
+            )
+            await asyncio.sleep(5)
+            async with timed(op):
+                async with session.get(url) as resp:
+                    return await resp.json()
@@ -0,0 +1,56 @@
+"""Enkel lokal lagring av JSON-data (cache mellom kjøringer).
+
+Filene legges i mappen fra miljøvariabelen CACHE_DIR (standard `.cache`).
+Innholdet er bare cache: går det tapt (f.eks. ved ny deploy), beregnes det
+på nytt.
+"""
+
+import json
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+
+def cache_path(name: str) -> str:
+    """Full sti til en cachefil, f.eks. `cache_path("digest.json")`."""
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_json(path: str, default: Any = None) -> Any:
+    """Leser JSON fra fil.
+
+    Args:
+        path (str): Filsti
+        default (Any): Verdien som returneres hvis filen mangler eller er ugyldig
+
+    Returns:
+        Any: Innholdet i filen, eller `default`
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as exc:
+        logger.warning("Klarte ikke lese %s: %s", path, exc)
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    """Skriver JSON til fil atomisk (via midlertidig fil og rename).
+
+    Args:
+        path (str): Filsti, mappen opprettes ved behov
+        data (Any): JSON-serialiserbare data
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
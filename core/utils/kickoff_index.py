@@ -0,0 +1,94 @@
+"""Indeks over kampstarter for en NFL-uke.
+
+Bygges én gang fra ESPN sitt scoreboard og gir O(1)-oppslag fra proff-lag
+(forkortelse, f.eks. "WSH") til kampstart. Kampstartene grupperes også i
+"klynger" (f.eks. søndagens tidlige vindu), slik at schedulere kan sove til
+rett før neste klynge i stedet for å polle hele uken.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+# Kamper som starter innenfor dette vinduet regnes som samme klynge
+CLUSTER_GAP = timedelta(minutes=60)
+
+
+def _parse_date(datestr: str) -> datetime:
+    """Parser ESPN-dato ("2025-09-07T17:00Z") til aware UTC-datetime."""
+    return datetime.fromisoformat(datestr.replace("Z", "+00:00")).astimezone(
+        timezone.utc
+    )
+
+
+@dataclass
+class KickoffIndex:
+    """Kampstarter for én uke.
+
+    Attributes:
+        by_team (dict[str, datetime]): Lagforkortelse → kampstart (UTC)
+        kickoffs (list[datetime]): Alle unike kampstarter, sortert
+        built_at (datetime): Når indeksen ble bygget (UTC)
+    """
+
+    by_team: dict[str, datetime] = field(default_factory=dict)
+    kickoffs: list[datetime] = field(default_factory=list)
+    built_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def from_scoreboard(cls, data: dict) -> "KickoffIndex":
+        """Bygger indeksen fra JSON-responsen til ESPN sitt scoreboard.
+
+        Args:
+            data (dict): Respons fra SCOREBOARD_URL
+
+        Returns:
+            KickoffIndex: Indeks for ukens kamper
+        """
+        by_team: dict[str, datetime] = {}
+        for ev in data.get("events", []):
+            datestr = ev.get("date")
+            if not datestr:
+                continue
+            kickoff = _parse_date(datestr)
+            for comp in ev.get("competitions", [{}])[0].get("competitors", []):
+                abbrev = comp.get("team", {}).get("abbreviation")
+                if abbrev:
+                    by_team[abbrev.upper()] = kickoff
+        return cls(by_team=by_team, kickoffs=sorted(set(by_team.values())))
+
+    def kickoff_for(self, pro_team: str | None) -> datetime | None:
+        """Kampstart for et proff-lag, eller None (bye eller ukjent lag)."""
+        if not pro_team:
+            return None
+        return self.by_team.get(pro_team.upper())
+
+    def clusters(self) -> list[datetime]:
+        """Starttidspunkt for hver klynge av kamper, sortert."""
+        starts: list[datetime] = []
+        for kickoff in self.kickoffs:
+            if not starts or kickoff - starts[-1] > CLUSTER_GAP:
+                starts.append(kickoff)
+        return starts
+
+    def next_cluster(self, now: datetime) -> datetime | None:
+        """Første klynge der minst én kamp ikke har startet ennå.
+
+        Args:
+            now (datetime): Nåværende tidspunkt (aware)
+
+        Returns:
+            datetime | None: Start på klyngen, eller None hvis uken er ferdig
+        """
+        upcoming = [k for k in self.kickoffs if k > now]
+        if not upcoming:
+            return None
+        first = upcoming[0]
+        # Returner starten på klyngen den første gjenværende kampen hører til
+        for start in reversed(self.clusters()):
+            if start <= first:
+                return start
+        return first
+
+    def has_kickoff_between(self, start: datetime, end: datetime) -> bool:
+        """True hvis en kamp starter i intervallet [start, end]."""
+        return any(start <= k <= end for k in self.kickoffs)
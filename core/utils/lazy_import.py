@@ -0,0 +1,71 @@
+"""Utsatt import av tunge tredjepartsbiblioteker.
+
+Modulene som brukes mot Google Sheets og ESPN (gspread, oauth2client,
+gspread_formatting, espn_api) tar merkbar tid å importere. Med `LazyImport`
+importeres de først når et attributt faktisk brukes, slik at oppstarten av
+botten ikke betaler for biblioteker som bare trengs i enkelte kommandoer.
+"""
+
+import importlib
+import time
+from typing import Any
+
+# Modulnavn → sekunder brukt på første import (for oppstartsrapporten)
+IMPORT_TIMES: dict[str, float] = {}
+
+
+class LazyImport:
+    """Proxy som importerer en modul (eventuelt et attributt) ved første bruk.
+
+    Attributtoppslag, tilordning og kall videresendes til det ekte objektet,
+    slik at proxyen kan brukes der koden tidligere hadde en vanlig import.
+
+    Args:
+        module_name (str): Modulen som skal importeres, f.eks. "gspread"
+        attr (str | None): Attributt i modulen, f.eks. "format_cell_range"
+
+    Example:
+        >>> gspread = LazyImport("gspread")
+        >>> gspread.authorize(creds)  # gspread importeres først her
+    """
+
+    def __init__(self, module_name: str, attr: str | None = None) -> None:
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attr", attr)
+        object.__setattr__(self, "_target", None)
+
+    def _load(self) -> Any:
+        """Importerer og cacher målobjektet."""
+        target = object.__getattribute__(self, "_target")
+        if target is not None:
+            return target
+
+        module_name = object.__getattribute__(self, "_module_name")
+        attr = object.__getattribute__(self, "_attr")
+        start = time.perf_counter()
+        target = importlib.import_module(module_name)
+        if module_name not in IMPORT_TIMES:
+            IMPORT_TIMES[module_name] = time.perf_counter() - start
+        if attr is not None:
+            target = getattr(target, attr)
+        object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._load(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        module_name = object.__getattribute__(self, "_module_name")
+        attr = object.__getattribute__(self, "_attr")
+        name = f"{module_name}.{attr}" if attr else module_name
+        loaded = object.__getattribute__(self, "_target") is not None
+        return f"<LazyImport {name} ({'lastet' if loaded else 'ikke lastet'})>"
@@ -0,0 +1,165 @@
+"""Optimal oppstilling og "managereffektivitet" fra ukens box scores.
+
+Benkepoeng sier lite om hvor mye et lag faktisk tapte på oppstillingen, siden
+en spiller på benken bare kan erstatte en starter på en plass den er
+kvalifisert for.
+Her løses oppstillingen som et tilordningsproblem: startplassene (QB, RB,
+RB/WR/TE, OP osv.) er rader, spillerne er kolonner, og verdien er poengene
+spilleren fikk, men bare der `eligibleSlots` tillater plassen. Den ungarske
+metoden gir beste tilordning i O(n²m), som for en hel liga tar millisekunder.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from core.utils.lazy_import import LazyImport
+
+np = LazyImport("numpy")
+
+# Plasser som ikke er startplasser
+BENCH_SLOTS = frozenset({"BE", "IR"})
+
+# "Kostnad" for en ugyldig tilordning (spilleren kan ikke stå på plassen)
+_INELIGIBLE = 1e9
+
+
+@dataclass
+class LineupResult:
+    """Faktisk og optimal oppstilling for ett lag én uke.
+
+    Attributes:
+        actual (float): Poeng fra startere som faktisk sto i oppstillingen
+        optimal (float): Poeng fra beste mulige oppstilling
+        lineup (list[tuple[str, str]]): Optimal oppstilling som (plass, navn),
+            navn er "" der plassen står tom
+    """
+
+    actual: float
+    optimal: float
+    lineup: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def efficiency(self) -> float:
+        """Andel av mulige poeng laget fikk (1.0 = perfekt oppstilling)."""
+        if self.optimal <= 0:
+            return 1.0
+        return self.actual / self.optimal
+
+    @property
+    def lost(self) -> float:
+        """Poeng laget gikk glipp av med oppstillingen sin."""
+        return self.optimal - self.actual
+
+
+def hungarian(cost) -> list[int]:
+    """Minimal tilordning av rader til kolonner (ungarsk metode).
+
+    Hver rad tilordnes én unik kolonne slik at summen av kostnadene blir
+    minst mulig. Krever minst like mange kolonner som rader.
+
+    Args:
+        cost: numpy-array med form (n, m), n <= m
+
+    Returns:
+        list[int]: Kolonnen hver rad er tilordnet
+    """
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("Trenger minst like mange kolonner som rader")
+    # Potensialer og matching, 1-indeksert med kolonne 0 som hjelpekolonne
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        match[0] = row
+        col = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[col] = True
+            current_row = match[col]
+            free = ~used
+            free[0] = False
+            reduced = cost[current_row - 1] - u[current_row] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = col
+            next_col = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[next_col]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            col = next_col
+            if match[col] == 0:
+                break
+        # Snu den forbedrende stien
+        while col:
+            prev = way[col]
+            match[col] = match[prev]
+            col = prev
+
+    assignment = [0] * n
+    for col in range(1, m + 1):
+        if match[col]:
+            assignment[match[col] - 1] = col - 1
+    return assignment
+
+
+def optimal_lineup(lineup: Iterable[Any]) -> LineupResult:
+    """Finner beste oppstilling for et lag fra ukens box score-oppstilling.
+
+    Startplassene hentes fra plassene lagets startere faktisk sto på. Spillere
+    på IR regnes ikke med. En plass kan stå tom hvis ingen kvalifisert
+    spiller har positive poeng.
+
+    Args:
+        lineup (Iterable): `box.home_lineup` eller `box.away_lineup`
+
+    Returns:
+        LineupResult: Faktiske og optimale poeng
+    """
+    players = [p for p in lineup if p.slot_position != "IR"]
+    slots = [p.slot_position for p in players if p.slot_position not in BENCH_SLOTS]
+    actual = sum(p.points for p in players if p.slot_position not in BENCH_SLOTS)
+    if not slots:
+        return LineupResult(actual=actual, optimal=0.0)
+
+    # Én tom-kolonne per plass (0 poeng), så alle plasser alltid kan fylles
+    cost = np.full((len(slots), len(players) + len(slots)), _INELIGIBLE)
+    for j, player in enumerate(players):
+        eligible = set(getattr(player, "eligibleSlots", ()) or ())
+        for i, slot in enumerate(slots):
+            if slot in eligible or slot == player.slot_position:
+                cost[i, j] = -player.points
+    cost[:, len(players) :] = 0.0
+
+    assignment = hungarian(cost)
+    optimal = 0.0
+    chosen: list[tuple[str, str]] = []
+    for i, (slot, col) in enumerate(zip(slots, assignment)):
+        if col < len(players) and cost[i, col] < _INELIGIBLE:
+            optimal += players[col].points
+            chosen.append((slot, players[col].name))
+        else:
+            chosen.append((slot, ""))
+    return LineupResult(actual=actual, optimal=optimal, lineup=chosen)
+
+
+def league_efficiency(boxes: Iterable[Any]) -> dict[int, tuple[str, LineupResult]]:
+    """Regner ut optimal oppstilling for alle lag i en uke.
+
+    Args:
+        boxes (Iterable): `league.box_scores(week=...)` fra espn_api
+
+    Returns:
+        dict[int, tuple[str, LineupResult]]: team_id → (lagnavn, resultat)
+    """
+    results: dict[int, tuple[str, LineupResult]] = {}
+    for box in boxes:
+        for team, lineup in [
+            (box.home_team, box.home_lineup),
+            (box.away_team, box.away_lineup),
+        ]:
+            results[team.team_id] = (team.team_name, optimal_lineup(lineup))
+    return results
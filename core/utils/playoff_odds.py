@@ -0,0 +1,283 @@
+"""Monte Carlo-simulering av sluttspillsjanser i fantasyligaen.
+
+Resten av grunnserien simuleres mange ganger med numpy: hvert lags ukescore
+trekkes fra en normalfordeling med lagets snitt og standardavvik så langt i
+sesongen, og alle simuleringene for en uke regnes ut samtidig som matriser
+(simuleringer × lag). Løkken går bare over gjenværende uker, aldri over
+enkeltsimuleringer.
+
+Tabellen rangeres etter flest seiere, og lag med like mange seiere skilles
+etter ligaens regel (`playoff_seed_tie_rule`): TOTAL_POINTS_SCORED gir flest
+poeng, og H2H_RECORD gir flest seiere mot de andre lagene på samme antall
+seiere før poengene. Divisjonsrekord (INTRA_DIVISION_RECORD) er ikke
+modellert, så slike ligaer rangeres som TOTAL_POINTS_SCORED. De beste lagene
+får bye i første sluttspillrunde når antall sluttspillag ikke er en
+toerpotens (f.eks. 6 lag gir 2 byes).
+
+Alle data hentes fra `League`-objektet som allerede er lastet, så
+simuleringen gjør ingen ekstra kall mot ESPN.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.utils.lazy_import import LazyImport
+
+np = LazyImport("numpy")
+
+# Antall simulerte sesonger og prosesser (1 = ingen prosesspool)
+SIMULATIONS = int(os.getenv("PLAYOFF_SIMULATIONS", "100000"))
+WORKERS = int(os.getenv("PLAYOFF_SIM_WORKERS", "1"))
+# Standardavvik for ukescore når et lag har for få kamper til å anslå det
+DEFAULT_STD = 25.0
+# Simuleringer per batch når prosesspoolen brukes
+BATCH_SIZE = 25_000
+# Ligaens regler for likhet i tabellen (espn_api `playoff_seed_tie_rule`)
+POINTS_RULE = "TOTAL_POINTS_SCORED"
+H2H_RULE = "H2H_RECORD"
+
+
+@dataclass
+class SeasonModel:
+    """Alt simuleringen trenger, i en form som kan sendes til andre prosesser.
+
+    Attributes:
+        team_ids (list[int]): ESPN team_id, i samme rekkefølge som arrayene
+        names (list[str]): Lagnavn
+        wins (list[float]): Seiere så langt (uavgjort teller en halv)
+        points (list[float]): Poeng så langt
+        mean (list[float]): Snittscore per uke
+        std (list[float]): Standardavvik for ukescore
+        schedule (list[list[tuple[int, int]]]): Gjenværende uker som lister
+            av kamper (indeks, indeks)
+        playoff_teams (int): Antall lag i sluttspillet
+        tie_rule (str): Regelen for lag med like mange seiere
+        h2h (list[list[float]]): Seiere så langt mot hvert av de andre lagene
+            (rad vant mot kolonne, uavgjort teller en halv)
+    """
+
+    team_ids: list[int]
+    names: list[str]
+    wins: list[float]
+    points: list[float]
+    mean: list[float]
+    std: list[float]
+    schedule: list[list[tuple[int, int]]] = field(default_factory=list)
+    playoff_teams: int = 6
+    tie_rule: str = POINTS_RULE
+    h2h: list[list[float]] = field(default_factory=list)
+
+    @property
+    def byes(self) -> int:
+        """Antall lag med bye i første sluttspillrunde."""
+        bracket = 1
+        while bracket < self.playoff_teams:
+            bracket *= 2
+        return bracket - self.playoff_teams
+
+    @classmethod
+    def from_league(cls, league: Any) -> "SeasonModel":
+        """Bygger modellen fra et espn_api `League`-objekt.
+
+        Args:
+            league: Ligaen fra `get_league()`
+
+        Returns:
+            SeasonModel: Modell for resten av grunnserien
+        """
+        teams = list(league.teams)
+        index = {team.team_id: i for i, team in enumerate(teams)}
+        regular_season = league.settings.reg_season_count
+
+        played: list[list[float]] = []
+        for team in teams:
+            played.append(
+                [
+                    score
+                    for score, outcome in zip(
+                        team.scores[:regular_season], team.outcomes
+                    )
+                    if outcome != "U" and score is not None
+                ]
+            )
+        all_scores = [s for scores in played for s in scores]
+        league_mean = float(np.mean(all_scores)) if all_scores else 100.0
+
+        # Innbyrdes seiere i ferdigspilte uker
+        h2h = [[0.0] * len(teams) for _ in teams]
+        for team in teams:
+            for week, outcome in enumerate(team.outcomes[:regular_season]):
+                if outcome not in ("W", "T") or week >= len(team.schedule):
+                    continue
+                opponent = team.schedule[week]
+                j = index.get(getattr(opponent, "team_id", opponent))
+                if j is not None:
+                    h2h[index[team.team_id]][j] += 1.0 if outcome == "W" else 0.5
+
+        schedule: list[list[tuple[int, int]]] = []
+        first = teams[0] if teams else None
+        for week in range(regular_season if first else 0):
+            if week >= len(first.outcomes) or first.outcomes[week] != "U":
+                continue
+            games = []
+            for team in teams:
+                opponent = team.schedule[week]
+                opp_id = getattr(opponent, "team_id", opponent)
+                i, j = index[team.team_id], index.get(opp_id)
+                if j is not None and i < j:
+                    games.append((i, j))
+            schedule.append(games)
+
+        return cls(
+            team_ids=[team.team_id for team in teams],
+            names=[team.team_name for team in teams],
+            wins=[team.wins + 0.5 * getattr(team, "ties", 0) for team in teams],
+            points=[float(team.points_for) for team in teams],
+            mean=[float(np.mean(s)) if s else league_mean for s in played],
+            std=[
+                float(np.std(s, ddof=1)) if len(s) >= 3 else DEFAULT_STD for s in played
+            ],
+            schedule=schedule,
+            playoff_teams=league.settings.playoff_team_count,
+            tie_rule=getattr(league.settings, "playoff_seed_tie_rule", POINTS_RULE),
+            h2h=h2h,
+        )
+
+
+@dataclass
+class PlayoffOdds:
+    """Sannsynligheter per lag, i samme rekkefølge som modellen.
+
+    Attributes:
+        names (list[str]): Lagnavn
+        playoff (list[float]): Sjanse for sluttspill
+        bye (list[float]): Sjanse for bye
+        last (list[float]): Sjanse for sisteplass
+        simulations (int): Antall simulerte sesonger
+    """
+
+    names: list[str]
+    playoff: list[float]
+    bye: list[float]
+    last: list[float]
+    simulations: int
+
+
+def _simulate_batch(model: SeasonModel, n: int, seed: Any) -> tuple:
+    """Simulerer `n` sesonger og teller utfall per lag.
+
+    Returns:
+        tuple: (sluttspill, bye, sisteplass) som antall per lag
+    """
+    rng = np.random.default_rng(seed)
+    teams = len(model.team_ids)
+    wins = np.tile(np.asarray(model.wins, dtype=float), (n, 1))
+    points = np.tile(np.asarray(model.points, dtype=float), (n, 1))
+    mean = np.asarray(model.mean)
+    std = np.asarray(model.std)
+    use_h2h = model.tie_rule == H2H_RULE
+    if use_h2h:
+        played = np.asarray(model.h2h, dtype=float) if model.h2h else None
+        h2h = np.tile(
+            played if played is not None else np.zeros((teams, teams)), (n, 1, 1)
+        )
+
+    for games in model.schedule:
+        if not games:
+            continue
+        scores = rng.normal(mean, std, size=(n, teams))
+        home, away = np.array(games).T
+        home_won = scores[:, home] > scores[:, away]
+        wins[:, home] += home_won
+        wins[:, away] += ~home_won
+        points[:, home] += scores[:, home]
+        points[:, away] += scores[:, away]
+        if use_h2h:
+            h2h[:, home, away] += home_won
+            h2h[:, away, home] += ~home_won
+
+    # Seiere først, så ligaens regel for likhet, til slutt poeng
+    keys = [-points]
+    if use_h2h:
+        # Seiere mot lagene med like mange seiere
+        tied = wins[:, :, None] == wins[:, None, :]
+        keys.append(-(h2h * tied).sum(axis=2))
+    keys.append(-wins)
+    order = np.lexsort(keys, axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(teams), axis=1)
+
+    return (
+        (ranks < model.playoff_teams).sum(axis=0),
+        (ranks < model.byes).sum(axis=0),
+        (ranks == teams - 1).sum(axis=0),
+    )
+
+
+def simulate(
+    model: SeasonModel,
+    simulations: int = SIMULATIONS,
+    workers: int = WORKERS,
+    seed: int | None = None,
+) -> PlayoffOdds:
+    """Simulerer resten av grunnserien og regner ut sannsynligheter.
+
+    Args:
+        model (SeasonModel): Modellen fra `SeasonModel.from_league`
+        simulations (int): Antall sesonger som simuleres
+        workers (int): Antall prosesser; over 1 fordeles batcher på en
+            prosesspool
+        seed (int | None): Frø for reproduserbare resultater
+
+    Returns:
+        PlayoffOdds: Sannsynligheter per lag
+    """
+    batches = [BATCH_SIZE] * (simulations // BATCH_SIZE)
+    if simulations % BATCH_SIZE:
+        batches.append(simulations % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(_simulate_batch, [model] * len(batches), batches, seeds)
+            )
+    else:
+        results = [_simulate_batch(model, n, s) for n, s in zip(batches, seeds)]
+
+    playoff, bye, last = (sum(r[i] for r in results) for i in range(3))
+    return PlayoffOdds(
+        names=list(model.names),
+        playoff=[float(x) / simulations for x in playoff],
+        bye=[float(x) / simulations for x in bye],
+        last=[float(x) / simulations for x in last],
+        simulations=simulations,
+    )
+
+
+def format_playoff_odds(odds: PlayoffOdds, show_bye: bool = True) -> str:
+    """Formaterer sjansene som en liste sortert etter sluttspillsjanse.
+
+    Args:
+        odds (PlayoffOdds): Resultatet fra `simulate`
+        show_bye (bool): Ta med bye-sjansen
+
+    Returns:
+        str: Ferdig tekst
+    """
+    count = f"{odds.simulations:,}".replace(",", " ")
+    lines = [f"**Sluttspillsjanser ({count} simuleringer):**"]
+    rows = sorted(
+        zip(odds.names, odds.playoff, odds.bye, odds.last),
+        key=lambda row: (row[1], row[2], -row[3]),
+        reverse=True,
+    )
+    for name, playoff, bye, last in rows:
+        parts = [f"sluttspill {playoff:.0%}"]
+        if show_bye:
+            parts.append(f"bye {bye:.0%}")
+        parts.append(f"sisteplass {last:.0%}")
+        lines.append(f"- {name}: " + ", ".join(parts))
+    return "\n".join(lines)
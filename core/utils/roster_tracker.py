@@ -0,0 +1,190 @@
+"""Inkrementell sporing av spillerstaller og skadestatus.
+
+I stedet for at hver funksjon går gjennom alle spillerstaller på hver polling,
+holder `RosterTracker` forrige øyeblikksbilde i kompakt form
+((lag, spiller) → (slot, status)) og gir bare ut endringer:
+
+- `INACTIVE_STARTER`: en starter har fått inaktiv status (eller en inaktiv
+  spiller er satt inn i oppstillingen)
+- `BENCHED`: en inaktiv starter er flyttet til benken/IR
+- `CLEARED`: en spiller har ikke lenger inaktiv status
+- `DROPPED`: en inaktiv starter er ikke lenger på laget
+
+`ExpiringSet` er et sett med levetid per element, brukt for å huske hvem som
+allerede er varslet uten at settet vokser gjennom hele sesongen.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterable
+
+INACTIVE_STATUSES = frozenset({"OUT", "DOUBTFUL", "INACTIVE", "SUSPENSION"})
+BENCH_SLOTS = frozenset({"BE", "IR"})
+
+INACTIVE_STARTER = "inactive_starter"
+BENCHED = "benched"
+CLEARED = "cleared"
+DROPPED = "dropped"
+
+
+def _player_key(player) -> Any:
+    """Stabil nøkkel for en spiller (playerId, ellers navn)."""
+    return getattr(player, "playerId", None) or getattr(player, "name", None)
+
+
+def _is_flagged(slot: str, status: str) -> bool:
+    """True hvis spilleren er en inaktiv starter."""
+    return slot not in BENCH_SLOTS and status in INACTIVE_STATUSES
+
+
+@dataclass
+class RosterEvent:
+    """Én endring i en spillerstall.
+
+    Attributes:
+        kind (str): INACTIVE_STARTER, BENCHED, CLEARED eller DROPPED
+        team_id (int): ESPN team_id for fantasy-laget
+        team_name (str): Navnet på fantasy-laget
+        player_id (Any): playerId (eller navn) for spilleren
+        name (str): Spillernavnet
+        slot (str): Ny lineupSlot ("" hvis spilleren er borte)
+        status (str): Ny injuryStatus ("" hvis ingen)
+        player (Any): Spillerobjektet fra espn_api (None ved DROPPED)
+    """
+
+    kind: str
+    team_id: int
+    team_name: str
+    player_id: Any
+    name: str
+    slot: str
+    status: str
+    player: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def key(self) -> tuple:
+        """(team_id, player_id), brukes som nøkkel av konsumentene."""
+        return (self.team_id, self.player_id)
+
+
+class RosterTracker:
+    """Sammenligner spillerstaller mellom pollinger og gir ut endringer.
+
+    Attributes:
+        snapshot (dict): (team_id, player_id) → (slot, status, navn)
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: dict[tuple, tuple[str, str, str]] = {}
+        self._team_names: dict[int, str] = {}
+
+    def update(self, teams: Iterable) -> list[RosterEvent]:
+        """Tar et nytt øyeblikksbilde og returnerer endringene siden forrige.
+
+        Første kall gir INACTIVE_STARTER for alle inaktive startere.
+
+        Args:
+            teams (Iterable): `league.teams` fra espn_api
+
+        Returns:
+            list[RosterEvent]: Endringene, i stallrekkefølge
+        """
+        events: list[RosterEvent] = []
+        current: dict[tuple, tuple[str, str, str]] = {}
+        previous = self.snapshot
+
+        for team in teams:
+            team_name = getattr(team, "team_name", f"Team {team.team_id}")
+            self._team_names[team.team_id] = team_name
+            for player in team.roster:
+                key = (team.team_id, _player_key(player))
+                slot = getattr(player, "lineupSlot", "") or ""
+                status = (getattr(player, "injuryStatus", "") or "").upper()
+                entry = (slot, status, player.name)
+                current[key] = entry
+
+                old = previous.get(key)
+                if old is not None and old[:2] == entry[:2]:
+                    continue
+                kind = self._classify(old, slot, status)
+                if kind is not None:
+                    events.append(
+                        RosterEvent(
+                            kind=kind,
+                            team_id=key[0],
+                            team_name=team_name,
+                            player_id=key[1],
+                            name=player.name,
+                            slot=slot,
+                            status=status,
+                            player=player,
+                        )
+                    )
+
+        for key, (slot, status, name) in previous.items():
+            if key not in current and _is_flagged(slot, status):
+                events.append(
+                    RosterEvent(
+                        kind=DROPPED,
+                        team_id=key[0],
+                        team_name=self._team_names.get(key[0], ""),
+                        player_id=key[1],
+                        name=name,
+                        slot="",
+                        status="",
+                    )
+                )
+
+        self.snapshot = current
+        return events
+
+    @staticmethod
+    def _classify(old: tuple | None, slot: str, status: str) -> str | None:
+        """Finner hendelsestypen for en spiller som er ny eller endret."""
+        was_flagged = old is not None and _is_flagged(old[0], old[1])
+        was_inactive = old is not None and old[1] in INACTIVE_STATUSES
+        if _is_flagged(slot, status):
+            return None if was_flagged else INACTIVE_STARTER
+        if status not in INACTIVE_STATUSES and was_inactive:
+            return CLEARED
+        if was_flagged and slot in BENCH_SLOTS:
+            return BENCHED
+        return None
+
+
+class ExpiringSet:
+    """Sett der hvert element forsvinner etter `ttl` sekunder.
+
+    Utløpte elementer fjernes når settet brukes, så størrelsen holder seg
+    begrenset til det som er lagt til innenfor levetiden.
+
+    Args:
+        ttl (float): Levetid i sekunder
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._expires: dict[Hashable, float] = {}
+
+    def _evict(self) -> None:
+        """Fjerner utløpte elementer (dict-en er sortert etter innsetting)."""
+        now = time.monotonic()
+        while self._expires:
+            key, expires = next(iter(self._expires.items()))
+            if expires > now:
+                break
+            del self._expires[key]
+
+    def add(self, key: Hashable) -> None:
+        """Legger til (eller fornyer) et element."""
+        self._expires.pop(key, None)
+        self._expires[key] = time.monotonic() + self.ttl
+        self._evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._evict()
+        return key in self._expires
+
+    def __len__(self) -> int:
+        self._evict()
+        return len(self._expires)
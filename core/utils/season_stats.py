@@ -0,0 +1,261 @@
+"""Sesongstatistikk for fantasyligaen, lagret som tabeller (uke × lag).
+
+Ukesprisene i matchup-digesten regnes ut fra én ukes box scores og kastes
+etterpå. `SeasonStats` tar vare på tallene bak dem: for hver uke og hvert lag
+lagres poeng, margin, benkepoeng og avvik mot projeksjon i numpy-matriser.
+Tabellen oppdateres inkrementelt når digesten lages, og sesongens rekorder og
+rekker hentes ut med vektoriserte spørringer uten å hente gamle uker på nytt.
+"""
+
+from typing import Any, Iterable
+
+from core.utils.json_store import cache_path, load_json, save_json
+from core.utils.lazy_import import LazyImport
+
+np = LazyImport("numpy")
+
+# Måltallene som lagres per uke og lag, i rekkefølgen de ligger i tabellen
+METRICS = ("score", "margin", "bench", "proj_delta")
+# Antall uker tabellen har plass til (NFL har 18 uker i grunnserien)
+MAX_WEEKS = 18
+
+STATS_CACHE = cache_path("season_stats.json")
+
+
+def _bench_points(lineup: Iterable) -> float:
+    """Summerer poeng på benken (slot_position BE)."""
+    return sum(p.points for p in lineup if p.slot_position == "BE")
+
+
+def _proj_delta(actual: float, projected: float | None) -> float:
+    """Avvik mot projeksjon, som i ukesprisene (uten projeksjon: poengene)."""
+    return actual - projected if projected not in (None, -1) else actual
+
+
+def _longest_runs(mask) -> Any:
+    """Lengste sammenhengende rekke med True per kolonne.
+
+    Løkken går over ukene (maks 18), mens alle lagene behandles samtidig.
+    """
+    run = np.zeros(mask.shape[1], dtype=int)
+    best = np.zeros(mask.shape[1], dtype=int)
+    for row in mask:
+        run = (run + 1) * row
+        np.maximum(best, run, out=best)
+    return best
+
+
+class SeasonStats:
+    """Per-uke og per-lag måltall for én sesong.
+
+    Args:
+        year (int): Sesongen tabellen gjelder
+
+    Attributes:
+        team_ids (list[int]): ESPN team_id for hver kolonne
+        names (dict[int, str]): team_id → lagnavn (siste kjente)
+        values: numpy-array med form (len(METRICS), MAX_WEEKS, antall lag),
+            NaN der uken ikke er registrert
+    """
+
+    def __init__(self, year: int) -> None:
+        self.year = year
+        self.team_ids: list[int] = []
+        self.names: dict[int, str] = {}
+        self.values = np.full((len(METRICS), MAX_WEEKS, 0), np.nan)
+
+    def _column(self, team) -> int:
+        """Kolonnen til et lag, nye lag får en ny kolonne."""
+        self.names[team.team_id] = team.team_name
+        if team.team_id not in self.team_ids:
+            self.team_ids.append(team.team_id)
+            extra = np.full((len(METRICS), MAX_WEEKS, 1), np.nan)
+            self.values = np.concatenate([self.values, extra], axis=2)
+        return self.team_ids.index(team.team_id)
+
+    def metric(self, name: str) -> Any:
+        """Matrisen (uke × lag) for ett måltall."""
+        return self.values[METRICS.index(name)]
+
+    @property
+    def weeks(self) -> list[int]:
+        """Ukene som er registrert, sortert."""
+        recorded = ~np.isnan(self.metric("score")).all(axis=1)
+        return [int(w) + 1 for w in np.flatnonzero(recorded)]
+
+    def record_week(self, week: int, boxes: Iterable) -> None:
+        """Registrerer (eller overskriver) én uke fra box scores.
+
+        Args:
+            week (int): NFL-uken, 1-basert
+            boxes (Iterable): `league.box_scores(week=week)` fra espn_api
+        """
+        if not 1 <= week <= MAX_WEEKS:
+            raise ValueError(f"Uke {week} er utenfor 1-{MAX_WEEKS}")
+        row = week - 1
+        for box in boxes:
+            home = (box.home_team, box.home_score, box.home_lineup, box.home_projected)
+            away = (box.away_team, box.away_score, box.away_lineup, box.away_projected)
+            for (team, score, lineup, projected), opp_score in [
+                (home, box.away_score),
+                (away, box.home_score),
+            ]:
+                col = self._column(team)
+                self.values[:, row, col] = (
+                    score,
+                    score - opp_score,
+                    _bench_points(lineup),
+                    _proj_delta(score, projected),
+                )
+
+    def extreme(self, name: str, highest: bool = True) -> tuple | None:
+        """Høyeste eller laveste enkeltverdi for et måltall i sesongen.
+
+        Returns:
+            tuple | None: (verdi, team_id, uke), eller None uten data
+        """
+        values = self.metric(name)
+        if np.isnan(values).all():
+            return None
+        flat = np.nanargmax(values) if highest else np.nanargmin(values)
+        row, col = np.unravel_index(flat, values.shape)
+        return float(values[row, col]), self.team_ids[col], int(row) + 1
+
+    def totals(self, name: str) -> dict[int, float]:
+        """Sum over sesongen per lag for et måltall."""
+        sums = np.nansum(self.metric(name), axis=0)
+        return {team_id: float(s) for team_id, s in zip(self.team_ids, sums)}
+
+    def closest_win(self) -> tuple | None:
+        """Minste positive margin i sesongen: (margin, team_id, uke)."""
+        margins = self.metric("margin")
+        wins = np.where(margins > 0, margins, np.nan)
+        if np.isnan(wins).all():
+            return None
+        row, col = np.unravel_index(np.nanargmin(wins), wins.shape)
+        return float(wins[row, col]), self.team_ids[col], int(row) + 1
+
+    def streaks(self) -> dict[int, tuple[int, int]]:
+        """Lengste seiers- og tapsrekke per lag over registrerte uker.
+
+        Uker som mangler i tabellen hoppes over, slik at en uke botten ikke
+        fikk registrert ikke bryter en rekke.
+
+        Returns:
+            dict[int, tuple[int, int]]: team_id → (seiere på rad, tap på rad)
+        """
+        rows = [w - 1 for w in self.weeks]
+        margins = self.metric("margin")[rows]
+        wins = _longest_runs(margins > 0)
+        losses = _longest_runs(margins < 0)
+        return {
+            team_id: (int(won), int(lost))
+            for team_id, won, lost in zip(self.team_ids, wins, losses)
+        }
+
+    def to_dict(self) -> dict:
+        """Gjør tabellen om til JSON-vennlig form (NaN blir None)."""
+        return {
+            "year": self.year,
+            "team_ids": self.team_ids,
+            "names": {str(k): v for k, v in self.names.items()},
+            "metrics": {
+                name: [
+                    [None if np.isnan(v) else float(v) for v in row]
+                    for row in self.metric(name)
+                ]
+                for name in METRICS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SeasonStats":
+        """Gjenoppretter tabellen fra `to_dict`-formatet."""
+        stats = cls(data["year"])
+        stats.team_ids = list(data.get("team_ids", []))
+        stats.names = {int(k): v for k, v in data.get("names", {}).items()}
+        metrics = data.get("metrics", {})
+        stats.values = np.array(
+            [
+                np.array(metrics[name], dtype=float).reshape(
+                    MAX_WEEKS, len(stats.team_ids)
+                )
+                for name in METRICS
+            ]
+        )
+        return stats
+
+
+def load_season_stats(year: int, path: str | None = None) -> SeasonStats:
+    """Henter lagret statistikk for sesongen, eller en tom tabell.
+
+    Args:
+        year (int): Sesongen
+        path (str | None): Fil, standard er STATS_CACHE
+
+    Returns:
+        SeasonStats: Tabellen for sesongen
+    """
+    data = load_json(path or STATS_CACHE)
+    if not data or data.get("year") != year:
+        return SeasonStats(year)
+    return SeasonStats.from_dict(data)
+
+
+def save_season_stats(stats: SeasonStats, path: str | None = None) -> None:
+    """Lagrer statistikken (bare én sesong beholdes)."""
+    save_json(path or STATS_CACHE, stats.to_dict())
+
+
+def format_season_summary(stats: SeasonStats) -> str:
+    """Lager sesongoppsummeringen som postes i siste uke.
+
+    Args:
+        stats (SeasonStats): Sesongens tabell
+
+    Returns:
+        str: Ferdig tekst, eller tom streng uten data
+    """
+    if not stats.weeks:
+        return ""
+
+    def name(team_id: int) -> str:
+        return stats.names.get(team_id, f"Team {team_id}")
+
+    lines = [f"**Sesongens rekorder ({len(stats.weeks)} uker):**"]
+    for label, record, fmt in [
+        ("Høyeste ukescore", stats.extreme("score"), "{:.2f} poeng"),
+        ("Laveste ukescore", stats.extreme("score", highest=False), "{:.2f} poeng"),
+        ("Største seier", stats.extreme("margin"), "margin {:.2f}"),
+        ("Tetteste seier", stats.closest_win(), "margin {:.2f}"),
+        ("Mest på benken én uke", stats.extreme("bench"), "{:.2f} poeng"),
+    ]:
+        if record is not None:
+            value, team_id, week = record
+            lines.append(
+                f"- {label}: {name(team_id)}, {fmt.format(value)} (uke {week})"
+            )
+
+    for label, metric, fmt in [
+        ("Mest poeng totalt", "score", "{:.2f} poeng"),
+        ("Mest poeng på benken totalt", "bench", "{:.2f} poeng"),
+        ("Best mot projeksjon totalt", "proj_delta", "{:+.2f}"),
+    ]:
+        totals = stats.totals(metric)
+        if totals:
+            team_id = max(totals, key=totals.get)
+            lines.append(f"- {label}: {name(team_id)}, {fmt.format(totals[team_id])}")
+
+    streaks = stats.streaks()
+    if streaks:
+        hot = max(streaks, key=lambda t: streaks[t][0])
+        cold = max(streaks, key=lambda t: streaks[t][1])
+        if streaks[hot][0]:
+            lines.append(
+                f"- Lengste seiersrekke: {name(hot)}, {streaks[hot][0]} på rad"
+            )
+        if streaks[cold][1]:
+            lines.append(
+                f"- Lengste tapsrekke: {name(cold)}, {streaks[cold][1]} på rad"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,122 @@
+"""Sesongpoeng per tipper, ført fortløpende i "State"-fanen.
+
+Resultatene legger ukens poeng til totalen som er lagret her, i stedet for å
+lese og tolke forrige "Sesongpoeng"-rad i arket. Totalen før siste uke tas
+også vare på, slik at en ny kjøring av samme uke ikke teller uken to ganger.
+Tabellen lagres i kolonne J-O, med én rad per tipper.
+"""
+
+from dataclasses import dataclass, field
+
+# Kolonnene i "State"-fanen totalene bruker
+TOTALS_HEADER = ["sesong", "uke", "discord_id", "navn", "sesongpoeng", "for_uken"]
+TOTALS_FIRST_COL = "J"
+TOTALS_LAST_COL = "O"
+# Antall kolonner "State"-fanen må ha for å få plass til totalene
+TOTALS_MIN_COLS = 15
+
+
+@dataclass
+class SeasonTotals:
+    """Sesongpoengene etter en gitt uke.
+
+    Attributes:
+        season (int): Sesongen (årstall)
+        week (int | None): Siste uke som er med, None hvis ukjent
+        names (dict[str, str]): Discord-ID → navn, i kolonnerekkefølge
+        totals (dict[str, int]): Discord-ID → sesongpoeng etter uken
+        before (dict[str, int] | None): Discord-ID → sesongpoeng før uken,
+            None hvis ukjent
+        stored (int): Antall rader som sist ble lest/skrevet
+    """
+
+    season: int
+    week: int | None
+    names: dict[str, str] = field(default_factory=dict)
+    totals: dict[str, int] = field(default_factory=dict)
+    before: dict[str, int] | None = None
+    stored: int = 0
+
+    def base_for(self, season: int, week: int) -> dict[str, int] | None:
+        """Totalen uken bygger på, eller None hvis den må leses fra arket.
+
+        Args:
+            season (int): Sesongen uken hører til
+            week (int): Uken som skal regnes ut
+
+        Returns:
+            dict[str, int] | None: Discord-ID → sesongpoeng før uken
+        """
+        if season != self.season or self.week is None:
+            return None
+        if week == self.week + 1:
+            return self.totals
+        if week == self.week:
+            return self.before
+        return None
+
+    def standings(self) -> list[tuple[str, int]]:
+        """(navn, sesongpoeng) sortert med flest poeng først."""
+        return sorted(
+            ((self.names.get(pid, pid), points) for pid, points in self.totals.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def mismatches(self, sheet_totals: dict[str, int]) -> dict[str, tuple[int, int]]:
+        """Tippere der totalen her og i arket er ulike.
+
+        Args:
+            sheet_totals (dict[str, int]): Discord-ID → sesongpoeng i arket
+
+        Returns:
+            dict[str, tuple[int, int]]: Discord-ID → (lagret, arket)
+        """
+        return {
+            pid: (self.totals.get(pid, 0), sheet_totals.get(pid, 0))
+            for pid in set(self.totals) | set(sheet_totals)
+            if self.totals.get(pid, 0) != sheet_totals.get(pid, 0)
+        }
+
+    @classmethod
+    def from_rows(cls, rows: list[list[str]]) -> "SeasonTotals | None":
+        """Leser totalene fra "State"-fanen (uten overskriftsraden).
+
+        Returns:
+            SeasonTotals | None: Totalene, eller None hvis ingenting er lagret
+        """
+        parsed = None
+        for row in rows:
+            row = list(row) + [""] * (len(TOTALS_HEADER) - len(row))
+            season, week, pid, name, total, before = row[: len(TOTALS_HEADER)]
+            try:
+                season, total = int(season), int(total)
+                week = int(week) if week else None
+            except (TypeError, ValueError):
+                continue
+            if parsed is None:
+                parsed = cls(season, week, before={} if before != "" else None)
+            parsed.names[pid] = name
+            parsed.totals[pid] = total
+            if parsed.before is not None:
+                parsed.before[pid] = int(before) if before else 0
+        if parsed is not None:
+            parsed.stored = len(rows)
+        return parsed
+
+    def to_rows(self) -> list[list]:
+        """Rader til "State"-fanen. Tippere som er borte blir tomme rader."""
+        ids = list(self.names) + [pid for pid in self.totals if pid not in self.names]
+        rows: list[list] = [
+            [
+                self.season,
+                self.week if self.week is not None else "",
+                pid,
+                self.names.get(pid, ""),
+                self.totals.get(pid, 0),
+                self.before.get(pid, 0) if self.before is not None else "",
+            ]
+            for pid in ids
+        ]
+        rows += [[""] * len(TOTALS_HEADER)] * (self.stored - len(rows))
+        return rows
@@ -0,0 +1,119 @@
+"""Arkivering av ferdige uker i Vestsk Tipping.
+
+Hovedarket vokser med én blokk per uke: en tom rad, én rad per kamp,
+"Ukespoeng" og "Sesongpoeng". Eksport og resultater leser hele arket, så
+eldre blokker flyttes til en egen fane per sesong ("Arkiv 2025"). I
+hovedarket står det bare igjen én "Overført"-rad med sesongpoengene ved
+arkiveringen, slik at neste uke fortsatt kan bygge videre på totalen.
+"""
+
+from dataclasses import dataclass, field
+import os
+
+# Antall ferdige uker som blir stående i hovedarket etter hver behandlet uke.
+# 0 slår av automatisk arkivering (kommandoen !arkiver virker uansett).
+ARCHIVE_KEEP_WEEKS = int(os.getenv("ARCHIVE_KEEP_WEEKS", "0"))
+# Antall uker !arkiver beholder når verken argument eller miljøvariabel er satt
+DEFAULT_KEEP_WEEKS = 4
+# Rad 1 (navn) og rad 2 (Discord-ID) blir alltid stående
+HEADER_ROWS = 2
+TOTAL_LABEL = "Sesongpoeng"
+CARRY_LABEL = "Overført"
+
+
+def archive_title(season: int) -> str:
+    """Navnet på arkivfanen for en sesong."""
+    return f"Arkiv {season}"
+
+
+def _label(row: list[str]) -> str:
+    return row[0].strip() if row else ""
+
+
+def week_blocks(rows: list[list[str]]) -> list[tuple[int, int]]:
+    """Finner de ferdige ukeblokkene i arket.
+
+    En blokk starter rett etter forrige "Sesongpoeng"- eller "Overført"-rad
+    (eller toppradene) og slutter på sin egen "Sesongpoeng"-rad. Rader etter
+    siste "Sesongpoeng" tilhører en uke som ikke er ferdig og tas ikke med.
+
+    Args:
+        rows (list[list[str]]): Alle rader i arket, som fra `get_all_values`
+
+    Returns:
+        list[tuple[int, int]]: (første, siste) radnummer per uke, 1-basert
+    """
+    blocks = []
+    start = HEADER_ROWS + 1
+    for number, row in enumerate(rows[HEADER_ROWS:], start=HEADER_ROWS + 1):
+        label = _label(row)
+        if label == CARRY_LABEL:
+            start = number + 1
+        elif label == TOTAL_LABEL:
+            blocks.append((start, number))
+            start = number + 1
+    return blocks
+
+
+@dataclass
+class ArchivePlan:
+    """Hva som skal flyttes fra hovedarket til arkivfanen.
+
+    Attributes:
+        weeks (int): Antall uker som arkiveres
+        rows (list[list[str]]): Radene som legges til i arkivfanen
+        delete_start (int): Første rad som slettes fra hovedarket
+        delete_end (int): Siste rad som slettes (inklusiv)
+        carry_row (int | None): "Sesongpoeng"-raden som blir stående som
+            "Overført", eller None når hele sesongen arkiveres
+    """
+
+    weeks: int
+    rows: list[list[str]] = field(default_factory=list)
+    delete_start: int = HEADER_ROWS + 1
+    delete_end: int = HEADER_ROWS
+    carry_row: int | None = None
+
+
+def plan_archive(
+    rows: list[list[str]], keep: int, whole_season: bool = False
+) -> ArchivePlan | None:
+    """Planlegger en arkivering uten å røre arket.
+
+    Args:
+        rows (list[list[str]]): Alle rader i hovedarket
+        keep (int): Antall nyeste ferdige uker som blir stående
+        whole_season (bool): Arkiver alle ferdige uker uten "Overført"-rad,
+            slik at neste sesong starter på null
+
+    Returns:
+        ArchivePlan | None: Planen, eller None hvis det ikke er noe å arkivere
+    """
+    blocks = week_blocks(rows)
+    archived = blocks if whole_season else blocks[: max(len(blocks) - keep, 0)]
+    last = archived[-1][1] if archived else 0
+    if whole_season:
+        # En "Overført"-rad fra forrige arkivering skal heller ikke bli stående
+        carried = [
+            number
+            for number, row in enumerate(rows, start=1)
+            if number > HEADER_ROWS and _label(row) == CARRY_LABEL
+        ]
+        last = max([last] + carried)
+    if not last:
+        return None
+
+    copied = []
+    for row in rows[HEADER_ROWS:last]:
+        if _label(row) == CARRY_LABEL:
+            continue
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        copied.append(row)
+
+    if whole_season:
+        return ArchivePlan(len(archived), copied, HEADER_ROWS + 1, last)
+    # Siste arkiverte "Sesongpoeng"-rad har allerede totalen, så den blir
+    # stående som "Overført" og alt over den (unntatt toppradene) slettes
+    return ArchivePlan(len(archived), copied, HEADER_ROWS + 1, last - 1, last)
@@ -0,0 +1,142 @@
+"""Indeks over hvilke rader hver uke har i Vestsk Tipping-arket.
+
+Eksporten vet hvor den skriver en uke, så den fører radene inn her. Da kan
+resultater og nye kjøringer lese akkurat de radene de trenger i stedet for å
+skanne hele arket. Indeksen lagres i "State"-fanen (kolonne D-H) ved siden av
+resten av tilstanden til botten. Uketallene starter på nytt hver sesong, så
+hver rad har også sesongen.
+"""
+
+from dataclasses import dataclass
+
+# Kolonnene i "State"-fanen indeksen bruker
+INDEX_HEADER = ["sesong", "uke", "forste_kamprad", "ukespoeng_rad", "sesongpoeng_rad"]
+INDEX_FIRST_COL = "D"
+INDEX_LAST_COL = "H"
+# Antall kolonner "State"-fanen må ha for å få plass til indeksen
+INDEX_MIN_COLS = 8
+
+
+@dataclass(frozen=True)
+class WeekRows:
+    """Radene til én uke i hovedarket (1-basert).
+
+    Attributes:
+        first (int): Første kamprad
+        ukespoeng (int): "Ukespoeng"-raden, rett etter siste kamp
+        sesongpoeng (int): "Sesongpoeng"-raden, rett etter "Ukespoeng"
+    """
+
+    first: int
+    ukespoeng: int
+    sesongpoeng: int
+
+    @property
+    def last_game(self) -> int:
+        return self.ukespoeng - 1
+
+    @property
+    def games(self) -> int:
+        return self.ukespoeng - self.first
+
+    @property
+    def previous_total(self) -> int:
+        """Raden med forrige totalsum ("Sesongpoeng" eller "Overført").
+
+        Eksporten legger alltid én tom rad mellom forrige uke og kampene.
+        """
+        return self.first - 2
+
+
+class SheetIndex:
+    """Uke → radene til uken i hovedarket for én sesong.
+
+    Args:
+        season (int): Sesongen (årstall)
+        weeks (dict[int, WeekRows] | None): Kjente uker
+    """
+
+    def __init__(self, season: int, weeks: dict[int, WeekRows] | None = None) -> None:
+        self.season = season
+        self.weeks = dict(weeks or {})
+        # Antall rader som sist ble lest/skrevet, så slettede uker kan tømmes
+        self.stored = len(self.weeks)
+
+    def get(self, week: int | None) -> WeekRows | None:
+        return self.weeks.get(week) if week else None
+
+    def record(self, week: int, first: int, games: int) -> WeekRows:
+        """Fører inn en uke med `games` kamper fra rad `first`."""
+        rows = WeekRows(first, first + games, first + games + 1)
+        self.weeks[week] = rows
+        return rows
+
+    def next_start(self) -> int | None:
+        """Første kamprad for neste uke, eller None uten kjente uker.
+
+        Plassen til "Ukespoeng" og "Sesongpoeng" holdes av selv om resultatene
+        for siste uke ikke er ført ennå.
+        """
+        if not self.weeks:
+            return None
+        return max(rows.sesongpoeng for rows in self.weeks.values()) + 2
+
+    def delete_rows(self, start: int, end: int) -> None:
+        """Oppdaterer indeksen etter at rad `start`-`end` er slettet fra arket.
+
+        Uker som begynte i det slettede området fjernes, og uker etter
+        flyttes opp.
+        """
+        removed = end - start + 1
+        self.weeks = {
+            week: (
+                WeekRows(
+                    rows.first - removed,
+                    rows.ukespoeng - removed,
+                    rows.sesongpoeng - removed,
+                )
+                if rows.first > end
+                else rows
+            )
+            for week, rows in self.weeks.items()
+            if not start <= rows.first <= end
+        }
+
+    @classmethod
+    def from_rows(cls, rows: list[list[str]], season: int) -> "SheetIndex":
+        """Leser indeksen fra "State"-fanen (uten overskriftsraden).
+
+        Rader fra andre sesonger og rader som ikke kan tolkes hoppes over.
+
+        Args:
+            rows (list[list[str]]): Verdiene i kolonne D-H fra rad 2
+            season (int): Sesongen som skal leses
+
+        Returns:
+            SheetIndex: Indeksen for sesongen
+        """
+        weeks = {}
+        for row in rows:
+            try:
+                row_season, week, first, ukespoeng, sesongpoeng = (
+                    int(v) for v in row[:5]
+                )
+            except (TypeError, ValueError):
+                continue
+            if row_season == season:
+                weeks[week] = WeekRows(first, ukespoeng, sesongpoeng)
+        index = cls(season, weeks)
+        index.stored = len(rows)
+        return index
+
+    def to_rows(self) -> list[list]:
+        """Rader til "State"-fanen, sortert på uke.
+
+        Uker som er fjernet siden sist lagring blir til tomme rader.
+        """
+        rows: list[list] = [
+            [self.season, week, r.first, r.ukespoeng, r.sesongpoeng]
+            for week, r in sorted(self.weeks.items())
+        ]
+        rows += [[""] * len(INDEX_HEADER)] * (self.stored - len(rows))
+        return rows
@@ -0,0 +1,90 @@
+"""Formler for "Ukespoeng" og "Sesongpoeng" i Vestsk Tipping-arket.
+
+I formelmodus (TIPPING_TOTALS_MODE=formel) skriver botten bare vinneren av
+hver kamp i en egen kolonne etter tipperne, og formler i "Ukespoeng"- og
+"Sesongpoeng"-radene. Google regner ut poengene, og botten leser bare de to
+radene tilbake til Discord-meldingen.
+
+Formlene bruker ingen argumentskilletegn (komma eller semikolon), så de
+tolkes likt uansett språkinnstilling i arket.
+"""
+
+import os
+
+from cogs.sheets import col_letter
+
+WINNER_HEADER = "Vinner"
+
+
+def formula_mode() -> bool:
+    """Om ukespoeng og sesongpoeng skal regnes ut av formler i arket."""
+    return os.getenv("TIPPING_TOTALS_MODE", "bot") == "formel"
+
+
+def winner_column(num_players: int) -> int:
+    """Kolonnen med kampvinnere, rett etter siste tipper (1-basert)."""
+    return 2 + num_players
+
+
+def _runs(rows: list[int]) -> list[tuple[int, int]]:
+    """Sammenhengende (første, siste) rader i en sortert liste."""
+    runs: list[tuple[int, int]] = []
+    for row in rows:
+        if runs and runs[-1][1] == row - 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+def week_updates(
+    winners: dict[int, str],
+    num_players: int,
+    uke_row: int,
+    previous_total: int | None,
+) -> list[dict]:
+    """Vinnere og formler for én uke, til `Worksheet.batch_update`.
+
+    Args:
+        winners (dict[int, str]): Kamprad → vinner ("Uavgjort" ved uavgjort)
+        num_players (int): Antall tippere (kolonne B og utover)
+        uke_row (int): Raden "Ukespoeng" skrives i, "Sesongpoeng" kommer under
+        previous_total (int | None): Raden med forrige totalsum, om noen
+
+    Returns:
+        list[dict]: Områder og verdier, f.eks. {"range": "J4:J19", "values": ...}
+    """
+    winner_col = col_letter(winner_column(num_players))
+    runs = _runs(sorted(winners))
+    data = [{"range": f"{winner_col}1", "values": [[WINNER_HEADER]]}]
+    for first, last in runs:
+        data.append(
+            {
+                "range": f"{winner_col}{first}:{winner_col}{last}",
+                "values": [[winners[row]] for row in range(first, last + 1)],
+            }
+        )
+
+    uke = ["Ukespoeng"]
+    sesong = ["Sesongpoeng"]
+    for col in range(2, 2 + num_players):
+        letter = col_letter(col)
+        terms = []
+        for first, last in runs:
+            picks = f"{letter}{first}:{letter}{last}"
+            answers = f"{winner_col}{first}:{winner_col}{last}"
+            terms.append(f'SUMPRODUCT(({picks}={answers})*({answers}<>""))')
+        uke.append("=" + ("+".join(terms) or "0"))
+        # Vanlig addisjon, fordi tall skrevet som tekst av botten regnes med
+        sesong.append(
+            f"={letter}{previous_total}+{letter}{uke_row}"
+            if previous_total
+            else f"={letter}{uke_row}"
+        )
+    data.append(
+        {
+            "range": f"A{uke_row}:{col_letter(1 + num_players)}{uke_row + 1}",
+            "values": [uke, sesong],
+        }
+    )
+    return data
@@ -0,0 +1,178 @@
+"""Monte Carlo-projeksjon av sesongtabellen i Vestsk Tipping.
+
+Resten av NFL-grunnserien simuleres med numpy. For hver kamp brukes
+sannsynligheten for hjemmeseier fra oddsen i ESPN sitt scoreboard
+(moneyline uten margin), eller en fast hjemmefordel når odds mangler.
+
+Hver tipper modelleres ut fra historikken i arket: tipperen følger oddsen,
+men forskjøvet med sin egen tendens til å tippe hjemmelaget oftere eller
+sjeldnere enn snittet. Alle kamper, tippere og simuleringer i en uke regnes
+ut samtidig som en array (simuleringer × tippere × kamper), og løkken går
+bare over gjenværende uker.
+"""
+
+import os
+from typing import Any, Iterable
+
+from core.utils.lazy_import import LazyImport
+
+np = LazyImport("numpy")
+
+# Antall simulerte sesonger
+SIMULATIONS = int(os.getenv("TIPPING_SIMULATIONS", "20000"))
+# Antall uker i NFL-grunnserien
+REGULAR_SEASON_WEEKS = 18
+# Sannsynlighet for hjemmeseier når scoreboardet ikke har odds
+HOME_WIN_PROB = 0.57
+# Tippesannsynligheter holdes innenfor dette intervallet
+_MIN_PICK_PROB = 0.02
+
+
+def moneyline_prob(home_ml: float | None, away_ml: float | None) -> float | None:
+    """Gjør moneyline-odds om til sannsynlighet for hjemmeseier.
+
+    Bookmakerens margin fjernes ved å normalisere de to implisitte
+    sannsynlighetene.
+
+    Args:
+        home_ml (float | None): Moneyline for hjemmelaget, f.eks. -150
+        away_ml (float | None): Moneyline for bortelaget, f.eks. +130
+
+    Returns:
+        float | None: Sannsynlighet for hjemmeseier, eller None uten odds
+    """
+
+    def implied(ml: float) -> float:
+        return -ml / (-ml + 100) if ml < 0 else 100 / (ml + 100)
+
+    try:
+        home, away = implied(float(home_ml)), implied(float(away_ml))
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    if home + away <= 0:
+        return None
+    return home / (home + away)
+
+
+def game_probabilities(events: Iterable[dict]) -> list[float]:
+    """Sannsynlighet for hjemmeseier for hver kamp i et scoreboard.
+
+    Ferdigspilte kamper får 1.0 eller 0.0 (0.5 ved uavgjort).
+
+    Args:
+        events (Iterable[dict]): `events` fra ESPN sitt scoreboard
+
+    Returns:
+        list[float]: Én sannsynlighet per kamp
+    """
+    probs: list[float] = []
+    for ev in events:
+        comp = ev.get("competitions", [{}])[0]
+        competitors = comp.get("competitors", [])
+        home = next((c for c in competitors if c.get("homeAway") == "home"), {})
+        away = next((c for c in competitors if c.get("homeAway") == "away"), {})
+
+        if ev.get("status", {}).get("type", {}).get("completed"):
+            home_score = int(home.get("score") or 0)
+            away_score = int(away.get("score") or 0)
+            if home_score == away_score:
+                probs.append(0.5)
+            else:
+                probs.append(1.0 if home_score > away_score else 0.0)
+            continue
+
+        prob = None
+        for odds in comp.get("odds", []):
+            prob = moneyline_prob(
+                odds.get("homeTeamOdds", {}).get("moneyLine"),
+                odds.get("awayTeamOdds", {}).get("moneyLine"),
+            )
+            if prob is not None:
+                break
+        probs.append(HOME_WIN_PROB if prob is None else prob)
+    return probs
+
+
+def pick_tendencies(rows: Iterable[list[str]], num_tippers: int) -> list[float]:
+    """Hvor ofte hver tipper har tippet hjemmelaget så langt.
+
+    Kamprader kjennes igjen på kampkoden "Borte@Hjemme" i kolonne A, og
+    tippene står i kolonnene etter. Et lite tillegg (Laplace) gjør at nye
+    tippere starter på 50 %.
+
+    Args:
+        rows (Iterable[list[str]]): Alle rader i arket
+        num_tippers (int): Antall tippere (kolonner etter kolonne A)
+
+    Returns:
+        list[float]: Andel hjemmetips per tipper
+    """
+    home_picks = [1] * num_tippers
+    picks = [2] * num_tippers
+    for row in rows:
+        if not row or "@" not in row[0]:
+            continue
+        away, _, home = row[0].strip().partition("@")
+        for t in range(num_tippers):
+            value = row[t + 1].strip() if t + 1 < len(row) else ""
+            if value in (home, away):
+                picks[t] += 1
+                home_picks[t] += value == home
+    return [h / n for h, n in zip(home_picks, picks)]
+
+
+def simulate_season(
+    totals: list[int],
+    weeks: list[list[float]],
+    home_rates: list[float],
+    simulations: int = SIMULATIONS,
+    seed: Any = None,
+) -> list[float]:
+    """Simulerer resten av sesongen og gir hver tippers vinnersjanse.
+
+    Delt førsteplass gir en like stor andel til hver av de delte vinnerne.
+
+    Args:
+        totals (list[int]): Sesongpoeng så langt per tipper
+        weeks (list[list[float]]): Sannsynlighet for hjemmeseier per kamp,
+            én liste per gjenværende uke
+        home_rates (list[float]): Andel hjemmetips per tipper
+        simulations (int): Antall simulerte sesonger
+        seed (Any): Frø for reproduserbare resultater
+
+    Returns:
+        list[float]: Sannsynlighet for å vinne sesongen per tipper
+    """
+    rng = np.random.default_rng(seed)
+    tippers = len(totals)
+    points = np.tile(np.asarray(totals, dtype=float), (simulations, 1))
+    bias = np.asarray(home_rates) - np.mean(home_rates)
+
+    for probs in weeks:
+        if not probs:
+            continue
+        p_home = np.asarray(probs)
+        pick_home = np.clip(
+            p_home[None, :] + bias[:, None], _MIN_PICK_PROB, 1 - _MIN_PICK_PROB
+        )
+        home_won = rng.random((simulations, 1, len(probs))) < p_home
+        picked_home = rng.random((simulations, tippers, len(probs))) < pick_home
+        points += (picked_home == home_won).sum(axis=2)
+
+    leaders = points == points.max(axis=1, keepdims=True)
+    share = leaders / leaders.sum(axis=1, keepdims=True)
+    return [float(x) for x in share.mean(axis=0)]
+
+
+def format_projection(names: list[str], probs: list[float]) -> list[str]:
+    """Formaterer vinnersjansene som linjer til resultatmeldingen.
+
+    Args:
+        names (list[str]): Tippernavn
+        probs (list[float]): Vinnersjanse per tipper
+
+    Returns:
+        list[str]: Linjer, sortert etter sjanse
+    """
+    rows = sorted(zip(names, probs), key=lambda row: row[1], reverse=True)
+    return [f"{i}. {name:<10} {prob:.0%}" for i, (name, prob) in enumerate(rows, 1)]
@@ -0,0 +1,55 @@
+"""Tester for benchmarkene og de falske tjenestene i core.fakes"""
+
+import pytest
+
+from benchmarks.run import compare, lineup_problems, run_all
+
+
+@pytest.mark.asyncio
+async def test_weekly_pipeline_against_fakes():
+    """Tester at hele ukesprosesseringen går gjennom mot fakes og teller kall."""
+    runs = await run_all([30], [18], latency=0.0, simulations=200)
+    by_name = {run["pipeline"]: run for run in runs}
+
+    assert set(by_name) == {"eksport", "resultater", "ppr", "digest", "lineup"}
+    # Eksporten leser reaksjonene per kamp og skriver alt i ett kall
+    assert by_name["eksport"]["calls"]["sheets.update_cells"] == 1
+    assert by_name["eksport"]["calls"]["discord.reaction_users"] == 32
+    assert by_name["resultater"]["calls"]["espn.scoreboard"] == 1
+    assert by_name["digest"]["weeks"] == 16
+    assert all(run["wall_seconds"] >= 0 for run in runs)
+    assert by_name["lineup"]["brute_force_seconds"] > 0
+
+
+def test_compare_flags_more_calls_and_slower_runs():
+    """Tester at flere kall og tregere kjøring regnes som regresjon."""
+    old = {
+        "latency_ms": 5,
+        "runs": [
+            {
+                "pipeline": "resultater",
+                "tippers": 8,
+                "weeks": 1,
+                "wall_seconds": 1.0,
+                "calls": {"sheets.cell": 26},
+            }
+        ],
+    }
+    new = {
+        "latency_ms": 5,
+        "runs": [dict(old["runs"][0], wall_seconds=1.1, calls={"sheets.cell": 27})],
+    }
+    problems = compare(new, old, tolerance=0.25)
+    assert len(problems) == 1 and "sheets.cell 26 → 27" in problems[0]
+
+    new["runs"][0]["wall_seconds"] = 2.0
+    assert len(compare(new, old, tolerance=0.25)) == 2
+    assert not compare(old, old, tolerance=0.25)
+
+
+def test_lineup_slower_than_brute_force_is_flagged():
+    """Tester at optimal oppstilling tregere enn brute force regnes som regresjon."""
+    run = {"pipeline": "lineup", "tippers": None, "weeks": 16}
+    assert not lineup_problems([dict(run, wall_seconds=0.01, brute_force_seconds=0.4)])
+    problems = lineup_problems([dict(run, wall_seconds=0.5, brute_force_seconds=0.4)])
+    assert len(problems) == 1 and "brute force" in problems[0]
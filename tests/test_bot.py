@@ -0,0 +1,65 @@
+"""Tester for cog-lastingen i bot.py"""
+
+import sys
+import textwrap
+
+import pytest
+
+from core import bot as bot_module
+
+PACKAGE = "bot_test_cogs"
+
+
+@pytest.fixture(name="cog_package")
+def fixture_cog_package(tmp_path, monkeypatch):
+    """Lager en pakke med to fungerende cogs og én som feiler ved import."""
+    package = tmp_path / PACKAGE
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "runs.py").write_text("RUNS = []\n")
+    (package / "heavy.py").write_text("VALUE = 42\n")
+    cog_body = textwrap.dedent(f"""
+        from {PACKAGE} import heavy
+        from {PACKAGE}.runs import RUNS
+
+        RUNS.append(__name__)
+
+
+        async def setup(bot):
+            pass
+        """)
+    (package / "good.py").write_text(cog_body)
+    (package / "other.py").write_text(cog_body)
+    (package / "bad.py").write_text("raise RuntimeError('ødelagt cog')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cogs = [f"{PACKAGE}.good", f"{PACKAGE}.bad", f"{PACKAGE}.other"]
+    monkeypatch.setattr(bot_module, "COGS", cogs)
+    yield cogs
+    for name in [m for m in sys.modules if m.startswith(PACKAGE)]:
+        del sys.modules[name]
+
+
+def test_warm_imports_dependencies_not_the_cog(cog_package):
+    """Tester at oppvarmingen importerer avhengighetene, men ikke selve cogen."""
+    bot_module._warm_cog_imports(cog_package[0])  # pylint: disable=protected-access
+
+    assert f"{PACKAGE}.heavy" in sys.modules
+    assert cog_package[0] not in sys.modules
+
+
+@pytest.mark.asyncio
+async def test_load_cogs_runs_each_cog_once_and_skips_failures(cog_package):
+    """Tester at en feilende cog gir None uten å stoppe de andre."""
+    good, bad, other = cog_package
+
+    assert await bot_module.load_cog(bad) is None
+    timings = await bot_module.load_cogs()
+
+    assert set(timings) == {good, other}
+    assert bad not in bot_module.bot.extensions
+    # Cog-modulen kjøres bare av load_extension, ikke i tråden i tillegg
+    runs = sys.modules[f"{PACKAGE}.runs"].RUNS
+    assert sorted(runs) == [good, other]
+
+    for name in timings:
+        await bot_module.bot.unload_extension(name)
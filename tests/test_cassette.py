@@ -0,0 +1,67 @@
+"""Tester for opptak og avspilling av ukeprosesseringen."""
+
+import subprocess
+import sys
+
+import pytest
+
+from core.cassette import Cassette, _Session, record_fake, replay
+
+
+@pytest.mark.asyncio
+async def test_replay_of_recording_matches(tmp_path):
+    """Tester at en kassett spilles av med samme kall og skrivinger."""
+    recorded = await record_fake(week=4, tippers=5)
+    path = tmp_path / "uke_4.json"
+    recorded.save(str(path))
+
+    report = await replay(Cassette.load(str(path)))
+
+    assert report["ok"]
+    assert report["diff"] == []
+    assert report["unused"] == 0
+    assert {row["status"] for row in report["timeline"]} == {"lik"}
+    ops = [(row["service"], row["op"]) for row in report["timeline"]]
+    assert ("discord", "reaction_users") in ops
+    assert ops.count(("sheets", "update_cells")) == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_diffs_changed_writes():
+    """Tester at endrede ESPN-svar gir diff i skrivingene."""
+    cassette = await record_fake(week=3, tippers=4)
+    for interaction in cassette.interactions:
+        if (
+            interaction["service"] == "espn"
+            and "week=3" in interaction["request"]["url"]
+        ):
+            for event in interaction["response"]["events"]:
+                for competitor in event["competitions"][0]["competitors"]:
+                    competitor["score"] = "0"
+
+    report = await replay(cassette)
+
+    assert report["ok"]
+    # Alle kampene blir uavgjort, så ukespoeng og meldingen endres
+    changed = [line for line in report["diff"] if line[:1] in "+-"]
+    assert any(line.startswith("-") and "Poeng for uke 3" in line for line in changed)
+    assert any(line.startswith("+") and "Poeng for uke 3" in line for line in changed)
+
+
+def test_cog_import_does_not_load_recorder():
+    """Tester at cogen ikke laster opptaket, mock eller fakes ved import."""
+    code = (
+        "import sys, cogs.vestsk_tipping; "
+        "print([m for m in ('core.cassette', 'core.fakes', 'unittest.mock') "
+        "if m in sys.modules])"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_session_is_abstract():
+    """Tester at en økt må implementere ark- og ESPN-kallene."""
+    with pytest.raises(TypeError):
+        _Session()  # pylint: disable=abstract-class-instantiated
@@ -0,0 +1,61 @@
+"""Tester for diagnostics.py"""
+
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from cogs.diagnostics import Diagnostics
+from core import metrics, perf, profiler
+
+
+@pytest.mark.asyncio
+async def test_metrikker_lists_operations():
+    """Sjekker at !metrikker viser registrerte operasjoner med filter."""
+    metrics.observe("espn.scoreboard", 0.4)
+    metrics.observe("sheets.get_all_values", 1.2)
+    cog = Diagnostics(MagicMock())
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.metrikker.callback(cog, ctx, "espn")
+
+    sent = ctx.send.call_args[0][0]
+    assert "espn.scoreboard" in sent
+    assert "sheets.get_all_values" not in sent
+
+
+@pytest.mark.asyncio
+async def test_perf_lists_command_percentiles():
+    """Sjekker at !perf viser kommandoer fra det rullerende vinduet."""
+    for seconds in (0.1, 0.2, 3.0):
+        perf.record("resultater", seconds)
+    cog = Diagnostics(MagicMock())
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.perf.callback(cog, ctx)
+
+    sent = ctx.send.call_args[0][0]
+    assert "resultater" in sent
+    assert "3.00" in sent
+
+
+@pytest.mark.asyncio
+async def test_timed_profile_runs_in_background():
+    """Sjekker at !profil N svarer med en gang og poster profilen etterpå."""
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot = MagicMock()
+    bot.get_channel.return_value = channel
+    cog = Diagnostics(bot)
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+
+    await cog.profil.callback(cog, ctx, "1")
+
+    assert profiler.is_running()
+    assert not cog.profile_task.done()
+    channel.send.assert_not_awaited()
+
+    await cog.profile_task
+    assert not profiler.is_running()
+    channel.send.assert_awaited_once()
@@ -0,0 +1,55 @@
+"""Tester for error_reporter.py"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from core import error_reporter
+
+
+@pytest.fixture(name="admin_channel")
+def fixture_admin_channel():
+    """Kobler feilrapporteringen til en dummy-bot og rydder opp etterpå."""
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot = MagicMock()
+    bot.get_channel.return_value = channel
+    error_reporter.setup_error_reporting(bot, window=0.05)
+    yield channel
+    error_reporter.setup_error_reporting(None)
+    error_reporter._pending.clear()
+
+
+@pytest.mark.asyncio
+async def test_identical_errors_grouped_into_one_summary(admin_channel):
+    """Sjekker at like feil gir én oppsummering med antall."""
+    for week in range(5):
+        error_reporter.report_error(
+            "vestsk.save_state", TimeoutError(f"Sheets svarte ikke (uke {week})")
+        )
+    error_reporter.report_error("fantasy.inactive_alert", ValueError("ESPN nede"))
+
+    await asyncio.sleep(0.1)
+
+    admin_channel.send.assert_awaited_once()
+    summary = admin_channel.send.call_args[0][0]
+    assert "6 feil fordelt på 2 type(r)" in summary
+    assert "`vestsk.save_state` TimeoutError" in summary
+    assert "×5" in summary
+    assert "×1" in summary
+
+
+def test_fingerprint_ignores_numbers():
+    """Sjekker at tall ikke skiller ellers like feil."""
+    assert error_reporter.fingerprint(
+        "a", "APIError", "uke 5 feilet (id 123)"
+    ) == error_reporter.fingerprint("a", "APIError", "uke 6 feilet (id 9)")
+
+
+def test_ring_buffer_newest_first():
+    """Sjekker at ringbufferen viser nyeste feil først."""
+    error_reporter.report_error("test.buffer", "første")
+    error_reporter.report_error("test.buffer", "andre")
+    recent = error_reporter.recent_errors(2)
+    assert [entry.message for entry in recent] == ["andre", "første"]
+    error_reporter._pending.clear()
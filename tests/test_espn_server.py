@@ -0,0 +1,99 @@
+"""Tester for den lokale ESPN-stand-in-serveren."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from core.fakes.espn_server import WEEK_STEPS, FakeESPNServer, SeasonClock
+from core.utils import espn_helpers
+
+SCOREBOARD_PATH = "/apis/site/v2/sports/football/nfl/scoreboard"
+
+
+@pytest.mark.asyncio
+async def test_scoreboard_follows_clock():
+    """Tester at kampene går fra planlagt via pågående til ferdige."""
+    server = FakeESPNServer(SeasonClock(week=3))
+    base_url = await server.start()
+    try:
+        url = f"{base_url}{SCOREBOARD_PATH}"
+        before = await espn_helpers.fetch_espn_json(url)
+        assert {e["status"]["type"]["state"] for e in before["events"]} == {"pre"}
+        assert before["leagues"][0]["calendar"][0]["entries"][2]["value"] == "3"
+
+        server.clock.advance(2)
+        live = await espn_helpers.fetch_espn_json(url)
+        first = live["events"][0]
+        assert first["status"]["type"]["name"] == "STATUS_IN_PROGRESS"
+        assert live["events"][1]["status"]["type"]["state"] == "pre"
+
+        server.clock.advance(WEEK_STEPS - 2)
+        final = await espn_helpers.fetch_espn_json(url)
+        assert all(e["status"]["type"]["completed"] for e in final["events"])
+        pairs = zip(
+            first["competitions"][0]["competitors"],
+            final["events"][0]["competitions"][0]["competitors"],
+        )
+        assert all(int(a["score"]) <= int(b["score"]) for a, b in pairs)
+
+        # Uker som allerede er spilt er ferdige, uansett klokkens steg
+        old = await espn_helpers.fetch_espn_json(f"{url}?week=1")
+        assert all(e["status"]["type"]["completed"] for e in old["events"])
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_and_latency():
+    """Tester at feil fra /_control og forsinkelse treffer neste forespørsel."""
+    server = FakeESPNServer()
+    base_url = await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{base_url}/_control/set?fail_next=503,429&latency_ms=20"
+            ) as resp:
+                assert resp.status == 200
+            statuses = []
+            for _ in range(3):
+                async with session.get(f"{base_url}{SCOREBOARD_PATH}") as resp:
+                    statuses.append(resp.status)
+        assert statuses == [503, 429, 200]
+        assert server.calls[SCOREBOARD_PATH] == 3
+        assert server.latency == pytest.approx(0.02)
+    finally:
+        await server.close()
+
+
+@pytest.mark.asyncio
+async def test_get_league_against_server(monkeypatch):
+    """Tester at get_league og box_scores fungerer mot serveren via base-URL."""
+    server = FakeESPNServer(SeasonClock(week=4), num_teams=8)
+    base_url = await server.start()
+    # get_league endrer konstanten i espn_api; monkeypatch setter den tilbake
+    monkeypatch.setattr(
+        espn_helpers.espn_requests,
+        "FANTASY_BASE_ENDPOINT",
+        espn_helpers.espn_requests.FANTASY_BASE_ENDPOINT,
+    )
+    for key, value in {
+        "ESPN_FANTASY_BASE_URL": base_url,
+        "ESPN_LEAGUE_ID": "1",
+        "ESPN_YEAR": "2025",
+        "ESPN_S2": "s2",
+        "ESPN_SWID": "swid",
+    }.items():
+        monkeypatch.setenv(key, value)
+    try:
+        league = await asyncio.to_thread(espn_helpers.get_league)
+        assert league.current_week == 4
+        assert len(league.teams) == 8
+        assert all(team.wins + team.losses == 3 for team in league.teams)
+
+        boxes = await asyncio.to_thread(league.box_scores, 3)
+        assert len(boxes) == 4
+        assert boxes[0].home_team in league.teams
+        assert len(boxes[0].home_lineup) == 15
+    finally:
+        await server.close()
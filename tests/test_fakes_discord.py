@@ -0,0 +1,58 @@
+"""Tester for Discord-simulatoren i core/fakes/discord.py."""
+
+from collections import Counter
+
+import pytest
+
+from core.fakes.discord import (
+    PAGE_SIZE,
+    FakeBot,
+    RateLimiter,
+    build_season_channel,
+)
+from core.fakes.sheets import tipper_ids
+
+
+@pytest.mark.asyncio
+async def test_history_pages_and_order():
+    """Tester sidevis historikk med rekkefølge som i discord.py."""
+    calls: Counter = Counter()
+    bot = FakeBot()
+    channel = build_season_channel(
+        18, tipper_ids(8), bot.user, chatter=100, calls=calls
+    )
+    assert len(channel.messages) > 2000
+
+    newest = [msg async for msg in channel.history(limit=250)]
+    assert calls["discord.history"] == 3
+    assert newest[0] is channel.messages[-1]
+    assert all(a.created_at >= b.created_at for a, b in zip(newest, newest[1:]))
+
+    after = channel.messages[-PAGE_SIZE - 1].created_at
+    oldest_first = [msg async for msg in channel.history(limit=None, after=after)]
+    assert oldest_first == channel.messages[-PAGE_SIZE:]
+
+    game = next(msg for msg in reversed(channel.messages) if msg.reactions)
+    users = [user async for user in game.reactions[0].users()]
+    assert bot.user in users and len(users) == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_counts_waits_per_route():
+    """Tester at tomme bøtter gir ventetid på riktig rute uten å sove."""
+    limits = RateLimiter({"discord.history": (5, 5.0)}, time_scale=0)
+    bot = FakeBot()
+    channel = build_season_channel(18, tipper_ids(8), bot.user, limits=limits)
+
+    async for _ in channel.history(limit=None):
+        pass
+    await channel.send("hei")
+
+    # 18 uker * 17 meldinger gir 4 sider; den femte ville ventet
+    assert limits.limited == Counter()
+    for _ in range(2):
+        async for _ in channel.history(limit=None):
+            pass
+    assert limits.limited["discord.history"] == 2
+    assert limits.waited["discord.history"] == pytest.approx(2 * 5.0, abs=0.5)
+    assert "discord.send" not in limits.waited
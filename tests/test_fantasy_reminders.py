@@ -1,11 +1,13 @@
 """Tester for fantasy_reminders.py"""
 
 from unittest.mock import AsyncMock, Mock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 import pytest
 import pytz
 
 from cogs.fantasy_reminders import FantasyReminders, setup
+from core.utils.kickoff_index import KickoffIndex
 
 
 @pytest.fixture(name="mock_bot")
@@ -92,6 +94,121 @@ class TestFantasyReminders:
 
             mock_channel.send.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_player_kickoff_uses_index(self, mock_bot):
+        """Tester at kampstart slås opp i indeksen før schedule-skanning."""
+        kickoff = datetime(2025, 9, 14, 17, 0, tzinfo=pytz.utc)
+        index = KickoffIndex(by_team={"DET": kickoff}, kickoffs=[kickoff])
+        with patch.object(FantasyReminders, "reminder_scheduler", return_value=None):
+            cog = FantasyReminders(mock_bot)
+
+        player = Mock(spec=["proTeam", "schedule"], proTeam="DET", schedule={})
+        assert cog._player_kickoff(player, index) == kickoff
+        bye = Mock(spec=["proTeam", "schedule"], proTeam="BUF", schedule={})
+        assert cog._player_kickoff(bye, index) is None
+
+    @pytest.mark.asyncio
+    async def test_inactive_alert_sent_once_per_change(self, mock_bot, mock_channel):
+        """Tester at en inaktiv starter varsles én gang, og at benking fjerner den."""
+        kickoff = datetime.now(pytz.utc) + timedelta(minutes=30)
+        index = KickoffIndex(by_team={"DET": kickoff}, kickoffs=[kickoff])
+        out_player = SimpleNamespace(
+            playerId=7,
+            name="Jahmyr",
+            lineupSlot="RB",
+            injuryStatus="OUT",
+            proTeam="DET",
+        )
+        league = SimpleNamespace(
+            teams=[SimpleNamespace(team_id=3, team_name="Lag 3", roster=[out_player])]
+        )
+        with patch.object(FantasyReminders, "reminder_scheduler", return_value=None):
+            cog = FantasyReminders(mock_bot)
+
+        with patch("cogs.fantasy_reminders.get_league", return_value=league):
+            await cog._check_inactive_players(index, mock_channel, None, {3: "42"})
+            await cog._check_inactive_players(index, mock_channel, None, {3: "42"})
+            mock_channel.send.assert_awaited_once()
+            assert "<@42>" in mock_channel.send.call_args[0][0]
+
+            out_player.lineupSlot = "BE"
+            await cog._check_inactive_players(index, mock_channel, None, {3: "42"})
+            assert not cog.pending_inactive
+
+    @pytest.mark.asyncio
+    async def test_inactive_check_gets_kickoff_from_index(self, mock_bot, mock_channel):
+        """Tester at spillere uten schedule får kampstart fra indeksen."""
+        now = datetime.now(pytz.utc)
+        soon, later = now + timedelta(minutes=30), now + timedelta(hours=3)
+        index = KickoffIndex(
+            by_team={"DET": soon, "BUF": later}, kickoffs=sorted([soon, later])
+        )
+        roster = [
+            SimpleNamespace(
+                playerId=player_id,
+                name=name,
+                lineupSlot="RB",
+                injuryStatus="OUT",
+                proTeam=pro_team,
+            )
+            for player_id, name, pro_team in ((7, "Jahmyr", "DET"), (8, "James", "BUF"))
+        ]
+        league = SimpleNamespace(
+            teams=[SimpleNamespace(team_id=3, team_name="Lag 3", roster=roster)]
+        )
+        with patch.object(FantasyReminders, "reminder_scheduler", return_value=None):
+            cog = FantasyReminders(mock_bot)
+
+        with patch("cogs.fantasy_reminders.get_league", return_value=league):
+            await cog._check_inactive_players(index, mock_channel, None, {3: "42"})
+
+        message = mock_channel.send.call_args[0][0]
+        assert f"Jahmyr (OUT) starter ca. kl {soon.astimezone(cog.norsk_tz):%H:%M}" in (
+            message
+        )
+        # Kampen om tre timer er utenfor varslingsvinduet
+        assert "James" not in message
+        assert 8 in {event.player_id for event in cog.pending_inactive.values()}
+
+    @pytest.mark.asyncio
+    async def test_digest_precomputed_and_sent_from_cache(
+        self, mock_bot, mock_channel, tmp_path
+    ):
+        """Tester at digesten beregnes, lagres og sendes fra cachen uten ESPN-kall."""
+        home = SimpleNamespace(team_id=1, team_name="Hjem", wins=2, losses=0)
+        away = SimpleNamespace(team_id=2, team_name="Borte", wins=0, losses=2)
+        box = SimpleNamespace(
+            home_team=home,
+            away_team=away,
+            home_score=120.5,
+            away_score=99.0,
+            home_lineup=[],
+            away_lineup=[],
+            home_projected=110.0,
+            away_projected=105.0,
+        )
+        league = Mock(current_week=6, year=2025, teams=[])
+        league.box_scores = Mock(return_value=[box])
+        with patch.object(FantasyReminders, "reminder_scheduler", return_value=None):
+            cog = FantasyReminders(mock_bot)
+
+        with patch(
+            "cogs.fantasy_reminders.DIGEST_CACHE", str(tmp_path / "digest.json")
+        ), patch("core.utils.season_stats.STATS_CACHE", str(tmp_path / "stats.json")):
+            with patch("cogs.fantasy_reminders.get_league", return_value=league):
+                digest = await cog.compute_matchup_digest(finished_week=5)
+            assert {c.kwargs["week"] for c in league.box_scores.call_args_list} == {
+                5,
+                6,
+            }
+            assert digest["awards"]["toppscorer"]["value"] == 120.5
+            cog._save_digest(cog._digest_key(datetime.now(cog.norsk_tz)), digest)
+
+            with patch("cogs.fantasy_reminders.get_league") as get_league_mock:
+                await cog.build_matchup_digest(mock_channel)
+                get_league_mock.assert_not_called()
+        assert "**Hjem (120.50)**" in mock_channel.send.call_args[0][0]
+
     @pytest.mark.asyncio
     async def test_setup_function(self, mock_bot):
         """Tester at setup-funksjonen virker."""
@@ -0,0 +1,69 @@
+"""Tester for keep_alive.py (helse- og metrikkserveren)."""
+
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from core import health
+from core.keep_alive import create_app
+
+
+def make_bot(ready=True, latency=0.05):
+    """Lager en dummy-bot med de attributtene helsesjekken bruker."""
+    bot = MagicMock()
+    bot.is_ready.return_value = ready
+    bot.is_closed.return_value = False
+    bot.latency = latency
+    bot.ws = None
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_health_reports_status():
+    """Sjekker at /health gir 200 og rapporterer scheduler og siste kall."""
+
+    async def forever():
+        await asyncio.sleep(3600)
+
+    task = asyncio.create_task(forever())
+    health.register_task("test.scheduler", task)
+    health.record_success("espn")
+    try:
+        async with TestClient(TestServer(create_app(make_bot()))) as client:
+            resp = await client.get("/health")
+            assert resp.status == 200
+            data = await resp.json()
+    finally:
+        task.cancel()
+
+    assert data["ok"] is True
+    assert data["gateway_latency_seconds"] == pytest.approx(0.05)
+    assert data["schedulers"]["test.scheduler"] == "running"
+    assert "espn" in data["last_success_seconds_ago"]
+
+
+@pytest.mark.asyncio
+async def test_health_unavailable_when_not_ready():
+    """Sjekker at /health gir 503 før botten er klar."""
+    bot = make_bot(ready=False, latency=float("inf"))
+    async with TestClient(TestServer(create_app(bot))) as client:
+        resp = await client.get("/health")
+        assert resp.status == 503
+        data = await resp.json()
+    assert data["gateway_latency_seconds"] is None
+
+
+@pytest.mark.asyncio
+async def test_metrics_prometheus_format():
+    """Sjekker at /metrics gir tekst i Prometheus-format."""
+    async with TestClient(TestServer(create_app(make_bot()))) as client:
+        resp = await client.get("/metrics")
+        assert resp.status == 200
+        body = await resp.text()
+        root = await client.get("/")
+        assert await root.text() == "Bot is running!"
+
+    assert "# TYPE tippebot_up gauge" in body
+    assert "tippebot_up 1" in body
+    assert "tippebot_gateway_latency_seconds 0.05" in body
@@ -0,0 +1,67 @@
+"""Tester for kickoff_index.py"""
+
+from datetime import datetime, timezone
+
+from core.utils.kickoff_index import KickoffIndex
+
+
+def event(date, away, home):
+    """Lager en minimal scoreboard-event."""
+    return {
+        "date": date,
+        "competitions": [
+            {
+                "competitors": [
+                    {"homeAway": "away", "team": {"abbreviation": away}},
+                    {"homeAway": "home", "team": {"abbreviation": home}},
+                ]
+            }
+        ],
+    }
+
+
+SCOREBOARD = {
+    "events": [
+        event("2025-09-12T00:20Z", "WSH", "GB"),
+        event("2025-09-14T17:00Z", "CHI", "DET"),
+        event("2025-09-14T17:00Z", "NE", "MIA"),
+        event("2025-09-14T20:25Z", "DEN", "IND"),
+        event("2025-09-14T20:05Z", "SF", "NO"),
+        event("2025-09-16T00:15Z", "LAC", "LV"),
+    ]
+}
+
+
+def test_lookup_by_pro_team():
+    """Sjekker oppslag fra lagforkortelse til kampstart."""
+    index = KickoffIndex.from_scoreboard(SCOREBOARD)
+    assert index.kickoff_for("wsh") == datetime(2025, 9, 12, 0, 20, tzinfo=timezone.utc)
+    assert index.kickoff_for("BUF") is None
+    assert index.kickoff_for(None) is None
+
+
+def test_clusters_group_same_window():
+    """Sjekker at kamper i samme vindu havner i samme klynge."""
+    index = KickoffIndex.from_scoreboard(SCOREBOARD)
+    assert [c.strftime("%d %H:%M") for c in index.clusters()] == [
+        "12 00:20",
+        "14 17:00",
+        "14 20:05",
+        "16 00:15",
+    ]
+
+
+def test_next_cluster():
+    """Sjekker hvilken klynge som er den neste."""
+    index = KickoffIndex.from_scoreboard(SCOREBOARD)
+    sunday_morning = datetime(2025, 9, 14, 10, 0, tzinfo=timezone.utc)
+    assert index.next_cluster(sunday_morning) == datetime(
+        2025, 9, 14, 17, 0, tzinfo=timezone.utc
+    )
+    # Midt i sen-vinduet: en kamp gjenstår, klyngen har allerede startet
+    mid_late = datetime(2025, 9, 14, 20, 10, tzinfo=timezone.utc)
+    assert index.next_cluster(mid_late) == datetime(
+        2025, 9, 14, 20, 5, tzinfo=timezone.utc
+    )
+    after_mnf = datetime(2025, 9, 16, 5, 0, tzinfo=timezone.utc)
+    assert index.next_cluster(after_mnf) is None
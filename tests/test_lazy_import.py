@@ -0,0 +1,50 @@
+"""Tester for lazy_import.py"""
+
+import sys
+
+import pytest
+
+from core.utils.lazy_import import IMPORT_TIMES, LazyImport
+
+MODULE = "lazy_import_test_module"
+
+
+@pytest.fixture(name="module_path")
+def fixture_module_path(tmp_path, monkeypatch):
+    """Lager en liten modul som bare kan importeres fra tmp_path."""
+    (tmp_path / f"{MODULE}.py").write_text(
+        "VALUE = 1\n\n\ndef double(x):\n    return 2 * x\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    sys.modules.pop(MODULE, None)
+    IMPORT_TIMES.pop(MODULE, None)
+
+
+def test_import_is_deferred_until_first_use(
+    module_path,
+):  # pylint: disable=unused-argument
+    """Tester at modulen først importeres ved første attributtoppslag."""
+    lazy = LazyImport(MODULE)
+    assert MODULE not in sys.modules
+    assert "ikke lastet" in repr(lazy)
+
+    assert lazy.VALUE == 1
+    assert MODULE in sys.modules
+    assert MODULE in IMPORT_TIMES
+    assert "(lastet)" in repr(lazy)
+
+
+def test_attributes_and_calls_are_forwarded(
+    module_path,
+):  # pylint: disable=unused-argument
+    """Tester at oppslag, tilordning og kall går til det ekte objektet."""
+    lazy = LazyImport(MODULE)
+    lazy.VALUE = 5
+    assert sys.modules[MODULE].VALUE == 5
+    assert lazy.double(3) == 6
+
+    double = LazyImport(MODULE, "double")
+    assert double(4) == 8
+    with pytest.raises(AttributeError):
+        _ = lazy.missing
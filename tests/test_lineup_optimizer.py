@@ -0,0 +1,98 @@
+"""Tester for lineup_optimizer.py"""
+
+import random
+from types import SimpleNamespace
+
+from benchmarks.run import brute_force_points
+from core.utils.lineup_optimizer import BENCH_SLOTS, league_efficiency, optimal_lineup
+
+ELIGIBLE = {
+    "QB": ["QB", "OP", "BE", "IR"],
+    "RB": ["RB", "RB/WR", "RB/WR/TE", "OP", "BE", "IR"],
+    "WR": ["WR", "RB/WR", "WR/TE", "RB/WR/TE", "OP", "BE", "IR"],
+    "TE": ["TE", "WR/TE", "RB/WR/TE", "OP", "BE", "IR"],
+    "D/ST": ["D/ST", "BE", "IR"],
+    "K": ["K", "BE", "IR"],
+}
+SLOTS = ["QB", "RB", "RB", "WR", "WR", "TE", "RB/WR/TE", "OP", "D/ST", "K"]
+BENCH = ["QB", "RB", "WR", "TE", "RB"]
+
+
+def _player(pos, slot, points, name):
+    return SimpleNamespace(
+        name=name,
+        position=pos,
+        slot_position=slot,
+        points=points,
+        eligibleSlots=ELIGIBLE[pos],
+    )
+
+
+def _synthetic_lineup(rng):
+    """Lager en tilfeldig oppstilling med startere, benk og én IR-spiller."""
+    lineup = []
+    for i, slot in enumerate(SLOTS):
+        pos = slot if slot in ELIGIBLE else rng.choice(["RB", "WR", "TE"])
+        pos = "QB" if slot == "OP" and rng.random() < 0.5 else pos
+        lineup.append(_player(pos, slot, round(rng.uniform(0, 35), 1), f"S{i}"))
+    for i, pos in enumerate(BENCH):
+        lineup.append(_player(pos, "BE", round(rng.uniform(0, 35), 1), f"B{i}"))
+    lineup.append(_player("WR", "IR", 50.0, "IR"))
+    return lineup
+
+
+def test_matches_brute_force():
+    """Tester at den ungarske metoden gir samme poeng som brute force."""
+    rng = random.Random(38)
+    for _ in range(10):
+        lineup = _synthetic_lineup(rng)
+        players = [p for p in lineup if p.slot_position != "IR"]
+        slots = [p.slot_position for p in players if p.slot_position not in BENCH_SLOTS]
+        result = optimal_lineup(lineup)
+        assert abs(result.optimal - brute_force_points(slots, players)) < 1e-9
+        assert result.optimal >= result.actual
+        names = [name for _, name in result.lineup if name]
+        assert len(names) == len(set(names)) and "IR" not in names
+
+
+def test_flex_and_efficiency():
+    """Tester at en benket WR flyttes inn i FLEX, men aldri til RB-plassen."""
+    lineup = [
+        _player("RB", "RB", 10.0, "Rb"),
+        _player("TE", "RB/WR/TE", 2.0, "Te"),
+        _player("WR", "BE", 20.0, "Wr"),
+    ]
+    result = optimal_lineup(lineup)
+    assert result.lineup == [("RB", "Rb"), ("RB/WR/TE", "Wr")]
+    assert (result.actual, result.optimal) == (12.0, 30.0)
+    assert result.efficiency == 12.0 / 30.0
+
+
+def test_whole_league_matches_brute_force():
+    """Tester at en liga med 12 lag gir samme optimale poeng som brute force.
+
+    Hastigheten mot brute force måles i `benchmarks.run` (lineup).
+    """
+    rng = random.Random(1)
+    boxes = [
+        SimpleNamespace(
+            home_team=SimpleNamespace(team_id=2 * i, team_name=f"Lag {2 * i}"),
+            away_team=SimpleNamespace(team_id=2 * i + 1, team_name="Borte"),
+            home_lineup=_synthetic_lineup(rng),
+            away_lineup=_synthetic_lineup(rng),
+        )
+        for i in range(6)
+    ]
+
+    results = league_efficiency(boxes)
+
+    assert len(results) == 12
+    for box in boxes:
+        for team, lineup in (
+            (box.home_team, box.home_lineup),
+            (box.away_team, box.away_lineup),
+        ):
+            players = [p for p in lineup if p.slot_position != "IR"]
+            slots = [p.slot_position for p in players if p.slot_position != "BE"]
+            optimal = results[team.team_id][1].optimal
+            assert abs(optimal - brute_force_points(slots, players)) < 1e-9
@@ -0,0 +1,51 @@
+"""Tester for loop_monitor.py"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from core.loop_monitor import LoopMonitor, Stall
+
+
+def blocking_sheets_call():
+    """Simulerer et synkront kall som blokkerer event-loopen."""
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_blocking_call():
+    """Sjekker at blokkering fanges med stack og rapporteres til admin."""
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot = MagicMock()
+    bot.get_channel.return_value = channel
+
+    monitor = LoopMonitor(bot, threshold=0.1, interval=0.02, cooldown=60)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_sheets_call()
+        await asyncio.sleep(0.1)
+        blocking_sheets_call()
+        await asyncio.sleep(0.1)
+    finally:
+        monitor.stop()
+
+    assert monitor.stalls == 2
+    assert monitor.max_lag >= 0.2
+    # Andre blokkering er innenfor cooldown og skal ikke gi ny melding
+    channel.send.assert_awaited_once()
+    report = channel.send.call_args[0][0]
+    assert "blocking_sheets_call" in report
+    assert "test_monitor_reports_blocking_call" in report
+
+
+def test_format_report_respects_discord_limit():
+    """Sjekker at lange stacker kortes ned til Discord sin grense."""
+    monitor = LoopMonitor(MagicMock())
+    stall = Stall(lag=1.5, task="Task-1 (auto_post_scheduler)", stack=["x" * 500] * 10)
+    report = monitor.format_report(stall, suppressed=3)
+    assert len(report) <= 2000
+    assert "1500 ms" in report
+    assert "+3 blokkeringer" in report
@@ -0,0 +1,76 @@
+"""Tester for core/metrics.py"""
+
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+
+from core import metrics
+
+
+def test_histogram_buckets_and_quantiles():
+    """Sjekker at observasjoner havner i riktige bøtter."""
+    hist = metrics.Histogram()
+    for seconds in (0.01, 0.02, 0.3, 0.4, 12.0):
+        hist.observe(seconds)
+    hist.observe(1.0, error=True)
+    hist.observe(11.0, timeout=True)
+
+    assert hist.count == 7
+    assert hist.errors == 1
+    assert hist.timeouts == 1
+    assert hist.max == 12.0
+    assert hist.quantile(0.25) == 0.025
+    assert hist.quantile(0.5) == 0.5
+    assert hist.quantile(1.0) == 30.0
+
+
+@pytest.mark.asyncio
+async def test_timed_records_errors_and_timeouts():
+    """Sjekker at timed() skiller mellom feil og timeouts."""
+    async with metrics.timed("test.ok"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timed("test.fail"):
+            raise ValueError("boom")
+    with pytest.raises(asyncio.TimeoutError):
+        async with metrics.timed("test.fail"):
+            raise asyncio.TimeoutError()
+
+    hists = metrics.histograms()
+    assert hists["test.ok"].count == 1
+    assert hists["test.fail"].errors == 1
+    assert hists["test.fail"].timeouts == 1
+
+
+def test_discord_operation_names():
+    """Sjekker at Discord-ruter oversettes til operasjonsnavn."""
+    base = "/api/v10/channels/123/messages"
+    assert metrics.discord_operation("POST", base) == "discord.send"
+    assert metrics.discord_operation("GET", base) == "discord.history"
+    assert (
+        metrics.discord_operation("GET", f"{base}/456/reactions/%F0%9F%8F%88")
+        == "discord.reaction_users"
+    )
+    assert (
+        metrics.discord_operation("PUT", f"{base}/456/reactions/x/@me")
+        == "discord.add_reaction"
+    )
+    assert metrics.discord_operation("GET", "/api/v10/users/@me") == "discord.get"
+
+
+def test_prometheus_includes_histograms():
+    """Sjekker at histogrammene eksponeres i Prometheus-formatet."""
+    metrics.observe("sheets.cell", 0.2)
+    bot = MagicMock()
+    bot.is_ready.return_value = True
+    bot.is_closed.return_value = False
+    bot.latency = 0.1
+    bot.ws = None
+
+    body = metrics.render_prometheus(bot)
+    assert "# TYPE tippebot_external_call_duration_seconds histogram" in body
+    assert (
+        'tippebot_external_call_duration_seconds_bucket{op="sheets.cell",le="0.25"}'
+        in body
+    )
+    assert 'tippebot_external_call_errors_total{op="sheets.cell"} 0' in body
@@ -0,0 +1,146 @@
+"""Tester for outbox.py (kø for utgående meldinger)."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from core import outbox
+
+
+def make_channel(channel_id, log=None):
+    """Lager en dummy-kanal som logger rekkefølgen på sendte meldinger."""
+    channel = MagicMock()
+    channel.id = channel_id
+
+    async def send(content, **kwargs):
+        if log is not None:
+            log.append((channel_id, content))
+        return MagicMock(content=content)
+
+    channel.send = AsyncMock(side_effect=send)
+    return channel
+
+
+def test_pack_messages_respects_limit_and_order():
+    """Sjekker at tekster slås sammen uten å overskride grensen."""
+    packed = outbox.pack_messages(["a" * 900, "b" * 900, "c" * 900, "d" * 2500])
+    assert [len(p) for p in packed] == [1801, 900, 2000, 500]
+    assert packed[0].startswith("a") and packed[1].startswith("c")
+
+
+@pytest.mark.asyncio
+async def test_send_message_without_outbox_sends_directly():
+    """Sjekker at meldinger sendes direkte når køen ikke kjører."""
+    channel = make_channel(1)
+    msg = await outbox.send_message(channel, "hei", coalesce=True)
+    channel.send.assert_awaited_once_with("hei")
+    assert msg.content == "hei"
+
+
+@pytest.mark.asyncio
+async def test_outbox_coalesces_but_keeps_game_messages_separate():
+    """Sjekker sammenslåing av kunngjøringer og egne kampmeldinger."""
+    channel = make_channel(1)
+    outbox.start_outbox(coalesce_delay=0.01)
+    try:
+        games = [outbox.send_message(channel, f"Kamp {i}") for i in range(3)]
+        notices = [
+            outbox.send_message(channel, f"Varsel {i}", coalesce=True) for i in range(5)
+        ]
+        sent = await asyncio.gather(*games, *notices)
+    finally:
+        await outbox.stop_outbox()
+
+    contents = [call.args[0] for call in channel.send.await_args_list]
+    assert contents[:3] == ["Kamp 0", "Kamp 1", "Kamp 2"]
+    assert contents[3:] == ["\n".join(f"Varsel {i}" for i in range(5))]
+    assert sent[0].content == "Kamp 0"
+    assert sent[3] is sent[7]
+
+
+@pytest.mark.asyncio
+async def test_user_messages_before_admin_logs():
+    """Sjekker at admin-logger venter på brukermeldinger i samme kanal."""
+    log = []
+    channel = make_channel(1, log)
+    outbox.start_outbox(coalesce_delay=0.01)
+    try:
+        await asyncio.gather(
+            outbox.send_message(channel, "admin", admin=True),
+            outbox.send_message(channel, "bruker 1"),
+            outbox.send_message(channel, "bruker 2"),
+        )
+    finally:
+        await outbox.stop_outbox()
+
+    assert log == [(1, "bruker 1"), (1, "bruker 2"), (1, "admin")]
+
+
+@pytest.mark.asyncio
+async def test_admin_logs_not_held_back_by_other_channels():
+    """Sjekker at admin-logger ikke venter på trafikk i andre kanaler."""
+    log = []
+    admin = make_channel(1, log)
+    preik = make_channel(2, log)
+    release = asyncio.Event()
+
+    async def slow_send(content, **kwargs):
+        await release.wait()
+        log.append((2, content))
+
+    preik.send = AsyncMock(side_effect=slow_send)
+    outbox.start_outbox(coalesce_delay=0.01)
+    try:
+        user = asyncio.ensure_future(outbox.send_message(preik, "bruker"))
+        await asyncio.wait_for(outbox.send_message(admin, "admin", admin=True), 1)
+        release.set()
+        await user
+    finally:
+        await outbox.stop_outbox()
+
+    assert log == [(1, "admin"), (2, "bruker")]
+
+
+@pytest.mark.asyncio
+async def test_each_message_sent_through_its_own_target():
+    """Sjekker at meldinger til samme kanal sendes via sitt eget mål."""
+    channel = make_channel(1)
+    ctx = MagicMock(spec=["channel", "send"])
+    ctx.channel = channel
+    ctx.send = AsyncMock()
+    no_id = MagicMock(spec=["send"])
+    no_id.send = AsyncMock()
+    outbox.start_outbox(coalesce_delay=0.01)
+    try:
+        await outbox.send_message(channel, "kanal")
+        await outbox.send_message(ctx, "ctx")
+        await outbox.send_message(no_id, "uten id")
+    finally:
+        await outbox.stop_outbox()
+
+    channel.send.assert_awaited_once_with("kanal")
+    ctx.send.assert_awaited_once_with("ctx")
+    no_id.send.assert_awaited_once_with("uten id")
+
+
+@pytest.mark.asyncio
+async def test_outbox_waits_for_rate_limit_reset():
+    """Sjekker at køen venter når bøtta er tom i stedet for å få 429."""
+    channel = make_channel(42)
+    outbox.record_rate_limit(
+        "POST",
+        "/api/v10/channels/42/messages",
+        {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.2"},
+    )
+    outbox.start_outbox()
+    try:
+        start = time.perf_counter()
+        await outbox.send_message(channel, "hei")
+        elapsed = time.perf_counter() - start
+    finally:
+        await outbox.stop_outbox()
+        outbox._limits.clear()
+
+    assert elapsed >= 0.15
+    channel.send.assert_awaited_once()
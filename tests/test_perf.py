@@ -0,0 +1,73 @@
+"""Tester for perf.py (tidsmåling av kommandoer)."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from core import perf
+from core.metrics import timed
+
+
+def make_bot():
+    """Lager en dummy-bot som fanger before/after-invoke-hookene."""
+    bot = MagicMock()
+    bot.before_invoke = lambda func: setattr(bot, "_before", func) or func
+    bot.after_invoke = lambda func: setattr(bot, "_after", func) or func
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot.get_channel.return_value = channel
+    return bot, channel
+
+
+def make_ctx(name):
+    """Lager en dummy-context for kommandoen `name`."""
+    ctx = MagicMock()
+    ctx.command.qualified_name = name
+    ctx.command_failed = False
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_slow_command_reported_with_stages():
+    """Sjekker at en treg kommando rapporteres med fordeling per steg."""
+    bot, channel = make_bot()
+    perf.setup_command_timing(bot, budget=0.05)
+    ctx = make_ctx("treg_test")
+
+    await bot._before(ctx)
+    with timed("sheets.get_all_values"):
+        time.sleep(0.03)
+    with timed("sheets.get_all_values"):
+        time.sleep(0.03)
+    perf.checkpoint("fase: beregn")
+    await bot._after(ctx)
+
+    assert perf.current() is None
+    assert perf.summary()["treg_test"]["n"] == 1
+    report = channel.send.call_args[0][0]
+    assert "`!treg_test`" in report
+    assert "sheets.get_all_values" in report
+    assert "(2 kall)" in report
+    assert "fase: beregn" in report
+
+
+@pytest.mark.asyncio
+async def test_fast_command_not_reported():
+    """Sjekker at kommandoer innenfor budsjettet kun registreres."""
+    bot, channel = make_bot()
+    perf.setup_command_timing(bot, budget=10)
+    ctx = make_ctx("rask_test")
+
+    await bot._before(ctx)
+    await bot._after(ctx)
+
+    channel.send.assert_not_called()
+    assert perf.summary()["rask_test"]["n"] == 1
+
+
+def test_quantile_nearest_rank():
+    """Sjekker kvantilberegningen."""
+    values = [0.1 * i for i in range(1, 21)]
+    assert perf.quantile(values, 0.5) == pytest.approx(1.0)
+    assert perf.quantile(values, 0.95) == pytest.approx(1.9)
+    assert perf.quantile([], 0.5) == 0.0
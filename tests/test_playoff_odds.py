@@ -0,0 +1,96 @@
+"""Tester for playoff_odds.py"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.utils.playoff_odds import (
+    H2H_RULE,
+    POINTS_RULE,
+    SeasonModel,
+    format_playoff_odds,
+    simulate,
+)
+
+
+def _league(teams=10, played=10, regular_season=14):
+    """Liga der lag 0 har vunnet alt og lag 9 har tapt alt."""
+    team_objs = []
+    for i in range(teams):
+        wins = played - i if i < played else 0
+        team_objs.append(
+            SimpleNamespace(
+                team_id=i + 1,
+                team_name=f"Lag {i + 1}",
+                wins=wins if i != teams - 1 else 0,
+                losses=played - wins if i != teams - 1 else played,
+                ties=0,
+                points_for=100.0 * played,
+                scores=[100.0 - 5 * i + 10 * (w % 2) for w in range(played)]
+                + [0.0] * (regular_season - played),
+                outcomes=["W"] * played + ["U"] * (regular_season - played),
+                schedule=[],
+            )
+        )
+    # Lagene roteres slik at de møter nye motstandere hver uke
+    for week in range(regular_season):
+        for i in range(0, teams, 2):
+            a, b = (i + week) % teams, (i + week + 1) % teams
+            team_objs[a].schedule.append(team_objs[b])
+            team_objs[b].schedule.append(team_objs[a])
+    settings = SimpleNamespace(reg_season_count=regular_season, playoff_team_count=6)
+    return SimpleNamespace(teams=team_objs, settings=settings)
+
+
+@pytest.fixture(name="model")
+def fixture_model():
+    return SeasonModel.from_league(_league())
+
+
+def test_model_from_league(model):
+    """Tester at bare uavgjorte uker simuleres og bye-antallet stemmer."""
+    assert len(model.schedule) == 4
+    assert all(len(games) == 5 for games in model.schedule)
+    assert model.byes == 2
+    assert model.wins[0] == 10
+
+
+def test_probabilities_are_consistent(model):
+    """Tester at sannsynlighetene summerer til antall plasser."""
+    odds = simulate(model, simulations=20_000, seed=1)
+    assert sum(odds.playoff) == pytest.approx(6)
+    assert sum(odds.bye) == pytest.approx(2)
+    assert sum(odds.last) == pytest.approx(1)
+    assert odds.playoff[0] == 1.0
+    assert odds.last[-1] > 0.9
+    assert "Lag 1: sluttspill 100%" in format_playoff_odds(odds)
+
+
+def test_process_pool_gives_same_result(model):
+    """Tester at prosesspoolen gir samme resultat som én prosess."""
+    single = simulate(model, simulations=50_000, workers=1, seed=7)
+    pooled = simulate(model, simulations=50_000, workers=2, seed=7)
+    assert single.playoff == pooled.playoff
+    assert single.last == pooled.last
+
+
+def test_tie_rule_decides_seeding():
+    """Tester at ligaens regel for likhet avgjør hvem av to lag som går videre."""
+    # Like mange seiere; lag 1 har flest poeng, lag 2 vant det innbyrdes møtet
+    league = _league(teams=2, played=2, regular_season=2)
+    first, second = league.teams
+    first.wins = second.wins = 1
+    first.points_for, second.points_for = 250.0, 200.0
+    first.outcomes, second.outcomes = ["W", "L"], ["L", "W"]
+    first.schedule, second.schedule = [None, second], [None, first]
+    league.settings.playoff_team_count = 1
+
+    league.settings.playoff_seed_tie_rule = POINTS_RULE
+    model = SeasonModel.from_league(league)
+    assert model.h2h == [[0.0, 0.0], [1.0, 0.0]]
+    assert simulate(model, simulations=10, seed=1).playoff == [1.0, 0.0]
+
+    league.settings.playoff_seed_tie_rule = H2H_RULE
+    model = SeasonModel.from_league(league)
+    assert model.tie_rule == H2H_RULE
+    assert simulate(model, simulations=10, seed=1).playoff == [0.0, 1.0]
@@ -1,5 +1,7 @@
 """Tester for ppr.py"""
 
+import asyncio
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from cogs.ppr import PPR
@@ -26,19 +28,33 @@ DUMMY_TEAM_NAMES = {
 
 # --- Fixtures ---
 @pytest.fixture(name="ppr_cog")
-@patch("cogs.ppr.get_client")
-def fixture_ppr_cog(mock_get_client):
-    """Oppretter en PPR-cog med mocket Google Sheets-klient."""
-    mock_bot = MagicMock()
-    mock_sheet = MagicMock()
-    # Sett mock_get_client til å returnere dummy client med open()->mock_sheet
-    dummy_client = MagicMock()
-    dummy_client.open.return_value = mock_sheet
-    mock_get_client.return_value = dummy_client
+def fixture_ppr_cog():
+    """Oppretter en PPR-cog med et mocket Fest i Vest-dokument."""
+    cog = PPR(MagicMock())
+    cog.sheet = MagicMock()
+    return cog
+
+
+@pytest.mark.asyncio
+async def test_sheet_opened_lazily_off_the_loop():
+    """Sikrer at arket åpnes ved første bruk, én gang, og i en tråd."""
+    threads = []
+
+    def open_sheet(name):
+        threads.append(threading.get_ident())
+        return MagicMock(name=name)
 
-    # Opprett PPR etter patchen er aktiv
-    ppr_cog = PPR(mock_bot)
-    return ppr_cog
+    dummy_client = MagicMock()
+    dummy_client.open.side_effect = open_sheet
+    with patch("cogs.ppr.get_client", return_value=dummy_client) as mock_get_client:
+        ppr_cog = PPR(MagicMock())
+        mock_get_client.assert_not_called()
+
+        # pylint: disable=protected-access
+        first, second = await asyncio.gather(ppr_cog._get_sheet(), ppr_cog._get_sheet())
+        assert first is second is ppr_cog.sheet
+        dummy_client.open.assert_called_once_with("Fest i Vest")
+        assert threads and threading.get_ident() not in threads
 
 
 # --- Tester ---
@@ -0,0 +1,57 @@
+"""Tester for profiler.py"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+
+from core import profiler
+
+
+def hot_loop():
+    """Bruker CPU slik at både cProfile og sampleren ser funksjonen."""
+    end = time.perf_counter() + 0.1
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profile_session_captures_hot_function():
+    """Sjekker at profilen inneholder funksjonen og asyncio-oppgaven."""
+
+    async def resultater_task():
+        hot_loop()
+
+    profiler.start_session()
+    await asyncio.create_task(resultater_task(), name="resultater")
+    result = profiler.stop_session()
+
+    assert not profiler.is_running()
+    assert "hot_loop" in result.pstats_text()
+    collapsed = result.collapsed_text()
+    assert "task:resultater" in collapsed
+    assert "hot_loop (test_profiler.py" in collapsed
+    assert result.pstats_bytes()
+
+
+@pytest.mark.asyncio
+async def test_armed_command_is_profiled_and_posted():
+    """Sjekker at en bestilt kommando profileres og sendes til admin."""
+    channel = MagicMock()
+    channel.send = AsyncMock()
+    bot = MagicMock()
+    bot.get_channel.return_value = channel
+
+    profiler.arm("resultater")
+    profiler.command_started("ppr")
+    assert not profiler.is_running()
+
+    profiler.command_started("resultater")
+    assert profiler.is_running()
+    hot_loop()
+    await profiler.command_finished(bot, "resultater")
+
+    assert not profiler.is_running()
+    kwargs = channel.send.call_args.kwargs
+    assert len(kwargs["files"]) == 3
+    assert "`!resultater`" in channel.send.call_args[0][0]
@@ -0,0 +1,65 @@
+"""Tester for roster_tracker.py"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.utils import roster_tracker
+from core.utils.roster_tracker import ExpiringSet, RosterTracker
+
+
+def player(pid, slot="RB", status="ACTIVE"):
+    """Lager en dummy-spiller."""
+    return SimpleNamespace(
+        playerId=pid, name=f"Spiller {pid}", lineupSlot=slot, injuryStatus=status
+    )
+
+
+def team(roster, team_id=1):
+    """Lager et dummy-lag."""
+    return SimpleNamespace(team_id=team_id, team_name="Laget", roster=roster)
+
+
+def kinds(events):
+    """Hendelsestype per spiller."""
+    return [(e.player_id, e.kind) for e in events]
+
+
+def test_tracker_emits_only_changes():
+    """Sjekker at kun endringer gir hendelser."""
+    tracker = RosterTracker()
+    first = tracker.update([team([player(1, status="OUT"), player(2)])])
+    assert kinds(first) == [(1, "inactive_starter")]
+
+    # Ingen endringer: ingen hendelser
+    assert not tracker.update([team([player(1, status="OUT"), player(2)])])
+
+    events = tracker.update(
+        [team([player(1, slot="BE", status="OUT"), player(2, status="DOUBTFUL")])]
+    )
+    assert kinds(events) == [(1, "benched"), (2, "inactive_starter")]
+
+    events = tracker.update([team([player(1, slot="BE", status="OUT"), player(2)])])
+    assert kinds(events) == [(2, "cleared")]
+
+
+def test_tracker_reports_dropped_inactive_starter():
+    """Sjekker at en inaktiv starter som forsvinner fra laget meldes."""
+    tracker = RosterTracker()
+    tracker.update([team([player(1, status="OUT"), player(2)])])
+    events = tracker.update([team([player(2)])])
+    assert kinds(events) == [(1, "dropped")]
+
+
+def test_expiring_set_evicts_old_entries():
+    """Sjekker at elementer forsvinner etter levetiden."""
+    clock = [1000.0]
+    with patch.object(roster_tracker.time, "monotonic", lambda: clock[0]):
+        notified = ExpiringSet(ttl=60)
+        notified.add("a")
+        clock[0] += 30
+        notified.add("b")
+        assert "a" in notified and len(notified) == 2
+        clock[0] += 31
+        assert "a" not in notified
+        assert "b" in notified
+        assert len(notified) == 1
@@ -0,0 +1,76 @@
+"""Tester for season_stats.py"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.utils.season_stats import (
+    SeasonStats,
+    format_season_summary,
+    load_season_stats,
+    save_season_stats,
+)
+
+
+def _team(team_id):
+    return SimpleNamespace(team_id=team_id, team_name=f"Lag {team_id}")
+
+
+def _box(home, away, hs, ascore, home_bench=0.0):
+    bench = [SimpleNamespace(points=home_bench, slot_position="BE")]
+    return SimpleNamespace(
+        home_team=home,
+        away_team=away,
+        home_score=hs,
+        away_score=ascore,
+        home_lineup=bench,
+        away_lineup=[],
+        home_projected=100.0,
+        away_projected=-1,
+    )
+
+
+@pytest.fixture(name="stats")
+def fixture_stats():
+    """Tre uker der lag 1 vinner de to første og taper den siste."""
+    a, b = _team(1), _team(2)
+    stats = SeasonStats(2025)
+    stats.record_week(1, [_box(a, b, 110.0, 90.0, home_bench=25.0)])
+    stats.record_week(2, [_box(a, b, 101.0, 100.5)])
+    stats.record_week(3, [_box(a, b, 80.0, 130.0)])
+    return stats
+
+
+def test_superlatives(stats):
+    """Tester at rekorder hentes med riktig lag og uke."""
+    assert stats.weeks == [1, 2, 3]
+    assert stats.extreme("score") == (130.0, 2, 3)
+    assert stats.extreme("score", highest=False) == (80.0, 1, 3)
+    assert stats.closest_win() == (0.5, 1, 2)
+    assert stats.totals("bench")[1] == 25.0
+    # Uten projeksjon (-1) brukes poengene som avvik
+    assert stats.totals("proj_delta")[2] == 320.5
+
+
+def test_streaks_and_rerecord(stats):
+    """Tester rekker, og at en uke kan registreres på nytt uten dobbeltelling."""
+    assert stats.streaks() == {1: (2, 1), 2: (1, 2)}
+    a, b = _team(1), _team(2)
+    stats.record_week(3, [_box(a, b, 140.0, 130.0)])
+    assert stats.streaks() == {1: (3, 0), 2: (0, 3)}
+    assert stats.totals("score")[1] == 351.0
+
+
+def test_roundtrip_and_summary(stats, tmp_path):
+    """Tester lagring og lasting, og at oppsummeringen nevner rekordene."""
+    path = str(tmp_path / "stats.json")
+    save_season_stats(stats, path)
+    loaded = load_season_stats(2025, path)
+    assert loaded.team_ids == [1, 2]
+    assert loaded.weeks == [1, 2, 3]
+    assert loaded.extreme("margin") == stats.extreme("margin")
+    assert load_season_stats(2026, path).weeks == []
+
+    summary = format_season_summary(loaded)
+    assert "Høyeste ukescore: Lag 2, 130.00 poeng (uke 3)" in summary
+    assert "Lengste seiersrekke: Lag 1, 2 på rad" in summary
@@ -0,0 +1,33 @@
+"""Tester for season_totals.py"""
+
+from core.utils.season_totals import SeasonTotals
+
+
+def test_base_for_next_week_and_rerun():
+    """Tester at neste uke bygger på totalen og ny kjøring på totalen før."""
+    totals = SeasonTotals(
+        2025, 5, {"1": "Ola", "2": "Kari"}, {"1": 30, "2": 34}, {"1": 22, "2": 25}
+    )
+    assert totals.base_for(2025, 6) == {"1": 30, "2": 34}
+    assert totals.base_for(2025, 5) == {"1": 22, "2": 25}
+    assert totals.base_for(2025, 7) is None
+    assert totals.base_for(2026, 6) is None
+    assert totals.standings() == [("Kari", 34), ("Ola", 30)]
+    assert totals.mismatches({"1": 30, "2": 33}) == {"2": (34, 33)}
+
+
+def test_rows_round_trip():
+    """Tester lagring i State-fanen, også uten totalen før uken."""
+    totals = SeasonTotals(2025, 5, {"1": "Ola"}, {"1": 30}, {"1": 22}, stored=3)
+    rows = totals.to_rows()
+    assert rows == [[2025, 5, "1", "Ola", 30, 22]] + [[""] * 6] * 2
+
+    parsed = SeasonTotals.from_rows([[str(v) for v in row] for row in rows])
+    assert (parsed.season, parsed.week, parsed.totals) == (2025, 5, {"1": 30})
+    assert parsed.before == {"1": 22}
+    assert parsed.stored == 3
+
+    unknown = SeasonTotals.from_rows([["2025", "", "1", "Ola", "30", ""]])
+    assert unknown.week is None and unknown.before is None
+    assert unknown.base_for(2025, 1) is None
+    assert SeasonTotals.from_rows([]) is None
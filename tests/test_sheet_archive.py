@@ -0,0 +1,41 @@
+"""Tester for sheet_archive.py"""
+
+from core.utils.sheet_archive import CARRY_LABEL, plan_archive, week_blocks
+
+ROWS = [
+    ["Navn", "Ola", "Kari"],
+    ["ID", "1", "2"],
+    ["", "", ""],
+    ["Bills@Jets", "Jets", "Bills"],
+    ["Ukespoeng", "1", "0"],
+    ["Sesongpoeng", "1", "0"],
+    ["", "", ""],
+    ["Lions@Bears", "Bears", "Lions"],
+    ["Ukespoeng", "0", "1"],
+    ["Sesongpoeng", "1", "1"],
+    ["", "", ""],
+    ["Rams@Seahawks", "Rams", ""],
+]
+
+
+def test_week_blocks_skip_unfinished_week():
+    """Tester at bare uker med Sesongpoeng regnes som ferdige."""
+    assert week_blocks(ROWS) == [(3, 6), (7, 10)]
+    carried = ROWS[:2] + [[CARRY_LABEL, "1", "0"]] + ROWS[6:]
+    assert week_blocks(carried) == [(4, 7)]
+
+
+def test_plan_archive_keeps_newest_weeks():
+    """Tester at eldste uke flyttes og totalen blir stående som Overført."""
+    plan = plan_archive(ROWS, keep=1)
+    assert plan.weeks == 1
+    assert plan.rows == [[], ["Bills@Jets", "Jets", "Bills"]] + [
+        ["Ukespoeng", "1", "0"],
+        ["Sesongpoeng", "1", "0"],
+    ]
+    assert (plan.delete_start, plan.delete_end, plan.carry_row) == (3, 5, 6)
+    assert plan_archive(ROWS, keep=2) is None
+
+    season = plan_archive(ROWS, keep=2, whole_season=True)
+    assert season.weeks == 2
+    assert (season.delete_start, season.delete_end, season.carry_row) == (3, 10, None)
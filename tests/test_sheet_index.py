@@ -0,0 +1,34 @@
+"""Tester for sheet_index.py"""
+
+from core.utils.sheet_index import SheetIndex, WeekRows
+
+
+def test_record_and_delete_rows():
+    """Tester neste ledige rad og flytting av uker etter sletting."""
+    index = SheetIndex(2025)
+    assert index.next_start() is None
+    week1 = index.record(1, 4, 16)
+    assert week1 == WeekRows(4, 20, 21)
+    assert (week1.last_game, week1.games, week1.previous_total) == (19, 16, 2)
+    index.record(2, 23, 14)
+    assert index.next_start() == 40
+
+    # Rad 3-21 slettes: uke 1 forsvinner og uke 2 flyttes opp
+    index.delete_rows(3, 21)
+    assert index.weeks == {2: WeekRows(4, 18, 19)}
+    assert index.get(None) is None
+
+
+def test_rows_round_trip_per_season():
+    """Tester lagring i State-fanen med sesong og tømming av fjernede uker."""
+    rows = [
+        ["2024", "18", "300", "316", "317"],
+        ["2025", "1", "4", "20", "21"],
+        ["2025", "2", "23", "39", "40"],
+        ["ugyldig"],
+    ]
+    index = SheetIndex.from_rows(rows, 2025)
+    assert set(index.weeks) == {1, 2}
+
+    del index.weeks[1]
+    assert index.to_rows() == [[2025, 2, 23, 39, 40]] + [[""] * 5] * 3
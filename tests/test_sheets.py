@@ -2,8 +2,10 @@
 
 from unittest.mock import patch, MagicMock
 import pytest
+from gspread.exceptions import APIError
 from cogs import sheets
 from core.errors import MissingCredentialsError
+from core.fakes.sheets import FakeClient, Quota
 
 
 class DummySheet:
@@ -99,3 +101,43 @@ def test_dummy_sheet_row_values():
     sheet = DummySheet()
     values = sheet.row_values(1)
     assert values == ["Header", "123", "456"]
+
+
+def test_col_letter():
+    """Tester kolonnebokstaver også forbi Z (mange tippere)."""
+    assert sheets.col_letter(1) == "A"
+    assert sheets.col_letter(26) == "Z"
+    assert sheets.col_letter(27) == "AA"
+    assert sheets.col_letter(129) == "DY"
+
+
+def test_fake_backend_selected_by_env(monkeypatch):
+    """Tester at SHEETS_BACKEND=fake gir et ark i minnet som kan skrives og leses."""
+    monkeypatch.setenv("SHEETS_BACKEND", "fake")
+    monkeypatch.setenv("SHEETS_FAKE_TIPPERS", "3")
+    monkeypatch.setattr(sheets, "_fake_client", None)
+
+    sheet = sheets.get_sheet("Vestsk Tipping")
+    assert sheet.row_values(2) == ["ID", "1000", "1001", "1002"]
+    cells = sheet.range("A3:B3")
+    cells[0].value, cells[1].value = "Bills@Jets", "Jets"
+    sheet.update_cells(cells)
+
+    batch = sheets.get_sheet("Vestsk Tipping").spreadsheet.values_batch_get(
+        ["'Vestsk Tipping'!A3:C3"]
+    )
+    assert batch["valueRanges"][0]["values"] == [["Bills@Jets", "Jets"]]
+
+
+def test_fake_backend_quota_gives_429():
+    """Tester at kvoten per minutt gir 429 og slipper til igjen etter et minutt."""
+    now = [0.0]
+    client = FakeClient(quota=Quota(2, clock=lambda: now[0]))
+    book = client.open("Test")
+    book.worksheets()
+    with pytest.raises(APIError) as exc_info:
+        book.worksheets()
+    assert exc_info.value.response.status_code == 429
+
+    now[0] = 60.0
+    assert book.worksheets()[0].title == "Test"
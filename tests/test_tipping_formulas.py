@@ -0,0 +1,43 @@
+"""Tester for tipping_formulas.py"""
+
+from core.fakes.sheets import FakeWorksheet
+from core.utils.tipping_formulas import formula_mode, week_updates
+
+
+def test_week_updates_formulas():
+    """Tester vinnerkolonne og formler, også med kamprader som ikke henger sammen."""
+    data = week_updates({5: "Jets", 6: "Uavgjort", 8: "Bears"}, 2, 9, None)
+    assert data[0] == {"range": "D1", "values": [["Vinner"]]}
+    assert [item["range"] for item in data[1:3]] == ["D5:D6", "D8:D8"]
+    uke, sesong = data[-1]["values"]
+    assert data[-1]["range"] == "A9:C10"
+    assert uke[1] == (
+        '=SUMPRODUCT((B5:B6=D5:D6)*(D5:D6<>""))'
+        '+SUMPRODUCT((B8:B8=D8:D8)*(D8:D8<>""))'
+    )
+    assert sesong == ["Sesongpoeng", "=B9", "=C9"]
+    assert week_updates({5: "Jets"}, 1, 6, 3)[-1]["values"][1] == [
+        "Sesongpoeng",
+        "=B3+B6",
+    ]
+
+
+def test_formulas_in_fake_sheet(monkeypatch):
+    """Tester at det falske arket regner ut formlene som Google."""
+    assert not formula_mode()
+    monkeypatch.setenv("TIPPING_TOTALS_MODE", "formel")
+    assert formula_mode()
+
+    ws = FakeWorksheet(
+        "Vestsk Tipping",
+        [
+            ["Navn", "Ola", "Kari"],
+            ["ID", "1", "2"],
+            ["Sesongpoeng", "3", "4"],
+            [],
+            ["Bills@Jets", "jets", "Bills"],
+            ["Lions@Bears", "Uavgjort", ""],
+        ],
+    )
+    ws.batch_update(week_updates({5: "Jets", 6: "Uavgjort"}, 2, 7, 3))
+    assert ws.get("A7:C8") == [["Ukespoeng", "2", "0"], ["Sesongpoeng", "5", "4"]]
@@ -0,0 +1,74 @@
+"""Tester for tipping_projection.py"""
+
+import pytest
+
+from core.utils.tipping_projection import (
+    HOME_WIN_PROB,
+    game_probabilities,
+    moneyline_prob,
+    pick_tendencies,
+    simulate_season,
+)
+
+
+def _event(home_ml=None, away_ml=None, completed=False, scores=("0", "0")):
+    odds = []
+    if home_ml is not None:
+        odds = [
+            {
+                "homeTeamOdds": {"moneyLine": home_ml},
+                "awayTeamOdds": {"moneyLine": away_ml},
+            }
+        ]
+    return {
+        "status": {"type": {"completed": completed}},
+        "competitions": [
+            {
+                "competitors": [
+                    {"homeAway": "home", "score": scores[0]},
+                    {"homeAway": "away", "score": scores[1]},
+                ],
+                "odds": odds,
+            }
+        ],
+    }
+
+
+def test_game_probabilities():
+    """Tester odds uten margin, ferdige kamper og fallback uten odds."""
+    assert moneyline_prob(-110, -110) == pytest.approx(0.5)
+    assert moneyline_prob(None, 120) is None
+    probs = game_probabilities(
+        [
+            _event(-200, 170),
+            _event(completed=True, scores=("17", "24")),
+            _event(),
+        ]
+    )
+    assert 0.6 < probs[0] < 0.67
+    assert probs[1:] == [0.0, HOME_WIN_PROB]
+
+
+def test_pick_tendencies():
+    """Tester at hjemmetips telles per tipper fra kampradene."""
+    rows = [
+        ["", "Ola", "Kari"],
+        ["Bills@Jets", "Jets", "Bills"],
+        ["Lions@Bears", "Bears", ""],
+        ["Ukespoeng", "2", "0"],
+    ]
+    assert pick_tendencies(rows, 2) == [pytest.approx(3 / 4), pytest.approx(1 / 3)]
+
+
+def test_simulate_season():
+    """Tester vinnersjanser for stor ledelse, delt ledelse og ingen uker igjen."""
+    weeks = [[0.6] * 16 for _ in range(3)]
+    probs = simulate_season([100, 60, 60], weeks, [0.5, 0.6, 0.4], 5_000, seed=1)
+    assert sum(probs) == pytest.approx(1)
+    assert probs[0] == 1.0
+
+    probs = simulate_season([50, 50], [], [0.5, 0.5], 100, seed=1)
+    assert probs == [0.5, 0.5]
+
+    probs = simulate_season([50, 49, 20], weeks, [0.5, 0.5, 0.5], 5_000, seed=1)
+    assert probs[0] > probs[1] > probs[2]
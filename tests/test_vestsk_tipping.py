@@ -1,12 +1,19 @@
 """Tests for vestsk_tipping.py"""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime
+import functools
 import pytest
 import pytz
 from cogs import sheets
-from cogs.vestsk_tipping import VestskTipping
-from core.errors import NoEventsFoundError, ExportError
+from cogs.vestsk_tipping import SCOREBOARD_CONCURRENCY, VestskTipping
+from core.errors import NoEventsFoundError, ExportError, ResultaterError
+from core.fakes import FakeBot, FakeContext, make_scoreboard
+from core.fakes.discord import build_season_channel
+from core.fakes.espn import FakeESPN, game_code, week_games
+from core.fakes.sheets import build_tipping_sheet, tipper_ids
+from core.utils.tipping_projection import simulate_season
 
 
 @pytest.fixture(autouse=True)
@@ -135,7 +142,7 @@ async def test_resultater_handles_api_error(monkeypatch):
             return DummyAiohttpResponse()
 
     monkeypatch.setattr(
-        "cogs.vestsk_tipping.aiohttp.ClientSession",
+        "core.utils.espn_helpers.aiohttp.ClientSession",
         lambda *a, **kw: DummyAiohttpSession(),
     )
 
@@ -287,7 +294,7 @@ async def test_resultater_no_events(monkeypatch):
             return DummyAiohttpResponse()
 
     monkeypatch.setattr(
-        "cogs.vestsk_tipping.aiohttp.ClientSession",
+        "core.utils.espn_helpers.aiohttp.ClientSession",
         lambda *a, **kw: DummyAiohttpSession(),
     )
     cog = VestskTipping.__new__(VestskTipping)
@@ -351,7 +358,7 @@ async def test_export_impl_message_filtering(monkeypatch):
         def __init__(self, messages):
             self._messages = messages
 
-        def history(self, limit, after):
+        def history(self, limit, after, oldest_first=None):
             # Simuler async generator
             async def gen():
                 for m in self._messages:
@@ -451,7 +458,7 @@ async def test_resultater_no_events_api(monkeypatch):
             return DummyAiohttpResponse()
 
     monkeypatch.setattr(
-        "cogs.vestsk_tipping.aiohttp.ClientSession",
+        "core.utils.espn_helpers.aiohttp.ClientSession",
         lambda *a, **kw: DummyAiohttpSession(),
     )
 
@@ -660,7 +667,7 @@ async def test_reminder_scheduler_sunday(monkeypatch):
             return DummyAiohttpResponse()
 
     monkeypatch.setattr(
-        "cogs.vestsk_tipping.aiohttp.ClientSession",
+        "core.utils.espn_helpers.aiohttp.ClientSession",
         lambda *a, **kw: DummyAiohttpSession(),
     )
 
@@ -669,3 +676,457 @@ async def test_reminder_scheduler_sunday(monkeypatch):
 
     assert any("Early window snart" in m for m in channel.sent)
     assert cog.last_reminder_sunday is not None
+
+
+@pytest.mark.asyncio
+async def test_export_finds_latest_week_in_busy_channel(monkeypatch):
+    """Tester at eksporten tar siste ukes kamper selv med mye prat i kanalen."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user, chatter=300)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+
+    await cog._export_impl(FakeContext(channel, bot), 3)
+
+    exported = [row[0] for row in worksheet.get_all_values()[-16:]]
+    assert exported == [game_code(*game) for game in week_games(3)]
+
+
+@pytest.mark.asyncio
+async def test_events_posted_recently_in_busy_channel():
+    """Tester at allerede postede kamper finnes bak mye nyere trafikk."""
+    bot = FakeBot()
+    channel = build_season_channel(2, tipper_ids(4), bot.user, chatter=600)
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    events = make_scoreboard(2, completed=False)["events"]
+
+    assert await cog._events_posted_recently(events, channel)
+
+
+@pytest.mark.asyncio
+async def test_archive_weeks_moves_old_weeks(monkeypatch):
+    """Tester arkivering til sesongfanen og at totalen føres videre."""
+    book = build_tipping_sheet(4, 3)
+    worksheet = book.get_worksheet(0)
+    before = worksheet.get_all_values()
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+
+    assert await cog._archive_weeks(1, season=2025) == (2, "Arkiv 2025")
+
+    rows = worksheet.get_all_values()
+    week2_total = [r for r in before if r[0] == "Sesongpoeng"][1]
+    assert rows[:2] == before[:2]
+    assert rows[2] == ["Overført"] + week2_total[1:]
+    assert rows[3:] == before[-19:]
+    archive = book.worksheet("Arkiv 2025").get_all_values()
+    assert archive == before[:-19]
+
+    # Ny sesong: resten flyttes og Overført-raden forsvinner
+    assert await cog._archive_weeks(0, whole_season=True, season=2025) == (
+        1,
+        "Arkiv 2025",
+    )
+    assert worksheet.get_all_values() == before[:2]
+    assert book.worksheet("Arkiv 2025").get_all_values() == before
+
+
+@pytest.mark.asyncio
+async def test_arkiver_keeps_zero_and_rejects_negative(monkeypatch):
+    """Tester at `!arkiver 0` arkiverer alt og at negative tall avvises."""
+    cog = VestskTipping.__new__(VestskTipping)
+    cog._arkiver_impl = AsyncMock()
+    ctx = MagicMock()
+    ctx.send = AsyncMock()
+    monkeypatch.setattr("cogs.vestsk_tipping.ARCHIVE_KEEP_WEEKS", 0)
+
+    await VestskTipping.arkiver.callback(cog, ctx, "0")
+    cog._arkiver_impl.assert_awaited_once_with(ctx, 0, False, None)
+
+    cog._arkiver_impl.reset_mock()
+    await VestskTipping.arkiver.callback(cog, ctx, None)
+    cog._arkiver_impl.assert_awaited_once_with(ctx, 4, False, None)
+
+    cog._arkiver_impl.reset_mock()
+    await VestskTipping.arkiver.callback(cog, ctx, "-2")
+    cog._arkiver_impl.assert_not_awaited()
+    assert "negativt" in ctx.send.await_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_resultater_uses_sheet_index(monkeypatch):
+    """Tester at eksporten fører radindeksen og at resultater bruker den."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    week2_total = [r for r in worksheet.get_all_values() if r[0] == "Sesongpoeng"][-1]
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet",
+        lambda name, worksheet_index=0: worksheet,
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.simulate_season",
+        functools.partial(simulate_season, simulations=100),
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    ctx = FakeContext(channel, bot)
+
+    await cog._export_impl(ctx, 3)
+    week3 = cog.sheet_index.get(3)
+    assert (week3.first, week3.games) == (42, 16)
+    state = book.worksheet("State").get("D2:H")
+    assert state == [[str(cog._current_season()), "3", "42", "58", "59"]]
+
+    for _ in range(2):
+        before = book.calls["sheets.get_all_values"]
+        await cog._resultater_impl(ctx, 3)
+        assert book.calls["sheets.get_all_values"] == before
+
+        rows = worksheet.get_all_values()
+        week_points = [int(v) for v in rows[week3.ukespoeng - 1][1:]]
+        totals = [int(v) for v in rows[week3.sesongpoeng - 1][1:]]
+        # En ny kjøring bygger på uke 2, ikke på sin egen sesongtotal
+        assert totals == [int(v) + p for v, p in zip(week2_total[1:], week_points)]
+
+
+@pytest.mark.asyncio
+async def test_failed_sheet_reads_keep_week_pending(monkeypatch):
+    """Tester at feil ved lesing av arket gir feil, så uken ikke regnes som ferdig."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    cog.state_loaded = True
+    cog.last_processed_week = 2
+
+    def fail(*_args, **_kwargs):
+        raise TimeoutError()
+
+    # Tom indeks: eksporten må lese kolonne A for å finne plassen
+    monkeypatch.setattr(worksheet, "col_values", fail)
+    with pytest.raises(ExportError, match="kolonne A"):
+        await cog._export_impl(FakeContext(channel, bot), 3)
+    assert not await cog._run_previous_week(channel, 3)
+    assert cog.last_processed_week == 2
+
+    # Eksporten går, men kampradene fra indeksen kan ikke leses
+    monkeypatch.undo()
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    await cog._export_impl(FakeContext(channel, bot), 3)
+    monkeypatch.setattr(worksheet, "range", fail)
+    with pytest.raises(ResultaterError, match="kampradene for uke 3"):
+        await cog._resultater_impl(FakeContext(channel, bot), 3)
+
+
+@pytest.mark.asyncio
+async def test_failed_total_read_keeps_week_pending(monkeypatch):
+    """Tester at en feilet lesing av forrige totalsum ikke gir en ferdig uke."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    cog.state_loaded = True
+    cog.last_processed_week = 2
+    await cog._export_impl(FakeContext(channel, bot), 3)
+
+    def fail(*_args, **_kwargs):
+        raise TimeoutError()
+
+    # Ingen lagrede sesongpoeng, så forrige "Sesongpoeng"-rad må leses
+    monkeypatch.setattr(worksheet, "get", fail)
+    with pytest.raises(ResultaterError, match="forrige totalsum for uke 3"):
+        await cog._resultater_impl(FakeContext(channel, bot), 3)
+    assert not await cog._run_previous_week(channel, 3)
+    assert cog.last_processed_week == 2
+
+
+@pytest.mark.asyncio
+async def test_season_totals_and_stilling(monkeypatch):
+    """Tester lagrede sesongpoeng, !stilling og sjekk mot arket."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(3), bot.user)
+    book = build_tipping_sheet(3, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.simulate_season",
+        functools.partial(simulate_season, simulations=100),
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    ctx = FakeContext(channel, bot)
+    await cog._export_impl(ctx, 3)
+    await cog._resultater_impl(ctx, 3)
+
+    totals_row = worksheet.get_all_values()[cog.sheet_index.get(3).sesongpoeng - 1]
+    ids = tipper_ids(3)
+    assert cog.season_totals.totals == dict(zip(ids, map(int, totals_row[1:])))
+    state = book.worksheet("State").get("J2:O")
+    assert [row[2] for row in state] == ids
+
+    # Ny kjøring bruker totalen før uken og leser ikke forrige rad i arket
+    before = book.calls["sheets.get"]
+    await cog._resultater_impl(ctx, 3)
+    assert book.calls["sheets.get"] - before == 1  # bare tipsene til projeksjonen
+    assert worksheet.get_all_values()[cog.sheet_index.get(3).sesongpoeng - 1] == (
+        totals_row
+    )
+
+    ctx.send = AsyncMock()
+    await cog._stilling_impl(ctx)
+    assert "Sesongstilling etter uke 3:" in ctx.send.call_args.args[0]
+
+    # Arket rettes for hånd: sjekken finner avviket og henter poengene på nytt
+    worksheet.update(f"B{cog.sheet_index.get(3).sesongpoeng}", [["99"]])
+    await cog._stilling_impl(ctx, check=True)
+    assert "Fant 1 avvik" in ctx.send.call_args_list[-2].args[0]
+    assert cog.season_totals.totals[ids[0]] == 99
+    assert cog.season_totals.before is not None
+
+
+@pytest.mark.asyncio
+async def test_rerun_of_earlier_week_keeps_latest_totals(monkeypatch):
+    """Tester at en ny kjøring av en eldre uke ikke ruller sesongpoengene tilbake."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(3), bot.user)
+    book = build_tipping_sheet(3, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.simulate_season",
+        functools.partial(simulate_season, simulations=100),
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    ctx = FakeContext(channel, bot)
+    await cog._export_impl(ctx, 3)
+    await cog._resultater_impl(ctx, 3)
+    week3_totals = dict(cog.season_totals.totals)
+
+    await cog._resultater_impl(ctx, 2)
+
+    assert cog.season_totals.week == 3
+    assert cog.season_totals.totals == week3_totals
+    assert book.worksheet("State").get("K2:K")[0] == ["3"]
+    ctx.send = AsyncMock()
+    await cog._stilling_impl(ctx)
+    assert "Sesongstilling etter uke 3:" in ctx.send.call_args.args[0]
+
+
+async def _process_week3(monkeypatch, mode: str):
+    """Eksport og resultater for uke 3 mot et nytt falskt ark."""
+    monkeypatch.setenv("TIPPING_TOTALS_MODE", mode)
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.fetch_espn_json", FakeESPN(completed_through=3).fetch_json
+    )
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.simulate_season",
+        functools.partial(simulate_season, simulations=100),
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    ctx = FakeContext(channel, bot)
+    await cog._export_impl(ctx, 3)
+    await cog._resultater_impl(ctx, 3)
+    return cog, book
+
+
+@pytest.mark.asyncio
+async def test_resultater_formula_mode_matches_bot(monkeypatch):
+    """Tester at formelmodus gir samme poeng som når botten regner selv."""
+    results = {}
+    for mode in ("bot", "formel"):
+        cog, book = await _process_week3(monkeypatch, mode)
+        week3 = cog.sheet_index.get(3)
+        rows = book.get_worksheet(0).get_all_values()
+        results[mode] = [
+            rows[week3.ukespoeng - 1][:5],
+            rows[week3.sesongpoeng - 1][:5],
+            cog.season_totals.totals,
+        ]
+
+    assert results["formel"] == results["bot"]
+    assert book.calls["sheets.cell"] == 0
+    assert rows[0][5] == "Vinner"
+    assert book.get_worksheet(0).rows[week3.sesongpoeng - 1][1].startswith("=")
+
+
+def _catch_up_cog(monkeypatch, completed_through: int):
+    """Cog med uke 1-2 behandlet og uke 3 postet, mot nytt falskt ark."""
+    bot = FakeBot()
+    channel = build_season_channel(3, tipper_ids(4), bot.user)
+    book = build_tipping_sheet(4, 2)
+    worksheet = book.get_worksheet(0)
+    espn = FakeESPN(completed_through=completed_through)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.get_sheet", lambda name, worksheet_index=0: worksheet
+    )
+    monkeypatch.setattr("cogs.vestsk_tipping.fetch_espn_json", espn.fetch_json)
+    monkeypatch.setattr(
+        "cogs.vestsk_tipping.simulate_season",
+        functools.partial(simulate_season, simulations=100),
+    )
+    cog = VestskTipping.__new__(VestskTipping)
+    cog.bot = bot
+    cog.norsk_tz = pytz.timezone("Europe/Oslo")
+    cog.state_loaded = True
+    cog.last_processed_week = 2
+    cog.last_posted_week = 3
+    return cog, channel, book, espn
+
+
+@pytest.mark.asyncio
+async def test_catch_up_processes_posted_week_and_skips_rest(monkeypatch):
+    """Tester at nedetid over flere uker tas igjen i én runde."""
+    cog, channel, book, espn = _catch_up_cog(monkeypatch, completed_through=5)
+    weeks = cog._missed_weeks(6)
+    assert weeks == [3, 4, 5]
+
+    assert await cog._catch_up_weeks(channel, weeks)
+
+    assert cog.last_processed_week == 5
+    assert book.worksheet("State").get("A2:B2") == [["5", "3"]]
+    assert sorted(cog.sheet_index.weeks) == [3]
+    rows = book.get_worksheet(0).get_all_values()
+    week3_total = rows[cog.sheet_index.get(3).sesongpoeng - 1]
+    assert cog.season_totals.week == 5
+    assert cog.season_totals.totals == dict(
+        zip(tipper_ids(4), map(int, week3_total[1:]))
+    )
+    assert any("Uke 4, 5 ble aldri lagt ut" in m for m in channel.sent)
+    # Tre scoreboard for ukene som tas igjen; projeksjonen etter uke 3 henter
+    # uke 4 og 5 fra cachen og resten (6-18) fra ESPN
+    assert espn.calls["espn.scoreboard"] == 3 + 13
+
+
+@pytest.mark.asyncio
+async def test_catch_up_stops_at_unfinished_week(monkeypatch):
+    """Tester at innhentingen stopper før en uke som ikke er ferdigspilt."""
+    cog, channel, book, _espn = _catch_up_cog(monkeypatch, completed_through=3)
+
+    assert not await cog._catch_up_weeks(channel, cog._missed_weeks(6))
+
+    assert cog.last_processed_week == 3
+    assert sorted(cog.sheet_index.weeks) == [3]
+    assert not any("aldri lagt ut" in m for m in channel.sent)
+
+    cog.last_processed_week = None
+    assert cog._missed_weeks(6) == [5]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_checks_channel_for_posted_weeks(monkeypatch):
+    """Tester at en uke postet i kanalen eksporteres uten `last_posted_week`."""
+    cog, channel, book, _espn = _catch_up_cog(monkeypatch, completed_through=5)
+    cog.last_posted_week = None
+
+    assert await cog._catch_up_weeks(channel, [3, 4, 5])
+
+    assert sorted(cog.sheet_index.weeks) == [3]
+    week3 = book.get_worksheet(0).get_all_values()[cog.sheet_index.get(3).first - 1]
+    assert any(week3[1:])
+    assert any("Uke 4, 5 ble aldri lagt ut" in m for m in channel.sent)
+
+
+@pytest.mark.asyncio
+async def test_catch_up_keeps_weeks_pending_when_history_fails(monkeypatch):
+    """Tester at uker ikke hoppes over når kanalen ikke kan leses."""
+    cog, channel, _book, _espn = _catch_up_cog(monkeypatch, completed_through=5)
+
+    def broken_history(*_args, **_kwargs):
+        raise RuntimeError("discord nede")
+
+    monkeypatch.setattr(channel, "history", broken_history)
+
+    assert not await cog._catch_up_weeks(channel, [3, 4, 5])
+
+    assert cog.last_processed_week == 2
+    assert not any("aldri lagt ut" in m for m in channel.sent)
+
+
+@pytest.mark.asyncio
+async def test_week_scoreboards_limited_and_finished_weeks_cached(monkeypatch):
+    """Tester at scoreboard-kallene begrenses og ferdige uker caches."""
+    espn = FakeESPN(completed_through=5)
+    active = peak = 0
+
+    async def fetch_json(url, *args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return await espn.fetch_json(url, *args, **kwargs)
+
+    monkeypatch.setattr("cogs.vestsk_tipping.fetch_espn_json", fetch_json)
+    cog = VestskTipping.__new__(VestskTipping)
+
+    weeks = range(1, 19)
+    first = await asyncio.gather(*(cog._fetch_week_scoreboard(2025, w) for w in weeks))
+    assert peak <= SCOREBOARD_CONCURRENCY
+    assert espn.calls["espn.scoreboard"] == 18
+
+    again = await asyncio.gather(*(cog._fetch_week_scoreboard(2025, w) for w in weeks))
+    # Bare ukene som ikke er ferdigspilt hentes på nytt
+    assert espn.calls["espn.scoreboard"] == 18 + 13
+    assert again[:5] == first[:5]